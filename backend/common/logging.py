@@ -11,21 +11,35 @@ Goals:
   - reads/propagates X-Request-ID
   - binds correlation_id for the request lifetime
   - emits a single http.request log line per request
+- Optional queued mode (`init_structured_logging(queued=True)` or `LOG_QUEUED=1`):
+  callers only snapshot context ids and enqueue the record; JSON formatting and the
+  stdout write happen on a background listener thread. The queue is bounded
+  (`LOG_QUEUE_SIZE`); when full, records are dropped and counted
+  (`log_records_dropped_total`) rather than blocking the caller. Pending records are
+  flushed on shutdown (`backend.common.shutdown`) and at exit.
 """
 
 from __future__ import annotations
 
+import atexit
+import copy
+import functools
 import json
 import logging
+import logging.handlers
 import os
+import queue
 import sys
+import threading
 import time
 import traceback
 import uuid
 from contextlib import contextmanager
 from contextvars import ContextVar
 from datetime import datetime, timezone
-from typing import Any, Mapping, Optional
+from typing import Any, Callable, Mapping, Optional
+
+from backend.common.ops_metrics import REGISTRY
 
 
 _REQUEST_ID: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
@@ -167,6 +181,47 @@ def bind_request_id(*, request_id: str | None = None) -> str:
         _REQUEST_ID.reset(token)
 
 
+@functools.lru_cache(maxsize=None)
+def _context_getters() -> tuple[Optional[Callable[[], Optional[str]]], Optional[Callable[[], str]]]:
+    """
+    (get_execution_id, get_or_create_correlation_id), resolved once per process.
+    Either is None when its module is unavailable in this runtime.
+    """
+    try:
+        from backend.observability.execution_id import get_execution_id as _get_execution_id  # noqa: WPS433
+    except Exception:
+        _get_execution_id = None  # type: ignore[assignment]
+    try:
+        from backend.observability.correlation import get_or_create_correlation_id as _get_or_create_cid  # noqa: WPS433
+    except Exception:
+        _get_or_create_cid = None  # type: ignore[assignment]
+    return _get_execution_id, _get_or_create_cid
+
+
+def _context_ids(record: logging.LogRecord) -> tuple[Optional[str], str, Optional[str]]:
+    """
+    (request_id, correlation_id, execution_id) for a record: explicit record fields
+    first, then the caller's context. Must run on the logging caller's thread/context.
+    """
+    get_eid, get_or_create_cid = _context_getters()
+    rid = _clean_text(getattr(record, "request_id", None) or get_request_id() or "", max_len=128) or None
+    cid = _clean_text(getattr(record, "correlation_id", None) or "", max_len=128) or None
+    try:
+        ctx_eid = get_eid() if get_eid is not None else None
+    except Exception:
+        ctx_eid = None
+    eid = _clean_text(getattr(record, "execution_id", None) or ctx_eid or "", max_len=128) or None
+    if not cid:
+        # Ensure a stable correlation_id is always present for queryability.
+        try:
+            cid = get_or_create_cid() if get_or_create_cid is not None else uuid.uuid4().hex
+        except Exception:
+            cid = uuid.uuid4().hex
+    if not rid:
+        rid = cid
+    return rid, cid, eid
+
+
 class JsonLogFormatter(logging.Formatter):
     def __init__(self, *, service: str | None, env: str | None, version: str | None, sha: str | None) -> None:
         super().__init__()
@@ -178,24 +233,7 @@ class JsonLogFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:  # noqa: A003 (format required by logging)
         severity = _normalize_severity(getattr(record, "severity", None) or record.levelname)
         event_type = _clean_text(getattr(record, "event_type", None) or "", max_len=128) or "log"
-        rid = _clean_text(getattr(record, "request_id", None) or get_request_id() or "", max_len=128) or None
-        cid = _clean_text(getattr(record, "correlation_id", None) or "", max_len=128) or None
-        try:
-            from backend.observability.execution_id import get_execution_id as _get_execution_id  # noqa: WPS433
-
-            eid = _clean_text(getattr(record, "execution_id", None) or _get_execution_id() or "", max_len=128) or None
-        except Exception:
-            eid = _clean_text(getattr(record, "execution_id", None) or "", max_len=128) or None
-        if not cid:
-            # Ensure a stable correlation_id is always present for queryability.
-            try:
-                from backend.observability.correlation import get_or_create_correlation_id as _get_or_create_correlation_id  # noqa: WPS433
-
-                cid = _get_or_create_correlation_id()
-            except Exception:
-                cid = uuid.uuid4().hex
-        if not rid:
-            rid = cid
+        rid, cid, eid = _context_ids(record)
 
         payload: dict[str, Any] = {
             "timestamp": _utc_ts(),
@@ -218,6 +256,9 @@ class JsonLogFormatter(logging.Formatter):
                 payload["exception"] = "".join(traceback.format_exception(*record.exc_info))[-8000:]
             except Exception:
                 payload["exception"] = "exception_format_failed"
+        elif record.exc_text:
+            # Pre-rendered by the queue handler on the caller thread.
+            payload["exception"] = record.exc_text[-8000:]
         elif record.stack_info:
             payload["stack"] = _clean_text(record.stack_info, max_len=8000)
 
@@ -243,6 +284,125 @@ def _silence_uvicorn_handlers() -> None:
         lg.propagate = True
 
 
+log_records_dropped_total = REGISTRY.counter(
+    "log_records_dropped_total",
+    help="Log records dropped because the structured logging queue was full.",
+)
+log_records_dropped_total.inc(0.0)
+
+LOG_QUEUE_SIZE_DEFAULT = 10_000
+
+
+class _ContextQueueHandler(logging.handlers.QueueHandler):
+    """
+    Caller-side half of queued logging: snapshot context ids, render the message
+    and any traceback, then enqueue without blocking (drop + count when full).
+    """
+
+    def __init__(self, q: "queue.Queue[Any]") -> None:
+        super().__init__(q)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Context vars are only visible on the caller; capture raw values (the
+        # listener cleans them) so this stays a handful of lookups.
+        get_eid, get_or_create_cid = _context_getters()
+        # Other handlers on the same logger see the caller's record, so mutate a copy.
+        record = copy.copy(record)
+        d = record.__dict__
+        if not d.get("request_id"):
+            record.request_id = _REQUEST_ID.get()
+        if not d.get("execution_id") and get_eid is not None:
+            try:
+                record.execution_id = get_eid()
+            except Exception:
+                pass
+        if not d.get("correlation_id") and get_or_create_cid is not None:
+            try:
+                record.correlation_id = get_or_create_cid()
+            except Exception:
+                pass
+        # Render now: args may be mutated and tracebacks pin frames after we return.
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            try:
+                record.exc_text = "".join(traceback.format_exception(*record.exc_info))
+            except Exception:
+                record.exc_text = "exception_format_failed"
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            log_records_dropped_total.inc()
+
+
+class _BoundedQueueListener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # The queue may be full at shutdown; wait for room instead of raising.
+        try:
+            self.queue.put(self._sentinel, timeout=5.0)
+        except queue.Full:
+            pass
+
+
+_queue_lock = threading.Lock()
+_queue_handler: Optional[_ContextQueueHandler] = None
+_queue_listener: Optional[_BoundedQueueListener] = None
+_queue_sink: Optional[logging.Handler] = None
+
+
+def flush_structured_logging(*, timeout_s: float = 2.0) -> bool:
+    """
+    Wait (up to `timeout_s`) until queued log records have been written.
+
+    Returns True when the queue drained (or queued mode is off). Polls instead of
+    taking the queue lock so it is safe to call from a signal handler.
+    """
+    handler, sink = _queue_handler, _queue_sink
+    if handler is None:
+        return True
+    q = handler.queue
+    deadline = time.monotonic() + max(0.0, float(timeout_s))
+    drained = True
+    while getattr(q, "unfinished_tasks", 0) > 0:
+        if time.monotonic() >= deadline:
+            drained = False
+            break
+        time.sleep(0.005)
+    if sink is not None:
+        try:
+            sink.flush()
+        except Exception:
+            pass
+    return drained
+
+
+def _stop_queued_logging() -> None:
+    global _queue_handler, _queue_listener, _queue_sink
+    with _queue_lock:
+        listener = _queue_listener
+        _queue_handler = _queue_listener = _queue_sink = None
+    if listener is not None:
+        try:
+            listener.stop()  # drains remaining records, then joins the thread
+        except Exception:
+            pass
+
+
+def _flush_on_shutdown() -> None:
+    flush_structured_logging()
+
+
+def _env_flag(name: str) -> bool:
+    return str(os.getenv(name) or "").strip().lower() in {"1", "true", "yes", "on"}
+
+
 def init_structured_logging(
     *,
     service: str | None = None,
@@ -250,28 +410,60 @@ def init_structured_logging(
     version: str | None = None,
     sha: str | None = None,
     level: str | int | None = None,
+    queued: bool | None = None,
+    queue_size: int | None = None,
 ) -> None:
     """
     Configure stdlib logging to emit JSON lines to stdout.
 
+    Queued mode (`queued=True`, default from `LOG_QUEUED`) moves formatting and the
+    stdout write to a background thread behind a bounded queue (`queue_size`,
+    default from `LOG_QUEUE_SIZE`).
+
     Safe to call multiple times (last call wins).
     """
+    global _queue_handler, _queue_listener, _queue_sink
     lvl = level or os.getenv("LOG_LEVEL", "INFO").upper()
     root = logging.getLogger()
     root.setLevel(lvl)
 
     # Replace handlers to ensure JSON output.
+    _stop_queued_logging()
     root.handlers = []
     handler = logging.StreamHandler(stream=sys.stdout)
     handler.setLevel(lvl)
     handler.setFormatter(JsonLogFormatter(service=service, env=env, version=version, sha=sha))
-    root.addHandler(handler)
+
+    use_queue = _env_flag("LOG_QUEUED") if queued is None else bool(queued)
+    if use_queue:
+        if queue_size is None:
+            try:
+                queue_size = int(os.getenv("LOG_QUEUE_SIZE") or LOG_QUEUE_SIZE_DEFAULT)
+            except ValueError:
+                queue_size = LOG_QUEUE_SIZE_DEFAULT
+        q: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, int(queue_size)))
+        qh = _ContextQueueHandler(q)
+        qh.setLevel(lvl)
+        listener = _BoundedQueueListener(q, handler, respect_handler_level=True)
+        listener.start()
+        with _queue_lock:
+            _queue_handler, _queue_listener, _queue_sink = qh, listener, handler
+        root.addHandler(qh)
+
+        from backend.common.shutdown import register_shutdown_hook  # noqa: WPS433
+
+        register_shutdown_hook(_flush_on_shutdown)
+    else:
+        root.addHandler(handler)
 
     # Make warnings go through logging (and therefore JSON).
     logging.captureWarnings(True)
     _silence_uvicorn_handlers()
 
 
+atexit.register(_stop_queued_logging)
+
+
 def log_event(
     logger: logging.Logger,
     event_type: str,
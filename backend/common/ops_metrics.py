@@ -3,17 +3,34 @@ Minimal, dependency-free metrics + Prometheus text exposition.
 
 Design goals:
 - stdlib-only (no prometheus_client dependency)
-- tiny API: counters, gauges, labeled counters
+- tiny API: counters, gauges, labeled counters, histograms, summaries
 - safe for multi-threaded access (used by background tasks + HTTP handlers)
+
+Histograms and summaries sit on hot paths, so recording never takes a lock: each
+thread writes its own shard (found through a threading.local) and shards are merged
+at scrape time. Shards of exited threads are folded into a per-label "retired" shard
+on the next scrape, so thread churn does not grow memory. A scrape may see an
+observation's bucket before its sum; the count is always derived from the buckets.
+
+    latency = REGISTRY.histogram("x_seconds", help="...", label_names=("op",))
+    with timed(latency, labels={"op": "commit"}):
+        ...
+
+    @timed(latency, labels={"op": "place"})
+    async def place(...): ...
 """
 
 from __future__ import annotations
 
+import functools
+import inspect
 import logging
+import math
 import threading
 import time
+from bisect import bisect_left
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, Mapping, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, TypeVar
 
 logger = logging.getLogger(__name__)
 
@@ -44,16 +61,33 @@ def _format_labels(label_items: Iterable[Tuple[str, str]]) -> str:
 class _MetricDef:
     name: str
     help: str
-    mtype: str  # "counter" | "gauge"
+    mtype: str  # "counter" | "gauge" | "histogram" | "summary"
     label_names: Tuple[str, ...] = ()
 
 
+_LabelKey = Tuple[Tuple[str, str], ...]
+
+# Latency-oriented defaults (seconds): sub-millisecond cache hits through 10s broker calls.
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+DEFAULT_QUANTILES: Tuple[float, ...] = (0.5, 0.9, 0.99)
+
+
+def _format_float(v: float) -> str:
+    if math.isinf(v):
+        return "+Inf" if v > 0 else "-Inf"
+    return repr(float(v))
+
+
 class MetricRegistry:
     def __init__(self) -> None:
         self._lock = threading.RLock()
         self._defs: Dict[str, _MetricDef] = {}
         # Values keyed by metric name -> labels tuple -> value
         self._values: Dict[str, Dict[Tuple[Tuple[str, str], ...], float]] = {}
+        # Histogram/summary storage (sharded per thread) keyed by metric name
+        self._dists: Dict[str, "_ShardedDistribution"] = {}
 
     def counter(self, name: str, *, help: str = "", label_names: Iterable[str] = ()) -> "Counter":
         return Counter(self, name=name, help=help, label_names=tuple(label_names))
@@ -61,6 +95,44 @@ class MetricRegistry:
     def gauge(self, name: str, *, help: str = "", label_names: Iterable[str] = ()) -> "Gauge":
         return Gauge(self, name=name, help=help, label_names=tuple(label_names))
 
+    def histogram(
+        self,
+        name: str,
+        *,
+        help: str = "",
+        label_names: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> "Histogram":
+        return Histogram(self, name=name, help=help, label_names=tuple(label_names), buckets=tuple(buckets))
+
+    def summary(
+        self,
+        name: str,
+        *,
+        help: str = "",
+        label_names: Iterable[str] = (),
+        quantiles: Iterable[float] = DEFAULT_QUANTILES,
+        max_age_s: float = 600.0,
+        max_samples: int = 1024,
+    ) -> "Summary":
+        return Summary(
+            self,
+            name=name,
+            help=help,
+            label_names=tuple(label_names),
+            quantiles=tuple(quantiles),
+            max_age_s=max_age_s,
+            max_samples=max_samples,
+        )
+
+    def _ensure_dist(self, mdef: _MetricDef, factory: Callable[[], "_ShardedDistribution"]) -> "_ShardedDistribution":
+        with self._lock:
+            self._ensure_def(mdef)
+            dist = self._dists.get(mdef.name)
+            if dist is None:
+                dist = self._dists[mdef.name] = factory()
+            return dist
+
     def _ensure_def(self, mdef: _MetricDef) -> None:
         with self._lock:
             existing = self._defs.get(mdef.name)
@@ -80,12 +152,10 @@ class MetricRegistry:
             return ()
         if not labels:
             raise ValueError("labels required for labeled metric")
-        items: list[Tuple[str, str]] = []
-        for k in label_names:
-            if k not in labels:
-                raise ValueError(f"missing label: {k}")
-            items.append((k, str(labels[k])))
-        return tuple(items)
+        try:
+            return tuple([(k, str(labels[k])) for k in label_names])
+        except KeyError as e:
+            raise ValueError(f"missing label: {e.args[0]}") from None
 
     def inc(self, name: str, *, by: float = 1.0, labels: Mapping[str, Any] | None = None) -> None:
         with self._lock:
@@ -101,8 +171,17 @@ class MetricRegistry:
             self._values[name][key] = float(value)
 
     def snapshot(self) -> Dict[str, Dict[Tuple[Tuple[str, str], ...], float]]:
+        """
+        Counter/gauge values by name. Histograms and summaries appear as their
+        exposition series (`<name>_count`, `<name>_sum`, `<name>_bucket` with an `le`
+        label, or `<name>` with a `quantile` label).
+        """
         with self._lock:
-            return {k: dict(v) for k, v in self._values.items()}
+            out = {k: dict(v) for k, v in self._values.items() if k not in self._dists}
+            for name, dist in self._dists.items():
+                for series, label_tup, v in dist.samples(name):
+                    out.setdefault(series, {})[label_tup] = v
+            return out
 
     def render_prometheus_text(self) -> str:
         """
@@ -115,6 +194,11 @@ class MetricRegistry:
                 if mdef.help:
                     lines.append(f"# HELP {mdef.name} {mdef.help}")
                 lines.append(f"# TYPE {mdef.name} {mdef.mtype}")
+                dist = self._dists.get(name)
+                if dist is not None:
+                    for series, label_tup, v in dist.samples(name):
+                        lines.append(f"{series}{_format_labels(label_tup)} {v}")
+                    continue
                 samples = self._values.get(name, {})
                 # Deterministic label ordering for stable diffs.
                 for label_tup in sorted(samples.keys()):
@@ -143,6 +227,340 @@ class Gauge:
         self._reg.set(self._name, value=value, labels=labels)
 
 
+class _HistogramShard:
+    __slots__ = ("counts", "sum")
+
+    def __init__(self, n_buckets: int) -> None:
+        self.counts = [0] * (n_buckets + 1)  # last slot is +Inf
+        self.sum = 0.0
+
+    def merge_into(self, other: "_HistogramShard") -> None:
+        counts = other.counts
+        for i, c in enumerate(self.counts):
+            counts[i] += c
+        other.sum += self.sum
+
+
+class _SummaryShard:
+    __slots__ = ("count", "sum", "values", "times", "next")
+
+    def __init__(self, max_samples: int) -> None:
+        self.count = 0
+        self.sum = 0.0
+        # Ring buffer of recent observations and when they were made (monotonic seconds).
+        self.values = [0.0] * max_samples
+        self.times = [-math.inf] * max_samples
+        self.next = 0
+
+    def window(self, since: float) -> List[Tuple[float, float]]:
+        return [(t, v) for t, v in zip(self.times, self.values) if t >= since]
+
+    def merge_into(self, other: "_SummaryShard") -> None:
+        other.count += self.count
+        other.sum += self.sum
+        # Keep the newest samples of both rings.
+        cap = len(other.values)
+        merged = sorted(self.window(-math.inf) + other.window(-math.inf))[-cap:]
+        other.times = [t for t, _ in merged] + [-math.inf] * (cap - len(merged))
+        other.values = [v for _, v in merged] + [0.0] * (cap - len(merged))
+        other.next = len(merged) % cap
+
+
+class _ShardedDistribution:
+    """
+    Per-thread shards of one histogram/summary, keyed by label set.
+
+    The owning thread is the only writer of a shard, so recording is lock-free;
+    `_lock` only guards the shard list (first observation per thread/label set) and
+    scrape-time merging.
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._live: List[Tuple[threading.Thread, _LabelKey, Any]] = []
+        self._retired: Dict[_LabelKey, Any] = {}
+        # Label set -> bound child (`.labels(...)`), so rebinding reuses its thread-local shards.
+        self.bound: Dict[_LabelKey, Any] = {}
+
+    def _new_shard(self) -> Any:
+        raise NotImplementedError
+
+    def shard(self, key: _LabelKey, local: threading.local, local_key: _LabelKey) -> Any:
+        """
+        This thread's shard for `key`, cached in `local.shards[local_key]`.
+
+        Bound children (`.labels(...)`) pass their own threading.local and local_key=()
+        so the hot-path lookup never hashes the label tuple.
+        """
+        try:
+            shards = local.shards
+        except AttributeError:
+            shards = local.shards = {}
+        sh = shards.get(local_key)
+        if sh is None:
+            sh = shards[local_key] = self._new_shard()
+            with self._lock:
+                self._live.append((threading.current_thread(), key, sh))
+        return sh
+
+    def shards_by_label(self) -> Dict[_LabelKey, List[Any]]:
+        """Label set -> shards to merge; folds shards of exited threads first."""
+        with self._lock:
+            live = []
+            for entry in self._live:
+                thread, key, sh = entry
+                if thread.is_alive():
+                    live.append(entry)
+                else:
+                    sh.merge_into(self._retired.setdefault(key, self._new_shard()))
+            self._live = live
+
+            out: Dict[_LabelKey, List[Any]] = {}
+            for key, sh in self._retired.items():
+                out.setdefault(key, []).append(sh)
+            for _, key, sh in live:
+                out.setdefault(key, []).append(sh)
+            return out
+
+    def samples(self, name: str) -> List[Tuple[str, _LabelKey, float]]:
+        raise NotImplementedError
+
+
+class _HistogramData(_ShardedDistribution):
+    def __init__(self, buckets: Tuple[float, ...], unlabeled: bool) -> None:
+        super().__init__()
+        self.upper = buckets
+        self._unlabeled = unlabeled
+
+    def _new_shard(self) -> _HistogramShard:
+        return _HistogramShard(len(self.upper))
+
+    def samples(self, name: str) -> List[Tuple[str, _LabelKey, float]]:
+        parts = self.shards_by_label()
+        if not parts and self._unlabeled:
+            parts[()] = []  # export zero-valued series before the first observation
+        out: List[Tuple[str, _LabelKey, float]] = []
+        for key in sorted(parts):
+            total = self._new_shard()
+            for sh in parts[key]:
+                sh.merge_into(total)
+            cumulative = 0
+            for le, c in zip((*self.upper, math.inf), total.counts):
+                cumulative += c
+                out.append((f"{name}_bucket", key + (("le", _format_float(le)),), float(cumulative)))
+            out.append((f"{name}_sum", key, float(total.sum)))
+            out.append((f"{name}_count", key, float(cumulative)))
+        return out
+
+
+class _SummaryData(_ShardedDistribution):
+    def __init__(
+        self,
+        quantiles: Tuple[float, ...],
+        max_age_s: float,
+        max_samples: int,
+        unlabeled: bool,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__()
+        self.quantiles = quantiles
+        self.max_age_s = max_age_s
+        self.max_samples = max_samples
+        self.clock = clock
+        self._unlabeled = unlabeled
+
+    def _new_shard(self) -> _SummaryShard:
+        return _SummaryShard(self.max_samples)
+
+    def samples(self, name: str) -> List[Tuple[str, _LabelKey, float]]:
+        parts = self.shards_by_label()
+        if not parts and self._unlabeled:
+            parts[()] = []
+        since = self.clock() - self.max_age_s
+        out: List[Tuple[str, _LabelKey, float]] = []
+        for key in sorted(parts):
+            shards = parts[key]
+            window = sorted(v for sh in shards for _, v in sh.window(since))
+            for q in self.quantiles:
+                if window:
+                    # Nearest-rank quantile over the recent window.
+                    v = window[min(len(window) - 1, max(0, math.ceil(q * len(window)) - 1))]
+                else:
+                    v = math.nan
+                out.append((name, key + (("quantile", _format_float(q)),), float(v)))
+            out.append((f"{name}_sum", key, float(sum(sh.sum for sh in shards))))
+            out.append((f"{name}_count", key, float(sum(sh.count for sh in shards))))
+        return out
+
+
+class Histogram:
+    """Prometheus histogram with fixed upper bounds (`le`); +Inf is implicit."""
+
+    def __init__(
+        self,
+        reg: MetricRegistry,
+        *,
+        name: str,
+        help: str,
+        label_names: Tuple[str, ...],
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        upper = tuple(sorted(float(b) for b in buckets if not math.isinf(float(b))))
+        if not upper or len(set(upper)) != len(upper):
+            raise ValueError(f"histogram {name}: buckets must be non-empty and distinct")
+        self._reg = reg
+        self._name = name
+        self._label_names = label_names
+        self._data: _HistogramData = reg._ensure_dist(  # type: ignore[assignment]
+            _MetricDef(name=name, help=help, mtype="histogram", label_names=label_names),
+            lambda: _HistogramData(upper, unlabeled=not label_names),
+        )
+        self._upper = self._data.upper
+        self._local = self._data._local
+        self._bound_key: _LabelKey = ()
+
+    def observe(self, value: float, *, labels: Mapping[str, Any] | None = None) -> None:
+        key = self._reg._labels_key(self._label_names, labels) if self._label_names else ()
+        try:
+            sh = self._local.shards[key]  # hot path: this thread's shard, no lock
+        except (AttributeError, KeyError):
+            sh = self._data.shard(key or self._bound_key, self._local, key)
+        v = float(value)
+        sh.counts[bisect_left(self._upper, v)] += 1
+        sh.sum += v
+
+    def labels(self, **labels: Any) -> "Histogram":
+        """This histogram bound to one label set (label lookup done once, here)."""
+        return _bind(self, labels)
+
+    def time(self, *, labels: Mapping[str, Any] | None = None) -> "_Timer":
+        return timed(self, labels=labels)
+
+
+class Summary:
+    """
+    Prometheus summary: count, sum and quantiles over the last `max_age_s` seconds
+    (at most `max_samples` recent observations per thread).
+    """
+
+    def __init__(
+        self,
+        reg: MetricRegistry,
+        *,
+        name: str,
+        help: str,
+        label_names: Tuple[str, ...],
+        quantiles: Tuple[float, ...] = DEFAULT_QUANTILES,
+        max_age_s: float = 600.0,
+        max_samples: int = 1024,
+    ) -> None:
+        if any(not 0.0 <= q <= 1.0 for q in quantiles):
+            raise ValueError(f"summary {name}: quantiles must be within [0, 1]")
+        self._reg = reg
+        self._name = name
+        self._label_names = label_names
+        self._data: _SummaryData = reg._ensure_dist(  # type: ignore[assignment]
+            _MetricDef(name=name, help=help, mtype="summary", label_names=label_names),
+            lambda: _SummaryData(
+                tuple(sorted(quantiles)), float(max_age_s), max(1, int(max_samples)), unlabeled=not label_names
+            ),
+        )
+        self._local = self._data._local
+        self._clock = self._data.clock
+        self._bound_key: _LabelKey = ()
+
+    def observe(self, value: float, *, labels: Mapping[str, Any] | None = None) -> None:
+        key = self._reg._labels_key(self._label_names, labels) if self._label_names else ()
+        try:
+            sh = self._local.shards[key]
+        except (AttributeError, KeyError):
+            sh = self._data.shard(key or self._bound_key, self._local, key)
+        v = float(value)
+        i = sh.next
+        sh.values[i] = v
+        sh.times[i] = self._clock()
+        sh.next = (i + 1) % len(sh.values)
+        sh.sum += v
+        sh.count += 1
+
+    def labels(self, **labels: Any) -> "Summary":
+        """This summary bound to one label set (label lookup done once, here)."""
+        return _bind(self, labels)
+
+    def time(self, *, labels: Mapping[str, Any] | None = None) -> "_Timer":
+        return timed(self, labels=labels)
+
+
+def _bind(metric: Any, labels: Mapping[str, Any]) -> Any:
+    # A shallow copy that reports its fixed label key as if it were unlabeled; one per
+    # label set, so repeated `.labels(...)` calls share the same thread-local shards.
+    key = metric._reg._labels_key(metric._label_names, labels)
+    data = metric._data
+    bound = data.bound.get(key)
+    if bound is None:
+        with data._lock:
+            bound = data.bound.get(key)
+            if bound is None:
+                bound = object.__new__(type(metric))
+                bound.__dict__.update(metric.__dict__)
+                bound._label_names = ()
+                bound._bound_key = key
+                bound._local = threading.local()
+                data.bound[key] = bound
+    return bound
+
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+class _Timer:
+    def __init__(self, metric: Histogram | Summary, labels: Mapping[str, Any] | None) -> None:
+        self._metric = metric
+        self._labels = labels
+        self._t0 = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._metric.observe(time.perf_counter() - self._t0, labels=self._labels)
+
+    def __call__(self, fn: _F) -> _F:
+        metric, labels = self._metric, self._labels
+
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def _async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                t0 = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    metric.observe(time.perf_counter() - t0, labels=labels)
+
+            return _async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def _wrapper(*args: Any, **kwargs: Any) -> Any:
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                metric.observe(time.perf_counter() - t0, labels=labels)
+
+        return _wrapper  # type: ignore[return-value]
+
+
+def timed(metric: Histogram | Summary, *, labels: Mapping[str, Any] | None = None) -> _Timer:
+    """
+    Observe elapsed wall-clock seconds into `metric`, as a context manager or decorator
+    (sync or async functions). Time is recorded whether or not the block raises.
+    """
+    return _Timer(metric, labels)
+
+
 # ---- Shared registry + required metric names ----
 
 REGISTRY = MetricRegistry()
@@ -209,6 +627,18 @@ errors_total = REGISTRY.counter(
     label_names=("component",),
 )
 
+# Hot-path latency distributions (record with `timed(...)`).
+strategy_cycle_seconds = REGISTRY.histogram(
+    "strategy_cycle_seconds",
+    help="Wall-clock seconds per strategy cycle (one symbol evaluation).",
+)
+broker_order_place_seconds = REGISTRY.histogram(
+    "broker_order_place_seconds",
+    help="Wall-clock seconds per broker place_order call, labeled by broker.",
+    label_names=("broker",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
 # Ensure required metrics appear even before first increment.
 # (Prometheus best practice: export zero-valued time series explicitly.)
 try:
@@ -11,14 +11,20 @@ Why this exists:
 This module provides:
 - A shared `threading.Event` that is set on SIGTERM/SIGINT (best-effort).
 - An interruptible wait helper (`wait_or_shutdown`) used in place of `time.sleep`.
+- Shutdown hooks (`register_shutdown_hook`) for best-effort flushing of buffered
+  state (e.g. queued log records) as soon as shutdown is requested.
 
 Important:
 - We *chain* any previous signal handlers so frameworks (gunicorn/uvicorn/etc.)
   keep their expected behavior.
 - If the previous handler was SIG_DFL, we emulate default termination via
   `SystemExit(128+signal)` so `atexit` handlers can still run.
+- The signal handler itself only sets `SHUTDOWN_EVENT`; hooks run on a helper
+  thread (and again at exit), so a slow flush or a lock held by the interrupted
+  code can never stall or deadlock the handler.
 """
 
+import atexit
 import signal
 import threading
 from types import FrameType
@@ -29,6 +35,43 @@ SHUTDOWN_EVENT = threading.Event()
 _INSTALLED = False
 _LOCK = threading.Lock()
 
+# Copy-on-write: writers swap in a new tuple under the lock; readers never lock.
+_HOOKS: tuple[Callable[[], Any], ...] = ()
+_HOOKS_LOCK = threading.Lock()
+_ATEXIT_REGISTERED = False
+
+
+def register_shutdown_hook(fn: Callable[[], Any]) -> None:
+    """
+    Run `fn` when shutdown is requested (signal or `request_shutdown`) and again at
+    interpreter exit. Hooks must be idempotent, fast, and never raise.
+    """
+    global _ATEXIT_REGISTERED, _HOOKS
+    with _HOOKS_LOCK:
+        if fn not in _HOOKS:
+            _HOOKS = _HOOKS + (fn,)
+        if not _ATEXIT_REGISTERED:
+            atexit.register(run_shutdown_hooks)
+            _ATEXIT_REGISTERED = True
+
+
+def unregister_shutdown_hook(fn: Callable[[], Any]) -> None:
+    global _HOOKS
+    with _HOOKS_LOCK:
+        _HOOKS = tuple(h for h in _HOOKS if h is not fn)
+
+
+def run_shutdown_hooks() -> None:
+    """
+    Best-effort: call every registered hook (registration order). Lock-free.
+    """
+    for fn in _HOOKS:
+        try:
+            fn()
+        except Exception:
+            # Never block shutdown due to hook failures.
+            pass
+
 
 def request_shutdown(*, reason: str | None = None) -> None:
     """
@@ -40,6 +83,7 @@ def request_shutdown(*, reason: str | None = None) -> None:
         SHUTDOWN_EVENT.set()
     except Exception:
         pass
+    run_shutdown_hooks()
 
 
 def wait_or_shutdown(timeout_s: float) -> bool:
@@ -57,9 +101,18 @@ def wait_or_shutdown(timeout_s: float) -> bool:
         return bool(SHUTDOWN_EVENT.is_set())
 
 
+def _run_hooks_when_shutdown_requested() -> None:
+    SHUTDOWN_EVENT.wait()
+    run_shutdown_hooks()
+
+
 def _wrap_handler(prev: Any) -> Callable[[int, FrameType | None], Any]:
     def _handler(signum: int, frame: FrameType | None) -> Any:
-        request_shutdown(reason=f"signal:{signum}")
+        # Hooks run on the `shutdown-hooks` thread, not here (see module docstring).
+        try:
+            SHUTDOWN_EVENT.set()
+        except Exception:
+            pass
 
         # Chain previous behavior (frameworks may rely on this).
         try:
@@ -97,6 +150,7 @@ def install_signal_handlers_once() -> None:
                 prev = signal.getsignal(s)
                 signal.signal(s, _wrap_handler(prev))
             _INSTALLED = True
+            threading.Thread(target=_run_hooks_when_shutdown_requested, name="shutdown-hooks", daemon=True).start()
         except Exception:
             # Never fail import/startup due to signal limitations.
             return
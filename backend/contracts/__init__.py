@@ -1,14 +1,20 @@
 from __future__ import annotations
 
 from backend.contracts.registry import (
+    CompiledSchemaValidator,
     SchemaValidationError,
+    get_compiled_validator,
+    get_compiled_validator_for_path,
     get_schema_path_for_topic,
     get_validator_for_topic,
     validate_topic_event,
 )
 
 __all__ = [
+    "CompiledSchemaValidator",
     "SchemaValidationError",
+    "get_compiled_validator",
+    "get_compiled_validator_for_path",
     "get_schema_path_for_topic",
     "get_validator_for_topic",
     "validate_topic_event",
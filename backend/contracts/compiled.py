@@ -0,0 +1,258 @@
+"""
+Compile a JSON Schema (draft 2020-12 subset) into a fast `is_valid` predicate.
+
+The schema is walked once and turned into nested closures, so validating an event
+is plain Python attribute/dict checks with no per-call schema interpretation. This
+is a yes/no fast path only: callers fall back to `jsonschema` to build error
+messages for rejected events, so rejections read exactly as before.
+
+Supported keywords cover the contract schemas in this repo: type, enum, const,
+required, properties, additionalProperties, items, min/maxItems, min/maxLength,
+pattern, minimum/maximum (+ exclusive), min/maxProperties, anyOf/allOf/oneOf/not
+and local `$ref` (`#/$defs/...`). Annotations (title, description, default,
+examples, format, `$id`, `x-*`, ...) are ignored, matching jsonschema's default
+(format is not asserted without a format checker). Any other keyword raises
+`UnsupportedSchema`, meaning "use jsonschema for everything".
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Callable, Mapping
+
+Predicate = Callable[[Any], bool]
+
+
+class UnsupportedSchema(ValueError):
+    pass
+
+
+_ANNOTATIONS = frozenset(
+    {
+        "$schema",
+        "$id",
+        "$comment",
+        "$defs",
+        "definitions",
+        "title",
+        "description",
+        "default",
+        "examples",
+        "format",
+        "deprecated",
+        "readOnly",
+        "writeOnly",
+        "contentEncoding",
+        "contentMediaType",
+    }
+)
+
+
+def _is_integer(v: Any) -> bool:
+    if isinstance(v, bool):
+        return False
+    if isinstance(v, int):
+        return True
+    return isinstance(v, float) and v.is_integer()
+
+
+def _is_number(v: Any) -> bool:
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+_TYPE_CHECKS: dict[str, Predicate] = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "integer": _is_integer,
+    "number": _is_number,
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+
+def _json_equal(a: Any, b: Any) -> bool:
+    # JSON equality: booleans never equal numbers; 1 == 1.0; containers compared deeply.
+    if isinstance(a, bool) or isinstance(b, bool):
+        return isinstance(a, bool) and isinstance(b, bool) and a == b
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_json_equal(a[k], b[k]) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_json_equal(x, y) for x, y in zip(a, b))
+    if isinstance(a, (dict, list)) or isinstance(b, (dict, list)):
+        return False
+    return a == b
+
+
+def _always(_: Any) -> bool:
+    return True
+
+
+def _never(_: Any) -> bool:
+    return False
+
+
+class _Compiler:
+    def __init__(self, root: Mapping[str, Any]) -> None:
+        self._root = root
+        # $ref target -> predicate, filled lazily so recursive refs terminate.
+        self._refs: dict[str, Predicate] = {}
+
+    def _resolve(self, ref: str) -> Mapping[str, Any]:
+        if not ref.startswith("#/"):
+            raise UnsupportedSchema(f"non_local_ref:{ref}")
+        node: Any = self._root
+        for part in ref[2:].split("/"):
+            part = part.replace("~1", "/").replace("~0", "~")
+            if not isinstance(node, Mapping) or part not in node:
+                raise UnsupportedSchema(f"unresolvable_ref:{ref}")
+            node = node[part]
+        return node
+
+    def _ref(self, ref: str) -> Predicate:
+        if ref not in self._refs:
+            slot: list[Predicate] = []
+            self._refs[ref] = lambda v: slot[0](v)
+            slot.append(self.compile(self._resolve(ref)))
+        return self._refs[ref]
+
+    def compile(self, schema: Any) -> Predicate:
+        if schema is True:
+            return _always
+        if schema is False:
+            return _never
+        if not isinstance(schema, Mapping):
+            raise UnsupportedSchema(f"schema_not_object:{type(schema).__name__}")
+
+        checks: list[Predicate] = []
+        for key, value in schema.items():
+            if key in _ANNOTATIONS or key.startswith("x-"):
+                continue
+            build = getattr(self, "_kw_" + key.replace("$", ""), None)
+            if build is None:
+                raise UnsupportedSchema(f"unsupported_keyword:{key}")
+            checks.extend(build(value, schema))
+
+        if not checks:
+            return _always
+        if len(checks) == 1:
+            return checks[0]
+        checks_t = tuple(checks)
+        return lambda v: all(c(v) for c in checks_t)
+
+    # ---- keywords (each returns zero or more predicates) ----
+
+    def _kw_ref(self, value: str, _schema: Mapping[str, Any]) -> list[Predicate]:
+        return [self._ref(str(value))]
+
+    def _kw_type(self, value: Any, _schema: Mapping[str, Any]) -> list[Predicate]:
+        names = [value] if isinstance(value, str) else list(value)
+        try:
+            preds = tuple(_TYPE_CHECKS[n] for n in names)
+        except KeyError as e:
+            raise UnsupportedSchema(f"unknown_type:{e.args[0]}") from None
+        if len(preds) == 1:
+            return [preds[0]]
+        return [lambda v: any(p(v) for p in preds)]
+
+    def _kw_enum(self, value: list[Any], _schema: Mapping[str, Any]) -> list[Predicate]:
+        options = tuple(value)
+        if all(isinstance(o, str) for o in options):
+            allowed = frozenset(options)
+            return [lambda v: isinstance(v, str) and v in allowed]
+        return [lambda v: any(_json_equal(v, o) for o in options)]
+
+    def _kw_const(self, value: Any, _schema: Mapping[str, Any]) -> list[Predicate]:
+        if isinstance(value, str):
+            return [lambda v: isinstance(v, str) and v == value]
+        return [lambda v: _json_equal(v, value)]
+
+    def _kw_required(self, value: list[str], _schema: Mapping[str, Any]) -> list[Predicate]:
+        keys = tuple(value)
+        return [lambda v: not isinstance(v, dict) or all(k in v for k in keys)]
+
+    def _kw_properties(self, value: Mapping[str, Any], _schema: Mapping[str, Any]) -> list[Predicate]:
+        props = tuple((k, self.compile(s)) for k, s in value.items())
+
+        def _check(v: Any) -> bool:
+            if not isinstance(v, dict):
+                return True
+            for k, pred in props:
+                if k in v and not pred(v[k]):
+                    return False
+            return True
+
+        return [_check]
+
+    def _kw_additionalProperties(self, value: Any, schema: Mapping[str, Any]) -> list[Predicate]:
+        if value is True:
+            return []
+        if "patternProperties" in schema:
+            raise UnsupportedSchema("unsupported_keyword:patternProperties")
+        known = frozenset((schema.get("properties") or {}).keys())
+        pred = self.compile(value)
+        return [lambda v: not isinstance(v, dict) or all(pred(x) for k, x in v.items() if k not in known)]
+
+    def _kw_items(self, value: Any, schema: Mapping[str, Any]) -> list[Predicate]:
+        if "prefixItems" in schema:
+            raise UnsupportedSchema("unsupported_keyword:prefixItems")
+        pred = self.compile(value)
+        return [lambda v: not isinstance(v, list) or all(pred(x) for x in v)]
+
+    def _kw_minItems(self, value: int, _schema: Mapping[str, Any]) -> list[Predicate]:
+        return [lambda v: not isinstance(v, list) or len(v) >= value]
+
+    def _kw_maxItems(self, value: int, _schema: Mapping[str, Any]) -> list[Predicate]:
+        return [lambda v: not isinstance(v, list) or len(v) <= value]
+
+    def _kw_minProperties(self, value: int, _schema: Mapping[str, Any]) -> list[Predicate]:
+        return [lambda v: not isinstance(v, dict) or len(v) >= value]
+
+    def _kw_maxProperties(self, value: int, _schema: Mapping[str, Any]) -> list[Predicate]:
+        return [lambda v: not isinstance(v, dict) or len(v) <= value]
+
+    def _kw_minLength(self, value: int, _schema: Mapping[str, Any]) -> list[Predicate]:
+        return [lambda v: not isinstance(v, str) or len(v) >= value]
+
+    def _kw_maxLength(self, value: int, _schema: Mapping[str, Any]) -> list[Predicate]:
+        return [lambda v: not isinstance(v, str) or len(v) <= value]
+
+    def _kw_pattern(self, value: str, _schema: Mapping[str, Any]) -> list[Predicate]:
+        rx = re.compile(value)
+        return [lambda v: not isinstance(v, str) or rx.search(v) is not None]
+
+    def _kw_minimum(self, value: float, _schema: Mapping[str, Any]) -> list[Predicate]:
+        return [lambda v: not _is_number(v) or v >= value]
+
+    def _kw_maximum(self, value: float, _schema: Mapping[str, Any]) -> list[Predicate]:
+        return [lambda v: not _is_number(v) or v <= value]
+
+    def _kw_exclusiveMinimum(self, value: float, _schema: Mapping[str, Any]) -> list[Predicate]:
+        return [lambda v: not _is_number(v) or v > value]
+
+    def _kw_exclusiveMaximum(self, value: float, _schema: Mapping[str, Any]) -> list[Predicate]:
+        return [lambda v: not _is_number(v) or v < value]
+
+    def _kw_anyOf(self, value: list[Any], _schema: Mapping[str, Any]) -> list[Predicate]:
+        preds = tuple(self.compile(s) for s in value)
+        return [lambda v: any(p(v) for p in preds)]
+
+    def _kw_allOf(self, value: list[Any], _schema: Mapping[str, Any]) -> list[Predicate]:
+        return [self.compile(s) for s in value]
+
+    def _kw_oneOf(self, value: list[Any], _schema: Mapping[str, Any]) -> list[Predicate]:
+        preds = tuple(self.compile(s) for s in value)
+        return [lambda v: sum(1 for p in preds if p(v)) == 1]
+
+    def _kw_not(self, value: Any, _schema: Mapping[str, Any]) -> list[Predicate]:
+        pred = self.compile(value)
+        return [lambda v: not pred(v)]
+
+
+def compile_schema(schema: Mapping[str, Any]) -> Predicate:
+    """
+    Compile `schema` into `is_valid(instance) -> bool`.
+
+    Raises `UnsupportedSchema` if the schema uses keywords outside the supported set.
+    """
+    return _Compiler(schema).compile(schema)
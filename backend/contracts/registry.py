@@ -4,7 +4,9 @@ import json
 from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
+
+from backend.contracts.compiled import UnsupportedSchema, compile_schema
 
 
 @dataclass(frozen=True, slots=True)
@@ -25,7 +27,7 @@ def _repo_root() -> Path:
     return Path(__file__).resolve().parents[2]
 
 
-def get_schema_path_for_topic(topic: str) -> Path:
+def get_schema_path_for_topic(topic: str, schema_version: int = 1) -> Path:
     t = (topic or "").strip()
     if not t:
         raise ValueError("missing_topic")
@@ -40,7 +42,7 @@ def get_schema_path_for_topic(topic: str) -> Path:
     if t not in allowed:
         raise ValueError(f"unsupported_topic:{t}")
 
-    return _repo_root() / "contracts" / "schemas" / f"{t}.v1.schema.json"
+    return _repo_root() / "contracts" / "schemas" / f"{t}.v{int(schema_version)}.schema.json"
 
 
 @lru_cache(maxsize=64)
@@ -54,17 +56,74 @@ def _load_schema(schema_path: str) -> dict[str, Any]:
 
 
 @lru_cache(maxsize=64)
-def get_validator_for_topic(topic: str):
+def _validator_for_path(schema_path: str):
     # Lazy import so services that don't need contract validation can still import.
     from jsonschema import Draft202012Validator  # type: ignore
 
-    schema_path = str(get_schema_path_for_topic(topic))
     schema = _load_schema(schema_path)
     Draft202012Validator.check_schema(schema)
     return Draft202012Validator(schema)
 
 
-def validate_topic_event(*, topic: str, event: Any) -> Optional[list[dict[str, Any]]]:
+def get_validator_for_topic(topic: str, schema_version: int = 1):
+    return _validator_for_path(str(get_schema_path_for_topic(topic, schema_version)))
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledSchemaValidator:
+    """
+    A schema compiled once per process: `is_valid` is the generated fast path
+    (None when the schema uses keywords the compiler does not support) and
+    `validator` is the jsonschema validator used to explain rejections.
+    """
+
+    schema_path: str
+    validator: Any
+    is_valid: Optional[Callable[[Any], bool]]
+
+    def errors(self, event: Any) -> Optional[list[dict[str, Any]]]:
+        """None if valid, else the stable error list (same as `validate_topic_event`)."""
+        if self.is_valid is not None and self.is_valid(event):
+            return None
+        errors: list[dict[str, Any]] = []
+        for e in sorted(self.validator.iter_errors(event), key=lambda x: (list(x.path), str(x.message))):
+            path = ".".join(str(p) for p in e.path)
+            errors.append(
+                {
+                    "path": path,
+                    "message": str(e.message),
+                    "schema_path": "/".join(str(p) for p in e.schema_path),
+                }
+            )
+            if len(errors) >= 50:
+                break
+        return None if not errors else errors
+
+
+@lru_cache(maxsize=64)
+def get_compiled_validator_for_path(schema_path: str) -> CompiledSchemaValidator:
+    """
+    Compiled validator for any JSON schema file (topic schemas, or the v2 contract
+    schemas under backend/contracts/schemas/v2). Cached per process.
+    """
+    validator = _validator_for_path(schema_path)
+    try:
+        is_valid: Optional[Callable[[Any], bool]] = compile_schema(_load_schema(schema_path))
+    except UnsupportedSchema:
+        is_valid = None
+    return CompiledSchemaValidator(schema_path=schema_path, validator=validator, is_valid=is_valid)
+
+
+@lru_cache(maxsize=128)
+def get_compiled_validator(topic: str, schema_version: int = 1) -> CompiledSchemaValidator:
+    """
+    Process-wide compiled validator keyed by (topic, schemaVersion); shared by the
+    publisher contract gate and any consumer calling `validate_topic_event`.
+    """
+    return get_compiled_validator_for_path(str(get_schema_path_for_topic(topic, schema_version)))
+
+
+def validate_topic_event(*, topic: str, event: Any, schema_version: int = 1) -> Optional[list[dict[str, Any]]]:
     """
     Validate an event payload (decoded JSON) for the given Pub/Sub topic.
 
@@ -77,18 +136,4 @@ def validate_topic_event(*, topic: str, event: Any) -> Optional[list[dict[str, A
     if not isinstance(event, dict):
         return [{"path": "", "message": f"event_not_object:{type(event).__name__}"}]
 
-    validator = get_validator_for_topic(topic)
-    errors: list[dict[str, Any]] = []
-    for e in sorted(validator.iter_errors(event), key=lambda x: (list(x.path), str(x.message))):
-        path = ".".join(str(p) for p in e.path)
-        errors.append(
-            {
-                "path": path,
-                "message": str(e.message),
-                "schema_path": "/".join(str(p) for p in e.schema_path),
-            }
-        )
-        if len(errors) >= 50:
-            break
-    return None if not errors else errors
-
+    return get_compiled_validator(topic, schema_version).errors(event)
@@ -2,7 +2,8 @@
 Vendor-neutral data plane scaffolding.
 
 This package defines storage interfaces (tick/candle/proposal) and provides a
-portable default implementation backed by partitioned NDJSON files.
+portable default implementation backed by partitioned NDJSON files, with optional
+columnar segments for closed days (see `backend.dataplane.segments`).
 """
 
 from __future__ import annotations
@@ -6,10 +6,11 @@ import re
 from dataclasses import asdict, is_dataclass
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Iterable, Mapping, Sequence
+from typing import Any, Iterable, Iterator, Mapping, Sequence
 
 from backend.common.timeutils import ensure_aware_utc, parse_timestamp
 
+from . import proposal_index
 from .interfaces import CandleStore, ProposalStore, TickStore
 
 
@@ -102,10 +103,86 @@ def _as_dict(obj: Any) -> dict[str, Any]:
     return out
 
 
+def _iter_ndjson_records(path: Path) -> Iterable[dict[str, Any]]:
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+            except Exception:
+                continue
+            yield rec
+
+
+def _iter_ndjson_tail(path: Path, offset: int) -> Iterator[dict[str, Any]]:
+    with path.open("rb") as f:
+        f.seek(offset)
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except Exception:
+                continue  # blank or torn line
+            yield rec
+
+
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _ns_from_dt(value: datetime) -> int:
+    # `value` must be tz-aware (parse_timestamp/ensure_aware_utc output).
+    return ((value - _EPOCH_UTC) // timedelta(microseconds=1)) * 1000
+
+
+_SEGMENT_CHUNK_ROWS = 65_536
+
+
+def _batched(rows: Iterator[dict[str, Any]], batch_size: int | None) -> Iterator[Any]:
+    if batch_size is None:
+        yield from rows
+        return
+    batch: list[dict[str, Any]] = []
+    for r in rows:
+        batch.append(r)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _check_batch_size(batch_size: int | None) -> None:
+    if batch_size is not None and int(batch_size) <= 0:
+        raise ValueError("batch_size must be a positive integer")
+
+
+def _iter_sorted_day(keyed: list[tuple[int, dict[str, Any]]]) -> Iterator[dict[str, Any]]:
+    # Timestamps are parsed once per record; the sort is stable so ties keep file order.
+    keyed.sort(key=lambda kr: kr[0])
+    for _, rec in keyed:
+        yield rec
+
+
 class _FileStoreBase:
     def __init__(self, root: Path | None = None) -> None:
         self.root = Path(root) if root is not None else default_data_root()
 
+    def _open_partition(self, ndjson_path: Path, *, rows: bool = False) -> tuple[Any, bool]:
+        """
+        Return (columnar segment or None, whether to read the NDJSON file) for a partition.
+
+        Segments are produced by `backend.dataplane.segments.compact_closed_days`; numpy is
+        only imported when a segment file is present. Row queries (`rows=True`) only use a
+        segment whose rows reproduce the NDJSON records exactly (extra fields are not columns).
+        """
+        seg_path = ndjson_path.with_suffix(".seg")
+        if not seg_path.exists():
+            return None, ndjson_path.exists()
+        from .segments import open_partition
+
+        return open_partition(seg_path, ndjson_path, need_exact_rows=rows)
+
     def _append_lines(self, path: Path, lines: Iterable[str]) -> None:
         path.parent.mkdir(parents=True, exist_ok=True)
         with path.open("a", encoding="utf-8") as f:
@@ -121,6 +198,7 @@ class FileTickStore(_FileStoreBase, TickStore):
 
     Layout:
       data/ticks/YYYY/MM/DD/<symbol>.ndjson
+      data/ticks/YYYY/MM/DD/<symbol>.seg     (optional columnar segment for closed days)
     """
 
     def _tick_path(self, d: date, symbol: str) -> Path:
@@ -150,31 +228,98 @@ class FileTickStore(_FileStoreBase, TickStore):
             self._append_lines(self._tick_path(d, symbol), lines)
 
     def query_ticks(self, symbol: str, start_utc: datetime, end_utc: datetime) -> list[dict[str, Any]]:
+        return list(self.iter_ticks(symbol, start_utc, end_utc))
+
+    def iter_ticks(
+        self, symbol: str, start_utc: datetime, end_utc: datetime, *, batch_size: int | None = None
+    ) -> Iterator[Any]:
+        """
+        Stream ticks in time order without materializing the whole window.
+
+        Day partitions are disjoint in time, so they are read one at a time, in order;
+        peak memory is bounded by a single day. With `batch_size`, yields lists of up to
+        `batch_size` records instead of single records.
+        """
+        _check_batch_size(batch_size)
+        return _batched(self._iter_ticks(symbol, ensure_aware_utc(start_utc), ensure_aware_utc(end_utc)), batch_size)
+
+    def _iter_ticks(self, symbol: str, start: datetime, end: datetime) -> Iterator[dict[str, Any]]:
+        start_ns, end_ns = _ns_from_dt(start), _ns_from_dt(end)
+        for d in _iter_dates(start, end):
+            p = self._tick_path(d, symbol)
+            seg, read_ndjson = self._open_partition(p, rows=True)
+            seg_rows = self._iter_segment_ticks(symbol, seg, start_ns, end_ns) if seg is not None else iter(())
+            if not read_ndjson:
+                # Segment slices are already time-ordered: stream straight off the memmap.
+                yield from seg_rows
+                continue
+            keyed = [(_ns_from_dt(parse_timestamp(r["timestamp"])), r) for r in seg_rows]
+            for rec in _iter_ndjson_records(p):
+                ts_val = rec.get("timestamp", rec.get("ts"))
+                if ts_val is None:
+                    continue
+                ts_ns = _ns_from_dt(parse_timestamp(ts_val))
+                if start_ns <= ts_ns <= end_ns:
+                    keyed.append((ts_ns, rec))
+            yield from _iter_sorted_day(keyed)
+
+    @staticmethod
+    def _iter_segment_ticks(symbol: str, seg: Any, start_ns: int, end_ns: int) -> Iterator[dict[str, Any]]:
+        from .segments import tick_row
+
+        cols = seg.time_slice(start_ns, end_ns)
+        for lo in range(0, len(cols["ts_ns"]), _SEGMENT_CHUNK_ROWS):
+            hi = lo + _SEGMENT_CHUNK_ROWS
+            for ts_ns, price, size in zip(
+                cols["ts_ns"][lo:hi].tolist(), cols["price"][lo:hi].tolist(), cols["size"][lo:hi].tolist()
+            ):
+                yield tick_row(symbol, ts_ns, price, size)
+
+    def query_tick_arrays(self, symbol: str, start_utc: datetime, end_utc: datetime) -> dict[str, Any]:
+        """
+        Columnar variant of `query_ticks` (requires numpy).
+
+        Returns {"ts_ns": int64, "price": float64, "size": int64} arrays sorted by time.
+        Windows served by a single compacted segment are zero-copy memmap views.
+        """
+        from .segments import TICK_COLUMNS
+
         start = ensure_aware_utc(start_utc)
         end = ensure_aware_utc(end_utc)
-        out: list[dict[str, Any]] = []
+        start_ns, end_ns = _ns_from_dt(start), _ns_from_dt(end)
+        parts: list[dict[str, Any]] = []
         for d in _iter_dates(start, end):
             p = self._tick_path(d, symbol)
-            if not p.exists():
+            seg, read_ndjson = self._open_partition(p)
+            if seg is not None:
+                parts.append(seg.time_slice(start_ns, end_ns))
+            if not read_ndjson:
                 continue
-            with p.open("r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        rec = json.loads(line)
-                    except Exception:
-                        continue
-                    ts_val = rec.get("timestamp", rec.get("ts"))
-                    if ts_val is None:
-                        continue
-                    ts = ensure_aware_utc(parse_timestamp(ts_val))
-                    if start <= ts <= end:
-                        out.append(rec)
-
-        out.sort(key=lambda r: ensure_aware_utc(parse_timestamp(r.get("timestamp", r.get("ts")))))
-        return out
+            cols: dict[str, list[Any]] = {name: [] for name, _ in TICK_COLUMNS}
+            for rec in _iter_ndjson_records(p):
+                ts_val = rec.get("timestamp", rec.get("ts"))
+                if ts_val is None:
+                    continue
+                ts_ns = _ns_from_dt(parse_timestamp(ts_val))
+                if start_ns <= ts_ns <= end_ns:
+                    cols["ts_ns"].append(ts_ns)
+                    cols["price"].append(float(rec.get("price") or 0.0))
+                    cols["size"].append(int(rec.get("size") or 0))
+            parts.append(cols)
+        return _concat_sorted_columns(parts, TICK_COLUMNS)
+
+
+def _concat_sorted_columns(parts: list[dict[str, Any]], schema: Sequence[tuple[str, str]]) -> dict[str, Any]:
+    import numpy as np
+
+    parts = [p for p in parts if len(p[schema[0][0]])]
+    if len(parts) == 1 and all(isinstance(parts[0][name], np.ndarray) for name, _ in schema):
+        return dict(parts[0])
+    if not parts:
+        return {name: np.empty(0, dtype=dtype) for name, dtype in schema}
+    cols = {name: np.concatenate([np.asarray(p[name], dtype=dtype) for p in parts]) for name, dtype in schema}
+    order = np.argsort(cols[schema[0][0]], kind="stable")
+    return {name: col[order] for name, col in cols.items()}
 
 
 class FileCandleStore(_FileStoreBase, CandleStore):
@@ -183,6 +328,7 @@ class FileCandleStore(_FileStoreBase, CandleStore):
 
     Layout:
       data/candles/<timeframe>/YYYY/MM/DD/<symbol>.ndjson
+      data/candles/<timeframe>/YYYY/MM/DD/<symbol>.seg     (optional columnar segment)
     """
 
     def _candle_path(self, d: date, timeframe: str, symbol: str) -> Path:
@@ -222,31 +368,87 @@ class FileCandleStore(_FileStoreBase, CandleStore):
     def query_candles(
         self, symbol: str, timeframe: str, start_utc: datetime, end_utc: datetime
     ) -> list[dict[str, Any]]:
+        return list(self.iter_candles(symbol, timeframe, start_utc, end_utc))
+
+    def iter_candles(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_utc: datetime,
+        end_utc: datetime,
+        *,
+        batch_size: int | None = None,
+    ) -> Iterator[Any]:
+        """
+        Stream candles in ts_start order, one day partition at a time (see `FileTickStore.iter_ticks`).
+        """
+        _check_batch_size(batch_size)
+        rows = self._iter_candles(symbol, timeframe, ensure_aware_utc(start_utc), ensure_aware_utc(end_utc))
+        return _batched(rows, batch_size)
+
+    def _iter_candles(self, symbol: str, timeframe: str, start: datetime, end: datetime) -> Iterator[dict[str, Any]]:
+        start_ns, end_ns = _ns_from_dt(start), _ns_from_dt(end)
+        for d in _iter_dates(start, end):
+            p = self._candle_path(d, timeframe, symbol)
+            seg, read_ndjson = self._open_partition(p, rows=True)
+            seg_rows = _candle_rows_from_columns(symbol, timeframe, seg.time_slice(start_ns, end_ns)) if seg else []
+            if not read_ndjson:
+                yield from seg_rows
+                continue
+            keyed = [(_ns_from_dt(parse_timestamp(r["ts_start_utc"])), r) for r in seg_rows]
+            for rec in _iter_ndjson_records(p):
+                ts_start = rec.get("ts_start_utc")
+                if ts_start is None:
+                    continue
+                ts_ns = _ns_from_dt(parse_timestamp(ts_start))
+                if start_ns <= ts_ns <= end_ns:
+                    keyed.append((ts_ns, rec))
+            yield from _iter_sorted_day(keyed)
+
+    def query_candle_arrays(
+        self, symbol: str, timeframe: str, start_utc: datetime, end_utc: datetime
+    ) -> dict[str, Any]:
+        """
+        Columnar variant of `query_candles` (requires numpy); see `segments.CANDLE_COLUMNS`.
+
+        Windows served by a single compacted segment are zero-copy memmap views.
+        """
+        from .segments import CANDLE_COLUMNS
+
         start = ensure_aware_utc(start_utc)
         end = ensure_aware_utc(end_utc)
-        out: list[dict[str, Any]] = []
+        start_ns, end_ns = _ns_from_dt(start), _ns_from_dt(end)
+        parts: list[dict[str, Any]] = []
         for d in _iter_dates(start, end):
             p = self._candle_path(d, timeframe, symbol)
-            if not p.exists():
+            seg, read_ndjson = self._open_partition(p)
+            if seg is not None:
+                parts.append(seg.time_slice(start_ns, end_ns))
+            if not read_ndjson:
                 continue
-            with p.open("r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        rec = json.loads(line)
-                    except Exception:
-                        continue
-                    ts_start = rec.get("ts_start_utc")
-                    if ts_start is None:
-                        continue
-                    ts = ensure_aware_utc(parse_timestamp(ts_start))
-                    if start <= ts <= end:
-                        out.append(rec)
-
-        out.sort(key=lambda r: ensure_aware_utc(parse_timestamp(r["ts_start_utc"])))
-        return out
+            cols: dict[str, list[Any]] = {name: [] for name, _ in CANDLE_COLUMNS}
+            for rec in _iter_ndjson_records(p):
+                if rec.get("ts_start_utc") is None or rec.get("ts_end_utc") is None:
+                    continue
+                ts_start_ns = _ns_from_dt(parse_timestamp(rec["ts_start_utc"]))
+                if not (start_ns <= ts_start_ns <= end_ns):
+                    continue
+                cols["ts_start_ns"].append(ts_start_ns)
+                cols["ts_end_ns"].append(_ns_from_dt(parse_timestamp(rec["ts_end_utc"])))
+                for k in ("open", "high", "low", "close"):
+                    cols[k].append(float(rec.get(k) or 0.0))
+                cols["volume"].append(int(rec.get("volume") or 0))
+                cols["vwap"].append(float("nan") if rec.get("vwap") is None else float(rec["vwap"]))
+                cols["trade_count"].append(int(rec.get("trade_count") or 0))
+                cols["is_final"].append(1 if rec.get("is_final") else 0)
+            parts.append(cols)
+        return _concat_sorted_columns(parts, CANDLE_COLUMNS)
+
+
+def _candle_rows_from_columns(symbol: str, timeframe: str, cols: Mapping[str, Any]) -> list[dict[str, Any]]:
+    from .segments import CANDLE_COLUMNS, candle_row
+
+    return [candle_row(symbol, timeframe, *row) for row in zip(*(cols[k].tolist() for k, _ in CANDLE_COLUMNS))]
 
 
 class FileProposalStore(_FileStoreBase, ProposalStore):
@@ -255,8 +457,17 @@ class FileProposalStore(_FileStoreBase, ProposalStore):
 
     Layout:
       data/proposals/YYYY/MM/DD/proposals.ndjson
+      data/proposals/YYYY/MM/DD/proposals.ndjson.idx   (sidecar index, see `proposal_index`)
+      data/proposals/YYYY/MM/DD/proposals.ndjson.keys
+
+    With `use_index=True` (default) writes maintain the sidecar index and queries filter on
+    it, decoding only matching records. Days without an index are scanned in full.
     """
 
+    def __init__(self, root: Path | None = None, *, use_index: bool = True) -> None:
+        super().__init__(root)
+        self.use_index = use_index
+
     def _proposal_path(self, d: date) -> Path:
         return self.root / "proposals" / f"{d:%Y}" / f"{d:%m}" / f"{d:%d}" / "proposals.ndjson"
 
@@ -279,7 +490,10 @@ class FileProposalStore(_FileStoreBase, ProposalStore):
             by_day.setdefault(d, []).append(_json_line(pd))
 
         for d, lines in by_day.items():
-            self._append_lines(self._proposal_path(d), lines)
+            if self.use_index:
+                proposal_index.append_indexed(self._proposal_path(d), lines)
+            else:
+                self._append_lines(self._proposal_path(d), lines)
 
     def query_proposals(self, **filters: Any) -> list[dict[str, Any]]:
         """
@@ -290,45 +504,77 @@ class FileProposalStore(_FileStoreBase, ProposalStore):
         - status
         """
 
+        return list(self.iter_proposals(**filters))
+
+    def iter_proposals(self, *, batch_size: int | None = None, **filters: Any) -> Iterator[Any]:
+        """
+        Stream proposals in created_at order, one day partition at a time.
+
+        Accepts the same filters as `query_proposals`; with `batch_size`, yields lists.
+        """
+
         start_utc = filters.get("start_utc")
         end_utc = filters.get("end_utc")
         if start_utc is None or end_utc is None:
             raise ValueError("query_proposals requires start_utc and end_utc")
-        start = ensure_aware_utc(start_utc)
-        end = ensure_aware_utc(end_utc)
+        _check_batch_size(batch_size)
+        return _batched(self._iter_proposals(ensure_aware_utc(start_utc), ensure_aware_utc(end_utc), filters), batch_size)
 
+    def _iter_proposals(self, start: datetime, end: datetime, filters: Mapping[str, Any]) -> Iterator[dict[str, Any]]:
         sym_f = (filters.get("symbol") or "").strip().upper() or None
         strat_f = (filters.get("strategy_name") or "").strip() or None
         status_f = (filters.get("status") or "").strip().upper() or None
 
-        out: list[dict[str, Any]] = []
+        def keyed_match(rec: Any) -> tuple[int, dict[str, Any]] | None:
+            if not isinstance(rec, dict):
+                return None
+            created = rec.get("created_at_utc", rec.get("created_at", rec.get("ts")))
+            if created is None:
+                return None
+            ts = ensure_aware_utc(parse_timestamp(created))
+            if not (start <= ts <= end):
+                return None
+            if sym_f is not None and str(rec.get("symbol", "")).strip().upper() != sym_f:
+                return None
+            if strat_f is not None and str(rec.get("strategy_name", "")).strip() != strat_f:
+                return None
+            if status_f is not None and str(rec.get("status", "")).strip().upper() != status_f:
+                return None
+            return _ns_from_dt(ts), rec
+
         for d in _iter_dates(start, end):
             p = self._proposal_path(d)
             if not p.exists():
                 continue
-            with p.open("r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        rec = json.loads(line)
-                    except Exception:
-                        continue
-                    created = rec.get("created_at_utc", rec.get("created_at", rec.get("ts")))
-                    if created is None:
-                        continue
-                    ts = ensure_aware_utc(parse_timestamp(created))
-                    if not (start <= ts <= end):
-                        continue
-                    if sym_f is not None and str(rec.get("symbol", "")).strip().upper() != sym_f:
-                        continue
-                    if strat_f is not None and str(rec.get("strategy_name", "")).strip() != strat_f:
-                        continue
-                    if status_f is not None and str(rec.get("status", "")).strip().upper() != status_f:
-                        continue
-                    out.append(rec)
-
-        out.sort(key=lambda r: ensure_aware_utc(parse_timestamp(r.get("created_at_utc", r.get("created_at")))))
-        return out
-
+            indexed = self._query_index(p, start, end, sym_f, strat_f, status_f)
+            if indexed is None:
+                keyed = [kr for kr in map(keyed_match, _iter_ndjson_records(p)) if kr is not None]
+            else:
+                keyed, covered = indexed
+                # Records appended past the index (crash between appends) are scanned directly.
+                keyed.extend(kr for kr in map(keyed_match, _iter_ndjson_tail(p, covered)) if kr is not None)
+            yield from _iter_sorted_day(keyed)
+
+    def _query_index(
+        self,
+        path: Path,
+        start: datetime,
+        end: datetime,
+        symbol: str | None,
+        strategy_name: str | None,
+        status: str | None,
+    ) -> tuple[list[tuple[int, dict[str, Any]]], int] | None:
+        if not self.use_index:
+            return None
+        try:
+            return proposal_index.query_day(
+                path,
+                start_ns=_ns_from_dt(start),
+                end_ns=_ns_from_dt(end),
+                symbol=symbol,
+                strategy_name=strategy_name,
+                status=status,
+            )
+        except ImportError:
+            # numpy is optional; fall back to a full scan.
+            return None
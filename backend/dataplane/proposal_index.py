@@ -0,0 +1,294 @@
+"""
+Append-only sidecar index for `proposals.ndjson` day files.
+
+For each day file the store keeps two siblings:
+
+    proposals.ndjson.idx   fixed-width records, one per NDJSON line (struct "<qiqiii4x")
+                           (byte offset, byte length, created_at epoch ns,
+                            symbol id, strategy id, status id)
+    proposals.ndjson.keys  NDJSON dictionary: {"f": <field>, "v": <value>, "id": <int>}
+
+Index keys are the exact normalized values `query_proposals` filters on
+(symbol/status upper-cased, strategy_name stripped), computed from the decoded line.
+Queries evaluate filters over the index columns and only decode matching lines.
+
+Writes append NDJSON -> keys -> index under an exclusive lock, so the index can lag
+the NDJSON file (crash between appends) but never reference bytes that do not exist.
+Readers index-scan the covered prefix and parse any uncovered tail directly.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Iterator, Mapping, Sequence
+
+from backend.common.timeutils import parse_timestamp
+
+try:  # pragma: no cover - platform dependent
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+INDEX_SUFFIX = ".idx"
+KEYS_SUFFIX = ".keys"
+
+_RECORD = struct.Struct("<qiqiii4x")
+_FIELDS = ("symbol", "strategy_name", "status")
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_US = timedelta(microseconds=1)
+
+_NUMPY_DTYPE = [
+    ("offset", "<i8"),
+    ("length", "<i4"),
+    ("created_ns", "<i8"),
+    ("symbol", "<i4"),
+    ("strategy_name", "<i4"),
+    ("status", "<i4"),
+    ("_pad", "V4"),
+]
+
+
+def index_path_for(ndjson_path: Path) -> Path:
+    return ndjson_path.with_name(ndjson_path.name + INDEX_SUFFIX)
+
+
+def keys_path_for(ndjson_path: Path) -> Path:
+    return ndjson_path.with_name(ndjson_path.name + KEYS_SUFFIX)
+
+
+def filter_values(rec: Mapping[str, Any]) -> tuple[str, str, str]:
+    """Normalized (symbol, strategy_name, status), matching `query_proposals` filters."""
+    return (
+        str(rec.get("symbol", "")).strip().upper(),
+        str(rec.get("strategy_name", "")).strip(),
+        str(rec.get("status", "")).strip().upper(),
+    )
+
+
+def created_ns(rec: Mapping[str, Any]) -> int | None:
+    created = rec.get("created_at_utc", rec.get("created_at", rec.get("ts")))
+    if created is None:
+        return None
+    ts = parse_timestamp(created)
+    return ((ts - _EPOCH) // _ONE_US) * 1000
+
+
+@dataclass
+class KeyDictionary:
+    """Per-day value -> id mapping for the indexed filter fields."""
+
+    ids: dict[str, dict[str, int]] = field(default_factory=lambda: {f: {} for f in _FIELDS})
+
+    @classmethod
+    def load(cls, path: Path) -> "KeyDictionary":
+        kd = cls()
+        if not path.exists():
+            return kd
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                    kd.ids[row["f"]][row["v"]] = int(row["id"])
+                except Exception:
+                    continue  # torn trailing line; the id is re-issued on next write
+        return kd
+
+    def lookup(self, field_name: str, value: str) -> int | None:
+        return self.ids[field_name].get(value)
+
+    def assign(self, field_name: str, value: str, new_rows: list[str]) -> int:
+        table = self.ids[field_name]
+        key_id = table.get(value)
+        if key_id is None:
+            key_id = len(table)
+            table[value] = key_id
+            new_rows.append(json.dumps({"f": field_name, "v": value, "id": key_id}, ensure_ascii=False) + "\n")
+        return key_id
+
+
+@contextmanager
+def _locked(path: Path) -> Iterator[None]:
+    lock_path = path.with_name(path.name + ".lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with lock_path.open("a") as lf:
+        if fcntl is not None:
+            fcntl.flock(lf.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lf.fileno(), fcntl.LOCK_UN)
+
+
+def _index_entries(lines: Sequence[bytes], base_offset: int, keys: KeyDictionary, new_keys: list[str]) -> bytes:
+    out = bytearray()
+    offset = base_offset
+    for raw in lines:
+        length = len(raw)
+        try:
+            rec = json.loads(raw)
+            ns = created_ns(rec) if isinstance(rec, dict) else None
+        except Exception:
+            ns = None
+        if ns is not None:
+            sym, strat, status = filter_values(rec)
+            out += _RECORD.pack(
+                offset,
+                length,
+                ns,
+                keys.assign("symbol", sym, new_keys),
+                keys.assign("strategy_name", strat, new_keys),
+                keys.assign("status", status, new_keys),
+            )
+        offset += length
+    return bytes(out)
+
+
+def _append(path: Path, data: bytes) -> None:
+    if not data:
+        return
+    with path.open("ab") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _truncate_torn(path: Path, record_size: int | None) -> None:
+    """Drop a partially written tail left by a crash (fixed records or newline-terminated lines)."""
+    if not path.exists():
+        return
+    size = path.stat().st_size
+    if record_size is not None:
+        keep = size - size % record_size
+    else:
+        with path.open("rb") as f:
+            data = f.read()
+        keep = data.rfind(b"\n") + 1
+    if keep != size:
+        with path.open("r+b") as f:
+            f.truncate(keep)
+
+
+def append_indexed(ndjson_path: Path, lines: Sequence[str]) -> None:
+    """Append NDJSON lines to a day file and index them, under the day's write lock."""
+    encoded = [(ln if ln.endswith("\n") else ln + "\n").encode("utf-8") for ln in lines]
+    ndjson_path.parent.mkdir(parents=True, exist_ok=True)
+    idx_path = index_path_for(ndjson_path)
+    keys_path = keys_path_for(ndjson_path)
+    with _locked(ndjson_path):
+        _truncate_torn(idx_path, _RECORD.size)
+        _truncate_torn(keys_path, None)
+        base = ndjson_path.stat().st_size if ndjson_path.exists() else 0
+        covered = covered_bytes(idx_path)
+        if covered > base:
+            _rebuild_locked(ndjson_path)
+            covered = base
+
+        keys = KeyDictionary.load(keys_path)
+        new_keys: list[str] = []
+        entries = b""
+        if covered < base:
+            # Lines appended without the index (older writers, crash before the index append).
+            with ndjson_path.open("rb") as f:
+                f.seek(covered)
+                entries = _index_entries(f.read(base - covered).splitlines(keepends=True), covered, keys, new_keys)
+        entries += _index_entries(encoded, base, keys, new_keys)
+
+        _append(ndjson_path, b"".join(encoded))
+        _append(keys_path, "".join(new_keys).encode("utf-8"))
+        _append(idx_path, entries)
+
+
+def covered_bytes(idx_path: Path) -> int:
+    """NDJSON bytes covered by the index (end of the last complete record)."""
+    if not idx_path.exists():
+        return 0
+    size = idx_path.stat().st_size
+    n = size // _RECORD.size
+    if n == 0:
+        return 0
+    with idx_path.open("rb") as f:
+        f.seek((n - 1) * _RECORD.size)
+        offset, length, *_ = _RECORD.unpack(f.read(_RECORD.size))
+    return offset + length
+
+
+def rebuild_index(ndjson_path: Path) -> int:
+    """(Re)build the sidecar index for an existing day file; returns records indexed."""
+    with _locked(ndjson_path):
+        return _rebuild_locked(ndjson_path)
+
+
+def _rebuild_locked(ndjson_path: Path) -> int:
+    idx_path = index_path_for(ndjson_path)
+    keys_path = keys_path_for(ndjson_path)
+    keys = KeyDictionary()
+    new_keys: list[str] = []
+    with ndjson_path.open("rb") as f:
+        entries = _index_entries(list(f), 0, keys, new_keys)
+
+    for path, data in ((keys_path, "".join(new_keys).encode("utf-8")), (idx_path, entries)):
+        tmp = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+        with tmp.open("wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    return len(entries) // _RECORD.size
+
+
+def query_day(
+    ndjson_path: Path,
+    *,
+    start_ns: int,
+    end_ns: int,
+    symbol: str | None,
+    strategy_name: str | None,
+    status: str | None,
+) -> tuple[list[tuple[int, dict[str, Any]]], int] | None:
+    """
+    Index-scan one day file: ([(created_ns, record), ...] in file order, covered_bytes).
+
+    Returns None when the day has no index (caller falls back to a full scan). Lines past
+    `covered_bytes` are not indexed and must be scanned by the caller.
+    """
+    import numpy as np
+
+    idx_path = index_path_for(ndjson_path)
+    if not idx_path.exists():
+        return None
+    n = idx_path.stat().st_size // _RECORD.size
+    covered = covered_bytes(idx_path)
+    if n == 0:
+        return [], covered
+    if covered > ndjson_path.stat().st_size:
+        return None  # index ahead of data (file truncated/replaced): distrust it
+
+    idx = np.fromfile(idx_path, dtype=np.dtype(_NUMPY_DTYPE), count=n)
+    mask = (idx["created_ns"] >= start_ns) & (idx["created_ns"] <= end_ns)
+
+    wanted = (("symbol", symbol), ("strategy_name", strategy_name), ("status", status))
+    if any(v is not None for _, v in wanted):
+        keys = KeyDictionary.load(keys_path_for(ndjson_path))
+        for field_name, value in wanted:
+            if value is None:
+                continue
+            key_id = keys.lookup(field_name, value)
+            if key_id is None:
+                return [], covered
+            mask &= idx[field_name] == key_id
+
+    hits = idx[mask]
+    out: list[tuple[int, dict[str, Any]]] = []
+    with ndjson_path.open("rb") as f:
+        for offset, length, ns in zip(hits["offset"].tolist(), hits["length"].tolist(), hits["created_ns"].tolist()):
+            f.seek(offset)
+            out.append((ns, json.loads(f.read(length))))
+    return out, covered
@@ -0,0 +1,411 @@
+"""
+Columnar, memory-mapped segment files for the file-based data plane.
+
+A segment is the compacted form of one NDJSON partition file (one symbol, one UTC
+day). Columns are fixed-width little-endian 8-byte values, rows are sorted by time,
+and a fixed-size footer carries the row count and min/max timestamps:
+
+    [column 0: rows * 8 bytes][column 1: rows * 8 bytes]...[footer: 64 bytes]
+
+Footer (struct "<8s8sqqqqq8x"):
+    magic       b"ATSEG\\x00\\x02\\x00" (format + version)
+    kind        b"ticks" | b"candles" (NUL padded)
+    rows        int64
+    min_ts_ns   int64 (0 when empty)
+    max_ts_ns   int64 (0 when empty)
+    src_bytes   int64 size of the NDJSON file the segment was compacted from (-1: none)
+    flags       int64 bit 0: rows rebuilt from the columns differ from the NDJSON records
+                (extra fields, different types); row queries then keep reading NDJSON
+
+Version 1 segments (no flags field) are still readable and are treated as inexact.
+
+Reads go through `numpy.memmap`; `Segment.time_slice()` binary-searches the sorted
+time column and returns zero-copy views.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Iterator, Mapping
+
+import numpy as np
+
+from backend.common.timeutils import ensure_aware_utc, parse_timestamp
+
+SEGMENT_SUFFIX = ".seg"
+
+_MAGIC = b"ATSEG\x00\x02\x00"
+_MAGIC_V1 = b"ATSEG\x00\x01\x00"
+_FOOTER = struct.Struct("<8s8sqqqqq8x")
+_FOOTER_V1 = struct.Struct("<8s8sqqqq16x")
+
+_FLAG_INEXACT_ROWS = 1
+
+TICK_COLUMNS: tuple[tuple[str, str], ...] = (
+    ("ts_ns", "<i8"),
+    ("price", "<f8"),
+    ("size", "<i8"),
+)
+
+CANDLE_COLUMNS: tuple[tuple[str, str], ...] = (
+    ("ts_start_ns", "<i8"),
+    ("ts_end_ns", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<i8"),
+    ("vwap", "<f8"),  # NaN == missing
+    ("trade_count", "<i8"),
+    ("is_final", "<i8"),
+)
+
+_SCHEMAS: dict[str, tuple[tuple[str, str], ...]] = {"ticks": TICK_COLUMNS, "candles": CANDLE_COLUMNS}
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_US = timedelta(microseconds=1)
+
+
+class SegmentFormatError(ValueError):
+    """Raised when a file is not a readable segment."""
+
+
+def datetime_to_ns(value: datetime) -> int:
+    return ((ensure_aware_utc(value) - _EPOCH) // _ONE_US) * 1000
+
+
+def segment_path_for(ndjson_path: Path) -> Path:
+    return ndjson_path.with_suffix(SEGMENT_SUFFIX)
+
+
+def ns_to_utc_iso(ns: int) -> str:
+    return (_EPOCH + timedelta(microseconds=ns // 1000)).isoformat()
+
+
+def tick_row(symbol: Any, ts_ns: int, price: float, size: int) -> dict[str, Any]:
+    """The tick record a segment row is served as (see `FileTickStore.iter_ticks`)."""
+    ts_iso = ns_to_utc_iso(ts_ns)
+    return {"symbol": symbol, "timestamp": ts_iso, "ts": ts_iso, "price": price, "size": size}
+
+
+def candle_row(
+    symbol: Any,
+    timeframe: Any,
+    ts_start_ns: int,
+    ts_end_ns: int,
+    open_: float,
+    high: float,
+    low: float,
+    close: float,
+    volume: int,
+    vwap: float,
+    trade_count: int,
+    is_final: int,
+) -> dict[str, Any]:
+    """The candle record a segment row is served as (see `FileCandleStore.iter_candles`)."""
+    return {
+        "symbol": symbol,
+        "timeframe": timeframe,
+        "ts_start_utc": ns_to_utc_iso(ts_start_ns),
+        "ts_end_utc": ns_to_utc_iso(ts_end_ns),
+        "open": open_,
+        "high": high,
+        "low": low,
+        "close": close,
+        "volume": volume,
+        "vwap": None if vwap != vwap else vwap,
+        "trade_count": trade_count,
+        "is_final": bool(is_final),
+    }
+
+
+def _same_record(row: Mapping[str, Any], rec: Mapping[str, Any]) -> bool:
+    # Compare as JSON so types matter too (100 vs 100.0, missing vs default).
+    return json.dumps(row, sort_keys=True, default=str) == json.dumps(rec, sort_keys=True, default=str)
+
+
+@dataclass(frozen=True)
+class Segment:
+    path: Path
+    kind: str
+    rows: int
+    min_ts_ns: int
+    max_ts_ns: int
+    src_bytes: int
+    columns: Mapping[str, np.ndarray]
+    # False when rows rebuilt from the columns differ from the NDJSON records they came from.
+    exact_rows: bool = True
+
+    @property
+    def time_column(self) -> np.ndarray:
+        return self.columns[_SCHEMAS[self.kind][0][0]]
+
+    def time_slice(self, start_ns: int, end_ns: int) -> dict[str, np.ndarray]:
+        """
+        Rows with start_ns <= time <= end_ns, as zero-copy views over the memmap.
+        """
+        if self.rows == 0 or end_ns < self.min_ts_ns or start_ns > self.max_ts_ns:
+            return {name: col[:0] for name, col in self.columns.items()}
+        ts = self.time_column
+        lo = int(np.searchsorted(ts, start_ns, side="left"))
+        hi = int(np.searchsorted(ts, end_ns, side="right"))
+        return {name: col[lo:hi] for name, col in self.columns.items()}
+
+
+def read_segment(path: Path) -> Segment:
+    path = Path(path)
+    size = path.stat().st_size
+    if size < _FOOTER.size:
+        raise SegmentFormatError(f"segment too small: {path}")
+    with path.open("rb") as f:
+        f.seek(size - _FOOTER.size)
+        footer = f.read(_FOOTER.size)
+    if footer[:8] == _MAGIC:
+        magic, kind_raw, rows, min_ts, max_ts, src_bytes, flags = _FOOTER.unpack(footer)
+    elif footer[:8] == _MAGIC_V1:
+        magic, kind_raw, rows, min_ts, max_ts, src_bytes = _FOOTER_V1.unpack(footer)
+        flags = _FLAG_INEXACT_ROWS
+    else:
+        raise SegmentFormatError(f"bad segment magic: {path}")
+    kind = kind_raw.rstrip(b"\x00").decode("ascii")
+    schema = _SCHEMAS.get(kind)
+    if schema is None:
+        raise SegmentFormatError(f"unknown segment kind {kind!r}: {path}")
+    col_bytes = rows * 8
+    if size != col_bytes * len(schema) + _FOOTER.size:
+        raise SegmentFormatError(f"segment size mismatch: {path}")
+
+    if rows == 0:
+        columns = {name: np.empty(0, dtype=dtype) for name, dtype in schema}
+    else:
+        mm = np.memmap(path, dtype=np.uint8, mode="r", shape=(col_bytes * len(schema),))
+        columns = {
+            name: mm[i * col_bytes : (i + 1) * col_bytes].view(dtype) for i, (name, dtype) in enumerate(schema)
+        }
+    return Segment(
+        path=path,
+        kind=kind,
+        rows=int(rows),
+        min_ts_ns=int(min_ts),
+        max_ts_ns=int(max_ts),
+        src_bytes=int(src_bytes),
+        columns=columns,
+        exact_rows=not (flags & _FLAG_INEXACT_ROWS),
+    )
+
+
+def write_segment(
+    path: Path, kind: str, columns: Mapping[str, Any], *, src_bytes: int = -1, exact_rows: bool = True
+) -> Segment:
+    """
+    Write `columns` as a segment, sorted (stably) by the time column.
+
+    `exact_rows=False` records that the rows do not reproduce their source records.
+
+    The file is written to a temp path and atomically renamed into place.
+    """
+    schema = _SCHEMAS[kind]
+    arrays = [np.ascontiguousarray(np.asarray(columns[name]), dtype=dtype) for name, dtype in schema]
+    rows = len(arrays[0])
+    if any(len(a) != rows for a in arrays):
+        raise ValueError("segment columns must have the same length")
+
+    order = np.argsort(arrays[0], kind="stable")
+    arrays = [a[order] for a in arrays]
+    min_ts = int(arrays[0][0]) if rows else 0
+    max_ts = int(arrays[0][-1]) if rows else 0
+    flags = 0 if exact_rows else _FLAG_INEXACT_ROWS
+    footer = _FOOTER.pack(_MAGIC, kind.encode("ascii"), rows, min_ts, max_ts, int(src_bytes), flags)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+    with tmp.open("wb") as f:
+        for a in arrays:
+            f.write(a.tobytes())
+        f.write(footer)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return read_segment(path)
+
+
+def open_partition(
+    seg_path: Path, ndjson_path: Path, *, need_exact_rows: bool = False
+) -> tuple[Segment | None, bool]:
+    """
+    Resolve which sources to read for one partition: (segment or None, read_ndjson).
+
+    With `need_exact_rows` (row queries), a segment whose rows differ from its NDJSON
+    source is skipped while that source is still on disk.
+
+    - No usable segment: read NDJSON only.
+    - Segment compacted from an NDJSON file that is unchanged (or gone): segment only.
+    - Segment compacted from an NDJSON file that has since changed size (late appends to a
+      day compacted early): the segment is stale, read NDJSON only.
+    - Authoritative segment (its NDJSON source was removed, src_bytes == -1): segment plus
+      any NDJSON appended afterwards.
+    """
+    if not seg_path.exists():
+        return None, ndjson_path.exists()
+    try:
+        seg = read_segment(seg_path)
+    except (OSError, SegmentFormatError):
+        return None, ndjson_path.exists()
+    if not ndjson_path.exists():
+        return seg, False
+    if seg.src_bytes < 0:
+        return seg, True
+    if ndjson_path.stat().st_size != seg.src_bytes:
+        return None, True
+    if need_exact_rows and not seg.exact_rows:
+        return None, True
+    return seg, False
+
+
+def _mark_authoritative(seg_path: Path) -> None:
+    """Rewrite the footer's src_bytes to -1 once the NDJSON source is gone."""
+    size = seg_path.stat().st_size
+    with seg_path.open("r+b") as f:
+        f.seek(size - _FOOTER.size)
+        footer = f.read(_FOOTER.size)
+        f.seek(size - _FOOTER.size)
+        if footer[:8] == _MAGIC_V1:
+            magic, kind, rows, min_ts, max_ts, _ = _FOOTER_V1.unpack(footer)
+            f.write(_FOOTER_V1.pack(magic, kind, rows, min_ts, max_ts, -1))
+        else:
+            magic, kind, rows, min_ts, max_ts, _, flags = _FOOTER.unpack(footer)
+            f.write(_FOOTER.pack(magic, kind, rows, min_ts, max_ts, -1, flags))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _iter_ndjson(path: Path) -> Iterator[dict[str, Any]]:
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+            except Exception:
+                continue
+            if isinstance(rec, dict):
+                yield rec
+
+
+def _ts_ns(value: Any) -> int:
+    return datetime_to_ns(parse_timestamp(value))
+
+
+def compact_tick_file(ndjson_path: Path) -> Segment:
+    """Convert one tick NDJSON partition into its sibling `.seg` file."""
+    ndjson_path = Path(ndjson_path)
+    src_bytes = ndjson_path.stat().st_size
+    ts: list[int] = []
+    price: list[float] = []
+    size: list[int] = []
+    exact = True
+    for rec in _iter_ndjson(ndjson_path):
+        ts_val = rec.get("timestamp", rec.get("ts"))
+        if ts_val is None:
+            continue
+        ts.append(_ts_ns(ts_val))
+        price.append(float(rec.get("price") or 0.0))
+        size.append(int(rec.get("size") or 0))
+        exact = exact and _same_record(tick_row(rec.get("symbol"), ts[-1], price[-1], size[-1]), rec)
+    return write_segment(
+        segment_path_for(ndjson_path),
+        "ticks",
+        {"ts_ns": ts, "price": price, "size": size},
+        src_bytes=src_bytes,
+        exact_rows=exact,
+    )
+
+
+def compact_candle_file(ndjson_path: Path) -> Segment:
+    """Convert one candle NDJSON partition into its sibling `.seg` file."""
+    ndjson_path = Path(ndjson_path)
+    src_bytes = ndjson_path.stat().st_size
+    cols: dict[str, list[Any]] = {name: [] for name, _ in CANDLE_COLUMNS}
+    exact = True
+    for rec in _iter_ndjson(ndjson_path):
+        ts_start = rec.get("ts_start_utc")
+        ts_end = rec.get("ts_end_utc")
+        if ts_start is None or ts_end is None:
+            continue
+        vwap = rec.get("vwap")
+        cols["ts_start_ns"].append(_ts_ns(ts_start))
+        cols["ts_end_ns"].append(_ts_ns(ts_end))
+        for k in ("open", "high", "low", "close"):
+            cols[k].append(float(rec.get(k) or 0.0))
+        cols["volume"].append(int(rec.get("volume") or 0))
+        cols["vwap"].append(float("nan") if vwap is None else float(vwap))
+        cols["trade_count"].append(int(rec.get("trade_count") or 0))
+        cols["is_final"].append(1 if rec.get("is_final") else 0)
+        if exact:
+            row = candle_row(rec.get("symbol"), rec.get("timeframe"), *(cols[name][-1] for name, _ in CANDLE_COLUMNS))
+            exact = _same_record(row, rec)
+    return write_segment(segment_path_for(ndjson_path), "candles", cols, src_bytes=src_bytes, exact_rows=exact)
+
+
+def _is_v1(seg_path: Path) -> bool:
+    with seg_path.open("rb") as f:
+        f.seek(-_FOOTER.size, os.SEEK_END)
+        return f.read(8) == _MAGIC_V1
+
+
+def _partition_date(path: Path) -> date | None:
+    # .../YYYY/MM/DD/<file>
+    try:
+        return date(int(path.parent.parent.parent.name), int(path.parent.parent.name), int(path.parent.name))
+    except ValueError:
+        return None
+
+
+def compact_closed_days(
+    root: Path,
+    *,
+    before: date,
+    remove_ndjson: bool = False,
+) -> dict[str, int]:
+    """
+    Compact every tick/candle NDJSON partition for UTC days strictly before `before`.
+
+    Partitions whose segment is already fresh are skipped, so the job is idempotent;
+    version 1 segments (no exactness flag) are rebuilt while their NDJSON source exists.
+    With `remove_ndjson=True` the NDJSON source is deleted once its segment is written and
+    the segment is marked authoritative. Partitions whose records carry fields or types the
+    columns cannot reproduce keep their NDJSON, so compaction never changes query results.
+    """
+    root = Path(root)
+    stats = {"compacted": 0, "skipped": 0, "rows": 0}
+    jobs = [(p, compact_tick_file) for p in sorted(root.glob("ticks/*/*/*/*.ndjson"))]
+    jobs += [(p, compact_candle_file) for p in sorted(root.glob("candles/*/*/*/*/*.ndjson"))]
+    for src, compact in jobs:
+        d = _partition_date(src)
+        if d is None or d >= before:
+            continue
+        seg_path = segment_path_for(src)
+        seg, read_ndjson = open_partition(seg_path, src)
+        if seg is not None and not read_ndjson and _is_v1(seg_path):
+            seg = None
+        if seg is not None and not read_ndjson:
+            stats["skipped"] += 1
+        elif seg is not None:
+            # Authoritative segment plus later NDJSON appends: leave both for the reader.
+            stats["skipped"] += 1
+            continue
+        else:
+            seg = compact(src)
+            stats["compacted"] += 1
+            stats["rows"] += seg.rows
+        if remove_ndjson and seg.exact_rows:
+            src.unlink()
+            _mark_authoritative(seg_path)
+    return stats
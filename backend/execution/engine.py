@@ -22,6 +22,7 @@ from urllib.parse import urlparse
 from backend.common.agent_mode import require_live_mode
 from backend.common.execution_enabled import require_execution_enabled
 from backend.common.kill_switch import get_kill_switch_state
+from backend.common.ops_metrics import broker_order_place_seconds, timed
 from backend.common.runtime_execution_prevention import fatal_if_execution_reached
 
 logger = logging.getLogger(__name__)
@@ -590,6 +591,8 @@ class ExecutionEngine:
         reservations: Any | None = None,
     ) -> None:
         self._broker = broker
+        # Bound once: no label lookup per order.
+        self._place_order_seconds = broker_order_place_seconds.labels(broker=type(broker).__name__)
         self.broker_name = str(broker_name)
         self.dry_run = bool(dry_run)
         self.risk = risk or RiskManager(config=RiskConfig(fail_open=True), ledger=None, positions=None)
@@ -789,7 +792,8 @@ class ExecutionEngine:
             require_live_mode(action="execute_intent")
             require_execution_enabled(operation="execution_engine.execute_intent", context={"strategy_id": intent.strategy_id, "symbol": intent.symbol})
 
-            broker_order = self._broker.place_order(intent=intent)
+            with timed(self._place_order_seconds):
+                broker_order = self._broker.place_order(intent=intent)
             broker_order_id = str(broker_order.get("id") or "") or None
             self._record_budget_use(intent=intent)
             if reservation is not None:
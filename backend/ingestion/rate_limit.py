@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import random
+import threading
 import time
 from dataclasses import dataclass
 
@@ -11,6 +12,8 @@ class TokenBucket:
 
     - rate_per_sec: tokens added per second
     - capacity: max burst tokens
+
+    Safe to share between threads.
     """
 
     def __init__(self, *, rate_per_sec: float, capacity: float) -> None:
@@ -18,6 +21,7 @@ class TokenBucket:
         self.capacity = float(capacity)
         self._tokens = float(capacity)
         self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
 
     def _refill(self) -> None:
         now = time.monotonic()
@@ -28,11 +32,37 @@ class TokenBucket:
         self._tokens = min(self.capacity, self._tokens + elapsed * self.rate_per_sec)
 
     def try_consume(self, tokens: float = 1.0) -> bool:
-        self._refill()
-        if self._tokens >= tokens:
-            self._tokens -= tokens
-            return True
-        return False
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0, *, timeout: float | None = None) -> bool:
+        """
+        Block until `tokens` are available and consume them.
+
+        Returns False if `timeout` seconds elapse first.
+        """
+        if tokens > self.capacity:
+            raise ValueError("tokens exceeds bucket capacity")
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                if self.rate_per_sec <= 0:
+                    raise ValueError("rate_per_sec must be > 0 to wait for tokens")
+                wait = (tokens - self._tokens) / self.rate_per_sec
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
 
 
 @dataclass
@@ -277,6 +277,205 @@ def _effective_price_per_unit(trade: LedgerTrade) -> float:
     return float(trade.price) - per_unit
 
 
+GroupKey = Tuple[str, str, str, str]
+
+CHECKPOINT_VERSION = 1
+
+
+@dataclass(slots=True)
+class _LedgerLot:
+    qty: float
+    price: float  # effective price (fees/slippage folded in), as `Lot.price`
+    gross_price: float  # raw fill price
+    fees_per_unit: float  # (fees + slippage) / qty of the opening fill
+
+
+@dataclass(slots=True)
+class _GroupState:
+    long: Deque[_LedgerLot]
+    short: Deque[_LedgerLot]
+    realized: float = 0.0
+    # Fee-aware attribution (same convention as `compute_pnl_fifo`).
+    realized_gross: float = 0.0
+    realized_fees: float = 0.0
+
+
+class FifoLedgerState:
+    """
+    Incremental FIFO lot state per (tenant_id, uid, strategy_id, symbol).
+
+    Trades are applied in `_trade_sort_key` order, one at a time (`apply`) or in batches
+    (`apply_many`, which sorts the batch). Each fill only touches the lots it consumes, held
+    in deques, so applying a fill is O(1) amortized. `snapshot()` produces the same rows as
+    `compute_fifo_pnl` over the same trades.
+
+    `to_checkpoint()` / `from_checkpoint()` round-trip the state through a JSON-serializable
+    dict, so period reports can resume from the last snapshot instead of replaying history.
+    """
+
+    def __init__(self) -> None:
+        self._groups: Dict[GroupKey, _GroupState] = {}
+        self._last_key: Optional[Tuple] = None
+        self.trade_count = 0
+
+    @property
+    def last_trade_key(self) -> Optional[Tuple]:
+        """Sort key of the last applied trade (see `_trade_sort_key`)."""
+        return self._last_key
+
+    def is_applied(self, trade: LedgerTrade) -> bool:
+        """True if `trade` sorts at or before the last applied trade (already covered)."""
+        return self._last_key is not None and _trade_sort_key(trade) <= self._last_key
+
+    def apply(self, trade: LedgerTrade) -> None:
+        key = _trade_sort_key(trade)
+        if self._last_key is not None and key < self._last_key:
+            raise ValueError("trade is older than the last applied trade; FIFO state is append-only")
+        self._last_key = key
+        self.trade_count += 1
+
+        gk = (trade.tenant_id, trade.uid, trade.strategy_id, trade.symbol)
+        state = self._groups.get(gk)
+        if state is None:
+            state = self._groups[gk] = _GroupState(long=deque(), short=deque())
+
+        qty = float(trade.qty)
+        px = float(trade.price)
+        px_eff = _effective_price_per_unit(trade)
+        fees_per_unit = (float(trade.fees or 0.0) + float(trade.slippage or 0.0)) / qty
+
+        if trade.side == "buy":
+            # Cover shorts first (FIFO), remaining becomes a new long lot.
+            closing, opening, sign = state.short, state.long, -1.0
+        else:
+            # Close longs first (FIFO), remaining becomes a new short lot.
+            closing, opening, sign = state.long, state.short, 1.0
+
+        remaining = qty
+        realized = state.realized
+        gross = 0.0
+        fees = 0.0
+        while remaining > 0 and closing:
+            lot = closing[0]
+            match = min(remaining, lot.qty)
+            realized += sign * (px_eff - lot.price) * match
+            gross += sign * (px - lot.gross_price) * match
+            fees += (lot.fees_per_unit + fees_per_unit) * match
+            lot.qty -= match
+            remaining -= match
+            if lot.qty <= 0:
+                closing.popleft()
+        if remaining > 0:
+            opening.append(_LedgerLot(qty=remaining, price=px_eff, gross_price=px, fees_per_unit=fees_per_unit))
+
+        state.realized = realized
+        state.realized_gross += gross
+        state.realized_fees += fees
+
+    def apply_many(self, trades: Iterable[LedgerTrade]) -> None:
+        for t in sorted(trades, key=_trade_sort_key):
+            self.apply(t)
+
+    def snapshot(self, mark_prices: Mapping[str, float]) -> List[SymbolPnl]:
+        """Per-group realized/unrealized P&L, ordered like `compute_fifo_pnl` output."""
+        out: List[SymbolPnl] = []
+        for (tenant_id, uid, strategy_id, symbol), state in self._groups.items():
+            mark = mark_prices.get(symbol)
+            unreal = 0.0
+            if isinstance(mark, (int, float)):
+                m = float(mark)
+                unreal += sum((m - lot.price) * lot.qty for lot in state.long)
+                unreal += sum((lot.price - m) * lot.qty for lot in state.short)
+
+            position_qty = sum(lot.qty for lot in state.long) - sum(lot.qty for lot in state.short)
+            out.append(
+                SymbolPnl(
+                    tenant_id=tenant_id,
+                    uid=uid,
+                    strategy_id=strategy_id,
+                    symbol=symbol,
+                    position_qty=position_qty,
+                    realized_pnl=float(state.realized),
+                    unrealized_pnl=unreal,
+                )
+            )
+
+        # Deterministic output ordering for tests and downstream consumers.
+        out.sort(key=lambda r: (r.tenant_id, r.uid, r.strategy_id, r.symbol))
+        return out
+
+    def realized_totals(self) -> Dict[Tuple[str, str, str], Dict[str, float]]:
+        """
+        Fee-aware realized totals (gross, fees, net) by (tenant_id, uid, strategy_id).
+
+        Fees and slippage are allocated pro-rata per unit and realized when lots close.
+        """
+        out: Dict[Tuple[str, str, str], Dict[str, float]] = {}
+        for (tenant_id, uid, strategy_id, _symbol), state in self._groups.items():
+            k = (tenant_id, uid, strategy_id)
+            if k not in out:
+                out[k] = {"realized_pnl_gross": 0.0, "realized_fees": 0.0, "realized_pnl_net": 0.0}
+            out[k]["realized_pnl_gross"] += state.realized_gross
+            out[k]["realized_fees"] += state.realized_fees
+            out[k]["realized_pnl_net"] = out[k]["realized_pnl_gross"] - out[k]["realized_fees"]
+        return out
+
+    def copy(self) -> "FifoLedgerState":
+        return FifoLedgerState.from_checkpoint(self.to_checkpoint())
+
+    def to_checkpoint(self) -> Dict[str, Any]:
+        def _lots(lots: Iterable[_LedgerLot]) -> List[List[float]]:
+            return [[l.qty, l.price, l.gross_price, l.fees_per_unit] for l in lots]
+
+        last = None
+        if self._last_key is not None:
+            ts, fill_id, order_id = self._last_key
+            last = [ts.isoformat(), fill_id, order_id]
+        return {
+            "version": CHECKPOINT_VERSION,
+            "last_trade_key": last,
+            "trade_count": self.trade_count,
+            "groups": [
+                {
+                    "key": list(k),
+                    "realized": st.realized,
+                    "realized_gross": st.realized_gross,
+                    "realized_fees": st.realized_fees,
+                    "long": _lots(st.long),
+                    "short": _lots(st.short),
+                }
+                for k, st in self._groups.items()
+            ],
+        }
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint: Mapping[str, Any]) -> "FifoLedgerState":
+        if checkpoint.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"unsupported FIFO checkpoint version: {checkpoint.get('version')!r}")
+
+        def _lots(rows: Iterable[Any]) -> Deque[_LedgerLot]:
+            return deque(
+                _LedgerLot(qty=float(q), price=float(p), gross_price=float(g), fees_per_unit=float(f))
+                for q, p, g, f in rows
+            )
+
+        state = cls()
+        last = checkpoint.get("last_trade_key")
+        if last is not None:
+            state._last_key = (to_utc(datetime.fromisoformat(last[0])), str(last[1]), str(last[2]))
+        state.trade_count = int(checkpoint.get("trade_count") or 0)
+        for g in checkpoint.get("groups") or []:
+            tenant_id, uid, strategy_id, symbol = (str(x) for x in g["key"])
+            state._groups[(tenant_id, uid, strategy_id, symbol)] = _GroupState(
+                long=_lots(g.get("long") or []),
+                short=_lots(g.get("short") or []),
+                realized=float(g.get("realized") or 0.0),
+                realized_gross=float(g.get("realized_gross") or 0.0),
+                realized_fees=float(g.get("realized_fees") or 0.0),
+            )
+        return state
+
+
 def compute_fifo_pnl(
     *,
     trades: Iterable[LedgerTrade],
@@ -296,9 +495,9 @@ def compute_fifo_pnl(
 
     Output:
     - list of SymbolPnl entries (one per group)
-    """
-    groups: Dict[Tuple[str, str, str, str], Dict[str, object]] = {}
 
+    Replays the full history; use `FifoLedgerState` to maintain the result incrementally.
+    """
     filtered: List[LedgerTrade] = []
     for t in trades:
         if as_of is not None:
@@ -310,84 +509,9 @@ def compute_fifo_pnl(
                     continue
         filtered.append(t)
 
-    for t in sorted(filtered, key=_trade_sort_key):
-        key = (t.tenant_id, t.uid, t.strategy_id, t.symbol)
-        if key not in groups:
-            groups[key] = {"long": [], "short": [], "realized": 0.0}
-
-        state = groups[key]
-        long_lots: List[Lot] = state["long"]  # type: ignore[assignment]
-        short_lots: List[Lot] = state["short"]  # type: ignore[assignment]
-        realized: float = state["realized"]  # type: ignore[assignment]
-
-        qty = float(t.qty)
-        px_eff = _effective_price_per_unit(t)
-
-        if t.side == "buy":
-            qty_to_buy = qty
-
-            # Cover shorts first (FIFO).
-            while qty_to_buy > 0 and short_lots:
-                lot = short_lots[0]
-                cover = min(qty_to_buy, lot.qty)
-                realized += (lot.price - px_eff) * cover
-                lot.qty -= cover
-                qty_to_buy -= cover
-                if lot.qty <= 0:
-                    short_lots.pop(0)
-
-            # Remaining becomes new long lot.
-            if qty_to_buy > 0:
-                long_lots.append(Lot(qty=qty_to_buy, price=px_eff))
-
-        else:  # sell
-            qty_to_sell = qty
-
-            # Close longs first (FIFO).
-            while qty_to_sell > 0 and long_lots:
-                lot = long_lots[0]
-                close = min(qty_to_sell, lot.qty)
-                realized += (px_eff - lot.price) * close
-                lot.qty -= close
-                qty_to_sell -= close
-                if lot.qty <= 0:
-                    long_lots.pop(0)
-
-            # Remaining becomes new short lot.
-            if qty_to_sell > 0:
-                short_lots.append(Lot(qty=qty_to_sell, price=px_eff))
-
-        state["realized"] = realized
-
-    out: List[SymbolPnl] = []
-    for (tenant_id, uid, strategy_id, symbol), state in groups.items():
-        long_lots = state["long"]  # type: ignore[assignment]
-        short_lots = state["short"]  # type: ignore[assignment]
-        realized = float(state["realized"])  # type: ignore[arg-type]
-
-        mark = mark_prices.get(symbol)
-        unreal = 0.0
-        if isinstance(mark, (int, float)):
-            m = float(mark)
-            unreal += sum((m - lot.price) * lot.qty for lot in long_lots)
-            unreal += sum((lot.price - m) * lot.qty for lot in short_lots)
-
-        position_qty = sum(lot.qty for lot in long_lots) - sum(lot.qty for lot in short_lots)
-        out.append(
-            SymbolPnl(
-                tenant_id=tenant_id,
-                uid=uid,
-                strategy_id=strategy_id,
-                symbol=symbol,
-                position_qty=position_qty,
-                realized_pnl=realized,
-                unrealized_pnl=unreal,
-            )
-        )
-
-    # Deterministic output ordering for tests and downstream consumers.
-    out.sort(key=lambda r: (r.tenant_id, r.uid, r.strategy_id, r.symbol))
-    return out
+    state = FifoLedgerState()
+    state.apply_many(filtered)
+    return state.snapshot(mark_prices)
 
 
 def aggregate_pnl(
@@ -2,10 +2,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, Iterable, Mapping, Tuple
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple, Union
 
 from .models import LedgerTrade
-from .pnl import aggregate_pnl, compute_fifo_pnl, compute_pnl_fifo
+from .pnl import FifoLedgerState, aggregate_pnl, compute_fifo_pnl, compute_pnl_fifo
 from backend.time.nyse_time import to_utc
 
 
@@ -74,11 +74,14 @@ def _realized_totals_as_of(
     """
     Compute cumulative realized P&L totals (gross, fees, net) grouped by (tenant_id, uid, strategy_id)
     as of a timestamp cutoff.
+
+    Lots are FIFO-matched per (tenant_id, uid, strategy_id, symbol), the same keying as
+    `compute_fifo_pnl` and `FifoLedgerState`, then summed per strategy.
     """
     filtered = _filter_as_of(trades, as_of=as_of, as_of_inclusive=as_of_inclusive)
-    groups: Dict[Tuple[str, str, str], list[dict[str, Any]]] = {}
+    groups: Dict[Tuple[str, str, str, str], list[dict[str, Any]]] = {}
     for i, t in enumerate(sorted(filtered, key=_trade_sort_key)):
-        k = (t.tenant_id, t.uid, t.strategy_id)
+        k = (t.tenant_id, t.uid, t.strategy_id, t.symbol)
         groups.setdefault(k, []).append(
             {
                 # Provide a deterministic id for stable FIFO ordering in ties.
@@ -94,13 +97,14 @@ def _realized_totals_as_of(
         )
 
     out: Dict[Tuple[str, str, str], Dict[str, float]] = {}
-    for k, group_trades in groups.items():
+    for (tenant_id, uid, strategy_id, _symbol), group_trades in groups.items():
         res = compute_pnl_fifo(group_trades, trade_id_field="trade_id", sort_by_ts=True)
-        out[k] = {
-            "realized_pnl_gross": float(res.realized_pnl_gross),
-            "realized_fees": float(res.realized_fees),
-            "realized_pnl_net": float(res.realized_pnl_net),
-        }
+        k = (tenant_id, uid, strategy_id)
+        if k not in out:
+            out[k] = {"realized_pnl_gross": 0.0, "realized_fees": 0.0, "realized_pnl_net": 0.0}
+        out[k]["realized_pnl_gross"] += float(res.realized_pnl_gross)
+        out[k]["realized_fees"] += float(res.realized_fees)
+        out[k]["realized_pnl_net"] = out[k]["realized_pnl_gross"] - out[k]["realized_fees"]
     return out
 
 
@@ -110,6 +114,7 @@ def compute_strategy_pnl_for_period(
     period_start: datetime,
     period_end: datetime,
     mark_prices: Mapping[str, float],
+    checkpoint: Optional[Union[FifoLedgerState, Mapping[str, Any]]] = None,
 ) -> Dict[Tuple[str, str, str], StrategyPeriodPnl]:
     """
     Compute P&L attribution by (tenant_id, uid, strategy_id) for a time window.
@@ -119,12 +124,21 @@ def compute_strategy_pnl_for_period(
 
     This ensures fills that open positions before the period (and close during the period)
     are attributed correctly.
+
+    checkpoint: optional `FifoLedgerState` (or its `to_checkpoint()` dict) taken at or before
+    period_start. Trades already covered by it are skipped, so `trades` only needs the fills
+    after the checkpoint; the result matches a full replay.
     """
     start_utc = _as_utc(period_start)
     end_utc = _as_utc(period_end)
     if end_utc <= start_utc:
         raise ValueError("period_end must be > period_start")
 
+    if checkpoint is not None:
+        return _strategy_pnl_from_checkpoint(
+            trades, checkpoint, start_utc=start_utc, end_utc=end_utc, mark_prices=mark_prices
+        )
+
     # Baseline at the start of the period (exclude trades at exactly period_start).
     rows_start = compute_fifo_pnl(
         trades=trades,
@@ -146,7 +160,49 @@ def compute_strategy_pnl_for_period(
     # Fee-aware realized attribution (gross + fees via FIFO allocation).
     totals_start = _realized_totals_as_of(trades, as_of=start_utc, as_of_inclusive=False)
     totals_end = _realized_totals_as_of(trades, as_of=end_utc, as_of_inclusive=False)
+    return _period_deltas(agg_start, agg_end, totals_start, totals_end)
+
 
+def _strategy_pnl_from_checkpoint(
+    trades: Iterable[LedgerTrade],
+    checkpoint: Union[FifoLedgerState, Mapping[str, Any]],
+    *,
+    start_utc: datetime,
+    end_utc: datetime,
+    mark_prices: Mapping[str, float],
+) -> Dict[Tuple[str, str, str], StrategyPeriodPnl]:
+    if isinstance(checkpoint, FifoLedgerState):
+        state = checkpoint.copy()
+    else:
+        state = FifoLedgerState.from_checkpoint(checkpoint)
+    last = state.last_trade_key
+    if last is not None and last[0] >= start_utc:
+        raise ValueError("checkpoint must precede period_start")
+
+    pending = sorted(
+        (t for t in trades if t.ts < end_utc and not state.is_applied(t)),
+        key=_trade_sort_key,
+    )
+    i = 0
+    while i < len(pending) and pending[i].ts < start_utc:
+        state.apply(pending[i])
+        i += 1
+    agg_start = aggregate_pnl(state.snapshot({}))
+    totals_start = state.realized_totals()
+
+    for t in pending[i:]:
+        state.apply(t)
+    agg_end = aggregate_pnl(state.snapshot(mark_prices))
+    totals_end = state.realized_totals()
+    return _period_deltas(agg_start, agg_end, totals_start, totals_end)
+
+
+def _period_deltas(
+    agg_start: Mapping[Tuple[str, str, str], Mapping[str, float]],
+    agg_end: Mapping[Tuple[str, str, str], Mapping[str, float]],
+    totals_start: Mapping[Tuple[str, str, str], Mapping[str, float]],
+    totals_end: Mapping[Tuple[str, str, str], Mapping[str, float]],
+) -> Dict[Tuple[str, str, str], StrategyPeriodPnl]:
     keys = set(agg_start.keys()) | set(agg_end.keys())
     keys |= set(totals_start.keys()) | set(totals_end.keys())
     out: Dict[Tuple[str, str, str], StrategyPeriodPnl] = {}
@@ -174,4 +230,3 @@ def compute_strategy_pnl_for_period(
             realized_fees=realized_fees_in_period,
         )
     return out
-
@@ -1,14 +1,15 @@
 from __future__ import annotations
 
+import heapq
 import logging
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, DefaultDict
+from typing import Any, DefaultDict, Sequence
 from collections import defaultdict
 
 from backend.time.nyse_time import UTC, ensure_aware_utc, parse_ts, utc_now
-from backend.marketdata.candles.models import EmittedCandle
-from backend.marketdata.candles.timeframes import Timeframe, bucket_range_utc, parse_timeframe
+from backend.marketdata.candles.models import Candle, EmittedCandle, Tick
+from backend.marketdata.candles.timeframe import Timeframe, bar_range_utc, parse_timeframes
 
 logger = logging.getLogger(__name__)
 
@@ -125,6 +126,10 @@ class CandleAggregator:
     - Bars are aligned to wall-clock boundaries in `tz_market` (default: America/New_York).
     - Uses event-time watermarking with a bounded out-of-order tolerance.
     - Only emits *finalized* candles from `ingest_tick()` and `flush()`.
+
+    Open bars are indexed per (symbol, timeframe) in a min-heap ordered by `end_ts`,
+    so finalization only touches bars that are actually due instead of scanning
+    every open bar across all symbols.
     """
 
     def __init__(
@@ -144,6 +149,8 @@ class CandleAggregator:
 
         self._tfs: list[Timeframe] = parse_timeframes(timeframes)
         self._bars: dict[tuple[str, str, datetime], _BarState] = {}
+        # (symbol, timeframe) -> heap of (end_ts, start_ts) for open bars in `_bars`.
+        self._due: dict[tuple[str, str], list[tuple[datetime, datetime]]] = {}
         self._watermark: dict[tuple[str, str], datetime] = {}  # (symbol, timeframe) -> max event ts
 
         # Observability counters
@@ -187,13 +194,15 @@ class CandleAggregator:
 
             st = self._bars.get(bar_key)
             if st is None:
-                self._bars[bar_key] = _BarState.new(
+                st = _BarState.new(
                     symbol=tick.symbol,
                     timeframe=tf.text,
                     start_ts=start_utc,
                     end_ts=end_utc,
                     tick=tick,
                 )
+                self._bars[bar_key] = st
+                heapq.heappush(self._due.setdefault(tf_key, []), (st.end_ts, st.start_ts))
             else:
                 st.apply(tick)
 
@@ -201,22 +210,55 @@ class CandleAggregator:
 
         return out
 
+    def ingest_ticks(
+        self,
+        symbols: Sequence[str],
+        ts_ns: Sequence[int],
+        prices: Sequence[float],
+        sizes: Sequence[int],
+    ) -> list[Candle]:
+        """
+        Columnar batch ingest over parallel arrays (NumPy arrays or sequences).
+
+        Equivalent to calling `ingest_tick()` for each row in order and concatenating the
+        returned candles, including lateness drops and watermark state. `ts_ns` is epoch
+        nanoseconds; it is truncated to microseconds to match `datetime` resolution.
+        Unlike the per-tick path, all rows are validated before any state is mutated.
+
+        Requires numpy.
+        """
+        from backend.marketdata.candles.columnar import ingest_ticks_columnar
+
+        return ingest_ticks_columnar(self, symbols, ts_ns, prices, sizes)
+
     def _finalize_ready(self, tf_key: tuple[str, str], *, watermark: datetime) -> list[Candle]:
         watermark = ensure_aware_utc(watermark)
-        finalize_before = watermark - self.lateness
-        symbol, tf_text = tf_key
+        finalized = self._pop_due(tf_key, finalize_before=watermark - self.lateness)
+        # Deterministic order for callers/logs.
+        finalized.sort(key=lambda c: (c.symbol, c.timeframe, c.start_ts))
+        return finalized
+
+    def _pop_due(self, tf_key: tuple[str, str], *, finalize_before: datetime) -> list[Candle]:
+        """
+        Pop and finalize every open bar for `tf_key` whose end_ts <= finalize_before.
+
+        Cost is O(log n) per finalized bar; bars that are not yet due are never visited.
+        """
+        heap = self._due.get(tf_key)
+        if not heap or heap[0][0] > finalize_before:
+            return []
 
+        symbol, tf_text = tf_key
         finalized: list[Candle] = []
-        for (sym, tft, start), st in list(self._bars.items()):
-            if sym != symbol or tft != tf_text:
+        while heap and heap[0][0] <= finalize_before:
+            _, start = heapq.heappop(heap)
+            st = self._bars.pop((symbol, tf_text, start), None)
+            if st is None:  # pragma: no cover - heap and dict are kept in lockstep
                 continue
-            if st.end_ts <= finalize_before:
-                self._bars.pop((sym, tft, start), None)
-                c = st.to_candle(is_final=True)
-                finalized.append(c)
-                self.candles_finalized += 1
-        # Deterministic order for callers/logs.
-        finalized.sort(key=lambda c: (c.symbol, c.timeframe, c.start_ts))
+            finalized.append(st.to_candle(is_final=True))
+            self.candles_finalized += 1
+        if not heap:
+            del self._due[tf_key]
         return finalized
 
     def flush(self, now_ts: datetime | None = None) -> list[Candle]:
@@ -232,11 +274,8 @@ class CandleAggregator:
             self._watermark[key] = max(prev, now_utc)
 
         finalized: list[Candle] = []
-        for k, st in list(self._bars.items()):
-            if st.end_ts <= finalize_before:
-                self._bars.pop(k, None)
-                finalized.append(st.to_candle(is_final=True))
-                self.candles_finalized += 1
+        for tf_key in list(self._due):
+            finalized.extend(self._pop_due(tf_key, finalize_before=finalize_before))
         finalized.sort(key=lambda c: (c.symbol, c.timeframe, c.start_ts))
         return finalized
 
@@ -275,7 +314,7 @@ class CandleAggregator:
         """
         try:
             symbol = str(event.get("symbol") or "").strip().upper()
-            ts = parse_timestamp(event.get("timestamp"))
+            ts = parse_ts(event.get("timestamp"))
             price = float(event.get("price"))
             size = int(event.get("size"))
         except Exception:
@@ -0,0 +1,257 @@
+"""
+Columnar (NumPy) tick ingestion for `CandleAggregator`.
+
+Buckets parallel trade arrays into bars with vectorized epoch-floor arithmetic and
+reproduces `CandleAggregator.ingest_tick()` exactly:
+- per-(symbol, timeframe) event-time watermarks and lateness drops
+- bar alignment via `bar_range_utc` (market-timezone wall clock / session days)
+- open/close tie-breaking and sequential vwap accumulation order
+- emission order (tick arrival, then timeframe order, then bar start)
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Sequence
+
+import numpy as np
+
+from backend.marketdata.candles.models import Candle
+from backend.marketdata.candles.timeframe import Timeframe, bar_range_utc
+from backend.time.nyse_time import UTC, ensure_aware_utc
+
+if TYPE_CHECKING:  # pragma: no cover
+    from backend.marketdata.candles.aggregator import CandleAggregator
+
+logger = logging.getLogger(__name__)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_ONE_US = timedelta(microseconds=1)
+
+# Every timezone offset in use is a whole multiple of 15 minutes, so UTC-aligned buckets
+# of this width never straddle a local bar boundary (minute/hour, midnight or 09:30).
+_ALIGN_US = 15 * 60 * 1_000_000
+
+
+def _to_us(dt: datetime) -> int:
+    return (ensure_aware_utc(dt) - _EPOCH) // _ONE_US
+
+
+def _from_us(us: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=int(us))
+
+
+def _candidate_width_us(tf: Timeframe) -> int:
+    """
+    Width of UTC-floored buckets that always fall inside a single bar of `tf`.
+
+    Bars are resolved once per candidate bucket through `bar_range_utc`, which keeps the
+    DST/session edge cases identical to the per-tick path.
+    """
+    if tf.is_intraday:
+        step_us = tf.as_timedelta_local() // _ONE_US
+        return math.gcd(step_us, _ALIGN_US)
+    return _ALIGN_US
+
+
+def _first_last_per_bar(sorted_bars: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    starts = np.flatnonzero(np.r_[True, sorted_bars[1:] != sorted_bars[:-1]])
+    ends = np.r_[starts[1:] - 1, len(sorted_bars) - 1]
+    return starts, ends
+
+
+def ingest_ticks_columnar(
+    agg: "CandleAggregator",
+    symbols: Sequence[str] | np.ndarray,
+    ts_ns: Sequence[int] | np.ndarray,
+    prices: Sequence[float] | np.ndarray,
+    sizes: Sequence[int] | np.ndarray,
+) -> list[Candle]:
+    """
+    Ingest parallel arrays of trades into `agg`; see `CandleAggregator.ingest_ticks`.
+    """
+    from backend.marketdata.candles.aggregator import _BarState
+
+    sym_raw = np.asarray(symbols, dtype=object)
+    ts_us = np.asarray(ts_ns, dtype=np.int64) // 1000
+    px = np.asarray(prices, dtype=np.float64)
+    sz = np.asarray(sizes, dtype=np.int64)
+
+    n = int(ts_us.shape[0])
+    if not (sym_raw.shape[0] == px.shape[0] == sz.shape[0] == n):
+        raise ValueError("symbols, ts_ns, prices and sizes must have the same length")
+    if n == 0:
+        return []
+    if bool((sz < 0).any()):
+        raise ValueError("Tick.size must be >= 0")
+
+    # Normalize symbols exactly like `Tick` does, then group rows by symbol (stable => arrival order).
+    uniq_raw, inv = np.unique(sym_raw.astype(str), return_inverse=True)
+    names: list[str] = []
+    name_ids: dict[str, int] = {}
+    remap = np.empty(len(uniq_raw), dtype=np.int64)
+    for i, raw in enumerate(uniq_raw):
+        name = str(raw).strip().upper()
+        if not name:
+            raise ValueError("Tick.symbol must be non-empty")
+        if name not in name_ids:
+            name_ids[name] = len(names)
+            names.append(name)
+        remap[i] = name_ids[name]
+    sid = remap[inv]
+    perm = np.argsort(sid, kind="stable")
+    group_starts, group_ends = _first_last_per_bar(sid[perm])
+
+    lateness_us = agg.lateness // _ONE_US
+    widths = [_candidate_width_us(tf) for tf in agg._tfs]
+    range_cache: dict[tuple[int, int], tuple[datetime, datetime]] = {}
+
+    # (row index of the finalizing tick, timeframe index, bar start us, candle)
+    emitted: list[tuple[int, int, int, Candle]] = []
+    late_drops = 0
+
+    for lo, hi in zip(group_starts.tolist(), group_ends.tolist()):
+        rows = perm[lo : hi + 1]
+        symbol = names[int(sid[rows[0]])]
+        t = ts_us[rows]
+
+        for tf_idx, tf in enumerate(agg._tfs):
+            tf_key = (symbol, tf.text)
+
+            run = np.maximum.accumulate(t)
+            prev_wm = agg._watermark.get(tf_key)
+            if prev_wm is not None:
+                run = np.maximum(run, _to_us(prev_wm))
+            cutoff = run - lateness_us
+            keep = t >= cutoff
+
+            n_drop = int(len(t) - np.count_nonzero(keep))
+            late_drops += n_drop
+            if n_drop == len(t):
+                continue
+            agg._watermark[tf_key] = _from_us(int(run[-1]))
+
+            kpos = np.flatnonzero(keep)
+            kt = t[kpos]
+            kp = px[rows[kpos]]
+            ks = sz[rows[kpos]]
+
+            # Resolve bars once per UTC candidate bucket, then collapse candidates into bars.
+            width = widths[tf_idx]
+            cand, cand_inv = np.unique(kt // width, return_inverse=True)
+            cand_start_us = np.empty(len(cand), dtype=np.int64)
+            bar_ranges: dict[int, tuple[datetime, datetime]] = {}
+            for i, c in enumerate(cand.tolist()):
+                rng = range_cache.get((tf_idx, c))
+                if rng is None:
+                    rng = bar_range_utc(
+                        _from_us(c * width), tf, tz=agg.tz_market, session_daily=agg.session_daily
+                    )
+                    range_cache[(tf_idx, c)] = rng
+                start_us = _to_us(rng[0])
+                cand_start_us[i] = start_us
+                bar_ranges[start_us] = rng
+            bar_start_us, bar_inv = np.unique(cand_start_us, return_inverse=True)
+            bidx = bar_inv[cand_inv]
+            nb = len(bar_start_us)
+
+            existing: list[Any] = [None] * nb
+            high = np.full(nb, -np.inf)
+            low = np.full(nb, np.inf)
+            volume = np.zeros(nb, dtype=np.int64)
+            count = np.zeros(nb, dtype=np.int64)
+            pv_sum = np.zeros(nb, dtype=np.float64)
+            v_sum = np.zeros(nb, dtype=np.int64)
+            for b, start_us in enumerate(bar_start_us.tolist()):
+                st = agg._bars.get((symbol, tf.text, bar_ranges[start_us][0]))
+                if st is not None:
+                    existing[b] = st
+                    high[b] = st.high
+                    low[b] = st.low
+                    volume[b] = st.volume
+                    count[b] = st.trade_count
+                    pv_sum[b] = st.pv_sum
+                    v_sum[b] = st.v_sum
+
+            # ufunc.at applies rows in array order, i.e. arrival order within a bar, which
+            # keeps the float accumulation of pv_sum identical to repeated `_BarState.apply`.
+            np.maximum.at(high, bidx, kp)
+            np.minimum.at(low, bidx, kp)
+            np.add.at(volume, bidx, ks)
+            np.add.at(count, bidx, 1)
+            np.add.at(pv_sum, bidx, kp * ks)
+            np.add.at(v_sum, bidx, ks)
+
+            # open: earliest ts, first arrival wins ties; close: latest ts, last arrival wins ties.
+            order = np.lexsort((kpos, kt, bidx))
+            first, last = _first_last_per_bar(bidx[order])
+            open_row = order[first]
+            close_row = order[last]
+
+            for b, start_us in enumerate(bar_start_us.tolist()):
+                o, c = int(open_row[b]), int(close_row[b])
+                st = existing[b]
+                if st is None:
+                    start_ts, end_ts = bar_ranges[start_us]
+                    st = _BarState(
+                        symbol=symbol,
+                        timeframe=tf.text,
+                        start_ts=ensure_aware_utc(start_ts),
+                        end_ts=ensure_aware_utc(end_ts),
+                        open=float(kp[o]),
+                        high=0.0,
+                        low=0.0,
+                        close=float(kp[c]),
+                        volume=0,
+                        trade_count=0,
+                        pv_sum=0.0,
+                        v_sum=0,
+                        open_ts=_from_us(int(kt[o])),
+                        close_ts=_from_us(int(kt[c])),
+                    )
+                    agg._bars[(symbol, tf.text, st.start_ts)] = st
+                    heapq.heappush(agg._due.setdefault(tf_key, []), (st.end_ts, st.start_ts))
+                else:
+                    if int(kt[o]) < _to_us(st.open_ts):
+                        st.open_ts = _from_us(int(kt[o]))
+                        st.open = float(kp[o])
+                    if int(kt[c]) >= _to_us(st.close_ts):
+                        st.close_ts = _from_us(int(kt[c]))
+                        st.close = float(kp[c])
+                st.high = float(high[b])
+                st.low = float(low[b])
+                st.volume = int(volume[b])
+                st.v_sum = int(v_sum[b])
+                st.trade_count = int(count[b])
+                st.pv_sum = float(pv_sum[b])
+
+            # Finalize every open bar of this key that became due; the finalizing row is the
+            # first one whose watermark cutoff reached the bar end.
+            finalize_before = int(cutoff[-1])
+            heap = agg._due.get(tf_key, [])
+            remaining: list[tuple[datetime, datetime]] = []
+            for end_ts, start_ts in heap:
+                end_us = _to_us(end_ts)
+                if end_us > finalize_before:
+                    remaining.append((end_ts, start_ts))
+                    continue
+                st = agg._bars.pop((symbol, tf.text, start_ts))
+                pos = int(np.searchsorted(cutoff, end_us, side="left"))
+                emitted.append((int(rows[pos]), tf_idx, _to_us(start_ts), st.to_candle(is_final=True)))
+                agg.candles_finalized += 1
+            if remaining:
+                if len(remaining) != len(heap):
+                    heapq.heapify(remaining)
+                    agg._due[tf_key] = remaining
+            else:
+                agg._due.pop(tf_key, None)
+
+    if late_drops:
+        agg.late_drops += late_drops
+        logger.info("late_drop ticks (beyond tolerance) | count=%d batch_size=%d", late_drops, n)
+
+    emitted.sort(key=lambda e: (e[0], e[1], e[2]))
+    return [c for _, _, _, c in emitted]
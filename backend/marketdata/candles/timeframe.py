@@ -167,8 +167,12 @@ def bar_range_utc(
     if tf.unit != "d":
         start_utc = floor_time(ts_utc, tf, tz=tz)
         start_local = start_utc.astimezone(tzinfo)
-        end_local = start_local + tf.as_timedelta_local()
-        return start_local.astimezone(UTC), end_local.astimezone(UTC)
+        end_utc = (start_local + tf.as_timedelta_local()).astimezone(UTC)
+        # Wall-clock arithmetic ignores `fold`, so around a DST fall-back it can overshoot the
+        # next bar (or even land before `start_utc`). Fall back to elapsed time in that case.
+        if end_utc <= start_utc or floor_time(end_utc - timedelta(microseconds=1), tf, tz=tz) != start_utc:
+            end_utc = start_utc + tf.as_timedelta_local()
+        return start_utc, end_utc
 
     # Daily: optionally align to RTH session start.
     local = ts_utc.astimezone(tzinfo)
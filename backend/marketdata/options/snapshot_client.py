@@ -0,0 +1,265 @@
+"""
+Pooled, concurrent client for Alpaca option snapshot endpoints.
+
+- One `requests.Session` with a keep-alive connection pool sized to `max_concurrency`,
+  shared by a thread pool of the same size.
+- Every HTTP request first takes a token from a shared `TokenBucket`, so concurrency
+  never exceeds the configured request rate.
+- Chain pagination is inherently sequential (each page carries the next token), so the
+  next page is submitted the moment its token is parsed, before the current page is
+  merged; chains for different underlyings and symbol batches run concurrently.
+- Per-request latency is recorded in a fixed-bucket histogram per endpoint.
+
+Endpoints:
+    GET {DATA}/v1beta1/options/snapshots/{underlying}?feed=...&page_token=...
+    GET {DATA}/v1beta1/options/snapshots?symbols=...
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from backend.ingestion.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATA_HOST = "https://data.alpaca.markets"
+
+# Alpaca accepts at most 200 contract symbols per snapshots request.
+MAX_SYMBOLS_PER_REQUEST = 200
+
+# Upper bounds (milliseconds) of the latency histogram buckets; the last bucket is +Inf.
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+@dataclass
+class LatencyHistogram:
+    """Fixed-bucket (non-cumulative) histogram of request latencies in milliseconds."""
+
+    bounds_ms: Tuple[float, ...] = LATENCY_BUCKETS_MS
+    counts: List[int] = field(default_factory=list)
+    count: int = 0
+    sum_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * (len(self.bounds_ms) + 1)
+
+    def observe(self, ms: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds_ms, ms)] += 1
+        self.count += 1
+        self.sum_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket containing quantile `q` (None when empty)."""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.bounds_ms, self.counts):
+            seen += n
+            if seen >= rank:
+                return float(bound)
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"le_{b:g}" for b in self.bounds_ms] + ["le_inf"]
+        return {
+            "count": self.count,
+            "sum_ms": self.sum_ms,
+            "max_ms": self.max_ms,
+            "p50_ms": self.quantile(0.50),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class SnapshotClient:
+    """
+    Thread-pooled option snapshot fetcher with connection reuse and rate limiting.
+
+    Use as a context manager (or call `close()`) to release the pool and sockets.
+    """
+
+    def __init__(
+        self,
+        headers: Mapping[str, str],
+        *,
+        data_host: str = DEFAULT_DATA_HOST,
+        max_concurrency: int = 4,
+        rate_limit: Optional[TokenBucket] = None,
+        rate_per_sec: float = 10.0,
+        timeout_s: float = 30.0,
+        session: Optional[requests.Session] = None,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        self.data_host = data_host.rstrip("/")
+        self.max_concurrency = int(max_concurrency)
+        self.timeout_s = float(timeout_s)
+        self.rate_limit = rate_limit or TokenBucket(rate_per_sec=rate_per_sec, capacity=max(1.0, rate_per_sec))
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        session.headers.update(dict(headers))
+        self._session = session
+        self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="option-snapshots")
+
+        self._latency: Dict[str, LatencyHistogram] = {}
+        self._latency_lock = threading.Lock()
+
+    def __enter__(self) -> "SnapshotClient":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+        self._session.close()
+
+    # --- instrumentation ---
+
+    def latency_histograms(self) -> Dict[str, Dict[str, Any]]:
+        """Per-endpoint latency histograms ("chain", "symbols")."""
+        with self._latency_lock:
+            return {name: h.to_dict() for name, h in self._latency.items()}
+
+    def _observe(self, endpoint: str, ms: float) -> None:
+        with self._latency_lock:
+            hist = self._latency.get(endpoint)
+            if hist is None:
+                hist = self._latency[endpoint] = LatencyHistogram()
+            hist.observe(ms)
+
+    # --- requests ---
+
+    def _get_json(self, endpoint: str, url: str, params: Mapping[str, Any]) -> Mapping[str, Any]:
+        self.rate_limit.acquire()
+        t0 = time.perf_counter()
+        try:
+            r = self._session.get(url, params=dict(params), timeout=self.timeout_s)
+            r.raise_for_status()
+            payload = r.json()
+        finally:
+            self._observe(endpoint, (time.perf_counter() - t0) * 1000.0)
+        return payload if isinstance(payload, Mapping) else {}
+
+    def _chain_page(self, underlying: str, feed: Optional[str], page_token: Optional[str]) -> Mapping[str, Any]:
+        params: Dict[str, Any] = {}
+        if feed:
+            params["feed"] = feed
+        if page_token:
+            params["page_token"] = page_token
+        return self._get_json("chain", f"{self.data_host}/v1beta1/options/snapshots/{underlying}", params)
+
+    def _symbols_batch(self, symbols: Sequence[str]) -> Mapping[str, Any]:
+        return self._get_json("symbols", f"{self.data_host}/v1beta1/options/snapshots", {"symbols": ",".join(symbols)})
+
+    def fetch_chains(
+        self,
+        underlyings: Sequence[str],
+        *,
+        feed: Optional[str] = "indicative",
+        max_pages: int = 5,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch full option chains for several underlyings concurrently.
+
+        Returns {underlying: {option_symbol: snapshot}}. A failed page is logged and ends
+        pagination for that underlying; snapshots from earlier pages are kept.
+        """
+        out: Dict[str, Dict[str, Any]] = {}
+        pages: Dict[str, int] = {}
+        pending: Dict[Future, str] = {}
+        for underlying in underlyings:
+            u = str(underlying).strip().upper()
+            if not u or u in out:
+                continue
+            out[u] = {}
+            pages[u] = 0
+            if max_pages > 0:
+                pending[self._pool.submit(self._chain_page, u, feed, None)] = u
+
+        while pending:
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for fut in done:
+                u = pending.pop(fut)
+                try:
+                    data = fut.result()
+                except Exception as e:
+                    logger.error(f"Failed to fetch option snapshots for {u}: {e}")
+                    continue
+                pages[u] += 1
+                token = data.get("next_page_token")
+                if token and pages[u] < max_pages:
+                    # Put the next page in flight before merging this one.
+                    pending[self._pool.submit(self._chain_page, u, feed, token)] = u
+                snaps = data.get("snapshots") or {}
+                if isinstance(snaps, Mapping):
+                    out[u].update(snaps)
+
+        for u, snaps in out.items():
+            logger.info(f"Fetched {len(snaps)} option snapshots for {u} ({pages[u]} pages)")
+        return out
+
+    def fetch_chain(
+        self,
+        underlying: str,
+        *,
+        feed: Optional[str] = "indicative",
+        max_pages: int = 5,
+    ) -> Dict[str, Any]:
+        """Single-underlying `fetch_chains`."""
+        chains = self.fetch_chains([underlying], feed=feed, max_pages=max_pages)
+        return next(iter(chains.values()), {})
+
+    def fetch_symbols(
+        self,
+        option_symbols: Sequence[str],
+        *,
+        chunk_size: int = MAX_SYMBOLS_PER_REQUEST,
+    ) -> Dict[str, Any]:
+        """
+        Fetch snapshots by contract symbol, with batches of `chunk_size` in flight concurrently.
+
+        Failed batches are logged and skipped; results are merged in batch order.
+        """
+        symbols = sorted({str(s).strip().upper() for s in option_symbols if s and str(s).strip()})
+        if not symbols:
+            return {}
+        size = max(1, min(int(chunk_size), MAX_SYMBOLS_PER_REQUEST))
+        chunks = [symbols[i : i + size] for i in range(0, len(symbols), size)]
+        futures = [self._pool.submit(self._symbols_batch, chunk) for chunk in chunks]
+
+        out: Dict[str, Any] = {}
+        for chunk, fut in zip(chunks, futures):
+            try:
+                payload = fut.result()
+            except Exception as e:
+                logger.exception(f"Failed to fetch snapshot chunk ({len(chunk)} symbols): {e}")
+                continue
+            snaps: Any = payload.get("snapshots")
+            if snaps is None:
+                snaps = payload
+            if not isinstance(snaps, Mapping):
+                logger.warning(f"Received non-dict snapshots payload: {snaps}")
+                continue
+            out.update(snaps)
+        logger.info(f"Total snapshots received: {len(out)} ({len(chunks)} requests)")
+        return out
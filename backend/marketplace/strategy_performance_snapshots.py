@@ -107,11 +107,13 @@ def build_monthly_strategy_performance_snapshots(
     year: int,
     month: int,
     mark_prices: Mapping[str, float],
+    checkpoint: Optional[Any] = None,
 ) -> Dict[str, StrategyPerformanceSnapshot]:
     """
     Build monthly per-user per-strategy performance docs keyed by perf_id.
 
-    NOTE: This assumes `ledger_trades` includes all fills with ts < period_end for correctness.
+    NOTE: This assumes `ledger_trades` includes all fills with ts < period_end for correctness,
+    or all fills after `checkpoint` (a `FifoLedgerState` checkpoint taken before the month).
     """
     period_start, period_end = month_period_utc(year=year, month=month)
     pnl_by_key = compute_strategy_pnl_for_period(
@@ -119,6 +121,7 @@ def build_monthly_strategy_performance_snapshots(
         period_start=period_start,
         period_end=period_end,
         mark_prices=mark_prices,
+        checkpoint=checkpoint,
     )
 
     out: Dict[str, StrategyPerformanceSnapshot] = {}
@@ -8,14 +8,16 @@ This package provides:
 """
 
 from .envelope import EventEnvelope
-from .publisher import PubSubPublisher
+from .publisher import PublishBatchSettings, PubSubPublisher
 from .subscriber import PubSubSubscriber
-from .local import InMemoryEventBus
+from .local import InMemoryEventBus, InMemoryPublisherClient
 
 __all__ = [
     "EventEnvelope",
     "PubSubPublisher",
+    "PublishBatchSettings",
     "PubSubSubscriber",
     "InMemoryEventBus",
+    "InMemoryPublisherClient",
 ]
 
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import time
 from collections import defaultdict, deque
 from dataclasses import dataclass
 from threading import Lock
-from typing import Any, Deque, Dict, Iterable, Mapping, Optional
+from typing import Any, Callable, Deque, Dict, Iterable, Mapping, Optional
 
 from backend.messaging.envelope import EventEnvelope
 
@@ -44,9 +45,12 @@ class InMemoryEventBus:
             git_sha=git_sha,
             ts=ts,
         )
+        return self.publish_envelope(topic=topic, envelope=env)
+
+    def publish_envelope(self, *, topic: str, envelope: EventEnvelope) -> EventEnvelope:
         with self._lock:
-            self._topics[str(topic)].append(_LocalTopicMessage(envelope=env))
-        return env
+            self._topics[str(topic)].append(_LocalTopicMessage(envelope=envelope))
+        return envelope
 
     def drain(self, *, topic: str) -> Iterable[EventEnvelope]:
         with self._lock:
@@ -55,3 +59,70 @@ class InMemoryEventBus:
             q.clear()
         return [m.envelope for m in items]
 
+
+
+class _LocalPublishFuture:
+    """
+    Resolves `latency_s` after publish: `result()` sleeps out whatever part of the
+    simulated round trip has not elapsed yet, so overlapping publishes overlap.
+    """
+
+    def __init__(self, *, ready_at: float, message_id: Optional[str], error: Optional[BaseException]) -> None:
+        self._ready_at = ready_at
+        self._message_id = message_id
+        self._error = error
+
+    def result(self, timeout: Optional[float] = None) -> str:
+        wait_s = self._ready_at - time.monotonic()
+        if wait_s > 0:
+            if timeout is not None and wait_s > timeout:
+                time.sleep(max(0.0, timeout))
+                raise TimeoutError("local publish timed out")
+            time.sleep(wait_s)
+        if self._error is not None:
+            raise self._error
+        return str(self._message_id)
+
+
+class InMemoryPublisherClient:
+    """
+    Stand-in for `google.cloud.pubsub_v1.PublisherClient` backed by an InMemoryEventBus.
+
+    Lets `PubSubPublisher` run end-to-end without Pub/Sub:
+        bus = InMemoryEventBus()
+        pub = PubSubPublisher(project_id="local", topic_id="system-events", agent_name="x",
+                              publisher_client=InMemoryPublisherClient(bus))
+
+    `latency_s` simulates the publish round trip; `fail` may return an exception to
+    raise for a given envelope (to exercise retries).
+    """
+
+    def __init__(
+        self,
+        bus: InMemoryEventBus,
+        *,
+        latency_s: float = 0.0,
+        fail: Optional[Callable[[EventEnvelope], Optional[BaseException]]] = None,
+    ) -> None:
+        self._bus = bus
+        self._latency_s = max(0.0, float(latency_s))
+        self._fail = fail
+        self._lock = Lock()
+        self._next_id = 0
+        self.publish_calls = 0
+
+    def topic_path(self, project: str, topic: str) -> str:
+        return f"projects/{project}/topics/{topic}"
+
+    def publish(self, topic: str, data: bytes, **attrs: str) -> _LocalPublishFuture:  # noqa: ARG002
+        envelope = EventEnvelope.from_bytes(data)
+        error = self._fail(envelope) if self._fail is not None else None
+        message_id: Optional[str] = None
+        with self._lock:
+            self.publish_calls += 1
+            if error is None:
+                self._next_id += 1
+                message_id = str(self._next_id)
+        if error is None:
+            self._bus.publish_envelope(topic=str(topic).split("/topics/")[-1], envelope=envelope)
+        return _LocalPublishFuture(ready_at=time.monotonic() + self._latency_s, message_id=message_id, error=error)
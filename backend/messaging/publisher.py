@@ -5,21 +5,201 @@ import os
 import random
 import threading
 import time
-from typing import Any, Mapping, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Iterable, Mapping, Optional, Sequence
 
+from backend.common.ops_metrics import REGISTRY
 from backend.messaging.envelope import EventEnvelope
-from backend.messaging.pubsub_attributes import (
-    EVENT_ENVELOPE_SCHEMA_VERSION,
-    build_standard_attributes,
-    resolve_environment,
-)
-from backend.contracts.registry import validate_topic_event
+from backend.contracts.registry import get_compiled_validator, validate_topic_event
 from backend.contracts.ops_alerts import try_write_contract_violation_alert
 from backend.observability.ops_json_logger import log as log_json
 from backend.observability.ops_json_logger import log_once as log_json_once
 
 logger = logging.getLogger(__name__)
 
+publish_latency_seconds = REGISTRY.histogram(
+    "pubsub_publish_latency_seconds",
+    help="Seconds from publish call (or enqueue, for batched modes) to Pub/Sub ack, labeled by mode.",
+    label_names=("mode",),
+)
+publish_batch_messages = REGISTRY.histogram(
+    "pubsub_publish_batch_messages",
+    help="Messages per Pub/Sub publish batch.",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+publish_flow_control_wait_seconds_total = REGISTRY.counter(
+    "pubsub_publish_flow_control_wait_seconds_total",
+    help="Seconds producers spent blocked by publisher flow control (outstanding bytes limit).",
+)
+publish_flow_control_wait_seconds_total.inc(0.0)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)).strip())
+    except Exception:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)).strip())
+    except Exception:
+        return default
+
+
+@dataclass(frozen=True, slots=True)
+class PublishBatchSettings:
+    """
+    Batching + flow control for `publish_many` / `publish_nowait`.
+
+    A batch is sent once it holds `max_messages` or `max_bytes`, or once its oldest
+    message has waited `max_latency_s`. Producers block in `publish_nowait` while
+    more than `max_outstanding_bytes` are queued or in flight.
+    """
+
+    max_messages: int = 100
+    max_bytes: int = 1_000_000
+    max_latency_s: float = 0.01
+    max_outstanding_bytes: int = 10_000_000
+    max_inflight_batches: int = 4
+
+    @staticmethod
+    def from_env() -> "PublishBatchSettings":
+        d = PublishBatchSettings()
+        return PublishBatchSettings(
+            max_messages=max(1, _env_int("PUBSUB_BATCH_MAX_MESSAGES", d.max_messages)),
+            max_bytes=max(1, _env_int("PUBSUB_BATCH_MAX_BYTES", d.max_bytes)),
+            max_latency_s=max(0.0, _env_float("PUBSUB_BATCH_MAX_LATENCY_S", d.max_latency_s)),
+            max_outstanding_bytes=max(1, _env_int("PUBSUB_FLOW_CONTROL_MAX_BYTES", d.max_outstanding_bytes)),
+            max_inflight_batches=max(1, _env_int("PUBSUB_BATCH_MAX_INFLIGHT", d.max_inflight_batches)),
+        )
+
+
+@dataclass(slots=True)
+class _PendingMessage:
+    envelope: EventEnvelope
+    data: bytes
+    future: "Future[str]"
+    enqueued_at: float
+
+
+class _PublishBatcher:
+    """
+    Background accumulator behind `PubSubPublisher.publish_nowait`.
+
+    One thread cuts batches (size/bytes/latency triggers) and hands them to a small
+    pool, so up to `max_inflight_batches` round trips overlap.
+    """
+
+    def __init__(self, publisher: "PubSubPublisher", settings: PublishBatchSettings) -> None:
+        self._pub = publisher
+        self._settings = settings
+        self._cond = threading.Condition()
+        self._pending: list[_PendingMessage] = []
+        self._pending_bytes = 0
+        self._outstanding_bytes = 0  # queued + in flight
+        self._outstanding_messages = 0
+        self._closed = False
+        self._flushing = 0  # callers in flush(): send the tail without waiting out max_latency
+        self._pool = ThreadPoolExecutor(max_workers=settings.max_inflight_batches, thread_name_prefix="pubsub-publish")
+        self._thread = threading.Thread(target=self._run, name="pubsub-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, envelope: EventEnvelope, data: bytes) -> "Future[str]":
+        size = len(data)
+        fut: "Future[str]" = Future()
+        s = self._settings
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("publisher_closed")
+            # Flow control: block while the outstanding-bytes budget is spent (a single
+            # oversized message is still admitted once everything else has drained).
+            if self._outstanding_bytes and self._outstanding_bytes + size > s.max_outstanding_bytes:
+                waited_from = time.monotonic()
+                while self._outstanding_bytes and self._outstanding_bytes + size > s.max_outstanding_bytes:
+                    if self._pub._shutdown_event.is_set():
+                        raise InterruptedError("shutdown requested")
+                    self._cond.wait(timeout=0.1)
+                publish_flow_control_wait_seconds_total.inc(time.monotonic() - waited_from)
+            self._pending.append(_PendingMessage(envelope=envelope, data=data, future=fut, enqueued_at=time.monotonic()))
+            self._pending_bytes += size
+            self._outstanding_bytes += size
+            self._outstanding_messages += 1
+            if len(self._pending) == 1 or self._batch_full():
+                self._cond.notify_all()
+        return fut
+
+    def _batch_full(self) -> bool:
+        return len(self._pending) >= self._settings.max_messages or self._pending_bytes >= self._settings.max_bytes
+
+    def _take_batch(self) -> list[_PendingMessage]:
+        s = self._settings
+        batch: list[_PendingMessage] = []
+        nbytes = 0
+        for m in self._pending:
+            if batch and (len(batch) >= s.max_messages or nbytes + len(m.data) > s.max_bytes):
+                break
+            batch.append(m)
+            nbytes += len(m.data)
+        del self._pending[: len(batch)]
+        self._pending_bytes -= nbytes
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return  # closed and drained
+                deadline = self._pending[0].enqueued_at + self._settings.max_latency_s
+                while not self._closed and not self._flushing and not self._batch_full():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(timeout=remaining)
+                batch = self._take_batch()
+            self._pool.submit(self._send, batch)
+
+    def _send(self, batch: list[_PendingMessage]) -> None:
+        try:
+            self._pub._publish_pending(batch)
+        except BaseException as e:  # never leave a caller's future unresolved
+            for m in batch:
+                if not m.future.done():
+                    m.future.set_exception(e)
+        finally:
+            with self._cond:
+                self._outstanding_bytes -= sum(len(m.data) for m in batch)
+                self._outstanding_messages -= len(batch)
+                self._cond.notify_all()
+
+    def flush(self, timeout_s: Optional[float] = None) -> bool:
+        deadline = None if timeout_s is None else time.monotonic() + max(0.0, float(timeout_s))
+        with self._cond:
+            self._flushing += 1
+            self._cond.notify_all()
+            try:
+                while self._outstanding_messages:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._cond.wait(timeout=remaining)
+            finally:
+                self._flushing -= 1
+        return True
+
+    def close(self, timeout_s: Optional[float] = None) -> bool:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout=timeout_s)
+        drained = self.flush(timeout_s)
+        self._pool.shutdown(wait=drained)
+        return drained
+
 
 class PubSubPublisher:
     """
@@ -39,11 +219,15 @@ class PubSubPublisher:
         publisher_client: Any = None,
         validate_credentials: bool = True,
         shutdown_event: threading.Event | None = None,
+        batch_settings: PublishBatchSettings | None = None,
     ) -> None:
         self.project_id = str(project_id)
         self.topic_id = str(topic_id)
         self.agent_name = str(agent_name)
         self.git_sha = git_sha
+        self.batch_settings = batch_settings or PublishBatchSettings.from_env()
+        self._batcher: Optional[_PublishBatcher] = None
+        self._batcher_lock = threading.Lock()
         if shutdown_event is None:
             # Default: wire up process SIGTERM/SIGINT to make backoff waits interruptible
             # even when callers don't explicitly pass a shutdown event.
@@ -117,18 +301,6 @@ class PubSubPublisher:
 
     def _publish_retry_config(self) -> dict[str, float | int]:
         # Environment overrides allow safe tuning without infra edits.
-        def _env_int(name: str, default: int) -> int:
-            try:
-                return int(os.getenv(name, str(default)).strip())
-            except Exception:
-                return default
-
-        def _env_float(name: str, default: float) -> float:
-            try:
-                return float(os.getenv(name, str(default)).strip())
-            except Exception:
-                return default
-
         return {
             "max_attempts": max(1, _env_int("PUBSUB_PUBLISH_MAX_ATTEMPTS", 5)),
             "initial_backoff_s": max(0.0, _env_float("PUBSUB_PUBLISH_INITIAL_BACKOFF_S", 0.25)),
@@ -225,6 +397,64 @@ class PubSubPublisher:
             raise InterruptedError("shutdown requested")
         return sleep_s
 
+    def _reject_invalid(self, envelope: EventEnvelope, errors: list[dict[str, Any]]) -> None:
+        # Record for ops (the caller fails fast; invalid events are never published).
+        log_json(
+            None,
+            "pubsub_contract_invalid",
+            severity="ERROR",
+            topic=self._topic_path,
+            topic_id=self.topic_id,
+            event_type=envelope.event_type,
+            agent_name=envelope.agent_name,
+            trace_id=envelope.trace_id,
+            schemaVersion=int(envelope.schemaVersion),
+            error_count=len(errors),
+            errors=errors[:10],
+        )
+        try_write_contract_violation_alert(
+            topic=str(self.topic_id),
+            producer=str(envelope.agent_name),
+            event_type=str(envelope.event_type),
+            message="publisher_rejected_invalid_event",
+            errors=errors,
+            sample={"event": envelope.to_dict()},
+        )
+
+    def _contract_errors_for_batch(self, envelopes: Sequence[EventEnvelope]) -> list[Optional[list[dict[str, Any]]]]:
+        """
+        Per-envelope contract errors (None = valid). The topic gate is resolved once
+        per batch; non-gated topics skip validation entirely.
+        """
+        try:
+            validator = get_compiled_validator(self.topic_id)
+        except Exception:
+            return [None] * len(envelopes)
+        out: list[Optional[list[dict[str, Any]]]] = []
+        for envelope in envelopes:
+            try:
+                out.append(validator.errors(envelope.to_dict()))
+            except Exception:
+                out.append(None)
+        return out
+
+    @staticmethod
+    def _check_schema_version(envelope: EventEnvelope) -> None:
+        schema_version = int(getattr(envelope, "schemaVersion", 0) or 0)
+        if schema_version != 1:
+            raise ValueError(f"Unsupported schemaVersion for EventEnvelope: {schema_version}")
+
+    def _message_attributes(self, envelope: EventEnvelope) -> dict[str, str]:
+        # Key envelope fields duplicated as attributes for filtering/debugging.
+        return {
+            "schemaVersion": str(self._schema_version()),
+            "event_type": envelope.event_type,
+            "agent_name": envelope.agent_name,
+            "trace_id": envelope.trace_id,
+            "git_sha": envelope.git_sha,
+            "ts": envelope.ts,
+        }
+
     def publish_envelope(self, envelope: EventEnvelope) -> str:
         """
         Publish a fully-formed envelope.
@@ -232,9 +462,7 @@ class PubSubPublisher:
         Returns a Pub/Sub message id (string).
         """
         # Contract guardrail: schemaVersion is REQUIRED and must be supported.
-        schema_version = int(getattr(envelope, "schemaVersion", 0) or 0)
-        if schema_version != 1:
-            raise ValueError(f"Unsupported schemaVersion for EventEnvelope: {schema_version}")
+        self._check_schema_version(envelope)
 
         # Contract unification gate (topic-specific): validate the JSON we will emit.
         # Only applies to canonical topics; other topics are ignored (no-op) to keep
@@ -244,28 +472,7 @@ class PubSubPublisher:
         except Exception:
             errors = None  # unknown topic / validator unavailable => do not block publish
         if errors:
-            # Record for ops and fail fast (do not publish invalid events).
-            log_json(
-                None,
-                "pubsub_contract_invalid",
-                severity="ERROR",
-                topic=self._topic_path,
-                topic_id=self.topic_id,
-                event_type=envelope.event_type,
-                agent_name=envelope.agent_name,
-                trace_id=envelope.trace_id,
-                schemaVersion=int(envelope.schemaVersion),
-                error_count=len(errors),
-                errors=errors[:10],
-            )
-            try_write_contract_violation_alert(
-                topic=str(self.topic_id),
-                producer=str(envelope.agent_name),
-                event_type=str(envelope.event_type),
-                message="publisher_rejected_invalid_event",
-                errors=errors,
-                sample={"event": envelope.to_dict()},
-            )
+            self._reject_invalid(envelope, errors)
             raise ValueError("contract_validation_failed")
 
         cfg = self._publish_retry_config()
@@ -275,19 +482,13 @@ class PubSubPublisher:
         started = time.monotonic()
         last_exc: Optional[BaseException] = None
 
-        std_attrs = build_standard_attributes(
-            event_type=envelope.event_type,
-            schema_version=EVENT_ENVELOPE_SCHEMA_VERSION,
-            producer=envelope.agent_name,
-            environment=resolve_environment(),
-        )
-        # Keep existing non-standard attributes for filtering/debugging.
-        publish_attrs: dict[str, str] = {
-            **std_attrs,
-            "agent_name": envelope.agent_name,
-            "trace_id": envelope.trace_id,
-            "git_sha": envelope.git_sha,
-            "ts": envelope.ts,
+        attrs = self._message_attributes(envelope)
+        data = envelope.to_bytes()
+        log_attrs = {
+            "event_type": attrs["event_type"],
+            "schema_version": attrs["schemaVersion"],
+            "producer": str(envelope.agent_name),
+            "environment": self._default_environment(),
         }
 
         for attempt in range(1, max_attempts + 1):
@@ -295,21 +496,7 @@ class PubSubPublisher:
                 remaining = max(0.0, deadline_s - (time.monotonic() - started))
                 timeout_s = max(0.1, remaining)
 
-                schema_version = self._schema_version()
-                producer = str(envelope.agent_name)
-                environment = self._default_environment()
-
-                future = self._client.publish(
-                    self._topic_path,
-                    envelope.to_bytes(),
-                    # Also duplicate key fields as attributes for filtering/debugging.
-                    schemaVersion=str(schema_version),
-                    event_type=envelope.event_type,
-                    agent_name=envelope.agent_name,
-                    trace_id=envelope.trace_id,
-                    git_sha=envelope.git_sha,
-                    ts=envelope.ts,
-                )
+                future = self._client.publish(self._topic_path, data, **attrs)
                 message_id = str(future.result(timeout=timeout_s))
 
                 # Cloud Run performance marker: time-to-first-publish (logging-only).
@@ -342,15 +529,13 @@ class PubSubPublisher:
                     metric="pubsub_publish_success",
                     topic=self._topic_path,
                     message_id=message_id,
-                    event_type=std_attrs["event_type"],
-                    schema_version=std_attrs["schema_version"],
-                    producer=std_attrs["producer"],
-                    environment=std_attrs["environment"],
+                    **log_attrs,
                     agent_name=envelope.agent_name,  # legacy
                     trace_id=envelope.trace_id,
                     attempt=attempt,
                     elapsed_ms=int((time.monotonic() - started) * 1000),
                 )
+                publish_latency_seconds.observe(time.monotonic() - started, labels={"mode": "sync"})
                 return message_id
             except Exception as e:
                 last_exc = e
@@ -363,10 +548,7 @@ class PubSubPublisher:
                     severity="ERROR" if (not retryable or attempt == max_attempts) else "WARNING",
                     metric="pubsub_publish_failure",
                     topic=self._topic_path,
-                    event_type=std_attrs["event_type"],
-                    schema_version=std_attrs["schema_version"],
-                    producer=std_attrs["producer"],
-                    environment=std_attrs["environment"],
+                    **log_attrs,
                     agent_name=envelope.agent_name,  # legacy
                     trace_id=envelope.trace_id,
                     attempt=attempt,
@@ -392,6 +574,189 @@ class PubSubPublisher:
             raise last_exc
         raise RuntimeError("Pub/Sub publish failed without exception")
 
+    # ---- Batched publishing ----
+
+    def _publish_batch_with_retry(
+        self,
+        items: Sequence[tuple[EventEnvelope, bytes]],
+        *,
+        batch_sizes: Sequence[int] = (),
+    ) -> list[str | BaseException]:
+        """
+        Publish already-validated messages concurrently (all futures in flight at
+        once) and retry only the retryable failures, under one shared deadline.
+
+        `batch_sizes` splits `items` into the batches recorded in
+        `pubsub_publish_batch_messages` (default: a single batch).
+        Returns a message id or the final exception per item, in order.
+        """
+        cfg = self._publish_retry_config()
+        max_attempts = int(cfg["max_attempts"])
+        deadline_s = float(cfg["deadline_s"])
+        started = time.monotonic()
+        results: list[str | BaseException | None] = [None] * len(items)
+        todo = list(range(len(items)))
+        for n in batch_sizes or (len(items),):
+            publish_batch_messages.observe(n)
+
+        for attempt in range(1, max_attempts + 1):
+            inflight: list[tuple[int, Any]] = []
+            failed: list[tuple[int, BaseException]] = []
+            for i in todo:
+                envelope, data = items[i]
+                try:
+                    inflight.append((i, self._client.publish(self._topic_path, data, **self._message_attributes(envelope))))
+                except Exception as e:
+                    failed.append((i, e))
+            for i, future in inflight:
+                try:
+                    timeout_s = max(0.1, deadline_s - (time.monotonic() - started))
+                    results[i] = str(future.result(timeout=timeout_s))
+                except Exception as e:
+                    failed.append((i, e))
+            if not failed:
+                break
+
+            retry = [i for i, e in failed if self._is_retryable_publish_error(e)]
+            for i, e in failed:
+                results[i] = e
+            first = failed[0][1]
+            final = (not retry) or attempt >= max_attempts
+            log_json(
+                None,
+                "pubsub_publish_failure",
+                severity="ERROR" if final else "WARNING",
+                metric="pubsub_publish_failure",
+                topic=self._topic_path,
+                batch_size=len(items),
+                failed_count=len(failed),
+                retryable_count=len(retry),
+                attempt=attempt,
+                max_attempts=max_attempts,
+                error_type=first.__class__.__name__,
+                error_code=self._exc_code(first),
+                error=str(first),
+                elapsed_ms=int((time.monotonic() - started) * 1000),
+            )
+            if final:
+                break
+            try:
+                self._sleep_backoff(
+                    attempt=attempt,
+                    initial_backoff_s=float(cfg["initial_backoff_s"]),
+                    max_backoff_s=float(cfg["max_backoff_s"]),
+                )
+            except InterruptedError as e:
+                for i in retry:
+                    results[i] = e
+                break
+            todo = sorted(retry)
+
+        ok = sum(1 for r in results if isinstance(r, str))
+        if ok:
+            log_json(
+                None,
+                "pubsub_publish_batch_success",
+                severity="INFO",
+                metric="pubsub_publish_success",
+                topic=self._topic_path,
+                batch_size=len(items),
+                published_count=ok,
+                elapsed_ms=int((time.monotonic() - started) * 1000),
+            )
+        return [r if r is not None else RuntimeError("Pub/Sub publish failed without exception") for r in results]
+
+    def _publish_pending(self, batch: Sequence[_PendingMessage]) -> None:
+        # Batcher callback: validate the batch, publish the valid messages, resolve futures.
+        errors = self._contract_errors_for_batch([m.envelope for m in batch])
+        valid: list[_PendingMessage] = []
+        for m, errs in zip(batch, errors):
+            if errs:
+                self._reject_invalid(m.envelope, errs)
+                m.future.set_exception(ValueError("contract_validation_failed"))
+            else:
+                valid.append(m)
+        if not valid:
+            return
+        results = self._publish_batch_with_retry([(m.envelope, m.data) for m in valid])
+        now = time.monotonic()
+        for m, r in zip(valid, results):
+            if isinstance(r, BaseException):
+                m.future.set_exception(r)
+            else:
+                publish_latency_seconds.observe(now - m.enqueued_at, labels={"mode": "nowait"})
+                m.future.set_result(r)
+
+    def publish_many(self, envelopes: Iterable[EventEnvelope]) -> list[str]:
+        """
+        Publish envelopes in batches (per `batch_settings`) and wait for all acks.
+
+        The whole call is validated up front: if any envelope violates the topic
+        contract nothing is published and `ValueError("contract_validation_failed")`
+        is raised. Every batch is sent before any ack is awaited. Returns message ids
+        in input order; if a message still fails after retries, its error is raised
+        once every batch has been attempted (the other messages may already be
+        published). One latency observation (mode="many") is recorded per call.
+        """
+        items: list[tuple[EventEnvelope, bytes]] = []
+        for envelope in envelopes:
+            self._check_schema_version(envelope)
+            items.append((envelope, envelope.to_bytes()))
+        if not items:
+            return []
+
+        errors = self._contract_errors_for_batch([e for e, _ in items])
+        if any(errors):
+            for (envelope, _), errs in zip(items, errors):
+                if errs:
+                    self._reject_invalid(envelope, errs)
+            raise ValueError("contract_validation_failed")
+
+        s = self.batch_settings
+        started = time.monotonic()
+        batch_sizes: list[int] = []
+        chunk_len = chunk_bytes = 0
+        for _, data in items:
+            if chunk_len and (chunk_len >= s.max_messages or chunk_bytes + len(data) > s.max_bytes):
+                batch_sizes.append(chunk_len)
+                chunk_len = chunk_bytes = 0
+            chunk_len += 1
+            chunk_bytes += len(data)
+        batch_sizes.append(chunk_len)
+        results = self._publish_batch_with_retry(items, batch_sizes=batch_sizes)
+
+        for r in results:
+            if isinstance(r, BaseException):
+                raise r
+        publish_latency_seconds.observe(time.monotonic() - started, labels={"mode": "many"})
+        return [str(r) for r in results]
+
+    def publish_nowait(self, envelope: EventEnvelope) -> "Future[str]":
+        """
+        Queue an envelope for batched publishing and return immediately with a
+        `concurrent.futures.Future` resolving to the message id.
+
+        Blocks only for flow control (outstanding bytes over the limit). Contract
+        violations surface as `ValueError("contract_validation_failed")` on the future.
+        """
+        self._check_schema_version(envelope)
+        data = envelope.to_bytes()
+        batcher = self._batcher
+        if batcher is None:
+            with self._batcher_lock:
+                if self._batcher is None:
+                    self._batcher = _PublishBatcher(self, self.batch_settings)
+                batcher = self._batcher
+        return batcher.submit(envelope, data)
+
+    def flush(self, timeout_s: Optional[float] = None) -> bool:
+        """
+        Wait until every `publish_nowait` message has been acked or failed.
+        Returns False if `timeout_s` elapsed first.
+        """
+        batcher = self._batcher
+        return True if batcher is None else batcher.flush(timeout_s)
+
     def publish_event(
         self,
         *,
@@ -415,6 +780,14 @@ class PubSubPublisher:
         Rationale: PublisherClient can own background threads/batching and gRPC channels.
         This method is intentionally defensive across google-cloud-pubsub versions.
         """
+        batcher = getattr(self, "_batcher", None)
+        if batcher is not None:
+            try:
+                batcher.close(timeout_s=float(self._publish_retry_config()["deadline_s"]))
+            except Exception:
+                logger.exception("pubsub_publisher.batcher_close_failed")
+            self._batcher = None
+
         client = getattr(self, "_client", None)
         if client is None:
             return
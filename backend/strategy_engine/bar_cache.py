@@ -0,0 +1,202 @@
+"""
+Rolling per-symbol window of 1m bars for the strategy engine.
+
+The first read of a symbol loads the full lookback window; later reads only fetch bars
+with `ts >= last_seen_ts` (the newest cached bar is re-read because the current minute's
+bar is upserted while it is forming). Bars older than the lookback are evicted locally.
+
+A symbol's window is dropped and fully reloaded when:
+- the lookback changes, the local clock goes backwards, or the window was not refreshed
+  for longer than the lookback
+- the newest cached bar is no longer returned (deleted/rewritten upstream)
+- new bars leave a gap larger than `max_gap` after the cached ones (a later backfill
+  would otherwise be missed); the fetched data is still used, the reload happens next read
+- the newest bar is in the future beyond `max_future_skew` (same: reload next read)
+
+Windows are returned newest first, exactly like `models.fetch_recent_bars`.
+
+Metrics:
+    strategy_bar_cache_hits_total           incremental reads
+    strategy_bar_cache_misses_total         full-window reads
+    strategy_bar_cache_rows_fetched_total   bar rows read from Postgres
+    strategy_bar_cache_invalidations_total  windows dropped
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Deque, Dict, List, Mapping, Optional, Sequence
+
+from backend.common.ops_metrics import REGISTRY
+
+from .models import Bar, fetch_bars_since_many
+
+FetchMany = Callable[[Mapping[str, Optional[datetime]], int], Awaitable[Dict[str, List[Bar]]]]
+
+bar_cache_hits_total = REGISTRY.counter(
+    "strategy_bar_cache_hits_total",
+    help="Bar window reads served incrementally from the strategy-engine cache.",
+)
+bar_cache_misses_total = REGISTRY.counter(
+    "strategy_bar_cache_misses_total",
+    help="Bar window reads that loaded the full lookback window.",
+)
+bar_cache_rows_fetched_total = REGISTRY.counter(
+    "strategy_bar_cache_rows_fetched_total",
+    help="Bar rows fetched from Postgres by the strategy-engine bar cache.",
+)
+bar_cache_invalidations_total = REGISTRY.counter(
+    "strategy_bar_cache_invalidations_total",
+    help="Cached bar windows dropped (gap, clock skew, lookback change, upstream rewrite).",
+)
+
+for _c in (bar_cache_hits_total, bar_cache_misses_total, bar_cache_rows_fetched_total, bar_cache_invalidations_total):
+    _c.inc(0.0)
+
+
+def _utc(ts: datetime) -> datetime:
+    return ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts.astimezone(timezone.utc)
+
+
+@dataclass
+class _Window:
+    lookback_minutes: int
+    bars: Deque[Bar]  # oldest first
+    refreshed_at: datetime
+    expired: bool = False  # serve the current read, reload on the next one
+
+    @property
+    def last_seen_ts(self) -> Optional[datetime]:
+        return _utc(self.bars[-1].ts) if self.bars else None
+
+
+class BarWindowCache:
+    def __init__(
+        self,
+        *,
+        max_gap: timedelta = timedelta(minutes=5),
+        max_future_skew: timedelta = timedelta(seconds=5),
+        fetch_many: FetchMany = fetch_bars_since_many,
+    ) -> None:
+        self.max_gap = max_gap
+        self.max_future_skew = max_future_skew
+        self._fetch_many = fetch_many
+        self._windows: Dict[str, _Window] = {}
+        self.hits = 0
+        self.misses = 0
+        self.rows_fetched = 0
+        self.invalidations = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "symbols": len(self._windows),
+            "hits": self.hits,
+            "misses": self.misses,
+            "rows_fetched": self.rows_fetched,
+            "invalidations": self.invalidations,
+        }
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        symbols = list(self._windows) if symbol is None else [symbol]
+        for s in symbols:
+            if self._windows.pop(s, None) is not None:
+                self.invalidations += 1
+                bar_cache_invalidations_total.inc()
+
+    def _reusable(self, w: _Window, lookback_minutes: int, now: datetime) -> bool:
+        if w.expired or w.lookback_minutes != lookback_minutes or now < w.refreshed_at:
+            return False
+        return now - w.refreshed_at <= timedelta(minutes=lookback_minutes)
+
+    def plan(self, symbols: Sequence[str], lookback_minutes: int, *, now: datetime) -> Dict[str, Optional[datetime]]:
+        """Per-symbol lower bound for the next read: last seen bar ts, or None for a full window."""
+        now = _utc(now)
+        since: Dict[str, Optional[datetime]] = {}
+        for s in dict.fromkeys(symbols):
+            w = self._windows.get(s)
+            if w is not None and not self._reusable(w, lookback_minutes, now):
+                self.invalidate(s)
+                w = None
+            last_seen = w.last_seen_ts if w is not None else None
+            if last_seen is None:
+                self.misses += 1
+                bar_cache_misses_total.inc()
+            else:
+                self.hits += 1
+                bar_cache_hits_total.inc()
+            since[s] = last_seen
+        return since
+
+    def _merge(
+        self,
+        symbol: str,
+        since: Optional[datetime],
+        rows: List[Bar],
+        lookback_minutes: int,
+        now: datetime,
+    ) -> bool:
+        """Fold fetched rows (newest first) into the window; False if a full reload is needed."""
+        new = deque(reversed(rows))
+        cutoff = now - timedelta(minutes=lookback_minutes)
+        w = self._windows.get(symbol)
+        if since is None or w is None:
+            w = self._windows[symbol] = _Window(lookback_minutes=lookback_minutes, bars=new, refreshed_at=now)
+        else:
+            if since >= cutoff and (not new or _utc(new[0].ts) != since):
+                return False
+            while w.bars and _utc(w.bars[-1].ts) >= since:
+                w.bars.pop()
+            w.bars.extend(new)
+            w.refreshed_at = now
+            fresh = [b for b in new if _utc(b.ts) > since]
+            if fresh and _utc(fresh[0].ts) - since > self.max_gap:
+                w.expired = True
+        while w.bars and _utc(w.bars[0].ts) < cutoff:
+            w.bars.popleft()
+        if w.bars and _utc(w.bars[-1].ts) - now > self.max_future_skew:
+            w.expired = True
+        return True
+
+    async def apply(
+        self,
+        fetched: Mapping[str, List[Bar]],
+        since: Mapping[str, Optional[datetime]],
+        lookback_minutes: int,
+        *,
+        now: datetime,
+    ) -> Dict[str, List[Bar]]:
+        """Merge a read made with `plan()` bounds; returns windows newest first."""
+        now = _utc(now)
+        reload: Dict[str, Optional[datetime]] = {}
+        for s, bound in since.items():
+            rows = list(fetched.get(s, []))
+            self.rows_fetched += len(rows)
+            bar_cache_rows_fetched_total.inc(float(len(rows)))
+            if not self._merge(s, bound, rows, lookback_minutes, now):
+                self.invalidate(s)
+                self.misses += 1
+                bar_cache_misses_total.inc()
+                reload[s] = None
+        if reload:
+            full = await self._fetch_many(reload, lookback_minutes)
+            for s in reload:
+                rows = list(full.get(s, []))
+                self.rows_fetched += len(rows)
+                bar_cache_rows_fetched_total.inc(float(len(rows)))
+                self._merge(s, None, rows, lookback_minutes, now)
+        return {s: list(reversed(self._windows[s].bars)) if s in self._windows else [] for s in since}
+
+    async def refresh(
+        self,
+        symbols: Sequence[str],
+        lookback_minutes: int,
+        *,
+        now: Optional[datetime] = None,
+    ) -> Dict[str, List[Bar]]:
+        """Read (incrementally where possible) and return each symbol's window, newest first."""
+        now = _utc(now or datetime.now(timezone.utc))
+        since = self.plan(symbols, lookback_minutes, now=now)
+        fetched = await self._fetch_many(since, lookback_minutes)
+        return await self.apply(fetched, since, lookback_minutes, now=now)
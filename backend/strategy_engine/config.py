@@ -1,4 +1,4 @@
-from backend.common.config import env_csv, env_int, env_str
+from backend.common.config import FALSY, env_csv, env_int, env_str
 
 class Config:
     DATABASE_URL = env_str("DATABASE_URL")
@@ -7,6 +7,20 @@ class Config:
     STRATEGY_BAR_LOOKBACK_MINUTES = int(env_int("STRATEGY_BAR_LOOKBACK_MINUTES", default=30) or 30)
     STRATEGY_FLOW_LOOKBACK_MINUTES = int(env_int("STRATEGY_FLOW_LOOKBACK_MINUTES", default=5) or 5)
 
+    # Symbols evaluated concurrently per run (1 = serial) and one batched bars/flow read per run.
+    STRATEGY_SYMBOL_CONCURRENCY = int(env_int("STRATEGY_SYMBOL_CONCURRENCY", default=4) or 4)
+    STRATEGY_BATCH_PREFETCH = (env_str("STRATEGY_BATCH_PREFETCH", default="1") or "1").strip().lower() not in FALSY
+
+    # Rolling bar window cache (see backend/strategy_engine/bar_cache.py).
+    STRATEGY_BAR_CACHE = (env_str("STRATEGY_BAR_CACHE", default="1") or "1").strip().lower() not in FALSY
+    STRATEGY_BAR_CACHE_MAX_GAP_SECONDS = int(env_int("STRATEGY_BAR_CACHE_MAX_GAP_SECONDS", default=300) or 300)
+
+    # Postgres pool (see backend/strategy_engine/db.py).
+    STRATEGY_DB_POOL_MIN_SIZE = int(env_int("STRATEGY_DB_POOL_MIN_SIZE", default=1) or 1)
+    STRATEGY_DB_POOL_MAX_SIZE = int(env_int("STRATEGY_DB_POOL_MAX_SIZE", default=5) or 5)
+    # transaction | statement | session | none; prepared statements only for session/none.
+    STRATEGY_DB_PGBOUNCER_MODE = env_str("STRATEGY_DB_PGBOUNCER_MODE", default="transaction") or "transaction"
+
     # Vertex AI (Gemini)
     # Keep a sane default so deployments don't need to set this explicitly.
     VERTEX_AI_MODEL_ID = env_str("VERTEX_AI_MODEL_ID", default="gemini-2.5-flash") or "gemini-2.5-flash"
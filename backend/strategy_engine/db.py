@@ -0,0 +1,155 @@
+"""
+Process-wide asyncpg pool for the strategy engine.
+
+`service._startup` calls `init_pool()` (except in OBSERVE mode) and `_shutdown` calls
+`close_pool()`; every query helper in `models` / `risk` borrows a connection through
+`connection()`. If pool creation failed, `connection()` retries it lazily with exponential
+backoff (1s doubling up to 60s) and uses a one-off connection until it succeeds. Without
+`init_pool()` (one-off scripts, tests) `connection()` always opens a single short-lived
+connection.
+
+Prepared statements: asyncpg caches prepared statements per connection, which breaks
+behind PgBouncer in transaction/statement pooling mode. The statement cache is therefore
+only enabled when STRATEGY_DB_PGBOUNCER_MODE is "session" or "none".
+
+Metrics (rendered by `/metrics`):
+    strategy_db_pool_size                         gauge
+    strategy_db_pool_in_use                       gauge
+    strategy_db_pool_acquires_total               counter
+    strategy_db_pool_acquire_wait_seconds_total   counter
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import asyncpg
+
+from backend.common.ops_metrics import REGISTRY
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+_PREPARED_STATEMENT_MODES = {"session", "none"}
+_STATEMENT_CACHE_SIZE = 100
+_POOL_RETRY_INITIAL_S = 1.0
+_POOL_RETRY_MAX_S = 60.0
+
+pool_size = REGISTRY.gauge("strategy_db_pool_size", help="Open connections in the strategy-engine asyncpg pool.")
+pool_in_use = REGISTRY.gauge("strategy_db_pool_in_use", help="Strategy-engine pool connections currently checked out.")
+pool_acquires_total = REGISTRY.counter(
+    "strategy_db_pool_acquires_total",
+    help="Connections acquired from the strategy-engine pool.",
+)
+pool_acquire_wait_seconds_total = REGISTRY.counter(
+    "strategy_db_pool_acquire_wait_seconds_total",
+    help="Total seconds spent waiting to acquire a strategy-engine pool connection.",
+)
+
+# Export zero-valued series before the first acquire.
+pool_acquires_total.inc(0.0)
+pool_acquire_wait_seconds_total.inc(0.0)
+
+_pool: asyncpg.Pool | None = None
+_pool_lock = asyncio.Lock()
+# Set by `init_pool()`; a pool that failed to come up is then retried from `connection()`.
+_pool_wanted = False
+_pool_init_timeout_s = 10.0
+_pool_failures = 0
+_pool_retry_at = 0.0
+
+
+def statement_cache_size() -> int:
+    """asyncpg statement cache size allowed by the configured PgBouncer mode (0 disables it)."""
+    mode = (config.STRATEGY_DB_PGBOUNCER_MODE or "transaction").strip().lower()
+    return _STATEMENT_CACHE_SIZE if mode in _PREPARED_STATEMENT_MODES else 0
+
+
+async def init_pool(*, timeout_s: float | None = None) -> asyncpg.Pool:
+    """
+    Create the process-wide pool (idempotent), waiting at most `timeout_s` (default: the
+    last timeout given, initially 10s). On failure the error is raised and the next attempt
+    is scheduled with exponential backoff.
+    """
+    global _pool, _pool_wanted, _pool_init_timeout_s, _pool_failures, _pool_retry_at
+    _pool_wanted = True
+    if timeout_s is not None:
+        _pool_init_timeout_s = max(0.1, float(timeout_s))
+    async with _pool_lock:
+        if _pool is None:
+            try:
+                _pool = await asyncio.wait_for(
+                    asyncpg.create_pool(
+                        config.DATABASE_URL,
+                        min_size=config.STRATEGY_DB_POOL_MIN_SIZE,
+                        max_size=config.STRATEGY_DB_POOL_MAX_SIZE,
+                        statement_cache_size=statement_cache_size(),
+                    ),
+                    timeout=_pool_init_timeout_s,
+                )
+            except Exception:
+                _pool_failures += 1
+                backoff_s = min(_POOL_RETRY_MAX_S, _POOL_RETRY_INITIAL_S * 2 ** (_pool_failures - 1))
+                _pool_retry_at = time.monotonic() + backoff_s
+                raise
+            _pool_failures = 0
+    update_pool_metrics()
+    return _pool
+
+
+async def close_pool() -> None:
+    global _pool, _pool_wanted, _pool_failures, _pool_retry_at
+    _pool_wanted = False
+    _pool_failures, _pool_retry_at = 0, 0.0
+    pool, _pool = _pool, None
+    if pool is not None:
+        await pool.close()
+    update_pool_metrics()
+
+
+def get_pool() -> asyncpg.Pool | None:
+    return _pool
+
+
+def update_pool_metrics() -> None:
+    pool = _pool
+    if pool is None:
+        pool_size.set(0.0)
+        pool_in_use.set(0.0)
+        return
+    size = pool.get_size()
+    pool_size.set(float(size))
+    pool_in_use.set(float(size - pool.get_idle_size()))
+
+
+@asynccontextmanager
+async def connection() -> AsyncIterator[asyncpg.Connection]:
+    """Borrow a pooled connection (or open a one-off connection when no pool is running)."""
+    pool = _pool
+    if pool is None and _pool_wanted and time.monotonic() >= _pool_retry_at:
+        try:
+            pool = await init_pool()
+        except Exception as e:
+            logger.warning("strategy_engine db_pool_retry_failed attempt=%d error=%s", _pool_failures, e)
+    if pool is None:
+        conn = await asyncpg.connect(config.DATABASE_URL, statement_cache_size=statement_cache_size())
+        try:
+            yield conn
+        finally:
+            await conn.close()
+        return
+
+    t0 = time.monotonic()
+    try:
+        async with pool.acquire() as conn:
+            pool_acquire_wait_seconds_total.inc(time.monotonic() - t0)
+            pool_acquires_total.inc()
+            update_pool_metrics()
+            yield conn
+    finally:
+        update_pool_metrics()
@@ -2,7 +2,9 @@ import argparse
 import asyncio
 import os
 import uuid
+from dataclasses import dataclass
 from datetime import date, datetime, timedelta, timezone
+from typing import Any
 
 from backend.common.agent_boot import configure_startup_logging
 from backend.common.freshness import check_freshness, stale_after_for_bar_interval
@@ -10,17 +12,22 @@ from backend.common.kill_switch import get_kill_switch_state
 from backend.common.ops_http_server import OpsHttpServer
 from backend.common.ops_log import log_json
 from backend.ops.status_contract import AgentIdentity, EndpointsBlock, build_ops_status
+from backend.safety.strategy_breakers import check_abnormal_volatility, check_missing_market_data
 from backend.common.ops_metrics import (
     agent_start_total,
     errors_total,
     mark_activity,
     order_proposals_total,
     strategy_cycles_skipped_total,
+    strategy_cycle_seconds,
     strategy_cycles_total,
+    timed,
 )
 
+from .bar_cache import BarWindowCache
 from .config import config
-from .models import fetch_recent_bars, fetch_recent_options_flow
+from .db import close_pool, init_pool
+from .models import Bar, FlowEvent, fetch_recent_bars, fetch_recent_market_inputs, fetch_recent_options_flow
 from .risk import can_place_trade, get_or_create_strategy_definition, log_decision
 from .strategies.naive_flow_trend import make_decision
 from backend.risk_allocator import RiskAllocator
@@ -34,10 +41,10 @@ from backend.trading.agent_intent.models import (
     IntentKind,
     IntentSide,
 )
-from .daily_target_halt import DailyTargetHaltController
 
 _last_cycle_at_iso: str | None = None
 _daily_target_latch = DailyTargetHaltLatch()
+_bar_cache = BarWindowCache(max_gap=timedelta(seconds=config.STRATEGY_BAR_CACHE_MAX_GAP_SECONDS))
 
 
 def _utc_now_iso() -> str:
@@ -71,6 +78,46 @@ def _status_payload() -> dict[str, object]:
     return st.model_dump()
 
 
+@dataclass
+class _CycleContext:
+    """Per-run state shared by the symbol evaluations of one `run_strategy` call."""
+
+    strategy_id: Any
+    today: date
+    iteration_id: str
+    allocator: RiskAllocator
+    daily_return_pct: Any
+    stale_after: timedelta
+    prefetched: tuple[dict[str, list[Bar]], dict[str, list[FlowEvent]]] | None = None
+    prefetch_error: Exception | None = None
+    halted: bool = False
+
+
+async def _market_inputs(ctx: _CycleContext, symbol: str) -> tuple[list[Bar], list[FlowEvent]]:
+    if ctx.prefetch_error is not None:
+        raise ctx.prefetch_error
+    if ctx.prefetched is not None:
+        bars_by_symbol, flow_by_symbol = ctx.prefetched
+        return bars_by_symbol.get(symbol, []), flow_by_symbol.get(symbol, [])
+    if config.STRATEGY_BAR_CACHE:
+        bars = (await _bar_cache.refresh([symbol], config.STRATEGY_BAR_LOOKBACK_MINUTES))[symbol]
+    else:
+        bars = await fetch_recent_bars(symbol, config.STRATEGY_BAR_LOOKBACK_MINUTES)
+    flow_events = await fetch_recent_options_flow(symbol, config.STRATEGY_FLOW_LOOKBACK_MINUTES)
+    return bars, flow_events
+
+
+async def _prefetch_market_inputs(symbols: list[str]) -> tuple[dict[str, list[Bar]], dict[str, list[FlowEvent]]]:
+    bar_lookback = config.STRATEGY_BAR_LOOKBACK_MINUTES
+    flow_lookback = config.STRATEGY_FLOW_LOOKBACK_MINUTES
+    if not config.STRATEGY_BAR_CACHE:
+        return await fetch_recent_market_inputs(symbols, bar_lookback, flow_lookback)
+    now = datetime.now(timezone.utc)
+    since = _bar_cache.plan(symbols, bar_lookback, now=now)
+    fetched, flow = await fetch_recent_market_inputs(symbols, bar_lookback, flow_lookback, bars_since=since)
+    return await _bar_cache.apply(fetched, since, bar_lookback, now=now), flow
+
+
 async def run_strategy(execute: bool):
     """
     Main function to run the strategy engine (evaluation only).
@@ -78,6 +125,12 @@ async def run_strategy(execute: bool):
     Safety contract:
     - No execution / no broker interaction (this service emits proposals only).
     - Refuse to evaluate when market data is stale (fail-closed NOOP).
+
+    Symbols are evaluated up to STRATEGY_SYMBOL_CONCURRENCY at a time (1 = serial, in
+    watchlist order); a failing symbol does not interrupt the others, and the first
+    failure is re-raised once all of them have finished. With STRATEGY_BATCH_PREFETCH, bars and flow for the whole watchlist
+    are read up front in one batched round trip. With STRATEGY_BAR_CACHE, bars come from the
+    rolling per-symbol window (only bars newer than the last seen one are read).
     """
     # This service is proposal-only. Keep `execute` for back-compat but do not act on it.
     _ = execute
@@ -107,263 +160,280 @@ async def run_strategy(execute: bool):
             # Keep default on bad input; fail-closed is enforced by the check itself.
             pass
 
-    for symbol in config.STRATEGY_SYMBOLS:
-        # A "cycle" is one symbol evaluation.
-        strategy_cycles_total.inc(1.0)
-        mark_activity("strategy-engine")
-        global _last_cycle_at_iso
-        _last_cycle_at_iso = _utc_now_iso()
+    ctx = _CycleContext(
+        strategy_id=strategy_id,
+        today=today,
+        iteration_id=iteration_id,
+        allocator=allocator,
+        daily_return_pct=daily_return_pct,
+        stale_after=stale_after,
+    )
+    symbols = list(config.STRATEGY_SYMBOLS)
+    if config.STRATEGY_BATCH_PREFETCH:
+        try:
+            ctx.prefetched = await _prefetch_market_inputs(symbols)
+        except Exception as e:
+            # Surfaced per symbol as the usual internal_error skip.
+            ctx.prefetch_error = e
+
+    concurrency = max(1, int(config.STRATEGY_SYMBOL_CONCURRENCY))
+    if concurrency == 1 or len(symbols) <= 1:
+        for symbol in symbols:
+            await _evaluate_symbol(ctx, symbol)
+            if ctx.halted:
+                break
+        return
+
+    sem = asyncio.Semaphore(concurrency)
+    failures: list[Exception] = []
+
+    async def _bounded(symbol: str) -> None:
+        async with sem:
+            # A halt only stops symbols that have not started yet.
+            if ctx.halted:
+                return
+            try:
+                await _evaluate_symbol(ctx, symbol)
+            except Exception as e:
+                # Contain it: a TaskGroup would cancel sibling evaluations mid-flight
+                # (e.g. between emitting an intent and logging its decision).
+                failures.append(e)
+                errors_total.inc(labels={"component": "strategy-engine"})
+                try:
+                    log_json(
+                        intent_type="strategy_symbol_failed",
+                        severity="ERROR",
+                        error_type=type(e).__name__,
+                        error=str(e),
+                        symbol=symbol,
+                        strategy=config.STRATEGY_NAME,
+                        iteration_id=iteration_id,
+                    )
+                except Exception:
+                    pass
+
+    async with asyncio.TaskGroup() as tg:
+        for symbol in symbols:
+            tg.create_task(_bounded(symbol))
+    if failures:
+        # Fail the run like the serial path does, once every symbol has finished.
+        raise failures[0]
+
+
+@timed(strategy_cycle_seconds)
+async def _evaluate_symbol(ctx: _CycleContext, symbol: str) -> None:
+    """Evaluate one symbol (one "cycle"); sets `ctx.halted` to stop the remaining symbols."""
+    strategy_id = ctx.strategy_id
+    today = ctx.today
+    iteration_id = ctx.iteration_id
+    allocator = ctx.allocator
+    daily_return_pct = ctx.daily_return_pct
+    stale_after = ctx.stale_after
+
+    # A "cycle" is one symbol evaluation.
+    global _last_cycle_at_iso
+    strategy_cycles_total.inc(1.0)
+    mark_activity("strategy-engine")
+    _last_cycle_at_iso = _utc_now_iso()
 
+    try:
+        log_json(
+            intent_type="strategy_symbol_start",
+            severity="INFO",
+            symbol=symbol,
+            strategy=config.STRATEGY_NAME,
+            iteration_id=iteration_id,
+        )
+    except Exception:
+        pass
+
+    try:
+        bars, flow_events = await _market_inputs(ctx, symbol)
+    except Exception as e:
+        # Skip this cycle on internal failures (SLO-aligned).
+        strategy_cycles_skipped_total.inc(1.0)
+        errors_total.inc(labels={"component": "strategy-engine"})
         try:
             log_json(
-                intent_type="strategy_symbol_start",
-                severity="INFO",
+                intent_type="strategy_cycle_skipped",
+                severity="ERROR",
+                reason_codes=["internal_error"],
+                error_type=type(e).__name__,
+                error=str(e),
                 symbol=symbol,
                 strategy=config.STRATEGY_NAME,
                 iteration_id=iteration_id,
             )
         except Exception:
             pass
+        return
 
+    # --- Per-strategy circuit breakers (safety-only; disabled unless configured) ---
+    # Missing market data (objective, no market assumptions).
+    md_missing = check_missing_market_data(bars=bars, source="bars:public.market_data_1m")
+    if md_missing.triggered:
+        strategy_cycles_skipped_total.inc(1.0)
         try:
-            bars = await fetch_recent_bars(symbol, config.STRATEGY_BAR_LOOKBACK_MINUTES)
-            flow_events = await fetch_recent_options_flow(symbol, config.STRATEGY_FLOW_LOOKBACK_MINUTES)
-        except Exception as e:
-            # Skip this cycle on internal failures (SLO-aligned).
-            strategy_cycles_skipped_total.inc(1.0)
-            errors_total.inc(labels={"component": "strategy-engine"})
-            try:
-                log_json(
-                    intent_type="strategy_cycle_skipped",
-                    severity="ERROR",
-                    reason_codes=["internal_error"],
-                    error_type=type(e).__name__,
-                    error=str(e),
-                    symbol=symbol,
-                    strategy=config.STRATEGY_NAME,
-                    iteration_id=iteration_id,
-                )
-            except Exception:
-                pass
-            continue
+            log_json(
+                intent_type="circuit_breaker_triggered",
+                severity="WARNING",
+                breaker_type="missing_market_data",
+                reason_codes=[md_missing.reason_code],
+                symbol=symbol,
+                strategy=config.STRATEGY_NAME,
+                iteration_id=iteration_id,
+                details=md_missing.details,
+            )
+        except Exception:
+            pass
+        await log_decision(strategy_id, symbol, "flat", md_missing.message, {"reason_code": md_missing.reason_code}, False)
+        return
 
-        # --- Per-strategy circuit breakers (safety-only; disabled unless configured) ---
-        # Missing market data (objective, no market assumptions).
-        md_missing = check_missing_market_data(bars=bars, source="bars:public.market_data_1m")
-        if md_missing.triggered:
+    # Abnormal volatility (ratio-based; threshold is operator-configured, default disabled).
+    try:
+        ratio_thr_raw = (os.getenv("STRATEGY_CB_VOL_RATIO_THRESHOLD") or "").strip()
+        ratio_thr = float(ratio_thr_raw) if ratio_thr_raw else 0.0
+    except Exception:
+        ratio_thr = 0.0
+    if ratio_thr > 0:
+        vol_cb = check_abnormal_volatility(
+            bars=bars,
+            source="bars:public.market_data_1m",
+            recent_n=int(os.getenv("STRATEGY_CB_VOL_RECENT_N") or "5"),
+            baseline_n=int(os.getenv("STRATEGY_CB_VOL_BASELINE_N") or "30"),
+            ratio_threshold=ratio_thr,
+        )
+        if vol_cb.triggered:
             strategy_cycles_skipped_total.inc(1.0)
             try:
                 log_json(
                     intent_type="circuit_breaker_triggered",
                     severity="WARNING",
-                    breaker_type="missing_market_data",
-                    reason_codes=[md_missing.reason_code],
+                    breaker_type="abnormal_volatility",
+                    reason_codes=[vol_cb.reason_code],
                     symbol=symbol,
                     strategy=config.STRATEGY_NAME,
                     iteration_id=iteration_id,
-                    details=md_missing.details,
+                    details=vol_cb.details,
                 )
             except Exception:
                 pass
-            await log_decision(strategy_id, symbol, "flat", md_missing.message, {"reason_code": md_missing.reason_code}, False)
-            continue
-
-        # Abnormal volatility (ratio-based; threshold is operator-configured, default disabled).
-        try:
-            ratio_thr_raw = (os.getenv("STRATEGY_CB_VOL_RATIO_THRESHOLD") or "").strip()
-            ratio_thr = float(ratio_thr_raw) if ratio_thr_raw else 0.0
-        except Exception:
-            ratio_thr = 0.0
-        if ratio_thr > 0:
-            vol_cb = check_abnormal_volatility(
-                bars=bars,
-                source="bars:public.market_data_1m",
-                recent_n=int(os.getenv("STRATEGY_CB_VOL_RECENT_N") or "5"),
-                baseline_n=int(os.getenv("STRATEGY_CB_VOL_BASELINE_N") or "30"),
-                ratio_threshold=ratio_thr,
-            )
-            if vol_cb.triggered:
-                strategy_cycles_skipped_total.inc(1.0)
-                try:
-                    log_json(
-                        intent_type="circuit_breaker_triggered",
-                        severity="WARNING",
-                        breaker_type="abnormal_volatility",
-                        reason_codes=[vol_cb.reason_code],
-                        symbol=symbol,
-                        strategy=config.STRATEGY_NAME,
-                        iteration_id=iteration_id,
-                        details=vol_cb.details,
-                    )
-                except Exception:
-                    pass
-                await log_decision(strategy_id, symbol, "flat", vol_cb.message, {"reason_code": vol_cb.reason_code}, False)
-                continue
-
-        # Freshness contract: refuse to evaluate if latest bar timestamp is stale.
-        latest_bar_ts = bars[0].ts if bars else None
-        # Additional contract: refuse to evaluate if latest bar timestamp is too far in the future
-        # (guards against clock skew / bad upstream data).
-        max_future_skew_s = float(os.getenv("STRATEGY_EVENT_MAX_FUTURE_SKEW_SECONDS") or "5")
-        try:
-            max_future_skew_s = max(0.0, float(max_future_skew_s))
-        except Exception:
-            max_future_skew_s = 5.0
-        if latest_bar_ts is not None:
-            ts_utc = latest_bar_ts if latest_bar_ts.tzinfo is not None else latest_bar_ts.replace(tzinfo=timezone.utc)
-            now_utc = datetime.now(timezone.utc)
-            if (ts_utc.astimezone(timezone.utc) - now_utc).total_seconds() > max_future_skew_s:
-                strategy_cycles_skipped_total.inc(1.0)
-                try:
-                    log_json(
-                        intent_type="FUTURE_TIMESTAMP",
-                        severity="WARNING",
-                        reason_codes=["future_timestamp"],
-                        symbol=symbol,
-                        strategy=config.STRATEGY_NAME,
-                        iteration_id=iteration_id,
-                        latest_ts_utc=ts_utc.astimezone(timezone.utc).isoformat(),
-                        now_utc=now_utc.isoformat(),
-                        max_future_skew_seconds=max_future_skew_s,
-                        source="bars:public.market_data_1m",
-                    )
-                except Exception:
-                    pass
-                await log_decision(
-                    strategy_id,
-                    symbol,
-                    "flat",
-                    "FUTURE_TIMESTAMP: latest bar timestamp is ahead of now beyond allowed skew",
-                    {"reason_code": "future_timestamp"},
-                    False,
-                )
-                continue
-        freshness = check_freshness(
-            latest_ts=latest_bar_ts,
-            stale_after=stale_after,
-            source="bars:public.market_data_1m",
-        )
-        if not freshness.ok:
+            await log_decision(strategy_id, symbol, "flat", vol_cb.message, {"reason_code": vol_cb.reason_code}, False)
+            return
+
+    # Freshness contract: refuse to evaluate if latest bar timestamp is stale.
+    latest_bar_ts = bars[0].ts if bars else None
+    # Additional contract: refuse to evaluate if latest bar timestamp is too far in the future
+    # (guards against clock skew / bad upstream data).
+    max_future_skew_s = float(os.getenv("STRATEGY_EVENT_MAX_FUTURE_SKEW_SECONDS") or "5")
+    try:
+        max_future_skew_s = max(0.0, float(max_future_skew_s))
+    except Exception:
+        max_future_skew_s = 5.0
+    if latest_bar_ts is not None:
+        ts_utc = latest_bar_ts if latest_bar_ts.tzinfo is not None else latest_bar_ts.replace(tzinfo=timezone.utc)
+        now_utc = datetime.now(timezone.utc)
+        if (ts_utc.astimezone(timezone.utc) - now_utc).total_seconds() > max_future_skew_s:
             strategy_cycles_skipped_total.inc(1.0)
             try:
                 log_json(
-                    intent_type="STALE_DATA",
+                    intent_type="FUTURE_TIMESTAMP",
                     severity="WARNING",
-                    reason_codes=["stale_data" if freshness.reason_code == "STALE_DATA" else "missing_timestamp"],
+                    reason_codes=["future_timestamp"],
                     symbol=symbol,
                     strategy=config.STRATEGY_NAME,
                     iteration_id=iteration_id,
-                    latest_ts_utc=(freshness.latest_ts_utc.isoformat() if freshness.latest_ts_utc else None),
-                    now_utc=freshness.now_utc.isoformat(),
-                    age_seconds=(float(freshness.age.total_seconds()) if freshness.age is not None else None),
-                    threshold_seconds=float(freshness.stale_after.total_seconds()),
-                    source=freshness.details.get("source"),
-                    assumed_utc=bool(freshness.details.get("assumed_utc", False)),
+                    latest_ts_utc=ts_utc.astimezone(timezone.utc).isoformat(),
+                    now_utc=now_utc.isoformat(),
+                    max_future_skew_seconds=max_future_skew_s,
+                    source="bars:public.market_data_1m",
                 )
             except Exception:
                 pass
-
-            reason = (
-                f"STALE_DATA: source={freshness.details.get('source')} "
-                f"age_s={freshness.details.get('age_seconds')} "
-                f"threshold_s={freshness.details.get('threshold_seconds')}"
+            await log_decision(
+                strategy_id,
+                symbol,
+                "flat",
+                "FUTURE_TIMESTAMP: latest bar timestamp is ahead of now beyond allowed skew",
+                {"reason_code": "future_timestamp"},
+                False,
             )
-            await log_decision(strategy_id, symbol, "flat", reason, {"reason_code": freshness.reason_code}, False)
-            try:
-                log_json(
-                    intent_type="strategy_decision",
-                    severity="INFO",
-                    symbol=symbol,
-                    strategy=config.STRATEGY_NAME,
-                    action="flat",
-                    reason=reason,
-                    iteration_id=iteration_id,
-                )
-            except Exception:
-                pass
-            continue
-
-        decision = make_decision(bars, flow_events)
-        action = decision.get("action")
+            return
+    freshness = check_freshness(
+        latest_ts=latest_bar_ts,
+        stale_after=stale_after,
+        source="bars:public.market_data_1m",
+    )
+    if not freshness.ok:
+        strategy_cycles_skipped_total.inc(1.0)
+        try:
+            log_json(
+                intent_type="STALE_DATA",
+                severity="WARNING",
+                reason_codes=["stale_data" if freshness.reason_code == "STALE_DATA" else "missing_timestamp"],
+                symbol=symbol,
+                strategy=config.STRATEGY_NAME,
+                iteration_id=iteration_id,
+                latest_ts_utc=(freshness.latest_ts_utc.isoformat() if freshness.latest_ts_utc else None),
+                now_utc=freshness.now_utc.isoformat(),
+                age_seconds=(float(freshness.age.total_seconds()) if freshness.age is not None else None),
+                threshold_seconds=float(freshness.stale_after.total_seconds()),
+                source=freshness.details.get("source"),
+                assumed_utc=bool(freshness.details.get("assumed_utc", False)),
+            )
+        except Exception:
+            pass
 
-        if action == "flat":
-            await log_decision(strategy_id, symbol, "flat", decision["reason"], decision["signal_payload"], False)
-            try:
-                log_json(
-                    intent_type="strategy_decision",
-                    severity="INFO",
-                    symbol=symbol,
-                    strategy=config.STRATEGY_NAME,
-                    action="flat",
-                    reason=decision.get("reason"),
-                    iteration_id=iteration_id,
-                )
-            except Exception:
-                pass
-            continue
-        else:
-            # Strategy-local daily profit target halt.
-            # If breached, we refuse to emit new order intents for the day.
-            if _daily_target_latch.halt_and_log_once(
-                today=today,
+        reason = (
+            f"STALE_DATA: source={freshness.details.get('source')} "
+            f"age_s={freshness.details.get('age_seconds')} "
+            f"threshold_s={freshness.details.get('threshold_seconds')}"
+        )
+        await log_decision(strategy_id, symbol, "flat", reason, {"reason_code": freshness.reason_code}, False)
+        try:
+            log_json(
+                intent_type="strategy_decision",
+                severity="INFO",
+                symbol=symbol,
                 strategy=config.STRATEGY_NAME,
-                daily_return_pct=daily_return_pct,
+                action="flat",
+                reason=reason,
                 iteration_id=iteration_id,
-                extra={"symbol": symbol},
-            ):
-                reason = f"HALTED_DAILY_TARGET: daily_return_pct={daily_return_pct} target={0.04}"
-                await log_decision(strategy_id, symbol, "flat", reason, {"halt_reason": "daily_target", "daily_return_pct": daily_return_pct}, False)
-                try:
-                    log_json(
-                        intent_type="strategy_decision",
-                        severity="WARNING",
-                        symbol=symbol,
-                        strategy=config.STRATEGY_NAME,
-                        action="flat",
-                        reason=reason,
-                        halted=True,
-                        halt_reason="daily_target",
-                        daily_return_pct=daily_return_pct,
-                        daily_target_return_pct=0.04,
-                        iteration_id=iteration_id,
-                    )
-                except Exception:
-                    pass
-                continue
+            )
+        except Exception:
+            pass
+        return
 
-            # We proposed an order (even if later blocked by risk / kill switch).
-            order_proposals_total.inc(1.0)
-            try:
-                log_json(
-                    intent_type="order_proposal",
-                    severity="INFO",
-                    symbol=symbol,
-                    action=action,
-                    strategy=config.STRATEGY_NAME,
-                    reason=decision.get("reason"),
-                    iteration_id=iteration_id,
-                )
-            except Exception:
-                pass
+    decision = make_decision(bars, flow_events)
+    action = decision.get("action")
 
-        # Strategy-local daily target halt (profit lock): stop emitting new intents once the daily return target is hit.
-        if daily_target.should_halt(symbol=symbol, iteration_id=iteration_id):
-            m = daily_target.last_metrics
-            strategy_cycles_skipped_total.inc(1.0)
-            reason = "DAILY_TARGET_HALT: daily_return_pct >= 0.04 (stop emitting intents)"
-            await log_decision(
-                strategy_id,
-                symbol,
-                "flat",
-                reason,
-                {
-                    "daily_return_pct": (float(m.daily_return_pct) if m is not None else None),
-                    "daily_target_pct": 0.04,
-                    "current_equity_usd": (float(m.current_equity_usd) if m is not None else None),
-                    "starting_equity_usd": (float(m.starting_equity_usd) if m is not None else None),
-                },
-                False,
+    if action == "flat":
+        await log_decision(strategy_id, symbol, "flat", decision["reason"], decision["signal_payload"], False)
+        try:
+            log_json(
+                intent_type="strategy_decision",
+                severity="INFO",
+                symbol=symbol,
+                strategy=config.STRATEGY_NAME,
+                action="flat",
+                reason=decision.get("reason"),
+                iteration_id=iteration_id,
             )
+        except Exception:
+            pass
+        return
+    else:
+        # Strategy-local daily profit target halt.
+        # If breached, we refuse to emit new order intents for the day.
+        if _daily_target_latch.halt_and_log_once(
+            today=today,
+            strategy=config.STRATEGY_NAME,
+            daily_return_pct=daily_return_pct,
+            iteration_id=iteration_id,
+            extra={"symbol": symbol},
+        ):
+            reason = f"HALTED_DAILY_TARGET: daily_return_pct={daily_return_pct} target={0.04}"
+            await log_decision(strategy_id, symbol, "flat", reason, {"halt_reason": "daily_target", "daily_return_pct": daily_return_pct}, False)
             try:
                 log_json(
                     intent_type="strategy_decision",
@@ -372,110 +442,137 @@ async def run_strategy(execute: bool):
                     strategy=config.STRATEGY_NAME,
                     action="flat",
                     reason=reason,
+                    halted=True,
+                    halt_reason="daily_target",
+                    daily_return_pct=daily_return_pct,
+                    daily_target_return_pct=0.04,
                     iteration_id=iteration_id,
-                    blocked=True,
-                    block_reason="daily_target_halt",
                 )
             except Exception:
                 pass
-            break
-
-        # Centralized decision flow:
-        # - strategies emit intent only (no qty/notional)
-        # - allocator sizes + applies capital-bearing gates (e.g., notional limits)
-        created_at_utc = datetime.now(timezone.utc)
-        side = (
-            IntentSide.BUY
-            if str(action).lower() == "buy"
-            else IntentSide.SELL
-            if str(action).lower() == "sell"
-            else IntentSide.FLAT
-        )
-        intent = AgentIntent(
-            created_at_utc=created_at_utc,
-            repo_id=str(os.getenv("REPO_ID") or "unknown_repo"),
-            agent_name=str(os.getenv("AGENT_NAME") or "strategy-engine"),
-            strategy_name=config.STRATEGY_NAME,
-            strategy_version=os.getenv("STRATEGY_VERSION") or None,
-            correlation_id=iteration_id,
-            symbol=symbol,
-            asset_type=IntentAssetType.EQUITY,
-            option=None,
-            kind=IntentKind.DIRECTIONAL,
-            side=side,
-            confidence=None,
-            rationale=AgentIntentRationale(
-                short_reason=str(decision.get("reason") or "").strip() or "Strategy decision",
-                indicators=decision.get("signal_payload") or {},
-            ),
-            constraints=AgentIntentConstraints(
-                valid_until_utc=(
-                    created_at_utc
-                    + timedelta(
-                        minutes=(
-                            int(os.getenv("INTENT_TTL_MINUTES") or "5")
-                            if str(os.getenv("INTENT_TTL_MINUTES") or "").strip().isdigit()
-                            else 5
-                        )
+            # Profit lock: symbols that have not started yet are not evaluated this run.
+            ctx.halted = True
+            return
+
+        # We proposed an order (even if later blocked by risk / kill switch).
+        order_proposals_total.inc(1.0)
+        try:
+            log_json(
+                intent_type="order_proposal",
+                severity="INFO",
+                symbol=symbol,
+                action=action,
+                strategy=config.STRATEGY_NAME,
+                reason=decision.get("reason"),
+                iteration_id=iteration_id,
+            )
+        except Exception:
+            pass
+
+    # Centralized decision flow:
+    # - strategies emit intent only (no qty/notional)
+    # - allocator sizes + applies capital-bearing gates (e.g., notional limits)
+    created_at_utc = datetime.now(timezone.utc)
+    side = (
+        IntentSide.BUY
+        if str(action).lower() == "buy"
+        else IntentSide.SELL
+        if str(action).lower() == "sell"
+        else IntentSide.FLAT
+    )
+    intent = AgentIntent(
+        created_at_utc=created_at_utc,
+        repo_id=str(os.getenv("REPO_ID") or "unknown_repo"),
+        agent_name=str(os.getenv("AGENT_NAME") or "strategy-engine"),
+        strategy_name=config.STRATEGY_NAME,
+        strategy_version=os.getenv("STRATEGY_VERSION") or None,
+        correlation_id=iteration_id,
+        symbol=symbol,
+        asset_type=IntentAssetType.EQUITY,
+        option=None,
+        kind=IntentKind.DIRECTIONAL,
+        side=side,
+        confidence=None,
+        rationale=AgentIntentRationale(
+            short_reason=str(decision.get("reason") or "").strip() or "Strategy decision",
+            indicators=decision.get("signal_payload") or {},
+        ),
+        constraints=AgentIntentConstraints(
+            valid_until_utc=(
+                created_at_utc
+                + timedelta(
+                    minutes=(
+                        int(os.getenv("INTENT_TTL_MINUTES") or "5")
+                        if str(os.getenv("INTENT_TTL_MINUTES") or "").strip().isdigit()
+                        else 5
                     )
-                ),
-                requires_human_approval=True,
-                order_type="market",
-                time_in_force="day",
-                limit_price=None,
-                delta_to_hedge=None,
-            ),
-        )
-        emit_agent_intent(intent)
-
-        last_price = float(bars[0].close) if bars else 0.0
-        allocation = await allocator.allocate_for_strategy_limits(
-            intent=intent,
-            strategy_id=strategy_id,
-            trading_date=today,
-            last_price=last_price,
-            can_place_trade_fn=can_place_trade,
-        )
-        if not allocation.allowed:
-            reason = "Risk limit exceeded."
-            await log_decision(strategy_id, symbol, action, reason, decision.get("signal_payload") or {}, False)
-            try:
-                log_json(
-                    intent_type="strategy_decision",
-                    severity="WARNING",
-                    symbol=symbol,
-                    strategy=config.STRATEGY_NAME,
-                    action=action,
-                    reason=reason,
-                    blocked=True,
-                    block_reason="risk_limit",
-                    iteration_id=iteration_id,
                 )
-            except Exception:
-                pass
-            continue
-
-        # Proposal emitted only (no execution in this service).
-        await log_decision(
-            strategy_id,
-            symbol,
-            action,
-            decision.get("reason") or "",
-            decision.get("signal_payload") or {},
-            False,
-        )
+            ),
+            requires_human_approval=True,
+            order_type="market",
+            time_in_force="day",
+            limit_price=None,
+            delta_to_hedge=None,
+        ),
+    )
+    emit_agent_intent(intent)
+
+    last_price = float(bars[0].close) if bars else 0.0
+    allocation = await allocator.allocate_for_strategy_limits(
+        intent=intent,
+        strategy_id=strategy_id,
+        trading_date=today,
+        last_price=last_price,
+        can_place_trade_fn=can_place_trade,
+    )
+    if not allocation.allowed:
+        reason = "Risk limit exceeded."
+        await log_decision(strategy_id, symbol, action, reason, decision.get("signal_payload") or {}, False)
         try:
             log_json(
                 intent_type="strategy_decision",
-                severity="INFO",
+                severity="WARNING",
                 symbol=symbol,
                 strategy=config.STRATEGY_NAME,
                 action=action,
-                reason=decision.get("reason"),
+                reason=reason,
+                blocked=True,
+                block_reason="risk_limit",
                 iteration_id=iteration_id,
             )
         except Exception:
             pass
+        return
+
+    # Proposal emitted only (no execution in this service).
+    await log_decision(
+        strategy_id,
+        symbol,
+        action,
+        decision.get("reason") or "",
+        decision.get("signal_payload") or {},
+        False,
+    )
+    try:
+        log_json(
+            intent_type="strategy_decision",
+            severity="INFO",
+            symbol=symbol,
+            strategy=config.STRATEGY_NAME,
+            action=action,
+            reason=decision.get("reason"),
+            iteration_id=iteration_id,
+        )
+    except Exception:
+        pass
+
+
+async def _run_with_pool(execute: bool) -> None:
+    await init_pool()
+    try:
+        await run_strategy(execute)
+    finally:
+        await close_pool()
 
 
 if __name__ == "__main__":
@@ -513,7 +610,7 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     try:
-        asyncio.run(run_strategy(args.execute))
+        asyncio.run(_run_with_pool(args.execute))
     except Exception as e:
         errors_total.inc(labels={"component": "strategy-engine"})
         raise
@@ -1,9 +1,9 @@
 import asyncpg
-from typing import List, TypedDict
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, TypedDict
 from dataclasses import dataclass
 from datetime import datetime
 
-from .config import config
+from .db import connection
 
 @dataclass
 class Bar:
@@ -24,12 +24,8 @@ class Position:
     symbol: str
     qty: float
 
-async def get_db_connection():
-    return await asyncpg.connect(config.DATABASE_URL, statement_cache_size=0)
-
 async def fetch_recent_bars(symbol: str, lookback_minutes: int) -> List[Bar]:
-    conn = await get_db_connection()
-    try:
+    async with connection() as conn:
         rows = await conn.fetch(
             """
             SELECT ts, open, high, low, close, volume
@@ -41,12 +37,9 @@ async def fetch_recent_bars(symbol: str, lookback_minutes: int) -> List[Bar]:
             lookback_minutes
         )
         return [Bar(**row) for row in rows]
-    finally:
-        await conn.close()
 
 async def fetch_recent_options_flow(symbol: str, lookback_minutes: int) -> List[FlowEvent]:
-    conn = await get_db_connection()
-    try:
+    async with connection() as conn:
         rows = await conn.fetch(
             """
             SELECT event_ts as ts, notional as total_value
@@ -59,13 +52,83 @@ async def fetch_recent_options_flow(symbol: str, lookback_minutes: int) -> List[
         )
         # Filter out rows where total_value is None
         return [FlowEvent(**row) for row in rows if row['total_value'] is not None]
-    finally:
-        await conn.close()
 
 async def fetch_positions() -> List[Position]:
-    conn = await get_db_connection()
-    try:
+    async with connection() as conn:
         rows = await conn.fetch("SELECT symbol, qty FROM public.broker_positions")
         return [Position(**row) for row in rows]
-    finally:
-        await conn.close()
\ No newline at end of file
+
+async def _fetch_bars_many(
+    conn,
+    since_by_symbol: Mapping[str, Optional[datetime]],
+    lookback_minutes: int,
+) -> Dict[str, List[Bar]]:
+    # One round trip for the whole watchlist; per-symbol lower bound (NULL = full window).
+    syms = list(since_by_symbol)
+    bars: Dict[str, List[Bar]] = {s: [] for s in syms}
+    if not syms:
+        return bars
+    rows = await conn.fetch(
+        """
+        SELECT m.symbol, m.ts, m.open, m.high, m.low, m.close, m.volume
+        FROM public.market_data_1m m
+        JOIN unnest($1::text[], $2::timestamptz[]) AS w(symbol, since) ON m.symbol = w.symbol
+        WHERE m.ts >= NOW() - ($3 * INTERVAL '1 minute') AND (w.since IS NULL OR m.ts >= w.since)
+        ORDER BY m.symbol, m.ts DESC
+        """,
+        syms,
+        [since_by_symbol[s] for s in syms],
+        lookback_minutes
+    )
+    for row in rows:
+        bars[row['symbol']].append(
+            Bar(ts=row['ts'], open=row['open'], high=row['high'], low=row['low'], close=row['close'], volume=row['volume'])
+        )
+    return bars
+
+async def fetch_bars_since_many(
+    since_by_symbol: Mapping[str, Optional[datetime]],
+    lookback_minutes: int,
+) -> Dict[str, List[Bar]]:
+    """
+    Bars within the lookback with `ts >= since` per symbol (the full window when since is None),
+    newest first. Used by the incremental bar window cache.
+    """
+    async with connection() as conn:
+        return await _fetch_bars_many(conn, since_by_symbol, lookback_minutes)
+
+async def fetch_recent_market_inputs(
+    symbols: Sequence[str],
+    bar_lookback_minutes: int,
+    flow_lookback_minutes: int,
+    *,
+    bars_since: Optional[Mapping[str, Optional[datetime]]] = None,
+) -> Tuple[Dict[str, List[Bar]], Dict[str, List[FlowEvent]]]:
+    """
+    Batch form of `fetch_recent_bars` + `fetch_recent_options_flow` for a whole watchlist.
+
+    One connection, one watchlist-wide query per table. Every requested symbol gets an
+    entry (empty when it has no rows), ordered newest first like the per-symbol helpers.
+    `bars_since` narrows the bar read per symbol (see `fetch_bars_since_many`).
+    """
+    syms = list(dict.fromkeys(symbols))
+    flow: Dict[str, List[FlowEvent]] = {s: [] for s in syms}
+    if not syms:
+        return {}, flow
+    since = {s: (bars_since or {}).get(s) for s in syms}
+    async with connection() as conn:
+        bars = await _fetch_bars_many(conn, since, bar_lookback_minutes)
+        flow_rows = await conn.fetch(
+            """
+            SELECT symbol, event_ts as ts, notional as total_value
+            FROM public.options_flow
+            WHERE symbol = ANY($1::text[]) AND event_ts >= NOW() - ($2 * INTERVAL '1 minute')
+            ORDER BY symbol, event_ts DESC
+            """,
+            syms,
+            flow_lookback_minutes
+        )
+    for row in flow_rows:
+        if row['total_value'] is not None:
+            flow[row['symbol']].append(FlowEvent(ts=row['ts'], total_value=row['total_value']))
+    return bars, flow
@@ -3,26 +3,19 @@ import json
 from datetime import date, datetime
 from uuid import UUID, uuid4
 
-from .config import config
-
-async def get_db_connection():
-    return await asyncpg.connect(config.DATABASE_URL, statement_cache_size=0)
+from .db import connection
 
 async def get_or_create_strategy_definition(name: str) -> UUID:
-    conn = await get_db_connection()
-    try:
+    async with connection() as conn:
         strategy_id = await conn.fetchval("SELECT id FROM public.strategy_definitions WHERE name = $1", name)
         if not strategy_id:
             strategy_id = await conn.fetchval(
                 "INSERT INTO public.strategy_definitions (name) VALUES ($1) RETURNING id", name
             )
         return strategy_id
-    finally:
-        await conn.close()
 
 async def get_or_create_today_state(strategy_id: UUID, trading_date: date) -> asyncpg.Record:
-    conn = await get_db_connection()
-    try:
+    async with connection() as conn:
         state = await conn.fetchrow(
             "SELECT * FROM public.strategy_state WHERE strategy_id = $1 AND trading_date = $2",
             strategy_id,
@@ -39,15 +32,10 @@ async def get_or_create_today_state(strategy_id: UUID, trading_date: date) -> as
                 trading_date,
             )
         return state
-    finally:
-        await conn.close()
 
 async def load_limits(strategy_id: UUID) -> asyncpg.Record:
-    conn = await get_db_connection()
-    try:
+    async with connection() as conn:
         return await conn.fetchrow("SELECT * FROM public.strategy_limits WHERE strategy_id = $1", strategy_id)
-    finally:
-        await conn.close()
 
 async def can_place_trade(strategy_id: UUID, trading_date: date, proposed_notional: float) -> bool:
     state = await get_or_create_today_state(strategy_id, trading_date)
@@ -64,8 +52,7 @@ async def can_place_trade(strategy_id: UUID, trading_date: date, proposed_notion
     return True
 
 async def record_trade(strategy_id: UUID, trading_date: date, notional: float):
-    conn = await get_db_connection()
-    try:
+    async with connection() as conn:
         await conn.execute(
             """
             UPDATE public.strategy_state
@@ -78,8 +65,6 @@ async def record_trade(strategy_id: UUID, trading_date: date, notional: float):
             strategy_id,
             trading_date,
         )
-    finally:
-        await conn.close()
 
 import json
 
@@ -92,8 +77,7 @@ async def log_decision(
     did_trade: bool,
     paper_trade_id: UUID = None,
 ):
-    conn = await get_db_connection()
-    try:
+    async with connection() as conn:
         await conn.execute(
             """
             INSERT INTO public.strategy_logs (strategy_id, symbol, decision, reason, signal_payload, did_trade, paper_trade_id)
@@ -106,6 +90,4 @@ async def log_decision(
             json.dumps(signal_payload),
             did_trade,
             paper_trade_id,
-        )
-    finally:
-        await conn.close()
\ No newline at end of file
+        )
\ No newline at end of file
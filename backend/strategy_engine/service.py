@@ -20,6 +20,7 @@ enforce_agent_mode_guard()
 
 import asyncio
 import json
+import logging
 import os
 import time
 import urllib.error
@@ -36,6 +37,7 @@ from backend.common.kill_switch import get_kill_switch_state
 from backend.common.ops_metrics import REGISTRY
 from backend.ops.status_contract import AgentIdentity, EndpointsBlock, build_ops_status
 
+from . import db
 from .driver import run_strategy
 
 app = FastAPI(title="AgentTrader Strategy Engine")
@@ -200,6 +202,15 @@ async def _startup() -> None:
     app.state.marketdata_freshness_seconds = None
     app.state.loop_heartbeat_monotonic = time.monotonic()
 
+    # Shared Postgres pool for every strategy-engine query (OBSERVE mode never touches the DB).
+    # Best-effort: if the DB is unreachable at boot, query helpers use one-off connections
+    # while `db.connection()` retries the pool with backoff.
+    if agent_mode != "OBSERVE":
+        try:
+            await db.init_pool(timeout_s=_env_float("STRATEGY_DB_POOL_INIT_TIMEOUT_S", 10.0))
+        except Exception:
+            logger.exception("strategy_engine db_pool_init_failed")
+
     # OBSERVE-mode heartbeat (local-only; no DB/network/broker interaction).
     # Goal: prove the bot is alive without trading.
     if agent_mode == "OBSERVE":
@@ -354,13 +365,17 @@ async def _shutdown() -> None:
             pass
 
     tasks = [t for t in (cycle_task, loop_task, init_task, observe_task, marketdata_poll_task) if t is not None]
-    if not tasks:
-        return
+    if tasks:
+        try:
+            await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), timeout=10.0)
+        except Exception:
+            # Best-effort; never hang shutdown.
+            pass
+
     try:
-        await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), timeout=10.0)
+        await asyncio.wait_for(db.close_pool(), timeout=10.0)
     except Exception:
-        # Best-effort; never hang shutdown.
-        pass
+        logger.exception("strategy_engine db_pool_close_failed")
 
 
 @app.get("/health")
@@ -456,6 +471,7 @@ async def ops_status() -> dict[str, Any]:
 
 @app.get("/metrics")
 async def metrics() -> Response:
+    db.update_pool_metrics()
     return Response(content=REGISTRY.render_prometheus_text(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import gzip
 import hashlib
 import json
 import tarfile
@@ -23,6 +24,7 @@ class StrategyBundle:
     """
 
     bundle_path: Path
+    # Content hash: bundles are byte-for-byte reproducible, so the same code => same sha256.
     sha256: str
     manifest: Dict[str, object]
 
@@ -102,7 +104,11 @@ def create_strategy_bundle(
         "files": [dst for _, dst in files],
     }
 
-    with tarfile.open(bundle_path, "w:gz") as tf:
+    # Reproducible archive: no gzip timestamp, fixed member mtimes/owners. Warm guests and
+    # cached drive images are keyed by the bundle sha256 (see runner.WarmVMPool).
+    with bundle_path.open("wb") as raw, gzip.GzipFile(
+        filename="", mode="wb", fileobj=raw, mtime=0
+    ) as gz, tarfile.open(fileobj=gz, mode="w") as tf:
         # Add manifest first for fast validation in guest.
         manifest_bytes = json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8")
         info = tarfile.TarInfo(name="manifest.json")
@@ -114,6 +120,9 @@ def create_strategy_bundle(
             ti = tf.gettarinfo(str(src_path), arcname=dst_name)
             # Always reduce permissions inside the bundle.
             ti.mode = 0o444
+            ti.mtime = 0
+            ti.uid = ti.gid = 0
+            ti.uname = ti.gname = ""
             with src_path.open("rb") as f:
                 tf.addfile(ti, fileobj=f)
 
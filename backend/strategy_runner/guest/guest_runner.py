@@ -5,7 +5,8 @@ Runs INSIDE the microVM.
 Responsibilities:
 - unpack the strategy bundle into an isolated directory
 - import the user strategy entrypoint
-- provide a strict NDJSON interface over vsock
+- provide a strict NDJSON interface over vsock (optionally upgraded to length-prefixed
+  frames, see backend/strategy_runner/protocol.py for the negotiation)
 
 The host must never import user code; only this guest process does.
 """
@@ -18,6 +19,7 @@ import json
 import os
 import signal
 import socket
+import struct
 import sys
 import tarfile
 import threading
@@ -27,9 +29,22 @@ from types import ModuleType
 from typing import Any, Callable, Dict, Iterable, List, Optional
 
 
+try:  # optional in the guest rootfs; without it the guest offers JSON frames only
+    import msgpack  # type: ignore
+except ImportError:
+    msgpack = None  # type: ignore
+
+
 PROTOCOL_VERSION = "v1"
 _SHUTDOWN_EVENT = threading.Event()
 
+# Wire encodings; must match backend/strategy_runner/protocol.py.
+ENCODING_NDJSON = "ndjson"
+ENCODING_JSON_FRAMES = "json-frames"
+ENCODING_MSGPACK = "msgpack"
+_FRAME_HEADER = struct.Struct(">I")
+_MAX_FRAME_BYTES = 16 * 1024 * 1024
+
 
 def _utc_now_iso() -> str:
     # Avoid importing datetime in guest hot path unnecessarily
@@ -177,21 +192,155 @@ def _as_intents(obj: Any, event_id: str) -> List[Dict[str, Any]]:
     return out
 
 
-def _read_ndjson_lines(f: io.BufferedReader) -> Iterable[Dict[str, Any]]:
-    for raw in f:
-        raw = raw.strip()
-        if not raw:
-            continue
-        yield json.loads(raw.decode("utf-8"))
+def _supported_encodings() -> tuple[str, ...]:
+    framed = (ENCODING_MSGPACK, ENCODING_JSON_FRAMES) if msgpack is not None else (ENCODING_JSON_FRAMES,)
+    return framed + (ENCODING_NDJSON,)
+
+
+def _choose_encoding(offered: Any) -> str:
+    if isinstance(offered, list):
+        ours = _supported_encodings()
+        for enc in offered:
+            if enc in ours:
+                return enc
+    return ENCODING_NDJSON
+
 
+def _read_message(f: io.BufferedReader, encoding: str) -> Optional[Dict[str, Any]]:
+    if encoding == ENCODING_NDJSON:
+        while True:
+            raw = f.readline()
+            if not raw:
+                return None
+            raw = raw.strip()
+            if raw:
+                return json.loads(raw.decode("utf-8"))
 
-def _write_ndjson(f: io.BufferedWriter, objs: Iterable[Dict[str, Any]]) -> None:
-    for o in objs:
-        f.write(json.dumps(o, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
-        f.write(b"\n")
+    header = f.read(_FRAME_HEADER.size)
+    if len(header) < _FRAME_HEADER.size:
+        return None
+    (size,) = _FRAME_HEADER.unpack(header)
+    if size > _MAX_FRAME_BYTES:
+        raise GuestFatal(f"frame too large: {size} bytes")
+    body = f.read(size)
+    if len(body) < size:
+        return None
+    if encoding == ENCODING_MSGPACK:
+        obj = msgpack.unpackb(body, raw=False)
+    else:
+        obj = json.loads(body.decode("utf-8"))
+    if not isinstance(obj, dict):
+        raise GuestFatal("message must be object")
+    return obj
+
+
+def _write_messages(f: io.BufferedWriter, objs: Iterable[Dict[str, Any]], encoding: str = ENCODING_NDJSON) -> None:
+    # One write per call: all intents of an event reach the host in a single segment.
+    if encoding == ENCODING_NDJSON:
+        data = b"".join(
+            json.dumps(o, separators=(",", ":"), ensure_ascii=False).encode("utf-8") + b"\n" for o in objs
+        )
+    else:
+        if encoding == ENCODING_MSGPACK:
+            bodies = [msgpack.packb(o, use_bin_type=True) for o in objs]
+        else:
+            bodies = [json.dumps(o, separators=(",", ":"), ensure_ascii=False).encode("utf-8") for o in objs]
+        data = b"".join(_FRAME_HEADER.pack(len(b)) + b for b in bodies)
+    if data:
+        f.write(data)
     f.flush()
 
 
+def _write_shutdown_log(wf: io.BufferedWriter, encoding: str) -> None:
+    # The host may hang up right after sending shutdown; that is not an error.
+    try:
+        _write_messages(wf, [_log("info", "shutdown")], encoding)
+    except OSError:
+        pass
+
+
+def serve_connection(conn: socket.socket, handler: Callable[[Dict[str, Any]], Any], *, port: int) -> bool:
+    """
+    Serve one host connection until EOF or shutdown.
+
+    Returns True when the host (or a signal) asked the guest to shut down; False when the
+    host simply closed the connection, in which case the caller may accept another one.
+    """
+    # Buffered both ways: unbuffered socket files read NDJSON lines one byte per syscall and
+    # may write only part of a payload; the buffered writer sends everything on flush().
+    rf = conn.makefile("rb")
+    wf = conn.makefile("wb")
+    encoding = ENCODING_NDJSON
+    _write_messages(wf, [_log("info", f"guest ready (port={port})")])
+    try:
+        while True:
+            msg = _read_message(rf, encoding)
+            if msg is None:
+                break
+            if _SHUTDOWN_EVENT.is_set():
+                _write_shutdown_log(wf, encoding)
+                return True
+            if msg.get("protocol") != PROTOCOL_VERSION:
+                _write_messages(wf, [_log("error", "unsupported protocol")], encoding)
+                continue
+            t = msg.get("type")
+            if t == "shutdown":
+                _write_shutdown_log(wf, encoding)
+                return True
+            if t == "sync":
+                # Messages are handled in order, so everything before the barrier is answered.
+                _write_messages(wf, [{"protocol": PROTOCOL_VERSION, "type": "sync_ack", "seq": msg.get("seq")}], encoding)
+                continue
+            if t == "negotiate":
+                chosen = _choose_encoding(msg.get("encodings"))
+                # Answer in the current encoding; everything after this reply uses the new one.
+                _write_messages(wf, [{"protocol": PROTOCOL_VERSION, "type": "negotiated", "encoding": chosen}], encoding)
+                encoding = chosen
+                continue
+            if t != "market_event":
+                _write_messages(wf, [_log("warn", f"ignoring unknown message type: {t}")], encoding)
+                continue
+
+            event_id = msg.get("event_id") or "unknown"
+            ok_ts, ts_reason = _validate_event_timestamp(msg.get("ts"))
+            if not ok_ts:
+                _write_messages(
+                    wf,
+                    [
+                        _log(
+                            "warn",
+                            f"dropping market_event due to timestamp_validation_failed reason={ts_reason} event_id={event_id}",
+                        )
+                    ],
+                    encoding,
+                )
+                continue
+            try:
+                intents_obj = handler(msg)
+                intents = _as_intents(intents_obj, str(event_id))
+                _write_messages(wf, intents, encoding)
+            except Exception as e:  # user code error
+                tb = traceback.format_exc(limit=20)
+                _write_messages(
+                    wf,
+                    [
+                        _log("error", f"strategy error: {e}"),
+                        _log("debug", tb),
+                    ],
+                    encoding,
+                )
+    finally:
+        try:
+            rf.close()
+        except Exception:
+            pass
+        try:
+            wf.close()
+        except Exception:
+            pass
+    return False
+
+
 def run_server(*, bundle_path: Path, port: int, work_dir: Path) -> int:
     work_dir.mkdir(parents=True, exist_ok=True)
     manifest = _safe_extract_tar(bundle_path, work_dir)
@@ -235,60 +384,8 @@ def run_server(*, bundle_path: Path, port: int, work_dir: Path) -> int:
             sys.stderr.write(f"guest_runner accept_error={type(e).__name__}: {e}\n")
             continue
         with conn:
-            rf = conn.makefile("rb", buffering=0)
-            wf = conn.makefile("wb", buffering=0)
-            _write_ndjson(wf, [_log("info", f"guest ready (port={port})")])
-            try:
-                for msg in _read_ndjson_lines(rf):
-                    if _SHUTDOWN_EVENT.is_set():
-                        _write_ndjson(wf, [_log("info", "shutdown")])
-                        return 0
-                    if msg.get("protocol") != PROTOCOL_VERSION:
-                        _write_ndjson(wf, [_log("error", "unsupported protocol")])
-                        continue
-                    t = msg.get("type")
-                    if t == "shutdown":
-                        _write_ndjson(wf, [_log("info", "shutdown")])
-                        return 0
-                    if t != "market_event":
-                        _write_ndjson(wf, [_log("warn", f"ignoring unknown message type: {t}")])
-                        continue
-
-                    event_id = msg.get("event_id") or "unknown"
-                    ok_ts, ts_reason = _validate_event_timestamp(msg.get("ts"))
-                    if not ok_ts:
-                        _write_ndjson(
-                            wf,
-                            [
-                                _log(
-                                    "warn",
-                                    f"dropping market_event due to timestamp_validation_failed reason={ts_reason} event_id={event_id}",
-                                )
-                            ],
-                        )
-                        continue
-                    try:
-                        intents_obj = handler(msg)
-                        intents = _as_intents(intents_obj, str(event_id))
-                        _write_ndjson(wf, intents)
-                    except Exception as e:  # user code error
-                        tb = traceback.format_exc(limit=20)
-                        _write_ndjson(
-                            wf,
-                            [
-                                _log("error", f"strategy error: {e}"),
-                                _log("debug", tb),
-                            ],
-                        )
-            finally:
-                try:
-                    rf.close()
-                except Exception:
-                    pass
-                try:
-                    wf.close()
-                except Exception:
-                    pass
+            if serve_connection(conn, handler, port=port):
+                return 0
 
     return 0
 
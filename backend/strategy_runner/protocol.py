@@ -2,9 +2,15 @@ from __future__ import annotations
 
 import json
 import re
+import struct
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, Iterable, List, Literal, Optional, Union
+from typing import Any, BinaryIO, Dict, Iterable, List, Literal, Optional, Sequence, Tuple, Union
+
+try:  # optional: compact binary frames when both host and guest have it
+    import msgpack  # type: ignore
+except ImportError:  # pragma: no cover
+    msgpack = None  # type: ignore
 
 PROTOCOL_VERSION = "v1"
 
@@ -12,14 +18,31 @@ PROTOCOL_VERSION = "v1"
 #
 # Host -> guest messages:
 # - {"type":"market_event", ...}
+# - {"type":"sync","seq":N}      batch barrier (session mode)
 # - {"type":"shutdown"}
 #
 # Guest -> host messages:
 # - {"type":"order_intent", ...}
 # - {"type":"log", ...}
+# - {"type":"sync_ack","seq":N}  every output for messages sent before sync N precedes it
+#
+# Wire encoding negotiation (optional, first message after "guest ready"):
+# - host  -> {"type":"negotiate","encodings":["msgpack","json-frames"]}  (preference order)
+# - guest -> {"type":"negotiated","encoding":"msgpack"}
+# Both sides switch to the chosen encoding right after that reply. Message schemas do not
+# change. Framed encodings send each message as a 4-byte big-endian length + payload, so
+# the receiver never scans for newlines. A guest that predates negotiation answers with an
+# "ignoring unknown message type" log and the connection stays NDJSON.
+
+MessageTypeIn = Literal["market_event", "sync", "negotiate", "shutdown"]
+MessageTypeOut = Literal["order_intent", "log", "sync_ack", "negotiated"]
+
+ENCODING_NDJSON = "ndjson"
+ENCODING_JSON_FRAMES = "json-frames"
+ENCODING_MSGPACK = "msgpack"
 
-MessageTypeIn = Literal["market_event", "shutdown"]
-MessageTypeOut = Literal["order_intent", "log"]
+_FRAME_HEADER = struct.Struct(">I")
+MAX_FRAME_BYTES = 16 * 1024 * 1024
 
 Side = Literal["buy", "sell"]
 OrderType = Literal["market", "limit", "stop", "stop_limit"]
@@ -188,6 +211,16 @@ def parse_inbound_message(obj: Dict[str, Any]) -> Union[MarketEvent, Dict[str, A
             source=source,
             payload=payload,
         )
+    if msg_type == "sync":
+        seq = _require(obj, "seq")
+        if isinstance(seq, bool) or not isinstance(seq, int):
+            raise ProtocolError("field seq must be integer")
+        return obj
+    if msg_type == "negotiate":
+        encodings = _require(obj, "encodings")
+        if not isinstance(encodings, list) or not all(isinstance(e, str) for e in encodings):
+            raise ProtocolError("field encodings must be list of strings")
+        return obj
     if msg_type == "shutdown":
         return obj
     raise ProtocolError(f"unsupported inbound type: {msg_type}")
@@ -259,3 +292,67 @@ def loads_ndjson(blob: Union[str, bytes]) -> List[Dict[str, Any]]:
     lines = [ln for ln in text.splitlines() if ln.strip()]
     return [json.loads(ln) for ln in lines]
 
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    """Wire encodings this process can speak, best first."""
+    framed = (ENCODING_MSGPACK, ENCODING_JSON_FRAMES) if msgpack is not None else (ENCODING_JSON_FRAMES,)
+    return framed + (ENCODING_NDJSON,)
+
+
+def choose_encoding(offered: Sequence[str]) -> str:
+    """First encoding in the peer's preference list that this side supports (NDJSON otherwise)."""
+    ours = supported_encodings()
+    for enc in offered:
+        if enc in ours:
+            return enc
+    return ENCODING_NDJSON
+
+
+def encode_messages(objs: Iterable[Dict[str, Any]], encoding: str) -> bytes:
+    if encoding == ENCODING_NDJSON:
+        return b"".join(json.dumps(o, separators=(",", ":"), ensure_ascii=False).encode("utf-8") + b"\n" for o in objs)
+    if encoding == ENCODING_MSGPACK:
+        if msgpack is None:
+            raise ProtocolError("msgpack encoding requires the msgpack package")
+        bodies = [msgpack.packb(o, use_bin_type=True) for o in objs]
+    elif encoding == ENCODING_JSON_FRAMES:
+        bodies = [json.dumps(o, separators=(",", ":"), ensure_ascii=False).encode("utf-8") for o in objs]
+    else:
+        raise ProtocolError(f"unsupported encoding: {encoding}")
+    return b"".join(_FRAME_HEADER.pack(len(b)) + b for b in bodies)
+
+
+def read_message(f: BinaryIO, encoding: str) -> Optional[Dict[str, Any]]:
+    """Read one message from a buffered binary stream; None at EOF."""
+    if encoding == ENCODING_NDJSON:
+        while True:
+            raw = f.readline()
+            if not raw:
+                return None
+            raw = raw.strip()
+            if raw:
+                return json.loads(raw.decode("utf-8"))
+
+    header = f.read(_FRAME_HEADER.size)
+    if not header:
+        return None
+    if len(header) < _FRAME_HEADER.size:
+        raise ProtocolError("truncated frame header")
+    (size,) = _FRAME_HEADER.unpack(header)
+    if size > MAX_FRAME_BYTES:
+        raise ProtocolError(f"frame too large: {size} bytes")
+    body = f.read(size)
+    if len(body) < size:
+        raise ProtocolError("truncated frame")
+    if encoding == ENCODING_MSGPACK:
+        if msgpack is None:
+            raise ProtocolError("msgpack encoding requires the msgpack package")
+        obj = msgpack.unpackb(body, raw=False)
+    elif encoding == ENCODING_JSON_FRAMES:
+        obj = json.loads(body.decode("utf-8"))
+    else:
+        raise ProtocolError(f"unsupported encoding: {encoding}")
+    if not isinstance(obj, dict):
+        raise ProtocolError("message must be object")
+    return obj
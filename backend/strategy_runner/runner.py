@@ -1,19 +1,33 @@
 from __future__ import annotations
 
-import json
+import os
+import shutil
 import socket
+import stat
 import subprocess
 import tempfile
+import threading
 import time
-from dataclasses import dataclass
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Union
 
 from backend.common.replay_events import build_replay_event, emit_replay_event
 from backend.common.shutdown import SHUTDOWN_EVENT, install_signal_handlers_once, wait_or_shutdown
 from .bundle import StrategyBundle, create_strategy_bundle
 from .firecracker import FirecrackerConfig, FirecrackerMicroVM
-from .protocol import PROTOCOL_VERSION, parse_order_intent
+from .protocol import (
+    ENCODING_JSON_FRAMES,
+    ENCODING_MSGPACK,
+    ENCODING_NDJSON,
+    PROTOCOL_VERSION,
+    encode_messages,
+    parse_order_intent,
+    read_message,
+    supported_encodings,
+)
 
 
 class StrategyRunnerError(RuntimeError):
@@ -76,21 +90,6 @@ def make_strategy_drive_image(
     return img
 
 
-def _read_ndjson(sock_f) -> Iterable[Dict[str, Any]]:
-    for raw in sock_f:
-        raw = raw.strip()
-        if not raw:
-            continue
-        yield json.loads(raw.decode("utf-8"))
-
-
-def _send_ndjson(sock_f, objs: Iterable[Dict[str, Any]]) -> None:
-    for o in objs:
-        sock_f.write(json.dumps(o, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
-        sock_f.write(b"\n")
-    sock_f.flush()
-
-
 def _connect_vsock(guest_cid: int, port: int, timeout_s: float = 5.0) -> socket.socket:
     # Best-effort: allow SIGTERM/SIGINT to interrupt connection waits.
     install_signal_handlers_once()
@@ -117,6 +116,543 @@ def _connect_vsock(guest_cid: int, port: int, timeout_s: float = 5.0) -> socket.
     raise StrategyRunnerError(f"failed to connect vsock to guest cid={guest_cid} port={port}: {last_err}")
 
 
+def _connect_guest(vm: Any, guest_cid: int, port: int, timeout_s: float) -> socket.socket:
+    return _connect_vsock(guest_cid, port, timeout_s=timeout_s)
+
+
+def _emit_intent_replay_event(strategy_id: str, msg: Dict[str, Any]) -> None:
+    try:
+        event_id = str(msg.get("event_id") or "").strip() or None
+        intent_id = str(msg.get("intent_id") or "").strip() or None
+        trace_id = event_id or intent_id or str(strategy_id)
+        emit_replay_event(
+            build_replay_event(
+                event="order_intent",
+                component="backend.strategy_runner.runner",
+                agent_name=str(strategy_id),
+                trace_id=trace_id,
+                data={
+                    "stage": "emitted_by_guest",
+                    "intent": msg,
+                },
+            )
+        )
+    except Exception:
+        pass
+
+
+# Per-user: a cached image is trusted by its name alone, so only its owner may write here.
+DEFAULT_DRIVE_CACHE_DIR = Path(tempfile.gettempdir()) / f"agenttrader_strategy_drives_{os.geteuid()}"
+
+
+def _ensure_private_dir(path: Path) -> None:
+    """Create `path` as 0700 if missing, and refuse it unless this process owns it exclusively."""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.geteuid() or st.st_mode & 0o077:
+        raise StrategyRunnerError(
+            f"drive image cache dir {path} must be a directory owned by uid {os.geteuid()} with mode 0700"
+        )
+
+
+class DriveImageCache:
+    """
+    Strategy drive images keyed by bundle sha256.
+
+    Bundles are reproducible, so resubmitting the same strategy code reuses its image instead
+    of running mke2fs again. Images are attached read-only, so one file can back any number of
+    guests. The least recently used images beyond `max_images` are deleted.
+
+    Images are served by name without re-hashing, so `cache_dir` must be private (owned by
+    this user, mode 0700); `get()` raises StrategyRunnerError otherwise.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Union[str, Path]] = None,
+        *,
+        max_images: int = 16,
+        build: Callable[..., Path] = make_strategy_drive_image,
+    ) -> None:
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else DEFAULT_DRIVE_CACHE_DIR
+        self.max_images = max(1, int(max_images))
+        self._build = build
+        self._lock = threading.Lock()
+        self._dir_checked = False
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, bundle: StrategyBundle) -> Path:
+        img = self.cache_dir / f"{bundle.sha256}.ext4"
+        with self._lock:
+            if not self._dir_checked:
+                _ensure_private_dir(self.cache_dir)
+                self._dir_checked = True
+            if img.exists():
+                self.hits += 1
+                os.utime(img)
+                return img
+            self.misses += 1
+            tmp = Path(tempfile.mkdtemp(prefix=".build_", dir=self.cache_dir))
+            try:
+                built = self._build(bundle=bundle, out_dir=tmp)
+                # Atomic publish: a concurrent runner never attaches a half-written image.
+                os.replace(built, img)
+            finally:
+                shutil.rmtree(tmp, ignore_errors=True)
+            self._evict_locked(keep=img)
+            return img
+
+    def _evict_locked(self, *, keep: Path) -> None:
+        images = sorted(self.cache_dir.glob("*.ext4"), key=lambda p: p.stat().st_mtime)
+        for p in images[: max(0, len(images) - self.max_images)]:
+            if p != keep:
+                p.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+@dataclass
+class WarmGuest:
+    """A booted guest whose vsock connection is open and past the guest-ready handshake."""
+
+    bundle_sha256: str
+    guest_cid: int
+    vm: Any
+    sock: socket.socket
+    rf: Any
+    wf: Any
+    boot_s: float
+    warm: bool = False
+    encoding: str = ENCODING_NDJSON
+
+    def send(self, objs: Sequence[Dict[str, Any]]) -> None:
+        self.wf.write(encode_messages(objs, self.encoding))
+        self.wf.flush()
+
+    def recv(self) -> Optional[Dict[str, Any]]:
+        return read_message(self.rf, self.encoding)
+
+
+class WarmVMPool:
+    """
+    Pre-booted strategy guests keyed by bundle sha256.
+
+    Booting the microVM, connecting vsock and importing the strategy dominate a short run.
+    The pool keeps `min_idle` guests per recently used bundle booted and connected, so
+    `acquire()` hands one out immediately while a background thread boots its replacement.
+
+    Guests are single-use: `release()` shuts the VM down instead of returning it, so strategy
+    module state never leaks from one session into the next. Only the `max_bundles` most
+    recently used bundles keep warm guests.
+
+    `encodings` is the wire-encoding preference offered to each guest after boot; the
+    connection stays NDJSON when the guest supports none of them (or it is empty).
+    """
+
+    def __init__(
+        self,
+        assets: FirecrackerAssets,
+        *,
+        vsock_port: int = 5005,
+        base_guest_cid: int = 3,
+        min_idle: int = 1,
+        max_bundles: int = 8,
+        drive_cache: Optional[DriveImageCache] = None,
+        vm_factory: Callable[[FirecrackerConfig], Any] = FirecrackerMicroVM,
+        connect: Callable[[Any, int, int, float], socket.socket] = _connect_guest,
+        boot_timeout_s: float = 10.0,
+        boot_workers: int = 2,
+        encodings: Sequence[str] = (ENCODING_MSGPACK, ENCODING_JSON_FRAMES),
+    ) -> None:
+        self.assets = assets
+        self.vsock_port = int(vsock_port)
+        self.base_guest_cid = int(base_guest_cid)
+        self.min_idle = max(0, int(min_idle))
+        self.max_bundles = max(1, int(max_bundles))
+        self.drive_cache = drive_cache if drive_cache is not None else DriveImageCache()
+        self.boot_timeout_s = float(boot_timeout_s)
+        self.encodings = tuple(e for e in encodings if e in supported_encodings() and e != ENCODING_NDJSON)
+        self._vm_factory = vm_factory
+        self._connect = connect
+        self._boot_workers = max(1, int(boot_workers))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._bundles: "OrderedDict[str, StrategyBundle]" = OrderedDict()  # LRU order
+        self._idle: Dict[str, Deque[WarmGuest]] = {}
+        self._booting: Dict[str, int] = {}
+        self._cids_in_use: set[int] = set()
+        self._closed = False
+        self.warm_hits = 0
+        self.cold_boots = 0
+        self.boot_failures = 0
+        self.last_boot_error: Optional[str] = None
+
+    def __enter__(self) -> "WarmVMPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def prewarm(self, bundle: StrategyBundle, count: Optional[int] = None) -> None:
+        """Boot guests for `bundle` in the background until `count` (default min_idle) are idle."""
+        with self._lock:
+            if self._closed:
+                raise StrategyRunnerError("warm VM pool is closed")
+            evicted = self._track_locked(bundle)
+            self._schedule_locked(bundle.sha256, self.min_idle if count is None else int(count))
+        for g in evicted:
+            self._destroy(g)
+
+    def acquire(self, bundle: StrategyBundle) -> WarmGuest:
+        with self._lock:
+            if self._closed:
+                raise StrategyRunnerError("warm VM pool is closed")
+            evicted = self._track_locked(bundle)
+            idle = self._idle.get(bundle.sha256)
+            guest = idle.popleft() if idle else None
+            if guest is not None:
+                self.warm_hits += 1
+            else:
+                self.cold_boots += 1
+            self._schedule_locked(bundle.sha256, self.min_idle)
+        for g in evicted:
+            self._destroy(g)
+
+        if guest is None:
+            return self._boot(bundle)
+        guest.warm = True
+        return guest
+
+    def release(self, guest: WarmGuest) -> None:
+        self._destroy(guest)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle = [g for q in self._idle.values() for g in q]
+            self._idle.clear()
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            # In-flight boots see `_closed` and tear their guest down themselves.
+            executor.shutdown(wait=True)
+        for g in idle:
+            self._destroy(g)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "idle": sum(len(q) for q in self._idle.values()),
+                "idle_by_bundle": {k: len(q) for k, q in self._idle.items()},
+                "booting": sum(self._booting.values()),
+                "warm_hits": self.warm_hits,
+                "cold_boots": self.cold_boots,
+                "boot_failures": self.boot_failures,
+                "last_boot_error": self.last_boot_error,
+                "drive_cache": self.drive_cache.stats(),
+            }
+
+    def _track_locked(self, bundle: StrategyBundle) -> List[WarmGuest]:
+        key = bundle.sha256
+        self._bundles[key] = bundle
+        self._bundles.move_to_end(key)
+        evicted: List[WarmGuest] = []
+        while len(self._bundles) > self.max_bundles:
+            old, _ = self._bundles.popitem(last=False)
+            evicted.extend(self._idle.pop(old, ()))
+        return evicted
+
+    def _schedule_locked(self, key: str, target: int) -> None:
+        missing = target - len(self._idle.get(key, ())) - self._booting.get(key, 0)
+        if missing <= 0:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._boot_workers, thread_name_prefix="strategy-vm-boot")
+        for _ in range(missing):
+            self._booting[key] = self._booting.get(key, 0) + 1
+            self._executor.submit(self._boot_into_pool, key)
+
+    def _boot_into_pool(self, key: str) -> None:
+        with self._lock:
+            bundle = None if self._closed else self._bundles.get(key)
+        guest: Optional[WarmGuest] = None
+        error: Optional[Exception] = None
+        if bundle is not None:
+            try:
+                guest = self._boot(bundle)
+            except Exception as e:
+                error = e
+
+        with self._lock:
+            self._booting[key] -= 1
+            if not self._booting[key]:
+                del self._booting[key]
+            if error is not None:
+                self.boot_failures += 1
+                self.last_boot_error = f"{type(error).__name__}: {error}"
+            keep = guest is not None and not self._closed and key in self._bundles
+            if keep:
+                self._idle.setdefault(key, deque()).append(guest)  # type: ignore[arg-type]
+        if guest is not None and not keep:
+            self._destroy(guest)
+
+    def _alloc_cid(self) -> int:
+        with self._lock:
+            cid = self.base_guest_cid
+            while cid in self._cids_in_use:
+                cid += 1
+            self._cids_in_use.add(cid)
+            return cid
+
+    def _free_cid(self, cid: int) -> None:
+        with self._lock:
+            self._cids_in_use.discard(cid)
+
+    def _boot(self, bundle: StrategyBundle) -> WarmGuest:
+        drive_img = self.drive_cache.get(bundle)
+        cid = self._alloc_cid()
+        cfg = FirecrackerConfig(
+            firecracker_bin=self.assets.firecracker_bin,
+            kernel_image=self.assets.kernel_image,
+            rootfs_image=self.assets.rootfs_image,
+            guest_cid=cid,
+            vsock_port=self.vsock_port,
+            strategy_drive_image=drive_img,
+        )
+        vm = self._vm_factory(cfg)
+        sock: Optional[socket.socket] = None
+        t0 = time.perf_counter()
+        try:
+            vm.start()
+            # guest is expected to have started its runner and listen on vsock_port
+            sock = self._connect(vm, cid, self.vsock_port, self.boot_timeout_s)
+            guest = WarmGuest(
+                bundle_sha256=bundle.sha256,
+                guest_cid=cid,
+                vm=vm,
+                sock=sock,
+                rf=sock.makefile("rb"),
+                wf=sock.makefile("wb"),
+                boot_s=0.0,
+            )
+            _await_guest_message(guest, _is_guest_ready, timeout_s=self.boot_timeout_s)
+            if self.encodings:
+                guest.send([{"protocol": PROTOCOL_VERSION, "type": "negotiate", "encodings": list(self.encodings)}])
+                reply = _await_guest_message(guest, _is_negotiation_reply, timeout_s=self.boot_timeout_s)
+                if reply.get("type") == "negotiated" and reply.get("encoding") in self.encodings:
+                    guest.encoding = str(reply["encoding"])
+        except BaseException:
+            if sock is not None:
+                try:
+                    sock.close()
+                except Exception:
+                    pass
+            vm.stop()
+            vm.cleanup()
+            self._free_cid(cid)
+            raise
+        guest.boot_s = time.perf_counter() - t0
+        return guest
+
+    def _destroy(self, guest: WarmGuest) -> None:
+        try:
+            guest.send([{"protocol": PROTOCOL_VERSION, "type": "shutdown"}])
+        except Exception:
+            pass
+        for f in (guest.rf, guest.wf, guest.sock):
+            try:
+                f.close()
+            except Exception:
+                pass
+        try:
+            guest.vm.stop()
+        finally:
+            guest.vm.cleanup()
+            self._free_cid(guest.guest_cid)
+
+
+def _is_guest_ready(msg: Dict[str, Any]) -> bool:
+    # The guest greets every connection with a "guest ready" log line.
+    return msg.get("type") == "log" and str(msg.get("message") or "").startswith("guest ready")
+
+
+def _is_negotiation_reply(msg: Dict[str, Any]) -> bool:
+    # Guests without negotiation support reject the message with a warn log and stay NDJSON.
+    if msg.get("type") == "negotiated":
+        return True
+    return msg.get("type") == "log" and "negotiate" in str(msg.get("message") or "")
+
+
+def _await_guest_message(guest: WarmGuest, match: Callable[[Dict[str, Any]], bool], *, timeout_s: float) -> Dict[str, Any]:
+    deadline = time.time() + timeout_s
+    while True:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            raise StrategyRunnerError("guest did not finish the startup handshake")
+        guest.sock.settimeout(remaining)
+        try:
+            msg = guest.recv()
+        except socket.timeout as e:
+            raise StrategyRunnerError("guest did not finish the startup handshake") from e
+        finally:
+            guest.sock.settimeout(None)
+        if msg is None:
+            raise StrategyRunnerError("guest closed the connection during startup")
+        if match(msg):
+            return msg
+
+
+class StrategySession:
+    """
+    Long-lived connection to one guest: `send(events)` returns that batch's order intents and
+    keeps the vsock stream open for the next batch.
+
+    Each batch ends with a `sync` barrier that the guest answers with `sync_ack` once all
+    output for the preceding events is written; without it an event that yields no intent is
+    indistinguishable from a slow strategy. Batches larger than `write_chunk_events` are
+    written from a helper thread in chunks while this thread reads, so intents stream back
+    while events are still going out and neither side can stall on a full socket buffer.
+    """
+
+    def __init__(
+        self,
+        guest: WarmGuest,
+        *,
+        strategy_id: str,
+        release: Callable[[WarmGuest], None],
+        timeout_s: Optional[float] = 30.0,
+        write_chunk_events: int = 64,
+    ) -> None:
+        self.strategy_id = strategy_id
+        # Per-read timeout; None waits as long as the guest takes.
+        self.timeout_s = None if timeout_s is None else float(timeout_s)
+        self.write_chunk_events = max(1, int(write_chunk_events))
+        self.intents: List[Dict[str, Any]] = []
+        self.events_sent = 0
+        self.batches = 0
+        self._guest = guest
+        self._release = release
+        self._seq = 0
+        self._closed = False
+
+    @property
+    def warm(self) -> bool:
+        return self._guest.warm
+
+    @property
+    def encoding(self) -> str:
+        return self._guest.encoding
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def __enter__(self) -> "StrategySession":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def send(self, events: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if self._closed:
+            raise StrategyRunnerError("strategy session is closed")
+        self._seq += 1
+        out = self._exchange(events, {"protocol": PROTOCOL_VERSION, "type": "sync", "seq": self._seq}, self._seq)
+        self.batches += 1
+        return out
+
+    def finish(self, events: Sequence[Dict[str, Any]] = ()) -> List[Dict[str, Any]]:
+        """
+        Send the final events plus shutdown and collect intents until the guest closes the
+        stream. This is the one-shot exchange used by `run()`; it needs no `sync` support.
+        """
+        if self._closed:
+            raise StrategyRunnerError("strategy session is closed")
+        try:
+            out = self._exchange(events, {"protocol": PROTOCOL_VERSION, "type": "shutdown"}, None)
+        finally:
+            self.close()
+        self.batches += 1
+        return out
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._release(self._guest)
+
+    def _exchange(self, events: Sequence[Dict[str, Any]], tail: Dict[str, Any], seq: Optional[int]) -> List[Dict[str, Any]]:
+        errors: List[BaseException] = []
+        writer: Optional[threading.Thread] = None
+        try:
+            if len(events) <= self.write_chunk_events:
+                self._guest.send([*events, tail])
+            else:
+                writer = threading.Thread(
+                    target=self._write_all,
+                    args=(events, tail, errors),
+                    name="strategy-session-writer",
+                    daemon=True,
+                )
+                writer.start()
+            out = self._read_until(seq)
+            if writer is not None:
+                writer.join()
+            if errors:
+                raise StrategyRunnerError(f"failed to send events to guest: {errors[0]}") from errors[0]
+        except BaseException:
+            # The stream position is unknown now; the guest cannot be used again. Shutting the
+            # socket down first also unblocks a writer stuck on a full send buffer.
+            try:
+                self._guest.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self.close()
+            raise
+        self.events_sent += len(events)
+        return out
+
+    def _write_all(self, events: Sequence[Dict[str, Any]], tail: Dict[str, Any], errors: List[BaseException]) -> None:
+        try:
+            for i in range(0, len(events), self.write_chunk_events):
+                self._guest.send(events[i : i + self.write_chunk_events])
+            self._guest.send([tail])
+        except BaseException as e:
+            errors.append(e)
+
+    def _read_until(self, seq: Optional[int]) -> List[Dict[str, Any]]:
+        """Read guest output up to `sync_ack` for `seq`, or to EOF when seq is None."""
+        out: List[Dict[str, Any]] = []
+        self._guest.sock.settimeout(self.timeout_s)
+        try:
+            while True:
+                try:
+                    msg = self._guest.recv()
+                except socket.timeout as e:
+                    raise StrategyRunnerError(f"guest did not answer within {self.timeout_s}s") from e
+                if msg is None:
+                    if seq is None:
+                        return out
+                    raise StrategyRunnerError("guest closed the connection mid-batch")
+                t = msg.get("type")
+                if t == "order_intent":
+                    # validate shape
+                    _ = parse_order_intent(msg)
+                    out.append(msg)
+                    self.intents.append(msg)
+                    _emit_intent_replay_event(self.strategy_id, msg)
+                elif t == "sync_ack" and seq is not None and msg.get("seq") == seq:
+                    return out
+                # log lines (including strategy errors) are not fatal in scaffolding
+        finally:
+            try:
+                self._guest.sock.settimeout(None)
+            except Exception:
+                pass
+
+
 @dataclass
 class StrategySandboxRunner:
     """
@@ -124,11 +660,25 @@ class StrategySandboxRunner:
     - package user strategy into a bundle
     - inject it into a microVM via an attached read-only drive image
     - stream market events in; collect order intents out
+
+    With `pool` set, sessions start on pre-booted guests; otherwise each one cold-boots a VM.
     """
 
     assets: FirecrackerAssets
     guest_cid: int = 3
     vsock_port: int = 5005
+    pool: Optional[WarmVMPool] = None
+    _cold_pool: Optional[WarmVMPool] = field(default=None, init=False, repr=False)
+
+    def open_session(
+        self,
+        *,
+        strategy_source: Union[str, Path],
+        strategy_id: str = "strategy",
+        timeout_s: float = 30.0,
+    ) -> StrategySession:
+        """Start a guest for the strategy and return a session that stays connected across `send()` calls."""
+        return self._open_session(strategy_source=strategy_source, strategy_id=strategy_id, timeout_s=timeout_s)
 
     def run(
         self,
@@ -137,6 +687,37 @@ class StrategySandboxRunner:
         events: Sequence[Dict[str, Any]],
         strategy_id: str = "strategy",
     ) -> List[Dict[str, Any]]:
+        session = self._open_session(
+            strategy_source=strategy_source,
+            strategy_id=strategy_id,
+            timeout_s=None,
+            replay_data={"events_count": len(events)},
+        )
+        return session.finish(events)
+
+    def _guest_pool(self) -> WarmVMPool:
+        if self.pool is not None:
+            return self.pool
+        if self._cold_pool is None:
+            self._cold_pool = WarmVMPool(
+                self.assets,
+                vsock_port=self.vsock_port,
+                base_guest_cid=self.guest_cid,
+                min_idle=0,
+            )
+        return self._cold_pool
+
+    def _open_session(
+        self,
+        *,
+        strategy_source: Union[str, Path],
+        strategy_id: str,
+        timeout_s: Optional[float],
+        replay_data: Optional[Dict[str, Any]] = None,
+    ) -> StrategySession:
+        bundle = create_strategy_bundle(strategy_source=strategy_source, strategy_id=strategy_id)
+        pool = self._guest_pool()
+        guest = pool.acquire(bundle)
         # Replay markers for offline sandbox runs.
         try:
             emit_replay_event(
@@ -147,79 +728,19 @@ class StrategySandboxRunner:
                     trace_id=str(strategy_id),
                     data={
                         "runner": "StrategySandboxRunner",
-                        "events_count": len(events),
-                        "guest_cid": self.guest_cid,
+                        "guest_cid": guest.guest_cid,
                         "vsock_port": self.vsock_port,
+                        "bundle_sha256": bundle.sha256,
+                        "warm": guest.warm,
+                        **(replay_data or {}),
                     },
                 )
             )
         except Exception:
             pass
-        bundle = create_strategy_bundle(strategy_source=strategy_source, strategy_id=strategy_id)
-        drive_img = make_strategy_drive_image(bundle=bundle)
-
-        cfg = FirecrackerConfig(
-            firecracker_bin=self.assets.firecracker_bin,
-            kernel_image=self.assets.kernel_image,
-            rootfs_image=self.assets.rootfs_image,
-            guest_cid=self.guest_cid,
-            vsock_port=self.vsock_port,
-            strategy_drive_image=drive_img,
+        return StrategySession(
+            guest,
+            strategy_id=strategy_id,
+            release=pool.release,
+            timeout_s=timeout_s,
         )
-
-        intents: List[Dict[str, Any]] = []
-        with FirecrackerMicroVM(cfg) as vm:
-            # guest is expected to have started its runner and listen on vsock_port
-            s = _connect_vsock(self.guest_cid, self.vsock_port, timeout_s=10.0)
-            with s:
-                rf = s.makefile("rb", buffering=0)
-                wf = s.makefile("wb", buffering=0)
-
-                # Optional: read initial logs
-                start_deadline = time.time() + 2.0
-                while time.time() < start_deadline:
-                    s.settimeout(0.1)
-                    try:
-                        line = rf.readline()
-                    except Exception:
-                        break
-                    if not line:
-                        break
-                    msg = json.loads(line.decode("utf-8"))
-                    # ignore logs
-                    if msg.get("type") != "log":
-                        break
-                s.settimeout(None)
-
-                _send_ndjson(wf, events)
-                _send_ndjson(wf, [{"protocol": PROTOCOL_VERSION, "type": "shutdown"}])
-
-                for msg in _read_ndjson(rf):
-                    if msg.get("type") == "order_intent":
-                        # validate shape
-                        _ = parse_order_intent(msg)
-                        intents.append(msg)
-                        try:
-                            event_id = str(msg.get("event_id") or "").strip() or None
-                            intent_id = str(msg.get("intent_id") or "").strip() or None
-                            trace_id = event_id or intent_id or str(strategy_id)
-                            emit_replay_event(
-                                build_replay_event(
-                                    event="order_intent",
-                                    component="backend.strategy_runner.runner",
-                                    agent_name=str(strategy_id),
-                                    trace_id=trace_id,
-                                    data={
-                                        "stage": "emitted_by_guest",
-                                        "intent": msg,
-                                    },
-                                )
-                            )
-                        except Exception:
-                            pass
-                    if msg.get("type") == "log" and msg.get("level") == "error":
-                        # keep log errors, but don't fail automatically in scaffolding
-                        pass
-
-        return intents
-
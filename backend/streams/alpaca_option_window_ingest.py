@@ -23,6 +23,7 @@ Env required:
 
 Env read:
 - ALPACA_SYMBOLS, OPTION_DTE_MAX, OPTION_STRIKE_WINDOW, ALPACA_FEED, ALPACA_PAPER, DATABASE_URL
+- OPTION_SNAPSHOT_CONCURRENCY (default: 4), OPTION_SNAPSHOT_RATE_PER_SEC (default: 10)
 
 Notes:
 - Uses Alpaca options contracts endpoint to discover symbols, then requests snapshots for those option symbols.
@@ -56,6 +57,8 @@ from backend.common.agent_boot import configure_startup_logging
 from backend.common.agent_mode_guard import enforce_agent_mode_guard
 from backend.common.env import get_env
 from backend.common.logging import init_structured_logging
+from backend.ingestion.rate_limit import TokenBucket
+from backend.marketdata.options.snapshot_client import SnapshotClient
 from backend.observability.build_fingerprint import get_build_fingerprint
 
 # Keep consistent with other backend/streams scripts
@@ -72,6 +75,8 @@ class WindowConfig:
     strike_window: float
     options_feed: str
     alpaca_paper: Optional[bool]
+    snapshot_concurrency: int = 4
+    snapshot_rate_per_sec: float = 10.0
 
 
 def _json_safe(v: Any) -> Any:
@@ -365,46 +370,16 @@ def fetch_option_snapshots_for_symbols(
     *,
     headers: Dict[str, str],
     option_symbols: Sequence[str],
+    client: Optional[SnapshotClient] = None,
 ) -> Dict[str, Any]:
-    """Fetch option snapshots by contract symbols, chunking requests."""
+    """Fetch option snapshots by contract symbols; chunks are fetched concurrently by `client`."""
 
     if not option_symbols:
         return {}
-
-    all_snapshots: Dict[str, Any] = {}
-    
-    # Alpaca API has a limit of 200 symbols per request
-    chunk_size = 200
-    
-    symbols_to_fetch = sorted(list(set(str(s).strip().upper() for s in option_symbols if s)))
-
-    for i in range(0, len(symbols_to_fetch), chunk_size):
-        chunk = symbols_to_fetch[i:i + chunk_size]
-        
-        logger.info(f"Requesting snapshots for {len(chunk)} option symbols...")
-
-        # Task requirement: fetch snapshots from this endpoint with symbols query param.
-        url = f"{DATA_BASE.rstrip('/')}/v1beta1/options/snapshots"
-        params = {"symbols": ",".join(chunk)}
-        
-        try:
-            payload = _request_json(url, headers=headers, params=params)
-            
-            snaps: Any = payload.get("snapshots")
-            if snaps is None:
-                snaps = payload
-            if not isinstance(snaps, dict):
-                logger.warning(f"Received non-dict snapshots payload: {snaps}")
-                continue
-
-            logger.info(f"Received {len(snaps)} snapshots in this chunk.")
-            all_snapshots.update(snaps)
-
-        except Exception as e:
-            logger.exception(f"Failed to fetch snapshot chunk: {e}")
-
-    logger.info(f"Total snapshots received: {len(all_snapshots)}")
-    return all_snapshots
+    if client is not None:
+        return client.fetch_symbols(option_symbols)
+    with SnapshotClient(headers, data_host=DATA_BASE) as own:
+        return own.fetch_symbols(option_symbols)
 
 
 def _connect_db(db_url: str):
@@ -518,12 +493,17 @@ def load_config() -> WindowConfig:
 
     alpaca_paper = _parse_bool(os.getenv("ALPACA_PAPER"))
 
+    snapshot_concurrency = max(1, int(get_env("OPTION_SNAPSHOT_CONCURRENCY", 4)))
+    snapshot_rate_per_sec = max(0.1, float(get_env("OPTION_SNAPSHOT_RATE_PER_SEC", 10)))
+
     return WindowConfig(
         symbols=symbols,
         dte_max=dte_max,
         strike_window=strike_window,
         options_feed=options_feed,
         alpaca_paper=alpaca_paper,
+        snapshot_concurrency=snapshot_concurrency,
+        snapshot_rate_per_sec=snapshot_rate_per_sec,
     )
 
 
@@ -583,81 +563,93 @@ def main() -> int:
     total_snapshots_fetched = 0
     total_rows_upserted = 0
 
-    for underlying in cfg.symbols:
-        try:
-            strict = underlying in {"SPY", "IWM", "QQQ"}
-            dte_max = 5 if strict else cfg.dte_max
-            strike_window = 5.0 if strict else cfg.strike_window
-            exp_lte = today + timedelta(days=dte_max)
-
-            underlying_price = fetch_underlying_latest_price(
-                data_host=alpaca.data_host,
-                headers=hdrs,
-                symbol=underlying,
-                stock_feed=stock_feed,
-            )
+    snapshot_client = SnapshotClient(
+        hdrs,
+        data_host=DATA_BASE,
+        max_concurrency=cfg.snapshot_concurrency,
+        rate_limit=TokenBucket(rate_per_sec=cfg.snapshot_rate_per_sec, capacity=cfg.snapshot_concurrency),
+    )
 
-            contracts = fetch_option_contracts(
-                trading_host=TRADING_BASE,
-                headers=hdrs,
-                underlying=underlying,
-                exp_gte=today,
-                exp_lte=exp_lte,
-            )
+    try:
+        for underlying in cfg.symbols:
+            try:
+                strict = underlying in {"SPY", "IWM", "QQQ"}
+                dte_max = 5 if strict else cfg.dte_max
+                strike_window = 5.0 if strict else cfg.strike_window
+                exp_lte = today + timedelta(days=dte_max)
+
+                underlying_price = fetch_underlying_latest_price(
+                    data_host=alpaca.data_host,
+                    headers=hdrs,
+                    symbol=underlying,
+                    stock_feed=stock_feed,
+                )
 
-            option_symbols, stats = select_option_symbols_window(
-                underlying=underlying,
-                underlying_price=underlying_price,
-                contracts=contracts,
-                dte_max=dte_max,
-                strike_window=strike_window,
-            )
+                contracts = fetch_option_contracts(
+                    trading_host=TRADING_BASE,
+                    headers=hdrs,
+                    underlying=underlying,
+                    exp_gte=today,
+                    exp_lte=exp_lte,
+                )
 
-            expirations_found = int(stats.get("expirations_found") or 0)
-            contracts_selected = int(stats.get("contracts_selected") or 0)
-            contracts_after_dte = int(stats.get("contracts_after_dte") or 0)
-            contracts_after_strike = int(stats.get("contracts_after_strike") or 0)
-
-            logger.info(
-                "%s: total_contracts_found=%s total_after_dte_filter=%s total_after_strike_filter=%s",
-                underlying,
-                len(contracts),
-                contracts_after_dte,
-                contracts_after_strike,
-            )
+                option_symbols, stats = select_option_symbols_window(
+                    underlying=underlying,
+                    underlying_price=underlying_price,
+                    contracts=contracts,
+                    dte_max=dte_max,
+                    strike_window=strike_window,
+                )
 
-            snapshots = fetch_option_snapshots_for_symbols(
-                headers=hdrs,
-                option_symbols=option_symbols,
-            )
+                expirations_found = int(stats.get("expirations_found") or 0)
+                contracts_selected = int(stats.get("contracts_selected") or 0)
+                contracts_after_dte = int(stats.get("contracts_after_dte") or 0)
+                contracts_after_strike = int(stats.get("contracts_after_strike") or 0)
+
+                logger.info(
+                    "%s: total_contracts_found=%s total_after_dte_filter=%s total_after_strike_filter=%s",
+                    underlying,
+                    len(contracts),
+                    contracts_after_dte,
+                    contracts_after_strike,
+                )
 
-            fetched = len(snapshots)
-            upserted = upsert_snapshots(
-                db_url=db_url,
-                snapshot_time=snapshot_time,
-                inserted_at=inserted_at,
-                underlying_symbol=underlying,
-                snapshots=snapshots,
-            )
-            logger.info("%s: snapshots_found=%s rows_upserted=%s", underlying, fetched, upserted)
-
-            total_expirations += expirations_found
-            total_contracts_selected += contracts_selected
-            total_snapshots_fetched += fetched
-            total_rows_upserted += upserted
-
-            logger.info(
-                "%s: expirations_found=%s contracts_selected=%s snapshots_fetched=%s rows_upserted=%s underlying_price=%.4f",
-                underlying,
-                expirations_found,
-                contracts_selected,
-                fetched,
-                upserted,
-                underlying_price,
-            )
+                snapshots = fetch_option_snapshots_for_symbols(
+                    headers=hdrs,
+                    option_symbols=option_symbols,
+                    client=snapshot_client,
+                )
+
+                fetched = len(snapshots)
+                upserted = upsert_snapshots(
+                    db_url=db_url,
+                    snapshot_time=snapshot_time,
+                    inserted_at=inserted_at,
+                    underlying_symbol=underlying,
+                    snapshots=snapshots,
+                )
+                logger.info("%s: snapshots_found=%s rows_upserted=%s", underlying, fetched, upserted)
+
+                total_expirations += expirations_found
+                total_contracts_selected += contracts_selected
+                total_snapshots_fetched += fetched
+                total_rows_upserted += upserted
+
+                logger.info(
+                    "%s: expirations_found=%s contracts_selected=%s snapshots_fetched=%s rows_upserted=%s underlying_price=%.4f",
+                    underlying,
+                    expirations_found,
+                    contracts_selected,
+                    fetched,
+                    upserted,
+                    underlying_price,
+                )
 
-        except Exception as e:
-            logger.exception("%s: failed: %s", underlying, e)
+            except Exception as e:
+                logger.exception("%s: failed: %s", underlying, e)
+    finally:
+        snapshot_client.close()
+    logger.info("snapshot_latency_ms=%s", json.dumps(snapshot_client.latency_histograms()))
 
     logger.info(
         "Done: total_expirations_found=%s total_contracts_selected=%s total_snapshots_fetched=%s total_rows_upserted=%s snapshot_time=%s",
@@ -0,0 +1,140 @@
+"""
+In-process cache of Pub/Sub message ids whose Firestore dedupe marker is known to exist.
+
+Firestore stays the source of truth: an entry is only added after the transaction that
+created (or found) the marker has committed, so a hit can answer "duplicate" without a
+Firestore round trip, and a miss always falls through to the transactional check.
+
+Keys are (scope, topic, message_id). The scope is the dedupe collection/kind the marker
+lives in: one message passes several independent dedupe gates (e.g. trade signals hit
+`ops_pubsub_dedupe` in the router and `ops_message_dedupe` in the writer), and a marker in
+one must not short-circuit the other.
+
+Entries expire after `ttl_s` (keep it below any Firestore TTL policy on the marker
+collections) and the least recently used entry is evicted beyond `max_entries`.
+One instance is shared by every worker thread of the process.
+
+Metrics:
+    consumer_dedupe_cache_lookups_total{result="hit"|"miss"}
+    consumer_dedupe_cache_firestore_reads_saved_total  dedupe reads answered from memory
+    consumer_dedupe_cache_hit_ratio                    hits / lookups since start
+    consumer_dedupe_cache_entries
+    consumer_dedupe_cache_evictions_total
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple
+
+from backend.common.ops_metrics import REGISTRY
+
+dedupe_cache_lookups_total = REGISTRY.counter(
+    "consumer_dedupe_cache_lookups_total",
+    help="Message dedupe cache lookups, labeled by result.",
+    label_names=("result",),
+)
+dedupe_cache_firestore_reads_saved_total = REGISTRY.counter(
+    "consumer_dedupe_cache_firestore_reads_saved_total",
+    help="Firestore dedupe-marker reads avoided by in-process cache hits.",
+)
+dedupe_cache_hit_ratio = REGISTRY.gauge(
+    "consumer_dedupe_cache_hit_ratio",
+    help="Message dedupe cache hits / lookups since process start.",
+)
+dedupe_cache_entries = REGISTRY.gauge("consumer_dedupe_cache_entries", help="Message ids held by the dedupe cache.")
+dedupe_cache_evictions_total = REGISTRY.counter(
+    "consumer_dedupe_cache_evictions_total",
+    help="Dedupe cache entries dropped by TTL expiry or LRU eviction.",
+)
+
+for _result in ("hit", "miss"):
+    dedupe_cache_lookups_total.inc(0.0, labels={"result": _result})
+dedupe_cache_firestore_reads_saved_total.inc(0.0)
+dedupe_cache_evictions_total.inc(0.0)
+dedupe_cache_hit_ratio.set(0.0)
+dedupe_cache_entries.set(0.0)
+
+_Key = Tuple[str, str, str]
+
+
+class MessageDedupeCache:
+    def __init__(
+        self,
+        *,
+        max_entries: int = 100_000,
+        ttl_s: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_s = max(0.0, float(ttl_s))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[_Key, float]" = OrderedDict()  # key -> expires_at, LRU order
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+            }
+
+    def seen(self, *, scope: str, topic: str, message_id: str) -> bool:
+        """True when the dedupe marker for this message is known to be committed."""
+        mid = str(message_id or "").strip()
+        if not mid:
+            return False
+        key = (str(scope), str(topic or ""), mid)
+        now = self._clock()
+        with self._lock:
+            expires_at = self._entries.get(key)
+            if expires_at is not None and expires_at <= now:
+                del self._entries[key]
+                self.evictions += 1
+                dedupe_cache_evictions_total.inc()
+                expires_at = None
+            if expires_at is None:
+                self.misses += 1
+                hit = False
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                hit = True
+            ratio = self.hits / (self.hits + self.misses)
+            size = len(self._entries)
+
+        dedupe_cache_lookups_total.inc(labels={"result": "hit" if hit else "miss"})
+        if hit:
+            dedupe_cache_firestore_reads_saved_total.inc()
+        dedupe_cache_hit_ratio.set(ratio)
+        dedupe_cache_entries.set(float(size))
+        return hit
+
+    def remember(self, *, scope: str, topic: str, message_id: str) -> None:
+        """Record a message whose dedupe marker has been committed (or found) in Firestore."""
+        mid = str(message_id or "").strip()
+        if not mid or self.ttl_s <= 0.0:
+            return
+        key = (str(scope), str(topic or ""), mid)
+        evicted = 0
+        with self._lock:
+            self._entries[key] = self._clock() + self.ttl_s
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            self.evictions += evicted
+            size = len(self._entries)
+
+        if evicted:
+            dedupe_cache_evictions_total.inc(float(evicted))
+        dedupe_cache_entries.set(float(size))
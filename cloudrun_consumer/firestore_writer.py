@@ -8,13 +8,22 @@ import sys
 import traceback
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Any, Optional, Tuple
+from typing import Any, Optional, Sequence, Tuple
 
 from cloudrun_consumer.time_audit import ensure_utc
 
+from backend.common.ops_metrics import REGISTRY, timed
+from cloudrun_consumer.dedupe_cache import MessageDedupeCache
+
 from cloudrun_consumer.idempotency import ensure_message_once
 from cloudrun_consumer.replay_support import ReplayContext, ensure_event_not_applied
 
+firestore_transaction_seconds = REGISTRY.histogram(
+    "consumer_firestore_transaction_seconds",
+    help="Wall-clock seconds per Firestore transaction (including contention retries), labeled by op.",
+    label_names=("op",),
+)
+
 
 def _lww_key(*, published_at: datetime, message_id: str) -> tuple[float, str]:
     """
@@ -103,6 +112,31 @@ def _max_dt(*values: Optional[datetime]) -> Optional[datetime]:
     return max(_as_utc(v) for v in xs)
 
 
+def _existing_event_max(existing: Any) -> Optional[datetime]:
+    """Latest of the stored eventTime/producedAt/publishedAt/source.publishedAt (stale-write guard)."""
+    if not isinstance(existing, dict):
+        return None
+    src = existing.get("source")
+    return _max_dt(
+        _parse_rfc3339(existing.get("eventTime")),
+        _parse_rfc3339(existing.get("producedAt")),
+        _parse_rfc3339(existing.get("publishedAt")),
+        _parse_rfc3339(src.get("publishedAt")) if isinstance(src, dict) else None,
+    )
+
+
+def _message_dedupe_doc_id(*, kind: str, topic: str, message_id: str) -> str:
+    """
+    `ops_message_dedupe/{id}` for a (kind, topic, messageId) triple.
+
+    Firestore doc ids cannot contain '/'; very long ids fall back to a hash.
+    """
+    raw = f"{kind}:{topic}:{message_id}".replace("/", "_")
+    if len(raw) <= 500:
+        return raw
+    return f"{kind}:{_short_hash_id([kind, topic, message_id])}"
+
+
 def _lww_key(*, published_at: datetime, message_id: str) -> tuple[datetime, str]:
     """
     Sort key for last-write-wins using (published_at, message_id).
@@ -203,18 +237,67 @@ class SourceInfo:
     published_at: datetime
 
 
+@dataclass(frozen=True)
+class EventDocWrite:
+    """
+    A fully built event-doc upsert, as `_upsert_event_doc` would apply it.
+
+    Produced by `market_tick_write` / `market_bar_1m_write` and committed in groups by
+    `upsert_event_docs_batch` (the micro-batched last-write-wins path).
+    """
+
+    collection: str
+    doc_id: str
+    event_time: datetime
+    source: SourceInfo
+    doc: dict[str, Any]
+
+    def lww_key(self) -> tuple[datetime, datetime, str]:
+        """Coalescing order: event time, then Pub/Sub (published_at, message_id)."""
+        return (_as_utc(self.event_time), *_lww_key(published_at=self.source.published_at, message_id=self.source.message_id))
+
+
 class FirestoreWriter:
-    def __init__(self, *, project_id: str, database: str = "(default)", collection_prefix: str = "") -> None:
+    # Process-wide cache of committed dedupe markers; None disables the short-circuit.
+    _dedupe_cache: Optional[MessageDedupeCache] = None
+
+    def __init__(
+        self,
+        *,
+        project_id: str,
+        database: str = "(default)",
+        collection_prefix: str = "",
+        dedupe_cache: Optional[MessageDedupeCache] = None,
+    ) -> None:
         from google.cloud import firestore as firestore_mod
 
         self._firestore = firestore_mod
         self._db = firestore_mod.Client(project=project_id, database=database)
         self._collection_prefix = str(collection_prefix or "").strip()
+        self._dedupe_cache = dedupe_cache
 
     def _col(self, name: str) -> str:
         p = self._collection_prefix
         return str(name) if not p else f"{p}{name}"
 
+    def _run_deduped(self, txn_fn: Any, *, scope: str, topic: str, message_id: str) -> Tuple[bool, str]:
+        """
+        Run a transaction gated by `ensure_message_once` through the dedupe cache.
+
+        A cached (scope, topic, messageId) is answered as a duplicate without touching
+        Firestore. Every return path of the gated transactions leaves the marker committed,
+        so the message is remembered once the transaction returns.
+        """
+        cache = self._dedupe_cache
+        if cache is not None and cache.seen(scope=scope, topic=topic, message_id=message_id):
+            return False, "duplicate_message_noop"
+        txn = self._db.transaction()
+        with timed(firestore_transaction_seconds, labels={"op": scope}):
+            result = self._firestore.transactional(txn_fn)(txn)
+        if cache is not None:
+            cache.remember(scope=scope, topic=topic, message_id=message_id)
+        return result
+
     def ensure_trade_signals_idempotency(
         self,
         *,
@@ -263,8 +346,7 @@ class FirestoreWriter:
 
             return True, "ok"
 
-        txn = self._db.transaction()
-        return self._firestore.transactional(_txn)(txn)
+        return self._run_deduped(_txn, scope="trade_signals_dedupe", topic="trade-signals", message_id=mid)
 
     def maybe_write_sampled_dlq_event(
         self,
@@ -439,6 +521,18 @@ class FirestoreWriter:
             return None
         doc_id = mid.replace("/", "_")
         ref = self._db.collection(self._col("ops_pubsub_deliveries")).document(doc_id)
+        cache = self._dedupe_cache
+        if cache is not None and cache.seen(scope="ops_pubsub_deliveries", topic=str(topic or ""), message_id=mid):
+            # Known redelivery: skip the create() that would fail with AlreadyExists.
+            self._bump_pubsub_delivery(
+                ref,
+                topic=topic,
+                subscription=subscription,
+                handler=handler,
+                published_at=published_at,
+                delivery_attempt=delivery_attempt,
+            )
+            return True
         try:
             ref.create(
                 {
@@ -453,6 +547,8 @@ class FirestoreWriter:
                     "seenCount": 1,
                 }
             )
+            if cache is not None:
+                cache.remember(scope="ops_pubsub_deliveries", topic=str(topic or ""), message_id=mid)
             return False
         except Exception as e:
             try:
@@ -460,24 +556,45 @@ class FirestoreWriter:
             except Exception:
                 AlreadyExists = None  # type: ignore[assignment]
             if AlreadyExists is not None and isinstance(e, AlreadyExists):  # type: ignore[arg-type]
-                try:
-                    ref.set(
-                        {
-                            "lastSeenAt": self._firestore.SERVER_TIMESTAMP,
-                            "seenCount": self._firestore.Increment(1),
-                            "lastTopic": str(topic or ""),
-                            "lastSubscription": str(subscription or ""),
-                            "lastHandler": str(handler or ""),
-                            "lastPublishedAt": _as_utc(published_at),
-                            "lastDeliveryAttempt": int(delivery_attempt) if delivery_attempt is not None else None,
-                        },
-                        merge=True,
-                    )
-                except Exception:
-                    pass
+                if cache is not None:
+                    cache.remember(scope="ops_pubsub_deliveries", topic=str(topic or ""), message_id=mid)
+                self._bump_pubsub_delivery(
+                    ref,
+                    topic=topic,
+                    subscription=subscription,
+                    handler=handler,
+                    published_at=published_at,
+                    delivery_attempt=delivery_attempt,
+                )
                 return True
             return None
 
+    def _bump_pubsub_delivery(
+        self,
+        ref: Any,
+        *,
+        topic: str,
+        subscription: str,
+        handler: str,
+        published_at: datetime,
+        delivery_attempt: Optional[int],
+    ) -> None:
+        try:
+            ref.set(
+                {
+                    "lastSeenAt": self._firestore.SERVER_TIMESTAMP,
+                    "seenCount": self._firestore.Increment(1),
+                    "lastTopic": str(topic or ""),
+                    "lastSubscription": str(subscription or ""),
+                    "lastHandler": str(handler or ""),
+                    "lastPublishedAt": _as_utc(published_at),
+                    "lastDeliveryAttempt": int(delivery_attempt) if delivery_attempt is not None else None,
+                },
+                merge=True,
+            )
+        except Exception:
+            pass
+
     def _upsert_event_doc(
         self,
         *,
@@ -497,7 +614,7 @@ class FirestoreWriter:
             msg_id = str(getattr(source, "message_id", "") or "").strip()
             if msg_id:
                 dedupe_ref = self._db.collection(self._col("ops_message_dedupe")).document(
-                    _dedupe_doc_id(kind=str(collection), topic=str(source.topic), message_id=msg_id)
+                    _message_dedupe_doc_id(kind=str(collection), topic=str(source.topic), message_id=msg_id)
                 )
                 first, _ = ensure_message_once(
                     txn=txn,
@@ -523,15 +640,7 @@ class FirestoreWriter:
             snap = ref.get(transaction=txn)
             existing = snap.to_dict() if snap.exists else {}
 
-            existing_max = None
-            if isinstance(existing, dict):
-                existing_max = _max_dt(
-                    _parse_rfc3339(existing.get("eventTime")),
-                    _parse_rfc3339(existing.get("producedAt")),
-                    _parse_rfc3339(existing.get("publishedAt")),
-                    _parse_rfc3339((existing.get("source") or {}).get("publishedAt")) if isinstance(existing.get("source"), dict) else None,
-                )
-
+            existing_max = _existing_event_max(existing)
             incoming = _as_utc(event_time)
             if existing_max is not None and incoming < existing_max:
                 return False, "stale_event_ignored"
@@ -539,8 +648,158 @@ class FirestoreWriter:
             txn.set(ref, doc)
             return True, "applied"
 
+        return self._run_deduped(
+            _txn,
+            scope=f"ops_message_dedupe:{collection}",
+            topic=str(source.topic),
+            message_id=str(getattr(source, "message_id", "") or ""),
+        )
+
+    def upsert_event_docs_batch(
+        self,
+        writes: Sequence[EventDocWrite],
+        *,
+        max_writes_per_txn: int = 500,
+    ) -> list[Tuple[bool, str]]:
+        """
+        Commit many event-doc upserts, coalescing writes that target the same doc.
+
+        Per target doc this applies the same rules as `_upsert_event_doc` (messageId dedupe,
+        stale-event guard), but only the last-write-wins winner (`EventDocWrite.lww_key`) is
+        written; the other fresh messages get their dedupe marker and `coalesced_superseded`.
+        Target docs are packed into as few transactions as Firestore's per-commit write limit
+        allows (one set per doc + one dedupe create per message).
+
+        Returns one (applied, reason) per input write, in input order. Replay-scoped writes
+        are not supported here; they go through `_upsert_event_doc`.
+        """
+        cache = self._dedupe_cache
+        results: list[Tuple[bool, str]] = [(False, "")] * len(writes)
+        groups: dict[tuple[str, str], list[int]] = {}
+        for i, w in enumerate(writes):
+            if cache is not None and cache.seen(
+                scope=f"ops_message_dedupe:{w.collection}", topic=str(w.source.topic), message_id=str(w.source.message_id)
+            ):
+                results[i] = (False, "duplicate_message_noop")
+                continue
+            groups.setdefault((str(w.collection), str(w.doc_id)), []).append(i)
+
+        limit = max(2, int(max_writes_per_txn))
+        chunk: list[list[int]] = []
+        chunk_writes = 0
+        for idxs in groups.values():
+            cost = len(idxs) + 1
+            if chunk and chunk_writes + cost > limit:
+                self._commit_event_doc_chunk(writes, chunk, results)
+                chunk, chunk_writes = [], 0
+            chunk.append(idxs)
+            chunk_writes += cost
+        if chunk:
+            self._commit_event_doc_chunk(writes, chunk, results)
+        return results
+
+    def _commit_event_doc_chunk(
+        self,
+        writes: Sequence[EventDocWrite],
+        groups: Sequence[Sequence[int]],
+        results: list[Tuple[bool, str]],
+    ) -> None:
+        for i, r in self._commit_event_doc_groups(writes, groups).items():
+            results[i] = r
+        cache = self._dedupe_cache
+        if cache is not None:
+            for idxs in groups:
+                for i in idxs:
+                    w = writes[i]
+                    cache.remember(
+                        scope=f"ops_message_dedupe:{w.collection}", topic=str(w.source.topic), message_id=str(w.source.message_id)
+                    )
+
+    def _commit_event_doc_groups(
+        self,
+        writes: Sequence[EventDocWrite],
+        groups: Sequence[Sequence[int]],
+    ) -> dict[int, Tuple[bool, str]]:
+        dedupe_col = self._db.collection(self._col("ops_message_dedupe"))
+        targets: list[Any] = []
+        dedupe: dict[int, Any] = {}
+        for idxs in groups:
+            w0 = writes[idxs[0]]
+            targets.append(self._db.collection(self._col(w0.collection)).document(str(w0.doc_id)))
+            for i in idxs:
+                w = writes[i]
+                msg_id = str(w.source.message_id or "").strip()
+                if msg_id:
+                    dedupe[i] = dedupe_col.document(
+                        _message_dedupe_doc_id(kind=str(w.collection), topic=str(w.source.topic), message_id=msg_id)
+                    )
+
+        def _txn(txn: Any) -> dict[int, Tuple[bool, str]]:
+            # One round trip for every dedupe marker and target doc in the chunk.
+            refs = {r.path: r for r in [*targets, *dedupe.values()]}
+            snaps = {snap.reference.path: snap for snap in txn.get_all(list(refs.values()))}
+
+            out: dict[int, Tuple[bool, str]] = {}
+            for ref, idxs in zip(targets, groups):
+                snap = snaps.get(ref.path)
+                existing = snap.to_dict() if snap is not None and snap.exists else {}
+                existing_max = _existing_event_max(existing)
+
+                seen: set[str] = set()
+                fresh: list[int] = []
+                for i in idxs:
+                    w = writes[i]
+                    d_ref = dedupe.get(i)
+                    if d_ref is not None:
+                        d_snap = snaps.get(d_ref.path)
+                        if d_ref.path in seen or (d_snap is not None and d_snap.exists):
+                            out[i] = (False, "duplicate_message_noop")
+                            continue
+                        seen.add(d_ref.path)
+                        txn.create(
+                            d_ref,
+                            {
+                                "createdAt": self._firestore.SERVER_TIMESTAMP,
+                                "messageId": str(w.source.message_id).strip(),
+                                "kind": str(w.collection),
+                                "targetDoc": f"{w.collection}/{w.doc_id}",
+                            },
+                        )
+                    if existing_max is not None and _as_utc(w.event_time) < existing_max:
+                        out[i] = (False, "stale_event_ignored")
+                        continue
+                    fresh.append(i)
+
+                if not fresh:
+                    continue
+                winner = max(fresh, key=lambda i: writes[i].lww_key())
+                for i in fresh:
+                    out[i] = (True, "applied") if i == winner else (False, "coalesced_superseded")
+                txn.set(ref, writes[winner].doc)
+            return out
+
         txn = self._db.transaction()
-        return self._firestore.transactional(_txn)(txn)
+        with timed(firestore_transaction_seconds, labels={"op": "event_doc_batch"}):
+            return self._firestore.transactional(_txn)(txn)
+
+    def upsert_event_doc(self, write: EventDocWrite) -> Tuple[bool, str]:
+        """
+        Commit one event-doc upsert in its own transaction (no coalescing).
+
+        Used to retry the writes of a failed `upsert_event_docs_batch` one at a time.
+        """
+        return self._upsert_write(write, replay=None, replay_dedupe_key=write.doc_id)
+
+    def _upsert_write(self, write: EventDocWrite, *, replay: Optional[ReplayContext], replay_dedupe_key: str) -> Tuple[bool, str]:
+        return self._upsert_event_doc(
+            collection=write.collection,
+            doc_id=write.doc_id,
+            event_time=write.event_time,
+            source=write.source,
+            doc=write.doc,
+            replay=replay,
+            replay_dedupe_key=replay_dedupe_key,
+        )
 
     def upsert_market_tick(
         self,
@@ -555,6 +814,30 @@ class FirestoreWriter:
         source: SourceInfo,
         replay: Optional[ReplayContext] = None,
     ) -> Tuple[bool, str]:
+        write = self.market_tick_write(
+            doc_id=doc_id,
+            event_id=event_id,
+            event_time=event_time,
+            produced_at=produced_at,
+            published_at=published_at,
+            symbol=symbol,
+            data=data,
+            source=source,
+        )
+        return self._upsert_write(write, replay=replay, replay_dedupe_key=event_id or doc_id)
+
+    def market_tick_write(
+        self,
+        *,
+        doc_id: str,
+        event_id: Optional[str],
+        event_time: datetime,
+        produced_at: Optional[datetime],
+        published_at: Optional[datetime],
+        symbol: Optional[str],
+        data: dict[str, Any],
+        source: SourceInfo,
+    ) -> EventDocWrite:
         doc: dict[str, Any] = {
             "docId": str(doc_id),
             "eventId": str(event_id) if event_id else None,
@@ -574,15 +857,7 @@ class FirestoreWriter:
             "lastAppliedAt": self._firestore.SERVER_TIMESTAMP,
         }
         doc = {k: v for k, v in doc.items() if v is not None}
-        return self._upsert_event_doc(
-            collection="market_ticks",
-            doc_id=str(doc_id),
-            event_time=event_time,
-            source=source,
-            doc=doc,
-            replay=replay,
-            replay_dedupe_key=event_id or doc_id,
-        )
+        return EventDocWrite(collection="market_ticks", doc_id=str(doc_id), event_time=event_time, source=source, doc=doc)
 
     def upsert_market_bar_1m(
         self,
@@ -600,6 +875,36 @@ class FirestoreWriter:
         source: SourceInfo,
         replay: Optional[ReplayContext] = None,
     ) -> Tuple[bool, str]:
+        write = self.market_bar_1m_write(
+            doc_id=doc_id,
+            event_id=event_id,
+            event_time=event_time,
+            produced_at=produced_at,
+            published_at=published_at,
+            symbol=symbol,
+            timeframe=timeframe,
+            start=start,
+            end=end,
+            data=data,
+            source=source,
+        )
+        return self._upsert_write(write, replay=replay, replay_dedupe_key=event_id or doc_id)
+
+    def market_bar_1m_write(
+        self,
+        *,
+        doc_id: str,
+        event_id: Optional[str],
+        event_time: datetime,
+        produced_at: Optional[datetime],
+        published_at: Optional[datetime],
+        symbol: Optional[str],
+        timeframe: Optional[str],
+        start: Optional[datetime],
+        end: Optional[datetime],
+        data: dict[str, Any],
+        source: SourceInfo,
+    ) -> EventDocWrite:
         doc: dict[str, Any] = {
             "docId": str(doc_id),
             "eventId": str(event_id) if event_id else None,
@@ -622,15 +927,7 @@ class FirestoreWriter:
             "lastAppliedAt": self._firestore.SERVER_TIMESTAMP,
         }
         doc = {k: v for k, v in doc.items() if v is not None}
-        return self._upsert_event_doc(
-            collection="market_bars_1m",
-            doc_id=str(doc_id),
-            event_time=event_time,
-            source=source,
-            doc=doc,
-            replay=replay,
-            replay_dedupe_key=event_id or doc_id,
-        )
+        return EventDocWrite(collection="market_bars_1m", doc_id=str(doc_id), event_time=event_time, source=source, doc=doc)
 
     def upsert_trade_signal(
         self,
@@ -759,8 +1056,7 @@ class FirestoreWriter:
             txn.set(dedupe_ref, {"outcome": "applied"}, merge=True)
             return True, "applied"
 
-        txn = self._db.transaction()
-        return self._firestore.transactional(_txn)(txn)
+        return self._run_deduped(_txn, scope="ops_dedupe", topic=str(source.topic), message_id=str(message_id))
 
     def dedupe_and_upsert_ingest_pipeline(
         self,
@@ -811,8 +1107,7 @@ class FirestoreWriter:
             txn.set(dedupe_ref, {"outcome": "applied"}, merge=True)
             return True, "applied"
 
-        txn = self._db.transaction()
-        return self._firestore.transactional(_txn)(txn)
+        return self._run_deduped(_txn, scope="ingest_pipelines_dedupe", topic=str(source.topic), message_id=str(message_id))
 
 
 def apply_pubsub_lww(
@@ -842,6 +1137,7 @@ def apply_pubsub_lww(
 
 
 __all__ = [
+    "EventDocWrite",
     "SourceInfo",
     "FirestoreWriter",
     "_existing_pubsub_lww",
@@ -4,29 +4,17 @@ from datetime import datetime
 from typing import Any, Optional
 
 from cloudrun_consumer.event_utils import choose_doc_id, ordering_ts, parse_ts
-from cloudrun_consumer.firestore_writer import SourceInfo
+from cloudrun_consumer.firestore_writer import EventDocWrite, SourceInfo
 from cloudrun_consumer.replay_support import ReplayContext
 
 
-def handle_market_tick(
+def _market_tick_fields(
     *,
     payload: dict[str, Any],
-    env: str,
-    default_region: str,
     source_topic: str,
     message_id: str,
     pubsub_published_at: datetime,
-    firestore_writer: Any,
-    replay: ReplayContext | None = None,
 ) -> dict[str, Any]:
-    """
-    Materialize market tick events into `market_ticks/{eventId|messageId}`.
-
-    Payload is stored mostly verbatim under `data` for schema flexibility.
-    """
-    _ = env
-    _ = default_region
-
     doc_id = choose_doc_id(payload=payload, message_id=message_id)
     event_id = None
     if "eventId" in payload and payload.get("eventId") is not None:
@@ -39,24 +27,75 @@ def handle_market_tick(
     symbol = payload.get("symbol") if isinstance(payload.get("symbol"), str) else None
 
     source = SourceInfo(topic=str(source_topic or ""), message_id=str(message_id), published_at=pubsub_published_at)
-    applied, reason = firestore_writer.upsert_market_tick(
-        doc_id=doc_id,
-        event_id=event_id,
-        event_time=event_time,
-        produced_at=produced_at,
-        published_at=published_at,
-        symbol=symbol,
-        data=payload,
-        source=source,
-        replay=replay,
-    )
+    return {
+        "doc_id": doc_id,
+        "event_id": event_id,
+        "event_time": event_time,
+        "produced_at": produced_at,
+        "published_at": published_at,
+        "symbol": symbol,
+        "data": payload,
+        "source": source,
+    }
 
+
+def _result(fields: dict[str, Any], *, applied: Optional[bool] = None, reason: Optional[str] = None) -> dict[str, Any]:
     return {
         "kind": "market_ticks",
-        "docId": doc_id,
-        "symbol": symbol,
+        "docId": fields["doc_id"],
+        "symbol": fields["symbol"],
         "applied": bool(applied),
         "reason": str(reason),
-        "eventTime": event_time.isoformat(),
+        "eventTime": fields["event_time"].isoformat(),
     }
 
+
+def handle_market_tick(
+    *,
+    payload: dict[str, Any],
+    env: str,
+    default_region: str,
+    source_topic: str,
+    message_id: str,
+    pubsub_published_at: datetime,
+    firestore_writer: Any,
+    replay: ReplayContext | None = None,
+) -> dict[str, Any]:
+    """
+    Materialize market tick events into `market_ticks/{eventId|messageId}`.
+
+    Payload is stored mostly verbatim under `data` for schema flexibility.
+    """
+    _ = env
+    _ = default_region
+
+    fields = _market_tick_fields(
+        payload=payload,
+        source_topic=source_topic,
+        message_id=message_id,
+        pubsub_published_at=pubsub_published_at,
+    )
+    applied, reason = firestore_writer.upsert_market_tick(**fields, replay=replay)
+    return _result(fields, applied=applied, reason=reason)
+
+
+def prepare_market_tick(
+    *,
+    payload: dict[str, Any],
+    source_topic: str,
+    message_id: str,
+    pubsub_published_at: datetime,
+    firestore_writer: Any,
+) -> tuple[EventDocWrite, dict[str, Any]]:
+    """
+    Build the `market_ticks` write for the micro-batched path without committing it.
+
+    Returns (write, result); the caller fills in `applied` / `reason` once the batch commits.
+    """
+    fields = _market_tick_fields(
+        payload=payload,
+        source_topic=source_topic,
+        message_id=message_id,
+        pubsub_published_at=pubsub_published_at,
+    )
+    return firestore_writer.market_tick_write(**fields), _result(fields)
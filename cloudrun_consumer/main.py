@@ -29,11 +29,14 @@ from backend.common.logging import install_fastapi_request_id_middleware
 from backend.common.logging import log_standard_event
 from backend.observability.correlation import bind_correlation_id, get_or_create_correlation_id
 
+from backend.common.ops_metrics import REGISTRY, timed
 from backend.contracts.ops_alerts import try_write_contract_violation_alert
 from backend.contracts.registry import validate_topic_event
 
+from cloudrun_consumer.dedupe_cache import MessageDedupeCache
 from cloudrun_consumer.event_utils import infer_topic
-from cloudrun_consumer.firestore_writer import FirestoreWriter
+from cloudrun_consumer.firestore_writer import EventDocWrite, FirestoreWriter
+from cloudrun_consumer.microbatch import LwwMicroBatcher, MicroBatchQueueFull
 from cloudrun_consumer.replay_support import ReplayContext, write_replay_marker
 from cloudrun_consumer.schema_router import route_payload
 from cloudrun_consumer.time_audit import ensure_utc
@@ -55,6 +58,35 @@ def _startup_diag(event_type: str, *, severity: str = "INFO", **fields: Any) ->
 SERVICE_NAME = "cloudrun-pubsub-firestore-materializer"
 DLQ_SAMPLE_RATE_DEFAULT = "0.01"
 DLQ_SAMPLE_TTL_HOURS_DEFAULT = "72"
+CONSUMER_MAX_WORKERS_DEFAULT = "8"
+CONSUMER_QUEUE_SIZE_DEFAULT = "64"
+FIRESTORE_RETRY_MAX_ATTEMPTS_DEFAULT = "6"
+FIRESTORE_RETRY_INITIAL_BACKOFF_S_DEFAULT = "0.25"
+FIRESTORE_RETRY_MAX_BACKOFF_S_DEFAULT = "6.0"
+FIRESTORE_RETRY_MAX_TOTAL_S_DEFAULT = "8.0"
+# Micro-batched last-write-wins materialization (market_ticks, market_bars_1m); window 0 disables.
+FIRESTORE_MICROBATCH_WINDOW_MS_DEFAULT = "50"
+FIRESTORE_MICROBATCH_MAX_MESSAGES_DEFAULT = "200"
+FIRESTORE_MICROBATCH_QUEUE_SIZE_DEFAULT = "2000"
+# In-process cache of committed dedupe markers; TTL 0 disables.
+DEDUPE_CACHE_MAX_ENTRIES_DEFAULT = "100000"
+DEDUPE_CACHE_TTL_S_DEFAULT = "600"
+
+message_processing_seconds = REGISTRY.histogram(
+    "consumer_message_processing_seconds",
+    help="Wall-clock seconds to materialize one message (including Firestore retries), labeled by handler.",
+    label_names=("handler",),
+)
+# Children bound per handler on first use, so the per-message path skips the label lookup.
+_processing_seconds_by_handler: dict[str, Any] = {}
+
+
+def _processing_seconds(handler: str) -> Any:
+    child = _processing_seconds_by_handler.get(handler)
+    if child is None:
+        child = _processing_seconds_by_handler.setdefault(handler, message_processing_seconds.labels(handler=handler))
+    return child
+
 
 # Emit structured JSON to stdout (Cloud Run will ingest as jsonPayload).
 init_structured_logging(service=SERVICE_NAME, env=os.getenv("ENV") or "unknown", level=os.getenv("LOG_LEVEL") or "INFO")
@@ -153,6 +185,42 @@ def _process_item_with_retry_sync(item: _WorkItem) -> dict[str, Any]:
     Retries transient Firestore errors with exponential backoff.
     Raises `_PermanentFirestoreError` on permanent Firestore permission/validation failures.
     """
+    with timed(_processing_seconds(item.handler_name)):
+        return _with_firestore_retry_sync(
+            lambda: _process_item_once_sync(item),
+            messageId=item.message_id,
+            topic=item.source_topic,
+            handler=item.handler_name,
+        )
+
+
+def _commit_event_docs_with_retry_sync(writes: list[EventDocWrite]) -> list[tuple[bool, str]]:
+    """
+    Commits one micro-batch of last-write-wins event docs (runs in a worker thread).
+    """
+    writer: FirestoreWriter = app.state.firestore_writer
+    with timed(_processing_seconds("microbatch")):
+        return _with_firestore_retry_sync(
+            lambda: writer.upsert_event_docs_batch(writes),
+            handler="microbatch",
+            batch_size=len(writes),
+        )
+
+
+def _commit_event_doc_with_retry_sync(write: EventDocWrite) -> tuple[bool, str]:
+    """
+    Commits one last-write-wins event doc on its own (micro-batch fallback; worker thread).
+    """
+    writer: FirestoreWriter = app.state.firestore_writer
+    return _with_firestore_retry_sync(
+        lambda: writer.upsert_event_doc(write),
+        messageId=write.source.message_id,
+        topic=write.source.topic,
+        handler="microbatch",
+    )
+
+
+def _with_firestore_retry_sync(fn: Any, **log_fields: Any) -> Any:
     max_attempts = max(1, _int_env("FIRESTORE_RETRY_MAX_ATTEMPTS", default=FIRESTORE_RETRY_MAX_ATTEMPTS_DEFAULT))
     initial_backoff_s = max(0.0, _float_env("FIRESTORE_RETRY_INITIAL_BACKOFF_S", default=FIRESTORE_RETRY_INITIAL_BACKOFF_S_DEFAULT))
     max_backoff_s = max(0.0, _float_env("FIRESTORE_RETRY_MAX_BACKOFF_S", default=FIRESTORE_RETRY_MAX_BACKOFF_S_DEFAULT))
@@ -163,7 +231,7 @@ def _process_item_with_retry_sync(item: _WorkItem) -> dict[str, Any]:
 
     for attempt in range(1, max_attempts + 1):
         try:
-            return _process_item_once_sync(item)
+            return fn()
         except ValueError:
             # "Poison" events should not be retried by us (Pub/Sub DLQ policy can handle).
             raise
@@ -181,9 +249,7 @@ def _process_item_with_retry_sync(item: _WorkItem) -> dict[str, Any]:
             log(
                 "firestore.retry",
                 severity="WARNING",
-                messageId=item.message_id,
-                topic=item.source_topic,
-                handler=item.handler_name,
+                **log_fields,
                 attempt=attempt,
                 max_attempts=max_attempts,
                 sleep_s=sleep_s,
@@ -341,6 +407,8 @@ class _WorkItem:
     env: str
     default_region: str
     replay: ReplayContext | None
+    # Set for idempotent last-write-wins routes (`RoutedHandler.prepare`).
+    prepare_fn: Any = None
 
 
 class _WorkQueueFull(Exception):
@@ -348,20 +416,49 @@ class _WorkQueueFull(Exception):
 
 
 class _WorkQueue:
-    def __init__(self, *, workers: int, queue_size: int) -> None:
+    """
+    Bounded worker pool for materialization work.
+
+    Handlers run in worker threads (with Firestore retry), so at most `workers` messages
+    are in flight and at most `queue_size` wait; a full queue surfaces as `_WorkQueueFull`.
+    Items with a `prepare_fn` (and no replay context) skip the worker pool: their write is
+    built up front and handed to the micro-batcher, which coalesces writes per target doc
+    and commits them in batches. Each item still resolves to its own result/exception.
+    """
+
+    def __init__(self, *, workers: int, queue_size: int, batcher: Optional[LwwMicroBatcher] = None) -> None:
         self._queue: asyncio.Queue[tuple[_WorkItem, asyncio.Future[dict[str, Any]]]] = asyncio.Queue(
             maxsize=max(0, int(queue_size))
         )
         self._workers: list[asyncio.Task[None]] = []
         self._workers_n = max(1, int(workers))
+        self._batcher = batcher
+
+    @property
+    def batcher(self) -> Optional[LwwMicroBatcher]:
+        return self._batcher
+
+    def batchable(self, item: _WorkItem) -> bool:
+        return self._batcher is not None and item.prepare_fn is not None and item.replay is None
 
     def start(self) -> None:
+        if self._batcher is not None:
+            self._batcher.start()
         if self._workers:
             return
         for i in range(self._workers_n):
             self._workers.append(asyncio.create_task(self._worker_loop(i)))
 
+    async def stop(self) -> None:
+        if self._batcher is not None:
+            await self._batcher.stop()
+        for t in self._workers:
+            t.cancel()
+        self._workers = []
+
     async def submit(self, item: _WorkItem) -> dict[str, Any]:
+        if self.batchable(item):
+            return await self._submit_batched(item)
         loop = asyncio.get_running_loop()
         fut: asyncio.Future[dict[str, Any]] = loop.create_future()
         try:
@@ -370,6 +467,21 @@ class _WorkQueue:
             raise _WorkQueueFull() from e
         return await fut
 
+    async def _submit_batched(self, item: _WorkItem) -> dict[str, Any]:
+        assert self._batcher is not None
+        write, result = item.prepare_fn(
+            payload=item.payload,
+            source_topic=item.source_topic,
+            message_id=item.message_id,
+            pubsub_published_at=item.publish_time,
+            firestore_writer=app.state.firestore_writer,
+        )
+        try:
+            applied, reason = await self._batcher.submit(write)
+        except MicroBatchQueueFull as e:
+            raise _WorkQueueFull() from e
+        return {**result, "applied": bool(applied), "reason": str(reason)}
+
     async def _worker_loop(self, worker_id: int) -> None:
         while True:
             item, fut = await self._queue.get()
@@ -455,9 +567,38 @@ async def _startup() -> None:
 
     database = os.getenv("FIRESTORE_DATABASE") or "(default)"
     collection_prefix = os.getenv("FIRESTORE_COLLECTION_PREFIX") or ""
-    app.state.firestore_writer = FirestoreWriter(project_id=project_id, database=database, collection_prefix=collection_prefix)
+    dedupe_cache: Optional[MessageDedupeCache] = None
+    dedupe_cache_ttl_s = max(0.0, _float_env("DEDUPE_CACHE_TTL_S", default=DEDUPE_CACHE_TTL_S_DEFAULT))
+    if dedupe_cache_ttl_s > 0.0:
+        dedupe_cache = MessageDedupeCache(
+            max_entries=_int_env("DEDUPE_CACHE_MAX_ENTRIES", default=DEDUPE_CACHE_MAX_ENTRIES_DEFAULT),
+            ttl_s=dedupe_cache_ttl_s,
+        )
+    app.state.firestore_writer = FirestoreWriter(
+        project_id=project_id,
+        database=database,
+        collection_prefix=collection_prefix,
+        dedupe_cache=dedupe_cache,
+    )
     app.state.loop_heartbeat_monotonic = time.monotonic()
 
+    microbatch_window_ms = max(0.0, _float_env("FIRESTORE_MICROBATCH_WINDOW_MS", default=FIRESTORE_MICROBATCH_WINDOW_MS_DEFAULT))
+    batcher: Optional[LwwMicroBatcher] = None
+    if microbatch_window_ms > 0.0:
+        batcher = LwwMicroBatcher(
+            commit=_commit_event_docs_with_retry_sync,
+            commit_one=_commit_event_doc_with_retry_sync,
+            window_ms=microbatch_window_ms,
+            max_batch=_int_env("FIRESTORE_MICROBATCH_MAX_MESSAGES", default=FIRESTORE_MICROBATCH_MAX_MESSAGES_DEFAULT),
+            queue_size=_int_env("FIRESTORE_MICROBATCH_QUEUE_SIZE", default=FIRESTORE_MICROBATCH_QUEUE_SIZE_DEFAULT),
+        )
+    app.state.work_queue = _WorkQueue(
+        workers=_int_env("CONSUMER_MAX_WORKERS", default=CONSUMER_MAX_WORKERS_DEFAULT),
+        queue_size=_int_env("CONSUMER_QUEUE_SIZE", default=CONSUMER_QUEUE_SIZE_DEFAULT),
+        batcher=batcher,
+    )
+    app.state.work_queue.start()
+
     log(
         "startup",
         severity="INFO",
@@ -471,9 +612,25 @@ async def _startup() -> None:
         env=os.getenv("ENV") or "unknown",
         default_region=os.getenv("DEFAULT_REGION") or "unknown",
         subscription_topic_map=bool((os.getenv("SUBSCRIPTION_TOPIC_MAP") or "").strip()),
+        microbatch_window_ms=microbatch_window_ms,
+        dedupe_cache_ttl_s=dedupe_cache_ttl_s,
     )
 
 
+@app.on_event("shutdown")
+async def _shutdown() -> None:
+    work_queue: Optional[_WorkQueue] = getattr(app.state, "work_queue", None)
+    if work_queue is not None:
+        # Commit (and answer) every message already handed to the micro-batcher.
+        await work_queue.stop()
+        if work_queue.batcher is not None:
+            log("microbatch.stats", severity="INFO", **work_queue.batcher.stats())
+    writer: Optional[FirestoreWriter] = getattr(app.state, "firestore_writer", None)
+    cache = getattr(writer, "_dedupe_cache", None)
+    if cache is not None:
+        log("dedupe_cache.stats", severity="INFO", **cache.stats())
+
+
 @app.get("/healthz")
 async def healthz() -> dict[str, Any]:
     return {"status": "ok", "service": SERVICE_NAME, "ts": _utc_now().isoformat()}
@@ -486,6 +643,11 @@ async def readyz(response: Response) -> dict[str, Any]:
     return {"status": "ok" if ok else "not_ready", "service": SERVICE_NAME}
 
 
+@app.get("/metrics")
+async def metrics() -> Response:
+    return Response(content=REGISTRY.render_prometheus_text(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.get("/livez")
 async def livez(response: Response) -> dict[str, Any]:
     now = time.monotonic()
@@ -633,18 +795,53 @@ async def pubsub_push(req: Request) -> dict[str, Any]:
 
     writer: FirestoreWriter = app.state.firestore_writer
 
+    work_queue: Optional[_WorkQueue] = getattr(app.state, "work_queue", None)
+    item = _WorkItem(
+        message_id=message_id,
+        subscription=subscription,
+        source_topic=source_topic,
+        handler_name=routed.name,
+        handler_fn=routed.handler,
+        payload=payload,
+        attributes=attributes,
+        publish_time=publish_time,
+        delivery_attempt=delivery_attempt,
+        env=env,
+        default_region=default_region,
+        replay=replay,
+        prepare_fn=routed.prepare,
+    )
+    batched = work_queue is not None and work_queue.batchable(item)
+
     with bind_correlation_id(correlation_id=correlation_id):
         try:
-            result = routed.handler(
-                payload=payload,
-                env=env,
-                default_region=default_region,
-                source_topic=source_topic,
-                message_id=message_id,
-                pubsub_published_at=publish_time,
-                firestore_writer=writer,
-                replay=replay,
+            if work_queue is not None:
+                result = await work_queue.submit(item)
+            else:
+                with timed(_processing_seconds(routed.name)):
+                    result = routed.handler(
+                        payload=payload,
+                        env=env,
+                        default_region=default_region,
+                        source_topic=source_topic,
+                        message_id=message_id,
+                        pubsub_published_at=publish_time,
+                        firestore_writer=writer,
+                        replay=replay,
+                    )
+        except _WorkQueueFull as e:
+            log(
+                "materialize.backpressure",
+                severity="WARNING",
+                outcome="failure",
+                correlation_id=correlation_id,
+                latency_ms=_latency_ms(),
+                handler=routed.name,
+                messageId=message_id,
+                topic=source_topic,
+                subscription=subscription,
             )
+            raise HTTPException(status_code=429, detail="backpressure_queue_full") from e
         except ValueError as e:
             log(
                 "materialize.bad_event",
@@ -676,7 +873,7 @@ async def pubsub_push(req: Request) -> dict[str, Any]:
 
         # Post-dedupe observability (best-effort) - no gating.
         try:
-            writer.observe_pubsub_delivery(
+            observe_kwargs: dict[str, Any] = dict(
                 message_id=message_id,
                 topic=source_topic,
                 subscription=subscription,
@@ -684,6 +881,12 @@ async def pubsub_push(req: Request) -> dict[str, Any]:
                 published_at=publish_time,
                 delivery_attempt=delivery_attempt,
             )
+            if batched:
+                # Keep the event loop free so concurrent pushes can share a batch window.
+                await asyncio.to_thread(writer.observe_pubsub_delivery, **observe_kwargs)
+            elif work_queue is None:
+                # Worker-pool items already recorded their delivery in `_process_item_once_sync`.
+                writer.observe_pubsub_delivery(**observe_kwargs)
         except Exception:
             pass
 
@@ -0,0 +1,155 @@
+"""
+Micro-batching for idempotent last-write-wins event docs (market_ticks, market_bars_1m).
+
+Each push request submits one `EventDocWrite` and awaits its own (applied, reason), so the
+HTTP response (and therefore the Pub/Sub ack/nack) stays per message. A single flusher
+collects writes for up to `window_ms` after the first one arrives (or until `max_batch`),
+then commits them in a worker thread with one `commit(writes)` call, which coalesces writes
+to the same target doc and returns one result per write. If the commit raises, the writes
+are retried one at a time through `commit_one` (when given), so only the message whose own
+write fails gets the exception (-> 5xx -> Pub/Sub redelivery); without `commit_one` every
+message of that batch gets it.
+
+Batches are committed one at a time: writes that arrive while a commit is in flight form
+the next batch, so batches grow with load instead of competing for the same hot docs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Callable, Optional, Sequence, Tuple
+
+from cloudrun_consumer.firestore_writer import EventDocWrite
+
+CommitFn = Callable[[Sequence[EventDocWrite]], Sequence[Tuple[bool, str]]]
+CommitOneFn = Callable[[EventDocWrite], Tuple[bool, str]]
+
+
+class MicroBatchQueueFull(Exception):
+    pass
+
+
+class LwwMicroBatcher:
+    def __init__(
+        self,
+        *,
+        commit: CommitFn,
+        commit_one: Optional[CommitOneFn] = None,
+        window_ms: float = 50.0,
+        max_batch: int = 200,
+        queue_size: int = 1000,
+    ) -> None:
+        self._commit = commit
+        self._commit_one = commit_one
+        self._window_s = max(0.0, float(window_ms)) / 1000.0
+        self._max_batch = max(1, int(max_batch))
+        # `None` is the stop sentinel.
+        self._queue: asyncio.Queue[Optional[tuple[EventDocWrite, asyncio.Future[Tuple[bool, str]]]]] = asyncio.Queue(
+            maxsize=max(0, int(queue_size))
+        )
+        self._task: Optional[asyncio.Task[None]] = None
+        self.batches = 0
+        self.messages = 0
+        self.docs_written = 0
+        self.coalesced = 0
+        self.fallbacks = 0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "messages": self.messages,
+            "docs_written": self.docs_written,
+            "coalesced": self.coalesced,
+            "fallbacks": self.fallbacks,
+            "queued": self._queue.qsize(),
+        }
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Commit everything already submitted, then stop the flusher."""
+        task, self._task = self._task, None
+        if task is not None:
+            await self._queue.put(None)
+            await task
+
+    async def submit(self, write: EventDocWrite) -> Tuple[bool, str]:
+        if self._task is None:
+            raise RuntimeError("LwwMicroBatcher is not running")
+        fut: asyncio.Future[Tuple[bool, str]] = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((write, fut))
+        except asyncio.QueueFull as e:
+            raise MicroBatchQueueFull() from e
+        return await fut
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = loop.time() + self._window_s
+            while len(batch) < self._max_batch:
+                if self._queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    item = self._queue.get_nowait()
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[tuple[EventDocWrite, asyncio.Future[Tuple[bool, str]]]]) -> None:
+        writes = [w for w, _ in batch]
+        try:
+            results = await asyncio.to_thread(self._commit, writes)
+        except Exception as e:
+            if self._commit_one is None:
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+                return
+            await self._flush_one_by_one(batch)
+            return
+
+        self.batches += 1
+        self.messages += len(batch)
+        self.docs_written += sum(1 for applied, _ in results if applied)
+        self.coalesced += sum(1 for _, reason in results if reason == "coalesced_superseded")
+        for (_, fut), result in zip(batch, results):
+            if not fut.done():
+                fut.set_result(result)
+        if len(results) != len(batch):
+            err = RuntimeError(f"micro-batch commit returned {len(results)} results for {len(batch)} writes")
+            for _, fut in batch[len(results) :]:
+                if not fut.done():
+                    fut.set_exception(err)
+
+    async def _flush_one_by_one(self, batch: list[tuple[EventDocWrite, asyncio.Future[Tuple[bool, str]]]]) -> None:
+        """Retry a failed batch write by write (no coalescing), isolating the failing messages."""
+        assert self._commit_one is not None
+        self.fallbacks += 1
+        self.messages += len(batch)
+        for write, fut in batch:
+            try:
+                result = await asyncio.to_thread(self._commit_one, write)
+            except Exception as e:
+                if not fut.done():
+                    fut.set_exception(e)
+                continue
+            if result[0]:
+                self.docs_written += 1
+            if not fut.done():
+                fut.set_result(result)
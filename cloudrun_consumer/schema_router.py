@@ -5,8 +5,8 @@ from typing import Any, Callable, Optional, Tuple
 
 from cloudrun_consumer.event_utils import choose_doc_id, ordering_ts
 from cloudrun_consumer.handlers.system_events import handle_system_event
-from cloudrun_consumer.handlers.market_ticks import handle_market_tick
-from cloudrun_consumer.handlers.market_bars_1m import handle_market_bar_1m
+from cloudrun_consumer.handlers.market_ticks import handle_market_tick, prepare_market_tick
+from cloudrun_consumer.handlers.market_bars_1m import handle_market_bar_1m, prepare_market_bar_1m
 from cloudrun_consumer.handlers.trade_signals import handle_trade_signal
 from cloudrun_consumer.handlers.ingest_pipelines import handle_ingest_pipeline
 from cloudrun_consumer.idempotency import ensure_message_once
@@ -16,6 +16,9 @@ from cloudrun_consumer.idempotency import ensure_message_once
 class RoutedHandler:
     name: str
     handler: Callable[..., dict[str, Any]]
+    # Idempotent last-write-wins streams: builds the write without committing it so the
+    # consumer can coalesce and batch-commit it (see `_WorkQueue` in main).
+    prepare: Optional[Callable[..., Tuple[Any, dict[str, Any]]]] = None
 
 
 def _wrap_trade_signals(handler: Callable[..., dict[str, Any]]) -> Callable[..., dict[str, Any]]:
@@ -54,8 +57,16 @@ def _wrap_trade_signals(handler: Callable[..., dict[str, Any]]) -> Callable[...,
                     )
                     return bool(first)
 
-                txn = db.transaction()
-                first_time = bool(fs_mod.transactional(_txn)(txn))
+                # In-process cache of committed markers: redeliveries skip the round trip.
+                cache = getattr(firestore_writer, "_dedupe_cache", None)
+                topic = str(kwargs.get("source_topic") or "")
+                if cache is not None and cache.seen(scope="ops_pubsub_dedupe", topic=topic, message_id=message_id):
+                    first_time = False
+                else:
+                    txn = db.transaction()
+                    first_time = bool(fs_mod.transactional(_txn)(txn))
+                    if cache is not None:
+                        cache.remember(scope="ops_pubsub_dedupe", topic=topic, message_id=message_id)
                 if not first_time:
                     pubsub_published_at = kwargs.get("pubsub_published_at")
                     event_time = ordering_ts(payload=payload, pubsub_published_at=pubsub_published_at)
@@ -98,9 +109,9 @@ def route_payload(
     # Topic-based routing for additional streams.
     t = (topic or "").strip()
     if t == "market-ticks":
-        return RoutedHandler(name="market_ticks", handler=handle_market_tick)
+        return RoutedHandler(name="market_ticks", handler=handle_market_tick, prepare=prepare_market_tick)
     if t == "market-bars-1m":
-        return RoutedHandler(name="market_bars_1m", handler=handle_market_bar_1m)
+        return RoutedHandler(name="market_bars_1m", handler=handle_market_bar_1m, prepare=prepare_market_bar_1m)
     if t == "trade-signals":
         return RoutedHandler(name="trade_signals", handler=_wrap_trade_signals(handle_trade_signal))
     if t in {"ingest-heartbeat", "ingest-pipelines", "ingest-pipeline-health"}:
@@ -1,3 +1,23 @@
+"""
+Load test the Pub/Sub push endpoint (Cloud Run consumer).
+
+System events (default):
+
+    python cloudrun_consumer/scripts/load_test_pubsub_push.py --topic system.events
+
+Micro-batched last-write-wins streams against the Firestore emulator: start the emulator
+(`gcloud emulators firestore start --host-port=localhost:8681`), run the consumer with
+FIRESTORE_EMULATOR_HOST set, then:
+
+    FIRESTORE_EMULATOR_HOST=localhost:8681 python cloudrun_consumer/scripts/load_test_pubsub_push.py \
+        --topic market-ticks --symbols 20 --requests 5000 --concurrency 200 \
+        --verify-firestore-project demo-loadtest
+
+Every symbol maps to one target doc (`eventId=loadtest-{symbol}`), so concurrent pushes
+for a symbol are coalesced. `--verify-firestore-project` reads the docs back and checks
+that each one holds the newest event that was acked for its symbol.
+"""
+
 from __future__ import annotations
 
 import argparse
@@ -13,7 +33,7 @@ import uuid
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Optional, Tuple
 
 _REPO_ROOT = Path(__file__).resolve().parents[2]
 if str(_REPO_ROOT) not in sys.path:
@@ -43,18 +63,36 @@ def _make_system_event_payload(*, service: str, env: str, region: str) -> Dict[s
     }
 
 
+LWW_TOPICS = {"market-ticks": "market_ticks", "market-bars-1m": "market_bars_1m"}
+
+
+def _make_market_payload(*, topic: str, symbol: str, seq: int, produced_at: str) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {
+        "eventId": f"loadtest-{symbol}",
+        "symbol": symbol,
+        "seq": seq,
+        "producedAt": produced_at,
+    }
+    if topic == "market-bars-1m":
+        payload.update({"timeframe": "1m", "open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0, "volume": seq})
+    else:
+        payload.update({"price": 100.0 + (seq % 100) / 100.0, "size": 1})
+    return payload
+
+
 def _make_push_envelope(
     *,
     topic: str,
     subscription: str,
     message_id: str,
     payload: Dict[str, Any],
+    publish_time: Optional[str] = None,
 ) -> Dict[str, Any]:
     return {
         "message": {
             "data": _b64_json(payload),
             "messageId": message_id,
-            "publishTime": _now_rfc3339(),
+            "publishTime": publish_time or _now_rfc3339(),
             "attributes": {"topic": topic},
         },
         "subscription": subscription,
@@ -86,6 +124,45 @@ def _post_json(url: str, body: Dict[str, Any], timeout_s: float) -> Tuple[int, f
         return 0, elapsed, f"exception:{e.__class__.__name__}:{e}"
 
 
+def _parse_rfc3339(value: Any) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc)
+    if not isinstance(value, str) or not value.strip():
+        return None
+    s = value.strip()
+    if s.endswith("Z"):
+        s = s[:-1] + "+00:00"
+    return datetime.fromisoformat(s).astimezone(timezone.utc)
+
+
+def _verify_lww_docs(
+    *,
+    project: str,
+    database: str,
+    collection: str,
+    expected: Dict[str, str],
+) -> Tuple[int, list[str]]:
+    """
+    Read back one doc per symbol and compare its eventTime to the newest acked event.
+
+    Returns (docs_ok, mismatches).
+    """
+    from google.cloud import firestore  # type: ignore
+
+    db = firestore.Client(project=project, database=database)
+    ok = 0
+    mismatches: list[str] = []
+    for symbol, produced_at in sorted(expected.items()):
+        snap = db.collection(collection).document(f"loadtest-{symbol}").get()
+        doc = snap.to_dict() if snap.exists else None
+        got = _parse_rfc3339((doc or {}).get("eventTime"))
+        if got is not None and got == _parse_rfc3339(produced_at):
+            ok += 1
+        else:
+            mismatches.append(f"{symbol}: expected eventTime={produced_at} got={got.isoformat() if got else None}")
+    return ok, mismatches
+
+
 def main() -> int:
     ap = argparse.ArgumentParser(description="Load test Pub/Sub push endpoint (Cloud Run consumer).")
     ap.add_argument("--url", default="http://localhost:8080/pubsub/push")
@@ -97,6 +174,14 @@ def main() -> int:
     ap.add_argument("--service", default="loadtest-service")
     ap.add_argument("--env", default="local")
     ap.add_argument("--region", default="local")
+    ap.add_argument("--symbols", type=int, default=10, help="market-ticks / market-bars-1m: distinct target docs")
+    ap.add_argument(
+        "--verify-firestore-project",
+        default="",
+        help="LWW topics: after the run, read the target docs back (set FIRESTORE_EMULATOR_HOST for the emulator)",
+    )
+    ap.add_argument("--firestore-database", default="(default)")
+    ap.add_argument("--firestore-collection-prefix", default="")
     args = ap.parse_args()
 
     total = max(1, int(args.requests))
@@ -107,12 +192,36 @@ def main() -> int:
     status_counts: Dict[int, int] = {}
     errors: Dict[str, int] = {}
     latencies: list[float] = []
+    lww = args.topic in LWW_TOPICS
+    n_symbols = max(1, int(args.symbols))
+    # symbol -> newest producedAt acked by the consumer (the expected LWW winner).
+    newest_acked: Dict[str, str] = {}
 
     def _one(i: int) -> Tuple[int, float, str]:
         msg_id = f"loadtest-{uuid.uuid4()}"
-        payload = _make_system_event_payload(service=args.service, env=args.env, region=args.region)
-        envlp = _make_push_envelope(topic=args.topic, subscription=args.subscription, message_id=msg_id, payload=payload)
-        return _post_json(args.url, envlp, timeout_s=timeout_s)
+        if not lww:
+            payload = _make_system_event_payload(service=args.service, env=args.env, region=args.region)
+            envlp = _make_push_envelope(topic=args.topic, subscription=args.subscription, message_id=msg_id, payload=payload)
+            return _post_json(args.url, envlp, timeout_s=timeout_s)
+
+        symbol = f"LT{i % n_symbols:03d}"
+        # publishTime == producedAt keeps the consumer's stale-event guard deterministic.
+        produced_at = _now_rfc3339()
+        payload = _make_market_payload(topic=args.topic, symbol=symbol, seq=i, produced_at=produced_at)
+        envlp = _make_push_envelope(
+            topic=args.topic,
+            subscription=args.subscription,
+            message_id=msg_id,
+            payload=payload,
+            publish_time=produced_at,
+        )
+        status, elapsed, err = _post_json(args.url, envlp, timeout_s=timeout_s)
+        if 200 <= status < 300:
+            with lock:
+                prev = newest_acked.get(symbol)
+                if prev is None or _parse_rfc3339(produced_at) > _parse_rfc3339(prev):  # type: ignore[operator]
+                    newest_acked[symbol] = produced_at
+        return status, elapsed, err
 
     started_all = time.perf_counter()
     with ThreadPoolExecutor(max_workers=conc) as ex:
@@ -143,8 +252,22 @@ def main() -> int:
         for k, v in sorted(errors.items(), key=lambda kv: kv[1], reverse=True)[:10]:
             print(f"  {k}: {v}")
 
-    # Non-zero exit if we see transport errors.
-    return 1 if status_counts.get(0, 0) else 0
+    verify_failed = False
+    if lww and args.verify_firestore_project:
+        collection = f"{args.firestore_collection_prefix}{LWW_TOPICS[args.topic]}"
+        docs_ok, mismatches = _verify_lww_docs(
+            project=args.verify_firestore_project,
+            database=args.firestore_database,
+            collection=collection,
+            expected=newest_acked,
+        )
+        print(f"verify: collection={collection} docs_ok={docs_ok}/{len(newest_acked)}")
+        for m in mismatches[:10]:
+            print(f"  mismatch {m}")
+        verify_failed = bool(mismatches)
+
+    # Non-zero exit if we see transport errors (or LWW verification mismatches).
+    return 1 if (status_counts.get(0, 0) or verify_failed) else 0
 
 
 if __name__ == "__main__":
@@ -0,0 +1,249 @@
+import random
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from backend.common.ops_metrics import REGISTRY
+from cloudrun_consumer.dedupe_cache import MessageDedupeCache
+from cloudrun_consumer.firestore_writer import FirestoreWriter, SourceInfo
+
+T0 = datetime(2026, 1, 9, 14, 30, 0, tzinfo=timezone.utc)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Snap:
+    def __init__(self, *, ref: "_DocRef", data: Optional[dict[str, Any]]) -> None:
+        self.reference = ref
+        self.exists = data is not None
+        self._data = deepcopy(data)
+
+    def to_dict(self) -> dict[str, Any]:
+        return deepcopy(self._data) if self._data is not None else {}
+
+
+class _DocRef:
+    def __init__(self, db: "_FakeDB", path: str) -> None:
+        self._db = db
+        self.path = path
+
+    def get(self, *, transaction: Any = None) -> _Snap:  # noqa: ARG002
+        self._db.reads += 1
+        return _Snap(ref=self, data=self._db.store.get(self.path))
+
+
+class _ColRef:
+    def __init__(self, db: "_FakeDB", name: str) -> None:
+        self._db = db
+        self._name = name
+
+    def document(self, doc_id: str) -> _DocRef:
+        return _DocRef(self._db, f"{self._name}/{doc_id}")
+
+
+class _Txn:
+    def __init__(self, db: "_FakeDB") -> None:
+        self._db = db
+
+    def get_all(self, refs: list[_DocRef]) -> list[_Snap]:
+        self._db.reads += 1
+        return [_Snap(ref=r, data=self._db.store.get(r.path)) for r in refs]
+
+    def create(self, ref: _DocRef, doc: dict[str, Any]) -> None:
+        if ref.path in self._db.store:
+            raise RuntimeError("AlreadyExists")
+        self._db.store[ref.path] = deepcopy(doc)
+
+    def set(self, ref: _DocRef, doc: dict[str, Any], merge: bool = False) -> None:  # noqa: ARG002
+        self._db.store[ref.path] = deepcopy(doc)
+
+
+class _FakeDB:
+    """Serializes transactions, which is all Firestore's optimistic concurrency guarantees here."""
+
+    def __init__(self) -> None:
+        self.store: dict[str, dict[str, Any]] = {}
+        self.transactions = 0
+        self.reads = 0
+        self.lock = threading.Lock()
+
+    def collection(self, name: str) -> _ColRef:
+        return _ColRef(self, name)
+
+    def transaction(self) -> _Txn:
+        return _Txn(self)
+
+
+class _FakeFirestoreMod:
+    SERVER_TIMESTAMP = "__SERVER_TIMESTAMP__"
+
+    def __init__(self, db: _FakeDB) -> None:
+        self._db = db
+
+    def transactional(self, fn: Any) -> Any:
+        def _wrapped(txn: Any) -> Any:
+            with self._db.lock:
+                self._db.transactions += 1
+                return fn(txn)
+
+        return _wrapped
+
+
+def _writer(cache: Optional[MessageDedupeCache]) -> FirestoreWriter:
+    w = FirestoreWriter.__new__(FirestoreWriter)
+    db = _FakeDB()
+    w._db = db
+    w._firestore = _FakeFirestoreMod(db)
+    w._collection_prefix = ""
+    w._dedupe_cache = cache
+    return w
+
+
+def _tick(w: FirestoreWriter, *, symbol: str, message_id: str, seconds: int) -> tuple[bool, str]:
+    t = T0 + timedelta(seconds=seconds)
+    return w.upsert_market_tick(
+        doc_id=f"tick-{symbol}",
+        event_id=f"tick-{symbol}",
+        event_time=t,
+        produced_at=t,
+        published_at=None,
+        symbol=symbol,
+        data={"symbol": symbol, "seq": seconds},
+        source=SourceInfo(topic="market-ticks", message_id=message_id, published_at=t),
+    )
+
+
+def _metric(name: str, labels: tuple = ()) -> float:
+    return REGISTRY.snapshot()[name].get(labels, 0.0)
+
+
+class TestMessageDedupeCache(unittest.TestCase):
+    def test_ttl_lru_and_scopes(self) -> None:
+        clock = _Clock()
+        cache = MessageDedupeCache(max_entries=2, ttl_s=10.0, clock=clock)
+        key = dict(scope="ops_message_dedupe:market_ticks", topic="market-ticks")
+
+        self.assertFalse(cache.seen(**key, message_id="m1"))
+        cache.remember(**key, message_id="m1")
+        self.assertTrue(cache.seen(**key, message_id="m1"))
+        # Same message id under another dedupe gate or topic is a different marker.
+        self.assertFalse(cache.seen(scope="ops_pubsub_dedupe", topic="market-ticks", message_id="m1"))
+        self.assertFalse(cache.seen(scope=key["scope"], topic="market-bars-1m", message_id="m1"))
+
+        clock.now += 11.0
+        self.assertFalse(cache.seen(**key, message_id="m1"))
+
+        for mid in ("a", "b"):
+            cache.remember(**key, message_id=mid)
+        self.assertTrue(cache.seen(**key, message_id="a"))  # "a" is now most recently used
+        cache.remember(**key, message_id="c")
+        self.assertTrue(cache.seen(**key, message_id="a"))
+        self.assertFalse(cache.seen(**key, message_id="b"))
+        self.assertEqual(cache.stats()["entries"], 2)
+        self.assertFalse(cache.seen(**key, message_id=""))
+
+    def test_hits_report_saved_reads(self) -> None:
+        cache = MessageDedupeCache()
+        saved0 = _metric("consumer_dedupe_cache_firestore_reads_saved_total")
+        hits0 = _metric("consumer_dedupe_cache_lookups_total", (("result", "hit"),))
+        w = _writer(cache)
+
+        self.assertEqual(_tick(w, symbol="SPY", message_id="m1", seconds=1), (True, "applied"))
+        db: _FakeDB = w._db  # type: ignore[assignment]
+        reads = db.reads
+        for _ in range(3):
+            self.assertEqual(_tick(w, symbol="SPY", message_id="m1", seconds=1), (False, "duplicate_message_noop"))
+
+        self.assertEqual((db.reads, db.transactions), (reads, 1))
+        self.assertEqual(_metric("consumer_dedupe_cache_firestore_reads_saved_total") - saved0, 3.0)
+        self.assertEqual(_metric("consumer_dedupe_cache_lookups_total", (("result", "hit"),)) - hits0, 3.0)
+        self.assertEqual(cache.stats()["hit_ratio"], 0.75)
+
+
+class TestRedeliveryStorm(unittest.TestCase):
+    def _storm(self, cache: Optional[MessageDedupeCache], *, expire_midway: Optional[_Clock] = None) -> tuple[FirestoreWriter, list]:
+        w = _writer(cache)
+        # 40 messages over 8 symbols, each delivered 6 times, shuffled and sent from 8 threads.
+        deliveries = [(f"S{i % 8}", f"m{i}", i) for i in range(40) for _ in range(6)]
+        random.Random(7).shuffle(deliveries)
+
+        def _deliver(d: tuple[str, str, int]) -> tuple[str, tuple[bool, str]]:
+            symbol, mid, seconds = d
+            return mid, _tick(w, symbol=symbol, message_id=mid, seconds=seconds)
+
+        half = len(deliveries) // 2
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            out = list(ex.map(_deliver, deliveries[:half]))
+            if expire_midway is not None:
+                expire_midway.now += 3600.0
+            out += list(ex.map(_deliver, deliveries[half:]))
+        return w, out
+
+    def _assert_exactly_once(self, w: FirestoreWriter, out: list) -> None:
+        db: _FakeDB = w._db  # type: ignore[assignment]
+        first_time = {}
+        for mid, (applied, reason) in out:
+            if reason != "duplicate_message_noop":
+                self.assertNotIn(mid, first_time, f"{mid} processed twice")
+                first_time[mid] = (applied, reason)
+        self.assertEqual(len(first_time), 40)
+        # Every symbol doc ends on its newest event, whatever the delivery order.
+        for s in range(8):
+            newest = max(i for i in range(40) if i % 8 == s)
+            self.assertEqual(db.store[f"market_ticks/tick-S{s}"]["data"]["seq"], newest)
+        markers = [k for k in db.store if k.startswith("ops_message_dedupe/")]
+        self.assertEqual(len(markers), 40)
+
+    def test_storm_with_cache_matches_firestore_only_and_saves_round_trips(self) -> None:
+        baseline, out_baseline = self._storm(None)
+        self._assert_exactly_once(baseline, out_baseline)
+
+        cache = MessageDedupeCache()
+        cached, out_cached = self._storm(cache)
+        self._assert_exactly_once(cached, out_cached)
+
+        final = {k: v for k, v in cached._db.store.items() if k.startswith("market_ticks/")}  # type: ignore[attr-defined]
+        final_baseline = {k: v for k, v in baseline._db.store.items() if k.startswith("market_ticks/")}  # type: ignore[attr-defined]
+        self.assertEqual(final, final_baseline)
+        self.assertEqual(baseline._db.transactions, 240)  # type: ignore[attr-defined]
+        self.assertLess(cached._db.transactions, 240)  # type: ignore[attr-defined]
+        self.assertEqual(cached._db.transactions + cache.stats()["hits"], 240)  # type: ignore[attr-defined]
+
+    def test_storm_stays_exactly_once_when_entries_expire(self) -> None:
+        clock = _Clock()
+        cache = MessageDedupeCache(max_entries=5, ttl_s=30.0, clock=clock)
+        w, out = self._storm(cache, expire_midway=clock)
+        self._assert_exactly_once(w, out)
+
+    def test_batch_path_short_circuits_cached_duplicates(self) -> None:
+        cache = MessageDedupeCache()
+        w = _writer(cache)
+        t = T0
+        write = w.market_tick_write(
+            doc_id="tick-SPY",
+            event_id="tick-SPY",
+            event_time=t,
+            produced_at=t,
+            published_at=None,
+            symbol="SPY",
+            data={"seq": 1},
+            source=SourceInfo(topic="market-ticks", message_id="m1", published_at=t),
+        )
+        self.assertEqual(w.upsert_event_docs_batch([write]), [(True, "applied")])
+        self.assertEqual(w.upsert_event_docs_batch([write, write]), [(False, "duplicate_message_noop")] * 2)
+        self.assertEqual(w._db.transactions, 1)  # type: ignore[attr-defined]
+        # The single-message path shares the marker scope with the batch path.
+        self.assertEqual(_tick(w, symbol="SPY", message_id="m1", seconds=0), (False, "duplicate_message_noop"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,316 @@
+import asyncio
+import threading
+import unittest
+from copy import deepcopy
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from cloudrun_consumer.firestore_writer import EventDocWrite, FirestoreWriter, SourceInfo
+from cloudrun_consumer.handlers.market_ticks import prepare_market_tick
+from cloudrun_consumer.microbatch import LwwMicroBatcher, MicroBatchQueueFull
+
+T0 = datetime(2026, 1, 9, 14, 30, 0, tzinfo=timezone.utc)
+
+
+class _Snap:
+    def __init__(self, *, ref: "_DocRef", data: Optional[dict[str, Any]]) -> None:
+        self.reference = ref
+        self.exists = data is not None
+        self._data = deepcopy(data)
+
+    def to_dict(self) -> dict[str, Any]:
+        return deepcopy(self._data) if self._data is not None else {}
+
+
+class _DocRef:
+    def __init__(self, db: "_FakeDB", path: str) -> None:
+        self._db = db
+        self.path = path
+
+    def get(self, transaction: Any = None) -> _Snap:
+        self._db.reads += 1
+        return _Snap(ref=self, data=self._db.store.get(self.path))
+
+
+class _ColRef:
+    def __init__(self, db: "_FakeDB", name: str) -> None:
+        self._db = db
+        self._name = name
+
+    def document(self, doc_id: str) -> _DocRef:
+        return _DocRef(self._db, f"{self._name}/{doc_id}")
+
+
+class _Txn:
+    def __init__(self, db: "_FakeDB") -> None:
+        self._db = db
+
+    def get_all(self, refs: list[_DocRef]) -> list[_Snap]:
+        self._db.reads += 1
+        return [_Snap(ref=r, data=self._db.store.get(r.path)) for r in refs]
+
+    def create(self, ref: _DocRef, doc: dict[str, Any]) -> None:
+        if ref.path in self._db.store:
+            raise RuntimeError("AlreadyExists")
+        self._db.store[ref.path] = deepcopy(doc)
+
+    def set(self, ref: _DocRef, doc: dict[str, Any]) -> None:
+        self._db.store[ref.path] = deepcopy(doc)
+
+
+class _FakeDB:
+    def __init__(self) -> None:
+        self.store: dict[str, dict[str, Any]] = {}
+        self.transactions = 0
+        self.reads = 0
+
+    def collection(self, name: str) -> _ColRef:
+        return _ColRef(self, name)
+
+    def transaction(self) -> _Txn:
+        self.transactions += 1
+        return _Txn(self)
+
+
+class _FakeFirestoreMod:
+    SERVER_TIMESTAMP = "__SERVER_TIMESTAMP__"
+
+    @staticmethod
+    def transactional(fn: Any) -> Any:
+        return fn
+
+
+def _writer() -> FirestoreWriter:
+    w = FirestoreWriter.__new__(FirestoreWriter)
+    w._db = _FakeDB()
+    w._firestore = _FakeFirestoreMod()
+    w._collection_prefix = ""
+    return w
+
+
+def _tick(w: FirestoreWriter, *, doc_id: str, message_id: str, seconds: int, price: float = 1.0) -> EventDocWrite:
+    t = T0 + timedelta(seconds=seconds)
+    return w.market_tick_write(
+        doc_id=doc_id,
+        event_id=doc_id,
+        event_time=t,
+        produced_at=t,
+        published_at=None,
+        symbol=doc_id,
+        data={"symbol": doc_id, "price": price},
+        source=SourceInfo(topic="market-ticks", message_id=message_id, published_at=t),
+    )
+
+
+class TestUpsertEventDocsBatch(unittest.TestCase):
+    def test_coalesces_per_doc_and_keeps_lww_winner(self) -> None:
+        w = _writer()
+        db: _FakeDB = w._db  # type: ignore[assignment]
+        writes = [
+            _tick(w, doc_id="SPY", message_id="m1", seconds=1, price=1.0),
+            _tick(w, doc_id="SPY", message_id="m2", seconds=3, price=3.0),
+            _tick(w, doc_id="QQQ", message_id="m3", seconds=1, price=9.0),
+            _tick(w, doc_id="SPY", message_id="m4", seconds=2, price=2.0),
+            _tick(w, doc_id="SPY", message_id="m1", seconds=1, price=1.0),  # redelivered while in flight
+        ]
+
+        results = w.upsert_event_docs_batch(writes)
+
+        self.assertEqual(
+            results,
+            [
+                (False, "coalesced_superseded"),
+                (True, "applied"),
+                (True, "applied"),
+                (False, "coalesced_superseded"),
+                (False, "duplicate_message_noop"),
+            ],
+        )
+        self.assertEqual(db.store["market_ticks/SPY"]["data"]["price"], 3.0)
+        self.assertEqual(db.store["market_ticks/SPY"]["lastAppliedMessageId"], "m2")
+        self.assertEqual(db.store["market_ticks/QQQ"]["data"]["price"], 9.0)
+        # Every fresh message is marked, so a redelivery after the batch is a no-op.
+        markers = sorted(k for k in db.store if k.startswith("ops_message_dedupe/"))
+        self.assertEqual(len(markers), 4)
+        self.assertEqual((db.transactions, db.reads), (1, 1))
+
+        again = w.upsert_event_docs_batch([_tick(w, doc_id="SPY", message_id="m4", seconds=2, price=2.0)])
+        self.assertEqual(again, [(False, "duplicate_message_noop")])
+        self.assertEqual(db.store["market_ticks/SPY"]["data"]["price"], 3.0)
+
+    def test_stale_events_are_ignored_against_stored_doc(self) -> None:
+        w = _writer()
+        db: _FakeDB = w._db  # type: ignore[assignment]
+        w.upsert_event_docs_batch([_tick(w, doc_id="SPY", message_id="m1", seconds=10, price=10.0)])
+
+        results = w.upsert_event_docs_batch(
+            [
+                _tick(w, doc_id="SPY", message_id="m2", seconds=5, price=5.0),
+                _tick(w, doc_id="SPY", message_id="m3", seconds=10, price=11.0),
+            ]
+        )
+
+        self.assertEqual(results, [(False, "stale_event_ignored"), (True, "applied")])
+        self.assertEqual(db.store["market_ticks/SPY"]["data"]["price"], 11.0)
+
+    def test_groups_are_split_across_transactions_by_write_limit(self) -> None:
+        w = _writer()
+        db: _FakeDB = w._db  # type: ignore[assignment]
+        writes = [_tick(w, doc_id=f"S{i}", message_id=f"m{i}", seconds=i) for i in range(5)]
+
+        results = w.upsert_event_docs_batch(writes, max_writes_per_txn=4)
+
+        self.assertEqual(results, [(True, "applied")] * 5)
+        self.assertEqual(db.transactions, 3)
+
+    def test_prepare_matches_handler_doc(self) -> None:
+        w = _writer()
+        payload = {"eventId": "evt-1", "symbol": "SPY", "price": 1.5, "producedAt": "2026-01-09T14:30:00Z"}
+        write, result = prepare_market_tick(
+            payload=payload,
+            source_topic="market-ticks",
+            message_id="m1",
+            pubsub_published_at=T0,
+            firestore_writer=w,
+        )
+        self.assertEqual((write.collection, write.doc_id), ("market_ticks", "evt-1"))
+        self.assertEqual(write.doc["data"], payload)
+        self.assertEqual(result["kind"], "market_ticks")
+        self.assertEqual(result["docId"], "evt-1")
+
+
+    def test_single_write_matches_batch_rules(self) -> None:
+        w = _writer()
+        db: _FakeDB = w._db  # type: ignore[assignment]
+        w.upsert_event_docs_batch([_tick(w, doc_id="SPY", message_id="m1", seconds=10, price=10.0)])
+
+        self.assertEqual(w.upsert_event_doc(_tick(w, doc_id="SPY", message_id="m1", seconds=10)), (False, "duplicate_message_noop"))
+        self.assertEqual(w.upsert_event_doc(_tick(w, doc_id="SPY", message_id="m2", seconds=5)), (False, "stale_event_ignored"))
+        self.assertEqual(w.upsert_event_doc(_tick(w, doc_id="SPY", message_id="m3", seconds=11, price=11.0)), (True, "applied"))
+        self.assertEqual(db.store["market_ticks/SPY"]["data"]["price"], 11.0)
+
+
+class TestLwwMicroBatcher(unittest.TestCase):
+    def test_window_batches_concurrent_submits_and_answers_each(self) -> None:
+        calls: list[list[str]] = []
+
+        def commit(writes: list[EventDocWrite]) -> list[tuple[bool, str]]:
+            calls.append([x.source.message_id for x in writes])
+            return [(True, f"ok:{x.source.message_id}") for x in writes]
+
+        w = _writer()
+
+        async def run() -> list[tuple[bool, str]]:
+            b = LwwMicroBatcher(commit=commit, window_ms=50, max_batch=100)
+            b.start()
+            out = await asyncio.gather(*(b.submit(_tick(w, doc_id="SPY", message_id=f"m{i}", seconds=i)) for i in range(6)))
+            await b.stop()
+            self.assertEqual(b.stats()["batches"], 1)
+            return list(out)
+
+        out = asyncio.run(run())
+        self.assertEqual(calls, [[f"m{i}" for i in range(6)]])
+        self.assertEqual(out, [(True, f"ok:m{i}") for i in range(6)])
+
+    def test_commit_failure_fails_every_message_in_the_batch(self) -> None:
+        def commit(writes: list[EventDocWrite]) -> list[tuple[bool, str]]:
+            raise RuntimeError("UNAVAILABLE")
+
+        w = _writer()
+
+        async def run() -> list[Any]:
+            b = LwwMicroBatcher(commit=commit, window_ms=20)
+            b.start()
+            out = await asyncio.gather(
+                *(b.submit(_tick(w, doc_id="SPY", message_id=f"m{i}", seconds=i)) for i in range(3)),
+                return_exceptions=True,
+            )
+            await b.stop()
+            return out
+
+        out = asyncio.run(run())
+        self.assertEqual(len(out), 3)
+        self.assertTrue(all(isinstance(e, RuntimeError) for e in out))
+
+    def test_commit_failure_retries_writes_one_at_a_time(self) -> None:
+        def commit(writes: list[EventDocWrite]) -> list[tuple[bool, str]]:
+            raise RuntimeError("INVALID_ARGUMENT")
+
+        def commit_one(write: EventDocWrite) -> tuple[bool, str]:
+            if write.source.message_id == "m1":
+                raise ValueError("bad doc")
+            return True, "applied"
+
+        w = _writer()
+
+        async def run() -> list[Any]:
+            b = LwwMicroBatcher(commit=commit, commit_one=commit_one, window_ms=20)
+            b.start()
+            out = await asyncio.gather(
+                *(b.submit(_tick(w, doc_id=f"S{i}", message_id=f"m{i}", seconds=i)) for i in range(3)),
+                return_exceptions=True,
+            )
+            await b.stop()
+            self.assertEqual(b.stats()["fallbacks"], 1)
+            return out
+
+        out = asyncio.run(run())
+        self.assertEqual(out[0], (True, "applied"))
+        self.assertIsInstance(out[1], ValueError)
+        self.assertEqual(out[2], (True, "applied"))
+
+    def test_missing_results_fail_the_unanswered_messages(self) -> None:
+        def commit(writes: list[EventDocWrite]) -> list[tuple[bool, str]]:
+            return [(True, "applied")]
+
+        w = _writer()
+
+        async def run() -> list[Any]:
+            b = LwwMicroBatcher(commit=commit, window_ms=20)
+            b.start()
+            out = await asyncio.wait_for(
+                asyncio.gather(
+                    *(b.submit(_tick(w, doc_id=f"S{i}", message_id=f"m{i}", seconds=i)) for i in range(3)),
+                    return_exceptions=True,
+                ),
+                timeout=5,
+            )
+            await b.stop()
+            return out
+
+        out = asyncio.run(run())
+        self.assertEqual(out[0], (True, "applied"))
+        self.assertTrue(all(isinstance(e, RuntimeError) for e in out[1:]))
+
+    def test_full_queue_and_stop_drains_pending(self) -> None:
+        release = threading.Event()
+        committed: list[int] = []
+
+        def commit(writes: list[EventDocWrite]) -> list[tuple[bool, str]]:
+            release.wait(5)
+            committed.append(len(writes))
+            return [(True, "applied")] * len(writes)
+
+        w = _writer()
+
+        async def run() -> None:
+            b = LwwMicroBatcher(commit=commit, window_ms=0, max_batch=1, queue_size=1)
+            b.start()
+            first = asyncio.ensure_future(b.submit(_tick(w, doc_id="A", message_id="m1", seconds=1)))
+            await asyncio.sleep(0.01)  # m1 is now committing; the queue is empty again
+            second = asyncio.ensure_future(b.submit(_tick(w, doc_id="B", message_id="m2", seconds=1)))
+            await asyncio.sleep(0)
+            with self.assertRaises(MicroBatchQueueFull):
+                await b.submit(_tick(w, doc_id="C", message_id="m3", seconds=1))
+            release.set()
+            stop = asyncio.ensure_future(b.stop())
+            self.assertEqual(await first, (True, "applied"))
+            self.assertEqual(await second, (True, "applied"))
+            await stop
+
+        asyncio.run(run())
+        self.assertEqual(committed, [1, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -22,18 +22,30 @@ Usage:
     results = backtester.run()
     print(f"Sharpe Ratio: {results['sharpe_ratio']:.2f}")
     print(f"Max Drawdown: {results['max_drawdown']:.2%}")
+
+    # Long 1m backtests: NumPy-backed fast mode (same fills, float64 curves/metrics)
+    results = backtester.run(fast=True)
 """
 
 import logging
 import os
+from collections.abc import Mapping
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Union
 
 from strategies.base_strategy import BaseStrategy, SignalType, TradingSignal
 
 logger = logging.getLogger(__name__)
 
+# Annualization for 1m bars: 252 trading days * 390 minutes.
+PERIODS_PER_YEAR = 252 * 390
+
+# Fast-mode metrics are computed in float64 instead of Decimal. Trades and PnL are
+# identical (fills are still booked in Decimal); equity/benchmark curves and the
+# metrics derived from them agree with the exact mode to this relative tolerance.
+FAST_MODE_RTOL = 1e-9
+
 
 class BacktestPosition:
     """Represents a position in the backtest portfolio."""
@@ -181,6 +193,108 @@ class BacktestAccount:
         }
 
 
+class BarView(Mapping):
+    """
+    Reusable `market_data` for fast mode: one object re-pointed at each bar.
+
+    Exposes the same keys as the per-bar dict of the exact mode, read from column
+    storage on access, so a strategy only pays for the fields it reads. Keys a strategy
+    assigns are kept until the view moves to the next bar.
+    """
+
+    _KEYS = ("symbol", "price", "timestamp", "open", "high", "low", "close", "volume", "greeks", "gex_status")
+
+    def __init__(self, symbol: str, timestamps: List[datetime], opens: List[float], highs: List[float],
+                 lows: List[float], closes: List[float], volumes: List[int]):
+        self.symbol = symbol
+        self.i = 0
+        self._timestamps = timestamps
+        self._open = opens
+        self._high = highs
+        self._low = lows
+        self._close = closes
+        self._volume = volumes
+        self._extra: Dict[str, Any] = {}
+
+    def seek(self, i: int) -> None:
+        self.i = i
+        if self._extra:
+            self._extra.clear()
+
+    def __getitem__(self, key: str) -> Any:
+        i = self.i
+        if key == "price" or key == "close":
+            return self._close[i]
+        if key in self._extra:
+            return self._extra[key]
+        if key == "symbol":
+            return self.symbol
+        if key == "timestamp":
+            return self._timestamps[i].isoformat()
+        if key == "open":
+            return self._open[i]
+        if key == "high":
+            return self._high[i]
+        if key == "low":
+            return self._low[i]
+        if key == "volume":
+            return self._volume[i]
+        if key == "greeks":
+            return {}  # Simplified
+        if key == "gex_status":
+            return "neutral"  # Simplified
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._extra[key] = value
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._KEYS
+        yield from (k for k in self._extra if k not in self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS) + sum(1 for k in self._extra if k not in self._KEYS)
+
+    def copy(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+
+class AccountView(Mapping):
+    """
+    Reusable `account_snapshot` for fast mode.
+
+    The snapshot only changes when a fill is booked, so it is rebuilt lazily after
+    `invalidate()` instead of once per bar. Treat its values as read-only.
+    """
+
+    def __init__(self, account: BacktestAccount):
+        self._account = account
+        self._snapshot: Optional[Dict[str, Any]] = None
+
+    def invalidate(self) -> None:
+        self._snapshot = None
+
+    def _current(self) -> Dict[str, Any]:
+        if self._snapshot is None:
+            self._snapshot = self._account.get_snapshot()
+        return self._snapshot
+
+    def __getitem__(self, key: str) -> Any:
+        return self._current()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._current())
+
+    def __len__(self) -> int:
+        return len(self._current())
+
+
 class Backtester:
     """
     Backtesting engine that simulates strategy execution on historical data.
@@ -290,10 +404,14 @@ class Backtester:
         logger.info(f"Fetched {len(data)} bars from {data[0]['timestamp']} to {data[-1]['timestamp']}")
         return data
     
-    def run(self) -> Dict[str, Any]:
+    def run(self, fast: bool = False) -> Dict[str, Any]:
         """
         Run the backtest simulation.
         
+        Args:
+            fast: Use the NumPy-backed fast path (see `_run_fast`). Trades match the
+                default mode exactly; curves and metrics within FAST_MODE_RTOL.
+        
         Returns:
             Dictionary with backtest results including metrics and equity curve
         """
@@ -305,6 +423,9 @@ class Backtester:
         if not bars:
             raise ValueError("No data available for backtesting")
         
+        if fast:
+            return self._run_fast(bars)
+        
         # Initialize account
         self.account = BacktestAccount(self.initial_capital)
         
@@ -376,6 +497,100 @@ class Backtester:
         # Calculate metrics
         metrics = self._calculate_metrics()
         
+        return self._results(metrics, self.account.equity_curve, self.benchmark_equity_curve)
+    
+    def _run_fast(self, bars: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        NumPy-backed simulation for long 1m backtests.
+        
+        Differences from the default loop, which are all allocation/precision only:
+        - bars are loaded once into column arrays; the strategy gets one reusable
+          BarView / AccountView instead of fresh market_data/snapshot dicts per bar
+        - Decimal is used only when a fill is booked (same prices as the default mode)
+        - cash/positions are recorded at fills only and expanded into preallocated
+          float64 equity and benchmark curves; metrics are computed on those arrays
+        """
+        import numpy as np  # Lazy import: the default mode does not need NumPy.
+        
+        n = len(bars)
+        timestamps = [bar["timestamp"] for bar in bars]
+        close = np.fromiter((bar["close"] for bar in bars), dtype=np.float64, count=n)
+        # Scalar reads go to Python lists: indexing an ndarray per bar returns np.float64
+        # and is slower than list indexing.
+        closes = close.tolist()
+        view = BarView(
+            self.symbol,
+            timestamps,
+            [bar["open"] for bar in bars],
+            [bar["high"] for bar in bars],
+            [bar["low"] for bar in bars],
+            closes,
+            [bar["volume"] for bar in bars],
+        )
+        
+        self.account = BacktestAccount(self.initial_capital)
+        account_view = AccountView(self.account)
+        benchmark_shares = self.initial_capital / Decimal(str(closes[0]))
+        
+        # State after each bar that booked a fill: (bar index, cash, total qty, open positions).
+        change_idx: List[int] = [0]
+        change_cash: List[float] = [float(self.account.cash)]
+        change_qty: List[float] = [0.0]
+        change_npos: List[int] = [0]
+        
+        evaluate = self.strategy.evaluate
+        trades = self.account.trades
+        hold = SignalType.HOLD
+        for i in range(n):
+            view.seek(i)
+            try:
+                signal = evaluate(view, account_view)
+            except Exception as e:
+                logger.error(f"Strategy evaluation error at {timestamps[i]}: {e}")
+                continue
+            
+            if signal.signal_type == hold:
+                continue
+            n_trades = len(trades)
+            self._execute_signal(signal, Decimal(str(closes[i])), timestamps[i])
+            if len(trades) != n_trades:
+                account_view.invalidate()
+                positions = self.account.positions
+                if i == 0:
+                    # Bar 0 is recorded after its fill, like every other bar.
+                    del change_idx[0], change_cash[0], change_qty[0], change_npos[0]
+                change_idx.append(i)
+                change_cash.append(float(self.account.cash))
+                change_qty.append(float(sum(pos.quantity for pos in positions)))
+                change_npos.append(len(positions))
+        
+        # Forward-fill the fill-time state over every bar, then mark to market.
+        seg = np.searchsorted(np.asarray(change_idx), np.arange(n), side="right") - 1
+        cash = np.asarray(change_cash, dtype=np.float64)[seg]
+        position_value = np.asarray(change_qty, dtype=np.float64)[seg] * close
+        equity = cash + position_value
+        num_positions = np.asarray(change_npos, dtype=np.int64)[seg]
+        benchmark = float(benchmark_shares) * close
+        
+        # Close any remaining positions at the end
+        if self.account.positions:
+            self.account.close_all_positions(Decimal(str(closes[-1])), timestamps[-1])
+        
+        metrics = self._calculate_metrics_fast(equity, benchmark)
+        
+        iso = [t.isoformat() for t in timestamps]
+        self.account.equity_curve = [
+            {"timestamp": t, "equity": e, "cash": c, "position_value": pv, "num_positions": k}
+            for t, e, c, pv, k in zip(iso, equity.tolist(), cash.tolist(), position_value.tolist(), num_positions.tolist())
+        ]
+        self.benchmark_equity_curve = [{"timestamp": t, "equity": b} for t, b in zip(iso, benchmark.tolist())]
+        
+        results = self._results(metrics, self.account.equity_curve, self.benchmark_equity_curve)
+        results["curve_arrays"] = {"equity": equity, "cash": cash, "benchmark": benchmark}
+        return results
+    
+    def _results(self, metrics: Dict[str, Any], equity_curve: List[Dict[str, Any]],
+                 benchmark_curve: List[Dict[str, Any]]) -> Dict[str, Any]:
         logger.info("Backtest complete!")
         logger.info(f"Final Equity: ${metrics['final_equity']:,.2f}")
         logger.info(f"Total Return: {metrics['total_return']:.2%}")
@@ -385,8 +600,8 @@ class Backtester:
         
         return {
             "metrics": metrics,
-            "equity_curve": self.account.equity_curve,
-            "benchmark_curve": self.benchmark_equity_curve,
+            "equity_curve": equity_curve,
+            "benchmark_curve": benchmark_curve,
             "trades": self.account.trades,
             "closed_positions": [pos.to_dict() for pos in self.account.closed_positions],
             "config": {
@@ -461,8 +676,7 @@ class Backtester:
             std_return = variance.sqrt() if variance > 0 else Decimal("0")
             
             # Annualize: 252 days * 390 minutes
-            periods_per_year = 252 * 390
-            sharpe_ratio = (mean_return / std_return * Decimal(str(periods_per_year)).sqrt()) if std_return > 0 else Decimal("0")
+            sharpe_ratio = (mean_return / std_return * Decimal(str(PERIODS_PER_YEAR)).sqrt()) if std_return > 0 else Decimal("0")
         else:
             sharpe_ratio = Decimal("0")
         
@@ -479,6 +693,57 @@ class Backtester:
             if drawdown > max_drawdown:
                 max_drawdown = drawdown
         
+        return {
+            "initial_capital": float(self.initial_capital),
+            "final_equity": float(final_equity),
+            "total_return": float(total_return),
+            "benchmark_return": float(benchmark_return),
+            "alpha": float(total_return - benchmark_return),
+            "sharpe_ratio": float(sharpe_ratio),
+            "max_drawdown": float(max_drawdown),
+            **self._trade_metrics(),
+        }
+    
+    def _calculate_metrics_fast(self, equity: Any, benchmark: Any) -> Dict[str, Any]:
+        """`_calculate_metrics` on float64 equity/benchmark arrays (fast mode)."""
+        import numpy as np
+        
+        if equity.size == 0:
+            return {}
+        
+        initial = float(self.initial_capital)
+        final_equity = float(equity[-1])
+        total_return = (final_equity - initial) / initial
+        benchmark_return = (float(benchmark[-1]) - initial) / initial
+        
+        # Sharpe Ratio (annualized, population std of per-bar returns)
+        sharpe_ratio = 0.0
+        if equity.size > 1:
+            returns = np.diff(equity) / equity[:-1]
+            mean_return = float(returns.mean())
+            std_return = float(np.sqrt(np.mean((returns - mean_return) ** 2)))
+            if std_return > 0:
+                sharpe_ratio = mean_return / std_return * float(np.sqrt(PERIODS_PER_YEAR))
+        
+        # Maximum Drawdown against the running peak
+        peak = np.maximum.accumulate(equity)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdown = np.where(peak > 0, (peak - equity) / peak, 0.0)
+        max_drawdown = max(float(drawdown.max()), 0.0)
+        
+        return {
+            "initial_capital": initial,
+            "final_equity": final_equity,
+            "total_return": total_return,
+            "benchmark_return": benchmark_return,
+            "alpha": total_return - benchmark_return,
+            "sharpe_ratio": sharpe_ratio,
+            "max_drawdown": max_drawdown,
+            **self._trade_metrics(),
+        }
+    
+    def _trade_metrics(self) -> Dict[str, Any]:
+        """Win/loss statistics over closed positions (Decimal PnL, same in both modes)."""
         # Win Rate
         winning_trades = [pos for pos in self.account.closed_positions if pos.pnl and pos.pnl > 0]
         total_trades = len(self.account.closed_positions)
@@ -497,13 +762,6 @@ class Backtester:
             avg_loss = Decimal("0")
         
         return {
-            "initial_capital": float(self.initial_capital),
-            "final_equity": float(final_equity),
-            "total_return": float(total_return),
-            "benchmark_return": float(benchmark_return),
-            "alpha": float(total_return - benchmark_return),
-            "sharpe_ratio": float(sharpe_ratio),
-            "max_drawdown": float(max_drawdown),
             "win_rate": float(win_rate),
             "total_trades": total_trades,
             "winning_trades": len(winning_trades),
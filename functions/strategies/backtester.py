@@ -483,12 +483,18 @@ class Backtester:
         # Record in equity curve
         self.equity_curve.append((timestamp, self.account_state.equity))
     
-    def run(self, regime: Optional[str] = None) -> Dict[str, Any]:
+    def run(
+        self,
+        regime: Optional[str] = None,
+        bars: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
         """
         Run the backtest simulation.
         
         Args:
             regime: Optional market regime to pass to strategy (e.g., "LONG_GAMMA", "SHORT_GAMMA")
+            bars: Optional pre-loaded bars (same shape as fetch_historical_data()); when
+                given, no data is fetched. Used by the parameter sweep (see sweep.py).
         
         Returns:
             Dictionary with backtest results including trades, equity curve, and metrics
@@ -505,7 +511,8 @@ class Backtester:
         )
         
         # Fetch historical data
-        bars = self.fetch_historical_data()
+        if bars is None:
+            bars = self.fetch_historical_data()
         
         if not bars:
             raise ValueError("No historical data available for backtesting")
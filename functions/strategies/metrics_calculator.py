@@ -6,12 +6,18 @@ Calculates key performance metrics for evaluating trading strategies:
 - Maximum Drawdown: Peak-to-trough loss
 - Win Rate: Percentage of profitable trades
 - Other metrics: Total return, volatility, etc.
+
+Three entry points share the formulas and output layout:
+- MetricsCalculator.calculate_all_metrics(): list of (timestamp, Decimal equity) tuples
+- MetricsCalculator.calculate_all_metrics_arrays(): NumPy arrays, one vectorized pass
+- StreamingMetrics: O(1) updates per equity point / fill for live dashboards
 """
 
 import logging
-from datetime import datetime
+from collections import deque
+from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Any, Dict, List, Tuple
+from typing import Any, Deque, Dict, List, Optional, Tuple
 import math
 
 logger = logging.getLogger(__name__)
@@ -52,43 +58,141 @@ class MetricsCalculator:
         if not equity_curve or len(equity_curve) < 2:
             return self._empty_metrics()
         
-        # Calculate return metrics
+        # Derive period returns once; Sharpe, Sortino and volatility share their moments
+        returns = self._calculate_period_returns(equity_curve)
+        mean_return, std_dev, downside_std = self._return_moments(returns)
+        max_drawdown, max_dd_pct = self.calculate_max_drawdown(equity_curve)
+        
         final_equity = equity_curve[-1][1]
-        total_return = self.calculate_total_return(start_capital, final_equity)
-        annualized_return = self.calculate_annualized_return(
-            equity_curve, start_capital
+        return self._assemble_metrics(
+            total_return=self.calculate_total_return(start_capital, final_equity),
+            annualized_return=self._annualize(
+                float(final_equity / start_capital) if start_capital > 0 else 0.0,
+                len(equity_curve)
+            ),
+            sharpe_ratio=self._sharpe(mean_return, std_dev) if returns else 0.0,
+            sortino_ratio=self._sortino(mean_return, downside_std) if returns else 0.0,
+            max_drawdown=float(max_drawdown),
+            max_dd_pct=max_dd_pct,
+            volatility=self._annualize_std(std_dev) if returns else 0.0,
+            trade_metrics=self.calculate_trade_metrics(trades, start_capital),
+            final_equity=float(final_equity),
+            start_capital=float(start_capital),
+            net_profit=float(final_equity - start_capital),
+            start_ts=equity_curve[0][0],
+            end_ts=equity_curve[-1][0],
+            n_points=len(equity_curve)
         )
+    
+    def calculate_all_metrics_arrays(
+        self,
+        timestamps: Any,
+        equity: Any,
+        trades: List[Dict[str, Any]],
+        start_capital: Decimal
+    ) -> Dict[str, Any]:
+        """
+        Calculate all performance metrics from array inputs in one vectorized pass.
         
-        # Calculate risk metrics
-        sharpe_ratio = self.calculate_sharpe_ratio(equity_curve, start_capital)
-        max_drawdown, max_dd_pct = self.calculate_max_drawdown(equity_curve)
-        volatility = self.calculate_volatility(equity_curve)
+        Same keys and formulas as calculate_all_metrics(), for large curves (sweeps,
+        analytics). Equity is float64, so ratios agree with the Decimal path to about
+        1e-12 relative before rounding; the rounded output matches except when a value
+        sits on a rounding boundary.
         
-        # Calculate trade metrics
-        trade_metrics = self.calculate_trade_metrics(trades, start_capital)
+        Args:
+            timestamps: Array/sequence of datetimes or numpy datetime64 (UTC)
+            equity: Array/sequence of equity values, same length
+            trades: List of trade dictionaries
+            start_capital: Initial capital
+        
+        Returns:
+            Dictionary with all calculated metrics
+        """
+        import numpy as np  # Lazy import: the list-based path does not need NumPy.
         
+        eq = np.asarray(equity, dtype=np.float64)
+        if eq.size < 2:
+            return self._empty_metrics()
+        
+        # Period returns; like _calculate_period_returns, skip periods from equity <= 0
+        prev = eq[:-1]
+        valid = prev > 0
+        returns = np.divide(np.diff(eq), prev, out=np.zeros_like(prev), where=valid)[valid]
+        
+        if returns.size:
+            mean_return = float(returns.mean())
+            std_dev = float(np.sqrt(np.mean((returns - mean_return) ** 2)))
+            daily_rf_rate = self.RISK_FREE_RATE / self.TRADING_DAYS_PER_YEAR
+            downside = np.minimum(returns - daily_rf_rate, 0.0)  # masked downside deviation
+            downside_std = float(np.sqrt(np.mean(downside * downside)))
+        else:
+            mean_return = std_dev = downside_std = 0.0
+        
+        # Running max drives drawdown; the first deepest trough wins, as in the loop
+        peak = np.maximum.accumulate(eq)
+        drawdown = peak - eq
+        i = int(np.argmax(drawdown))
+        max_drawdown = float(drawdown[i])
+        max_dd_pct = max_drawdown / float(peak[i]) if max_drawdown > 0 and peak[i] > 0 else 0.0
+        
+        start = float(start_capital)
+        final_equity = float(eq[-1])
+        return self._assemble_metrics(
+            total_return=(final_equity - start) / start if start > 0 else 0.0,
+            annualized_return=self._annualize(final_equity / start if start > 0 else 0.0, int(eq.size)),
+            sharpe_ratio=self._sharpe(mean_return, std_dev) if returns.size else 0.0,
+            sortino_ratio=self._sortino(mean_return, downside_std) if returns.size else 0.0,
+            max_drawdown=max_drawdown,
+            max_dd_pct=max_dd_pct,
+            volatility=self._annualize_std(std_dev) if returns.size else 0.0,
+            trade_metrics=self.calculate_trade_metrics(trades, start_capital),
+            final_equity=final_equity,
+            start_capital=start,
+            # Via Decimal so cent-valued curves report the same net profit as the list path
+            net_profit=float(Decimal(repr(final_equity)) - Decimal(str(start_capital))),
+            start_ts=_as_datetime(timestamps[0]),
+            end_ts=_as_datetime(timestamps[len(timestamps) - 1]),
+            n_points=int(eq.size)
+        )
+    
+    def _assemble_metrics(
+        self,
+        *,
+        total_return: float,
+        annualized_return: float,
+        sharpe_ratio: float,
+        sortino_ratio: float,
+        max_drawdown: float,
+        max_dd_pct: float,
+        volatility: float,
+        trade_metrics: Dict[str, Any],
+        final_equity: float,
+        start_capital: float,
+        net_profit: float,
+        start_ts: datetime,
+        end_ts: datetime,
+        n_points: int
+    ) -> Dict[str, Any]:
+        """Round and lay out the metrics dict shared by every calculation path."""
         # Calculate calmar ratio (return / max drawdown)
         calmar_ratio = (
             annualized_return / abs(max_dd_pct)
             if max_dd_pct != 0 else 0
         )
         
-        # Calculate sortino ratio (downside risk-adjusted return)
-        sortino_ratio = self.calculate_sortino_ratio(equity_curve, start_capital)
-        
         return {
             # Return Metrics
             "total_return_pct": round(total_return * 100, 2),
             "annualized_return_pct": round(annualized_return * 100, 2),
-            "final_equity": float(final_equity),
-            "start_capital": float(start_capital),
-            "net_profit": float(final_equity - start_capital),
+            "final_equity": final_equity,
+            "start_capital": start_capital,
+            "net_profit": net_profit,
             
             # Risk Metrics
             "sharpe_ratio": round(sharpe_ratio, 3),
             "sortino_ratio": round(sortino_ratio, 3),
             "calmar_ratio": round(calmar_ratio, 3),
-            "max_drawdown_dollars": round(float(max_drawdown), 2),
+            "max_drawdown_dollars": round(max_drawdown, 2),
             "max_drawdown_pct": round(max_dd_pct * 100, 2),
             "volatility_annualized_pct": round(volatility * 100, 2),
             
@@ -96,9 +200,9 @@ class MetricsCalculator:
             **trade_metrics,
             
             # Period
-            "start_date": equity_curve[0][0].isoformat(),
-            "end_date": equity_curve[-1][0].isoformat(),
-            "trading_days": len(equity_curve)
+            "start_date": start_ts.isoformat(),
+            "end_date": end_ts.isoformat(),
+            "trading_days": n_points
         }
     
     def calculate_total_return(
@@ -136,20 +240,11 @@ class MetricsCalculator:
             return 0.0
         
         final_equity = equity_curve[-1][1]
-        trading_days = len(equity_curve)
-        
-        if start_capital <= 0 or trading_days == 0:
-            return 0.0
-        
-        # Calculate compounded annual growth rate
-        total_return = float(final_equity / start_capital)
-        years = trading_days / self.TRADING_DAYS_PER_YEAR
         
-        if total_return <= 0 or years <= 0:
+        if start_capital <= 0:
             return 0.0
         
-        annualized = (total_return ** (1 / years)) - 1
-        return annualized
+        return self._annualize(float(final_equity / start_capital), len(equity_curve))
     
     def calculate_sharpe_ratio(
         self,
@@ -178,26 +273,8 @@ class MetricsCalculator:
         if not returns:
             return 0.0
         
-        # Calculate mean return
-        mean_return = sum(returns) / len(returns)
-        
-        # Calculate standard deviation of returns
-        variance = sum((r - mean_return) ** 2 for r in returns) / len(returns)
-        std_dev = math.sqrt(variance)
-        
-        if std_dev == 0:
-            return 0.0
-        
-        # Calculate daily risk-free rate
-        daily_rf_rate = self.RISK_FREE_RATE / self.TRADING_DAYS_PER_YEAR
-        
-        # Calculate Sharpe ratio
-        sharpe = (mean_return - daily_rf_rate) / std_dev
-        
-        # Annualize
-        sharpe_annualized = sharpe * math.sqrt(self.TRADING_DAYS_PER_YEAR)
-        
-        return sharpe_annualized
+        mean_return, std_dev, _ = self._return_moments(returns)
+        return self._sharpe(mean_return, std_dev)
     
     def calculate_sortino_ratio(
         self,
@@ -221,25 +298,8 @@ class MetricsCalculator:
         if not returns:
             return 0.0
         
-        # Calculate mean return
-        mean_return = sum(returns) / len(returns)
-        
-        # Calculate downside deviation (only negative returns)
-        daily_rf_rate = self.RISK_FREE_RATE / self.TRADING_DAYS_PER_YEAR
-        downside_returns = [min(0, r - daily_rf_rate) for r in returns]
-        downside_variance = sum(r ** 2 for r in downside_returns) / len(returns)
-        downside_std = math.sqrt(downside_variance)
-        
-        if downside_std == 0:
-            return 0.0
-        
-        # Calculate Sortino ratio
-        sortino = (mean_return - daily_rf_rate) / downside_std
-        
-        # Annualize
-        sortino_annualized = sortino * math.sqrt(self.TRADING_DAYS_PER_YEAR)
-        
-        return sortino_annualized
+        mean_return, _, downside_std = self._return_moments(returns)
+        return self._sortino(mean_return, downside_std)
     
     def calculate_max_drawdown(
         self,
@@ -298,15 +358,8 @@ class MetricsCalculator:
         if not returns:
             return 0.0
         
-        # Calculate standard deviation
-        mean_return = sum(returns) / len(returns)
-        variance = sum((r - mean_return) ** 2 for r in returns) / len(returns)
-        std_dev = math.sqrt(variance)
-        
-        # Annualize
-        annualized_vol = std_dev * math.sqrt(self.TRADING_DAYS_PER_YEAR)
-        
-        return annualized_vol
+        _, std_dev, _ = self._return_moments(returns)
+        return self._annualize_std(std_dev)
     
     def calculate_trade_metrics(
         self,
@@ -323,93 +376,54 @@ class MetricsCalculator:
         Returns:
             Dictionary with trade metrics
         """
-        if not trades:
-            return {
-                "total_trades": 0,
-                "winning_trades": 0,
-                "losing_trades": 0,
-                "win_rate_pct": 0.0,
-                "avg_win": 0.0,
-                "avg_loss": 0.0,
-                "largest_win": 0.0,
-                "largest_loss": 0.0,
-                "profit_factor": 0.0,
-                "avg_trade_pnl": 0.0
-            }
-        
-        # Separate trades into pairs (buy/sell)
-        buy_trades = {}
-        completed_trades = []
-        
+        tally = _TradeTally()
         for trade in trades:
-            symbol = trade["symbol"]
-            action = trade["action"]
-            
-            if action == "BUY":
-                if symbol not in buy_trades:
-                    buy_trades[symbol] = []
-                buy_trades[symbol].append(trade)
-            
-            elif action == "SELL":
-                if symbol in buy_trades and buy_trades[symbol]:
-                    # Match with most recent buy
-                    buy_trade = buy_trades[symbol].pop(0)
-                    
-                    # Calculate P&L for this round trip
-                    buy_cost = abs(buy_trade["total_cost"])
-                    sell_proceeds = abs(trade["total_cost"])
-                    pnl = sell_proceeds - buy_cost
-                    
-                    completed_trades.append({
-                        "pnl": pnl,
-                        "buy": buy_trade,
-                        "sell": trade
-                    })
-        
-        if not completed_trades:
-            return {
-                "total_trades": len(trades),
-                "winning_trades": 0,
-                "losing_trades": 0,
-                "win_rate_pct": 0.0,
-                "avg_win": 0.0,
-                "avg_loss": 0.0,
-                "largest_win": 0.0,
-                "largest_loss": 0.0,
-                "profit_factor": 0.0,
-                "avg_trade_pnl": 0.0
-            }
-        
-        # Calculate metrics
-        winning_trades = [t for t in completed_trades if t["pnl"] > 0]
-        losing_trades = [t for t in completed_trades if t["pnl"] < 0]
-        
-        total_wins = sum(t["pnl"] for t in winning_trades)
-        total_losses = abs(sum(t["pnl"] for t in losing_trades))
-        
-        win_rate = len(winning_trades) / len(completed_trades) if completed_trades else 0
-        avg_win = total_wins / len(winning_trades) if winning_trades else 0
-        avg_loss = total_losses / len(losing_trades) if losing_trades else 0
+            tally.add(trade)
+        return tally.metrics()
+    
+    def _return_moments(self, returns: List[float]) -> Tuple[float, float, float]:
+        """
+        Mean, standard deviation and downside deviation of period returns.
         
-        largest_win = max((t["pnl"] for t in winning_trades), default=0)
-        largest_loss = min((t["pnl"] for t in losing_trades), default=0)
+        Downside deviation only counts returns below the daily risk-free rate.
+        """
+        if not returns:
+            return 0.0, 0.0, 0.0
         
-        profit_factor = total_wins / total_losses if total_losses > 0 else 0
+        mean_return = sum(returns) / len(returns)
+        variance = sum((r - mean_return) ** 2 for r in returns) / len(returns)
         
-        avg_trade_pnl = sum(t["pnl"] for t in completed_trades) / len(completed_trades)
+        daily_rf_rate = self.RISK_FREE_RATE / self.TRADING_DAYS_PER_YEAR
+        downside_variance = sum(min(0, r - daily_rf_rate) ** 2 for r in returns) / len(returns)
         
-        return {
-            "total_trades": len(completed_trades),
-            "winning_trades": len(winning_trades),
-            "losing_trades": len(losing_trades),
-            "win_rate_pct": round(win_rate * 100, 2),
-            "avg_win": round(avg_win, 2),
-            "avg_loss": round(avg_loss, 2),
-            "largest_win": round(largest_win, 2),
-            "largest_loss": round(largest_loss, 2),
-            "profit_factor": round(profit_factor, 3),
-            "avg_trade_pnl": round(avg_trade_pnl, 2)
-        }
+        return mean_return, math.sqrt(variance), math.sqrt(downside_variance)
+    
+    def _annualize(self, growth: float, periods: int) -> float:
+        """Compounded annual growth rate from final/start equity over `periods` points."""
+        years = periods / self.TRADING_DAYS_PER_YEAR
+        if growth <= 0 or years <= 0:
+            return 0.0
+        return (growth ** (1 / years)) - 1
+    
+    def _sharpe(self, mean_return: float, std_dev: float) -> float:
+        """Annualized Sharpe ratio from period-return moments."""
+        if std_dev == 0:
+            return 0.0
+        daily_rf_rate = self.RISK_FREE_RATE / self.TRADING_DAYS_PER_YEAR
+        sharpe = (mean_return - daily_rf_rate) / std_dev
+        return sharpe * math.sqrt(self.TRADING_DAYS_PER_YEAR)
+    
+    def _sortino(self, mean_return: float, downside_std: float) -> float:
+        """Annualized Sortino ratio from the mean and downside deviation of returns."""
+        if downside_std == 0:
+            return 0.0
+        daily_rf_rate = self.RISK_FREE_RATE / self.TRADING_DAYS_PER_YEAR
+        sortino = (mean_return - daily_rf_rate) / downside_std
+        return sortino * math.sqrt(self.TRADING_DAYS_PER_YEAR)
+    
+    def _annualize_std(self, std_dev: float) -> float:
+        """Annualized volatility from the standard deviation of period returns."""
+        return std_dev * math.sqrt(self.TRADING_DAYS_PER_YEAR)
     
     def _calculate_period_returns(
         self,
@@ -515,3 +529,212 @@ class MetricsCalculator:
         report.append("=" * 80)
         
         return "\n".join(report)
+
+
+class StreamingMetrics:
+    """
+    Incrementally updated metrics for a live equity curve.
+    
+    Each update() and add_trade() is O(1), so dashboards can refresh metrics on every
+    equity point without recomputing from scratch. metrics() returns the same dict as
+    MetricsCalculator.calculate_all_metrics() over the points and trades seen so far.
+    Return means and downside deviation are accumulated in the same order as the batch
+    path and match it exactly; the standard deviation (Sharpe, volatility) uses Welford's
+    update and agrees to float rounding.
+    
+    Usage:
+        live = StreamingMetrics(start_capital=Decimal("100000"))
+        live.update(ts, equity)          # per equity point
+        live.add_trade(trade_dict)       # per fill
+        metrics = live.metrics()
+    """
+    
+    def __init__(self, start_capital: Decimal, calculator: Optional[MetricsCalculator] = None):
+        self.calculator = calculator or MetricsCalculator()
+        self.start_capital = start_capital
+        self._daily_rf_rate = self.calculator.RISK_FREE_RATE / self.calculator.TRADING_DAYS_PER_YEAR
+        
+        self._points = 0
+        self._first_ts: Optional[datetime] = None
+        self._last_ts: Optional[datetime] = None
+        self._last_equity: Any = None
+        
+        # Period-return accumulators
+        self._n_returns = 0
+        self._sum_returns = 0.0
+        self._welford_mean = 0.0
+        self._welford_m2 = 0.0
+        self._downside_sq = 0.0
+        
+        # Drawdown state
+        self._peak: Any = None
+        self._max_drawdown: Any = Decimal("0")
+        self._max_drawdown_pct = 0.0
+        
+        self._trades = _TradeTally()
+    
+    @property
+    def points(self) -> int:
+        return self._points
+    
+    def update(self, timestamp: datetime, equity: Any) -> None:
+        """Add the next equity point (timestamps must arrive in order)."""
+        prev = self._last_equity
+        if prev is None:
+            self._first_ts = timestamp
+            self._peak = equity
+        elif prev > 0:
+            r = float((equity - prev) / prev)
+            self._n_returns += 1
+            self._sum_returns += r
+            delta = r - self._welford_mean
+            self._welford_mean += delta / self._n_returns
+            self._welford_m2 += delta * (r - self._welford_mean)
+            self._downside_sq += min(0, r - self._daily_rf_rate) ** 2
+        
+        if equity > self._peak:
+            self._peak = equity
+        drawdown = self._peak - equity
+        if drawdown > self._max_drawdown:
+            self._max_drawdown = drawdown
+            self._max_drawdown_pct = float(drawdown / self._peak) if self._peak > 0 else 0.0
+        
+        self._points += 1
+        self._last_ts = timestamp
+        self._last_equity = equity
+    
+    def add_trade(self, trade: Dict[str, Any]) -> None:
+        """Add a fill (same dict shape as Backtester results["trades"])."""
+        self._trades.add(trade)
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Metrics over everything seen so far."""
+        calc = self.calculator
+        if self._points < 2:
+            return calc._empty_metrics()
+        
+        n = self._n_returns
+        if n:
+            mean_return = self._sum_returns / n
+            std_dev = math.sqrt(self._welford_m2 / n)
+            downside_std = math.sqrt(self._downside_sq / n)
+        
+        start_capital = self.start_capital
+        final_equity = self._last_equity
+        return calc._assemble_metrics(
+            total_return=calc.calculate_total_return(start_capital, final_equity),
+            annualized_return=calc._annualize(
+                float(final_equity / start_capital) if start_capital > 0 else 0.0,
+                self._points
+            ),
+            sharpe_ratio=calc._sharpe(mean_return, std_dev) if n else 0.0,
+            sortino_ratio=calc._sortino(mean_return, downside_std) if n else 0.0,
+            max_drawdown=float(self._max_drawdown),
+            max_dd_pct=self._max_drawdown_pct,
+            volatility=calc._annualize_std(std_dev) if n else 0.0,
+            trade_metrics=self._trades.metrics(),
+            final_equity=float(final_equity),
+            start_capital=float(start_capital),
+            net_profit=float(final_equity - start_capital),
+            start_ts=self._first_ts,
+            end_ts=self._last_ts,
+            n_points=self._points
+        )
+
+
+class _TradeTally:
+    """
+    Running round-trip trade statistics.
+    
+    SELLs are matched FIFO against earlier BUYs of the same symbol; P&L is
+    |sell total_cost| - |buy total_cost|.
+    """
+    
+    def __init__(self):
+        self.fills = 0
+        self.completed = 0
+        self._open_buys: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._wins = 0
+        self._losses = 0
+        self._total_wins: Any = 0
+        self._total_losses: Any = 0
+        self._total_pnl: Any = 0
+        self._largest_win: Any = None
+        self._largest_loss: Any = None
+    
+    def add(self, trade: Dict[str, Any]) -> None:
+        self.fills += 1
+        symbol = trade["symbol"]
+        action = trade["action"]
+        
+        if action == "BUY":
+            self._open_buys.setdefault(symbol, deque()).append(trade)
+            return
+        if action != "SELL" or not self._open_buys.get(symbol):
+            return
+        
+        buy_trade = self._open_buys[symbol].popleft()
+        pnl = abs(trade["total_cost"]) - abs(buy_trade["total_cost"])
+        
+        self.completed += 1
+        self._total_pnl += pnl
+        if pnl > 0:
+            self._wins += 1
+            self._total_wins += pnl
+            if self._largest_win is None or pnl > self._largest_win:
+                self._largest_win = pnl
+        elif pnl < 0:
+            self._losses += 1
+            self._total_losses += pnl
+            if self._largest_loss is None or pnl < self._largest_loss:
+                self._largest_loss = pnl
+    
+    def metrics(self) -> Dict[str, Any]:
+        if not self.completed:
+            return {
+                "total_trades": self.fills,
+                "winning_trades": 0,
+                "losing_trades": 0,
+                "win_rate_pct": 0.0,
+                "avg_win": 0.0,
+                "avg_loss": 0.0,
+                "largest_win": 0.0,
+                "largest_loss": 0.0,
+                "profit_factor": 0.0,
+                "avg_trade_pnl": 0.0
+            }
+        
+        total_wins = self._total_wins
+        total_losses = abs(self._total_losses)
+        
+        win_rate = self._wins / self.completed
+        avg_win = total_wins / self._wins if self._wins else 0
+        avg_loss = total_losses / self._losses if self._losses else 0
+        
+        largest_win = self._largest_win if self._largest_win is not None else 0
+        largest_loss = self._largest_loss if self._largest_loss is not None else 0
+        
+        profit_factor = total_wins / total_losses if total_losses > 0 else 0
+        
+        avg_trade_pnl = self._total_pnl / self.completed
+        
+        return {
+            "total_trades": self.completed,
+            "winning_trades": self._wins,
+            "losing_trades": self._losses,
+            "win_rate_pct": round(win_rate * 100, 2),
+            "avg_win": round(avg_win, 2),
+            "avg_loss": round(avg_loss, 2),
+            "largest_win": round(largest_win, 2),
+            "largest_loss": round(largest_loss, 2),
+            "profit_factor": round(profit_factor, 3),
+            "avg_trade_pnl": round(avg_trade_pnl, 2)
+        }
+
+
+def _as_datetime(value: Any) -> datetime:
+    """datetime for a datetime or numpy datetime64 (taken as UTC) timestamp."""
+    if isinstance(value, datetime):
+        return value
+    # numpy.datetime64 -> microsecond datetime; naive values are UTC by convention
+    return value.astype("datetime64[us]").item().replace(tzinfo=timezone.utc)
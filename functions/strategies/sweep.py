@@ -0,0 +1,551 @@
+"""
+Parameter-sweep and walk-forward runner for the strategies Backtester.
+
+Loads the bar history once (one Alpaca fetch, or bars you pass in), packs it into a
+shared-memory block and fans runs out to a ProcessPoolExecutor. Workers attach to the
+block by name and slice their window out of it, so each run costs a backtest, not a
+fetch plus a pickle of the whole history.
+
+    sweep = BacktestSweep(GammaScalper, config=BacktestConfig(symbol="SPY", lookback_days=60),
+                          alpaca_api_key=key, alpaca_secret_key=secret)
+    runs = sweep.grid_runs({"threshold": [0.10, 0.15, 0.20], "gex_negative_multiplier": [1.0, 1.5]})
+    for row in sweep.iter_results(runs):      # streamed as runs finish
+        print(row["run_id"], row["sharpe_ratio"])
+    write_results(sweep.results, "sweep.parquet")  # or .csv
+    print(sweep.stats.runs_per_s)
+
+Walk-forward: `walk_forward_runs(grid, train_bars=..., test_bars=...)` runs every grid point
+on each rolling train and test segment; `select_walk_forward(rows)` then picks the best
+train parameters per window and reports their out-of-sample test row.
+
+Reproducibility: runs are enumerated in a fixed order, every run gets a fresh strategy
+instance and a seed derived from (sweep seed, run_id) that is applied to `random` before
+the run, and result tables are written in run order whatever the completion order.
+
+Cancellation: `cancel()` (from any thread, or Ctrl-C) stops submitting runs and cancels
+queued ones; runs already executing in a worker finish and are still reported.
+"""
+
+import csv
+import hashlib
+import itertools
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .backtester import Backtester, BacktestConfig
+from .base_strategy import BaseStrategy
+from .metrics_calculator import MetricsCalculator
+
+logger = logging.getLogger(__name__)
+
+StrategyFactory = Callable[[Dict[str, Any]], BaseStrategy]
+
+# Shared bar layout: one 8-byte column per field, `n` rows each.
+# timestamp is int64 microseconds since the Unix epoch (UTC); volume is int64.
+_BAR_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("timestamp", "q"),
+    ("open", "d"),
+    ("high", "d"),
+    ("low", "d"),
+    ("close", "d"),
+    ("volume", "q"),
+)
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_US = timedelta(microseconds=1)
+
+
+class SharedBars:
+    """
+    Bar history in a shared-memory block, readable from any process by name.
+
+    The creating process owns the block and must `unlink()` it; attached processes
+    only `close()`.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, n_bars: int, owner: bool):
+        self._shm = shm
+        self.n_bars = n_bars
+        self._owner = owner
+        self._columns: Dict[str, memoryview] = {}
+        buf = shm.buf
+        for i, (name, fmt) in enumerate(_BAR_COLUMNS):
+            lo = i * n_bars * 8
+            self._columns[name] = buf[lo:lo + n_bars * 8].cast(fmt)
+
+    @classmethod
+    def create(cls, bars: Sequence[Mapping[str, Any]]) -> "SharedBars":
+        n = len(bars)
+        # SharedMemory rejects size 0; an empty history still gets a (unused) byte.
+        shm = shared_memory.SharedMemory(create=True, size=max(1, n * 8 * len(_BAR_COLUMNS)))
+        out = cls(shm, n, owner=True)
+        ts, op, hi, lo, cl, vol = (out._columns[name] for name, _ in _BAR_COLUMNS)
+        for i, bar in enumerate(bars):
+            t = bar["timestamp"]
+            if t.tzinfo is None:
+                t = t.replace(tzinfo=timezone.utc)
+            ts[i] = (t - _EPOCH) // _US
+            op[i] = float(bar["open"])
+            hi[i] = float(bar["high"])
+            lo[i] = float(bar["low"])
+            cl[i] = float(bar["close"])
+            vol[i] = int(bar["volume"])
+        return out
+
+    @classmethod
+    def attach(cls, name: str, n_bars: int) -> "SharedBars":
+        return cls(shared_memory.SharedMemory(name=name), n_bars, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def timestamp(self, i: int) -> datetime:
+        return _EPOCH + self._columns["timestamp"][i] * _US
+
+    def slice(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        """Bars [start, stop) in the fetch_historical_data() shape."""
+        c = self._columns
+        return [
+            {
+                "timestamp": _EPOCH + c["timestamp"][i] * _US,
+                "open": c["open"][i],
+                "high": c["high"][i],
+                "low": c["low"][i],
+                "close": c["close"][i],
+                "volume": c["volume"][i],
+            }
+            for i in range(start, stop)
+        ]
+
+    def close(self) -> None:
+        for view in self._columns.values():
+            view.release()
+        self._columns.clear()
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+@dataclass(frozen=True)
+class SweepRun:
+    """One backtest of the sweep: strategy params on the bar window [start, stop)."""
+    index: int
+    run_id: str
+    params: Dict[str, Any]
+    start: int
+    stop: int
+    seed: int
+    window_id: Optional[int] = None
+    segment: str = "full"  # full | train | test
+
+
+@dataclass
+class SweepStats:
+    """Progress of the current (or last) sweep."""
+    total: int = 0
+    completed: int = 0  # successful runs only; `runs_per_s` is their throughput
+    failed: int = 0
+    cancelled: int = 0
+    elapsed_s: float = 0.0
+
+    @property
+    def runs_per_s(self) -> float:
+        return self.completed / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+
+def parameter_grid(grid: Mapping[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Cartesian product of `grid`, in a stable order (keys sorted, values as given)."""
+    keys = sorted(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(list(grid[k]) for k in keys))]
+
+
+def walk_forward_windows(
+    n_bars: int,
+    *,
+    train_bars: int,
+    test_bars: int,
+    step_bars: Optional[int] = None,
+) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    """
+    Rolling ((train_start, train_stop), (test_start, test_stop)) windows over `n_bars`.
+
+    Each test segment directly follows its train segment; windows advance by
+    `step_bars` (default: `test_bars`, i.e. back-to-back out-of-sample segments).
+    """
+    if train_bars <= 0 or test_bars <= 0:
+        raise ValueError("train_bars and test_bars must be positive")
+    step = test_bars if step_bars is None else int(step_bars)
+    if step <= 0:
+        raise ValueError("step_bars must be positive")
+    windows = []
+    start = 0
+    while start + train_bars + test_bars <= n_bars:
+        mid = start + train_bars
+        windows.append(((start, mid), (mid, mid + test_bars)))
+        start += step
+    return windows
+
+
+def run_seed(seed: int, run_id: str) -> int:
+    """Per-run seed: stable across processes and Python hash randomization."""
+    digest = hashlib.sha256(f"{seed}:{run_id}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:4], "big")
+
+
+# ---------------------------------------------------------------------------
+# Worker side (module-level so the pool can pickle references to it)
+# ---------------------------------------------------------------------------
+
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(
+    shm_name: str,
+    n_bars: int,
+    strategy_factory: StrategyFactory,
+    config: BacktestConfig,
+    alpaca_api_key: str,
+    alpaca_secret_key: str,
+    regime: Optional[str],
+    log_level: int,
+) -> None:
+    # Per-fill INFO logs from hundreds of runs drown the sweep's own progress.
+    logging.getLogger().setLevel(log_level)
+    _worker_state.update(
+        bars=SharedBars.attach(shm_name, n_bars),
+        strategy_factory=strategy_factory,
+        config=config,
+        alpaca_api_key=alpaca_api_key,
+        alpaca_secret_key=alpaca_secret_key,
+        regime=regime,
+    )
+
+
+def _execute_run(run: SweepRun) -> Dict[str, Any]:
+    state = _worker_state
+    bars: SharedBars = state["bars"]
+    row = _row_header(run, bars)
+    try:
+        random.seed(run.seed)
+        np = sys.modules.get("numpy")
+        if np is not None:
+            np.random.seed(run.seed)
+
+        config: BacktestConfig = state["config"]
+        backtester = Backtester(
+            strategy=state["strategy_factory"](dict(run.params)),
+            config=config,
+            alpaca_api_key=state["alpaca_api_key"],
+            alpaca_secret_key=state["alpaca_secret_key"],
+        )
+        results = backtester.run(regime=state["regime"], bars=bars.slice(run.start, run.stop))
+        metrics = MetricsCalculator().calculate_all_metrics(
+            equity_curve=backtester.equity_curve,
+            trades=results["trades"],
+            start_capital=config.start_capital,
+        )
+        row.update(metrics)
+        row["status"] = "ok"
+    except Exception as e:  # one bad parameter set must not take the sweep down
+        row["status"] = "error"
+        row["error"] = f"{type(e).__name__}: {e}"
+    return row
+
+
+def _row_header(run: SweepRun, bars: SharedBars) -> Dict[str, Any]:
+    row: Dict[str, Any] = {
+        "run_id": run.run_id,
+        "index": run.index,
+        "window_id": run.window_id,
+        "segment": run.segment,
+        "bar_start": bars.timestamp(run.start).isoformat() if run.stop > run.start else "",
+        "bar_end": bars.timestamp(run.stop - 1).isoformat() if run.stop > run.start else "",
+        "bars": run.stop - run.start,
+        "seed": run.seed,
+        "status": "",
+        "error": "",
+    }
+    for key, value in sorted(run.params.items()):
+        row[f"param_{key}"] = value
+    return row
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+
+class BacktestSweep:
+    """
+    Fan a parameter grid (optionally over walk-forward windows) out to worker processes.
+
+    Args:
+        strategy_factory: Picklable callable building a fresh strategy from one parameter
+            set, e.g. a BaseStrategy subclass (called as `factory(params)`).
+        config: Backtest configuration shared by every run.
+        bars: Pre-loaded bars; when omitted they are fetched once with the config.
+        max_workers: Worker processes (default: os.cpu_count()).
+        seed: Sweep seed; per-run seeds derive from it.
+        regime: Market regime passed to every run.
+        max_in_flight: Runs submitted ahead of completion (default: 2 per worker), which
+            bounds how much work a cancel has to discard.
+        mp_context: multiprocessing context for the pool (default: platform default).
+        worker_log_level: Root log level inside workers.
+    """
+
+    def __init__(
+        self,
+        strategy_factory: StrategyFactory,
+        config: Optional[BacktestConfig] = None,
+        *,
+        bars: Optional[Sequence[Mapping[str, Any]]] = None,
+        alpaca_api_key: str = "",
+        alpaca_secret_key: str = "",
+        max_workers: Optional[int] = None,
+        seed: int = 0,
+        regime: Optional[str] = None,
+        max_in_flight: Optional[int] = None,
+        mp_context: Any = None,
+        worker_log_level: int = logging.WARNING,
+    ):
+        self.strategy_factory = strategy_factory
+        self.config = config or BacktestConfig()
+        self.alpaca_api_key = alpaca_api_key
+        self.alpaca_secret_key = alpaca_secret_key
+        self.max_workers = max_workers
+        self.seed = int(seed)
+        self.regime = regime
+        self.max_in_flight = max_in_flight
+        self.mp_context = mp_context
+        self.worker_log_level = worker_log_level
+        self._bars: Optional[List[Mapping[str, Any]]] = list(bars) if bars is not None else None
+        self._cancel = threading.Event()
+        self.stats = SweepStats()
+        self.results: List[Dict[str, Any]] = []
+
+    # -- data -----------------------------------------------------------------
+
+    def load_bars(self) -> List[Mapping[str, Any]]:
+        """The sweep's bar history, fetched from Alpaca on first use."""
+        if self._bars is None:
+            backtester = Backtester(
+                strategy=self.strategy_factory({}),
+                config=self.config,
+                alpaca_api_key=self.alpaca_api_key,
+                alpaca_secret_key=self.alpaca_secret_key,
+            )
+            self._bars = backtester.fetch_historical_data()
+        return self._bars
+
+    # -- run plans --------------------------------------------------------------
+
+    def grid_runs(self, grid: Mapping[str, Sequence[Any]]) -> List[SweepRun]:
+        """Every grid point over the full history."""
+        n = len(self.load_bars())
+        return [
+            SweepRun(
+                index=i,
+                run_id=f"p{i:04d}",
+                params=params,
+                start=0,
+                stop=n,
+                seed=run_seed(self.seed, f"p{i:04d}"),
+            )
+            for i, params in enumerate(parameter_grid(grid))
+        ]
+
+    def walk_forward_runs(
+        self,
+        grid: Mapping[str, Sequence[Any]],
+        *,
+        train_bars: int,
+        test_bars: int,
+        step_bars: Optional[int] = None,
+    ) -> List[SweepRun]:
+        """Every grid point on the train and the test segment of each rolling window."""
+        points = parameter_grid(grid)
+        windows = walk_forward_windows(
+            len(self.load_bars()), train_bars=train_bars, test_bars=test_bars, step_bars=step_bars
+        )
+        runs = []
+        for w, segments in enumerate(windows):
+            for segment, (start, stop) in zip(("train", "test"), segments):
+                for p, params in enumerate(points):
+                    run_id = f"w{w:03d}-{segment}-p{p:04d}"
+                    runs.append(
+                        SweepRun(
+                            index=len(runs),
+                            run_id=run_id,
+                            params=params,
+                            start=start,
+                            stop=stop,
+                            seed=run_seed(self.seed, run_id),
+                            window_id=w,
+                            segment=segment,
+                        )
+                    )
+        return runs
+
+    # -- execution --------------------------------------------------------------
+
+    def cancel(self) -> None:
+        """Stop the running sweep: no new runs start; executing runs still report."""
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def iter_results(self, runs: Sequence[SweepRun]) -> Iterator[Dict[str, Any]]:
+        """
+        Execute `runs`, yielding one result row per run as it finishes.
+
+        Rows are also collected in `self.results` (in run order once the sweep ends)
+        and progress is kept in `self.stats`.
+        """
+        bars = self.load_bars()
+        self._cancel.clear()
+        self.stats = SweepStats(total=len(runs))
+        self.results = []
+        queue = list(runs)
+        queue.reverse()  # pop() from the end == submit in run order
+
+        workers = self.max_workers or os.cpu_count() or 1
+        shared = SharedBars.create(bars)
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=self.mp_context,
+            initializer=_init_worker,
+            initargs=(
+                shared.name,
+                shared.n_bars,
+                self.strategy_factory,
+                self.config,
+                self.alpaca_api_key,
+                self.alpaca_secret_key,
+                self.regime,
+                self.worker_log_level,
+            ),
+        )
+        in_flight_cap = self.max_in_flight or 2 * workers
+        pending: Dict[Future, SweepRun] = {}
+        t0 = time.perf_counter()
+        logger.info(f"Sweep started: {len(runs)} runs, {workers} workers, {shared.n_bars} bars")
+        try:
+            while queue or pending:
+                while queue and len(pending) < in_flight_cap and not self._cancel.is_set():
+                    run = queue.pop()
+                    pending[pool.submit(_execute_run, run)] = run
+                if self._cancel.is_set():
+                    self.stats.cancelled += len(queue) + sum(1 for f in pending if f.cancel())
+                    queue.clear()
+                    pending = {f: r for f, r in pending.items() if not f.cancelled()}
+                    if not pending:
+                        break
+                # Short timeout so cancel() from another thread is noticed promptly.
+                done, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    run = pending.pop(fut)
+                    row = fut.result()
+                    if row["status"] == "ok":
+                        self.stats.completed += 1
+                    else:
+                        self.stats.failed += 1
+                        logger.warning(f"Sweep run {run.run_id} failed: {row['error']}")
+                    self.stats.elapsed_s = time.perf_counter() - t0
+                    self.results.append(row)
+                    yield row
+        except (KeyboardInterrupt, GeneratorExit):
+            self._cancel.set()
+            self.stats.cancelled += len(queue) + sum(1 for f in pending if f.cancel())
+            raise
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            shared.close()
+            self.stats.elapsed_s = time.perf_counter() - t0
+            self.results.sort(key=lambda r: r["index"])
+            logger.info(
+                f"Sweep {'cancelled' if self._cancel.is_set() else 'complete'}: "
+                f"{self.stats.completed}/{self.stats.total} runs ok "
+                f"({self.stats.failed} failed, {self.stats.cancelled} cancelled) "
+                f"in {self.stats.elapsed_s:.1f}s, {self.stats.runs_per_s:.2f} runs/sec"
+            )
+
+    def run(
+        self,
+        runs: Sequence[SweepRun],
+        on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Execute `runs` to completion (or cancel); returns rows in run order."""
+        for row in self.iter_results(runs):
+            if on_result is not None:
+                on_result(row)
+        return self.results
+
+
+def select_walk_forward(
+    rows: Sequence[Mapping[str, Any]],
+    objective: str = "sharpe_ratio",
+    maximize: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Per walk-forward window, the test row of the parameters that scored best on train.
+
+    Ties go to the earlier grid point so the selection is deterministic.
+    """
+    def params_of(r: Mapping[str, Any]) -> Tuple[Tuple[str, Any], ...]:
+        return tuple((k, r[k]) for k in sorted(r) if k.startswith("param_"))
+
+    by_window: Dict[int, Dict[str, List[Mapping[str, Any]]]] = {}
+    for r in rows:
+        if r.get("window_id") is None or r.get("status") != "ok":
+            continue
+        by_window.setdefault(r["window_id"], {}).setdefault(r["segment"], []).append(r)
+
+    selected = []
+    for window_id in sorted(by_window):
+        train = sorted(by_window[window_id].get("train", []), key=lambda r: r["index"])
+        tests = {params_of(r): r for r in by_window[window_id].get("test", [])}
+        if not train:
+            continue
+        sign = 1.0 if maximize else -1.0
+        best = max(train, key=lambda r: (sign * float(r[objective]), -r["index"]))
+        test = tests.get(params_of(best))
+        if test is None:
+            continue
+        selected.append({**test, f"train_{objective}": best[objective]})
+    return selected
+
+
+def write_results(rows: Sequence[Mapping[str, Any]], path: Union[str, Path]) -> Path:
+    """
+    Write result rows to `path`: Parquet for a .parquet suffix (needs pandas and
+    pyarrow), CSV otherwise. Columns keep first-seen order across rows.
+    """
+    path = Path(path)
+    columns: Dict[str, None] = {}
+    for r in rows:
+        columns.update(dict.fromkeys(r))
+
+    if path.suffix == ".parquet":
+        import pandas as pd  # Lazy import: only Parquet output needs pandas/pyarrow.
+
+        pd.DataFrame(list(rows), columns=list(columns)).to_parquet(path, index=False)
+        return path
+
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(columns))
+        writer.writeheader()
+        for r in rows:
+            writer.writerow(r)
+    return path
@@ -18,12 +18,17 @@ from __future__ import annotations
 
 import logging
 import os
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 import requests
 from firebase_admin import firestore
 
+from backend.marketdata.options.snapshot_client import SnapshotClient
+
 logger = logging.getLogger(__name__)
 
 
@@ -107,6 +112,7 @@ def fetch_option_snapshots(
     headers: Dict[str, str],
     feed: str = "indicative",
     max_pages: int = 5,
+    client: Optional[SnapshotClient] = None,
 ) -> Dict[str, Any]:
     """
     Fetch option chain snapshots for an underlying symbol from Alpaca.
@@ -116,46 +122,15 @@ def fetch_option_snapshots(
         headers: Alpaca API headers
         feed: Options feed type (default: "indicative")
         max_pages: Maximum number of pages to fetch
+        client: Shared snapshot client (pooled connections); a private one is used if omitted
         
     Returns:
         Dictionary of option snapshots keyed by option symbol
     """
-    url = f"https://data.alpaca.markets/v1beta1/options/snapshots/{underlying}"
-    
-    all_snapshots: Dict[str, Any] = {}
-    page_token: Optional[str] = None
-    pages_fetched = 0
-    
-    for _ in range(max_pages):
-        params: Dict[str, Any] = {"feed": feed}
-        if page_token:
-            params["page_token"] = page_token
-        
-        try:
-            response = requests.get(url, headers=headers, params=params, timeout=30)
-            response.raise_for_status()
-            data = response.json() or {}
-            
-            snapshots = data.get("snapshots") or {}
-            if isinstance(snapshots, dict):
-                all_snapshots.update(snapshots)
-            
-            pages_fetched += 1
-            page_token = data.get("next_page_token")
-            
-            if not page_token:
-                break
-                
-        except Exception as e:
-            logger.error(f"Failed to fetch option snapshots for {underlying}: {e}")
-            break
-    
-    logger.info(
-        f"Fetched {len(all_snapshots)} option snapshots for {underlying} "
-        f"({pages_fetched} pages)"
-    )
-    
-    return all_snapshots
+    if client is not None:
+        return client.fetch_chain(underlying, feed=feed, max_pages=max_pages)
+    with SnapshotClient(headers, max_concurrency=1) as own:
+        return own.fetch_chain(underlying, feed=feed, max_pages=max_pages)
 
 
 def calculate_strike_gex(
@@ -208,6 +183,22 @@ def calculate_strike_gex(
     return gex
 
 
+@lru_cache(maxsize=65536)
+def _parse_occ(option_symbol: str) -> Optional[Tuple[str, str, str, float]]:
+    """Cached OCC parse: (underlying, YYMMDD, "call"/"put", strike) or None."""
+    # Layout is fixed from the right: [root][YYMMDD][C|P][strike * 1000, 8 digits].
+    # Anchoring on the right keeps roots containing "C"/"P" (e.g. SPY) parseable.
+    if len(option_symbol) < 15:
+        return None
+    date_str = option_symbol[-15:-9]
+    cp = option_symbol[-9]
+    strike_str = option_symbol[-8:]
+    if cp not in ("C", "P") or not date_str.isdigit() or not strike_str.isdigit():
+        return None
+    underlying = option_symbol[:-15].strip()
+    return underlying, date_str, "call" if cp == "C" else "put", int(strike_str) / 1000.0
+
+
 def parse_option_symbol(option_symbol: str) -> Optional[Dict[str, Any]]:
     """
     Parse OCC option symbol format.
@@ -215,6 +206,8 @@ def parse_option_symbol(option_symbol: str) -> Optional[Dict[str, Any]]:
     Format: SYMBOL[YY][MM][DD][C/P][STRIKE]
     Example: SPY241231C00550000 = SPY Call expiring 2024-12-31 at strike $550
     
+    Results are cached per symbol (the same chain is re-parsed on every refresh).
+    
     Args:
         option_symbol: OCC format option symbol
         
@@ -222,37 +215,85 @@ def parse_option_symbol(option_symbol: str) -> Optional[Dict[str, Any]]:
         Dictionary with parsed components or None if parsing fails
     """
     try:
-        # Standard OCC format: 6 chars symbol, 6 digits date, C/P, 8 digits strike
-        if len(option_symbol) < 15:
-            return None
-        
-        # Find the C or P (call/put indicator)
-        cp_index = -1
-        for i, char in enumerate(option_symbol):
-            if char in ['C', 'P']:
-                cp_index = i
-                break
-        
-        if cp_index == -1:
-            return None
-        
-        underlying = option_symbol[:cp_index-6].strip()
-        date_str = option_symbol[cp_index-6:cp_index]
-        option_type = "call" if option_symbol[cp_index] == 'C' else "put"
-        strike_str = option_symbol[cp_index+1:]
-        
-        # Parse strike: last 8 digits represent strike * 1000
-        strike = int(strike_str) / 1000.0
-        
-        return {
-            "underlying": underlying,
-            "date": date_str,
-            "type": option_type,
-            "strike": strike,
-        }
-    except Exception as e:
+        parsed = _parse_occ(option_symbol)
+    except TypeError as e:
         logger.debug(f"Failed to parse option symbol {option_symbol}: {e}")
         return None
+    if parsed is None:
+        return None
+    underlying, date_str, option_type, strike = parsed
+    return {
+        "underlying": underlying,
+        "date": date_str,
+        "type": option_type,
+        "strike": strike,
+    }
+
+
+@dataclass(frozen=True)
+class OptionChainArrays:
+    """Columnar view of an option chain (one row per parsed contract)."""
+
+    strike: np.ndarray  # float64
+    is_call: np.ndarray  # bool
+    expiry: np.ndarray  # datetime64[D]
+    gamma: np.ndarray  # float64
+    open_interest: np.ndarray  # float64
+
+    def __len__(self) -> int:
+        return int(self.strike.shape[0])
+
+
+def option_chain_arrays(snapshots: Dict[str, Any]) -> OptionChainArrays:
+    """
+    Parse option snapshots once into NumPy arrays.
+
+    Contracts whose symbol does not parse are skipped. A contract whose symbol parses but
+    whose expiry is not a real date (such as 241399) is kept with a NaT expiry, so it still
+    counts towards GEX like it does in `calculate_strike_gex`. Missing greeks/open interest
+    become 0.0.
+    """
+    strikes: List[float] = []
+    is_call: List[bool] = []
+    expiries: List[np.datetime64] = []
+    gammas: List[float] = []
+    ois: List[float] = []
+
+    for option_symbol, snapshot in snapshots.items():
+        try:
+            parsed = _parse_occ(option_symbol)
+        except TypeError:
+            parsed = None
+        if parsed is None:
+            continue
+        _, date_str, option_type, strike = parsed
+        try:
+            expiry = np.datetime64(f"20{date_str[:2]}-{date_str[2:4]}-{date_str[4:]}", "D")
+        except ValueError:
+            logger.debug(f"Option symbol {option_symbol} has an invalid expiry {date_str}; using NaT")
+            expiry = np.datetime64("NaT", "D")
+
+        greeks = snapshot.get("greeks", {})
+        gamma = _safe_float(greeks.get("gamma")) if greeks else 0.0
+        open_interest = _safe_float(
+            snapshot.get("open_interest") or
+            snapshot.get("openInterest") or
+            snapshot.get("latestQuote", {}).get("open_interest")
+        )
+
+        strikes.append(strike)
+        is_call.append(option_type == "call")
+        expiries.append(expiry)
+        gammas.append(gamma)
+        ois.append(open_interest)
+
+    return OptionChainArrays(
+        strike=np.array(strikes, dtype=np.float64),
+        is_call=np.array(is_call, dtype=bool),
+        expiry=np.array(expiries, dtype="datetime64[D]"),
+        gamma=np.array(gammas, dtype=np.float64),
+        open_interest=np.array(ois, dtype=np.float64),
+    )
 
 
 def calculate_total_gex(
@@ -275,60 +316,57 @@ def calculate_total_gex(
         - put_gex: Total put GEX (negative)
         - strikes: List of GEX by strike
     """
-    call_gex_total = 0.0
-    put_gex_total = 0.0
-    strike_gex: Dict[float, Dict[str, float]] = {}
-    
-    for option_symbol, snapshot in snapshots.items():
-        parsed = parse_option_symbol(option_symbol)
-        if not parsed:
-            continue
-        
-        option_type = parsed["type"]
-        strike = parsed["strike"]
-        
-        gex = calculate_strike_gex(snapshot, underlying_price, option_type)
-        
-        if option_type == "call":
-            call_gex_total += gex
-        else:
-            put_gex_total += gex
-        
-        # Aggregate by strike
-        if strike not in strike_gex:
-            strike_gex[strike] = {"call_gex": 0.0, "put_gex": 0.0, "net_gex": 0.0}
-        
-        if option_type == "call":
-            strike_gex[strike]["call_gex"] += gex
-        else:
-            strike_gex[strike]["put_gex"] += gex
-        
-        strike_gex[strike]["net_gex"] += gex
-    
-    # Sort strikes and find zero gamma level
-    sorted_strikes = sorted(strike_gex.items())
+    return calculate_total_gex_arrays(underlying, option_chain_arrays(snapshots), underlying_price)
+
+
+def calculate_total_gex_arrays(
+    underlying: str,
+    chain: OptionChainArrays,
+    underlying_price: float,
+) -> Dict[str, Any]:
+    """
+    Columnar `calculate_total_gex` over a parsed chain; returns the same dict schema.
+
+    Per-strike sums use `np.add.at`, which accumulates in chain order, so results are
+    bit-identical to summing contract by contract.
+    """
+    # GEX = Gamma × Open Interest × 100 × Underlying Price; negative for puts.
+    gex = chain.gamma * chain.open_interest * 100 * underlying_price
+    gex = np.where(chain.is_call, gex, -gex)
+    # Contracts without gamma or open interest contribute exactly 0.0.
+    gex[(chain.gamma == 0.0) | (chain.open_interest == 0.0)] = 0.0
+
+    strikes, strike_idx = np.unique(chain.strike, return_inverse=True)
+    call_contrib = np.where(chain.is_call, gex, 0.0)
+    put_contrib = np.where(chain.is_call, 0.0, gex)
+    call_by_strike = np.zeros(len(strikes))
+    put_by_strike = np.zeros(len(strikes))
+    net_by_strike = np.zeros(len(strikes))
+    np.add.at(call_by_strike, strike_idx[chain.is_call], gex[chain.is_call])
+    np.add.at(put_by_strike, strike_idx[~chain.is_call], gex[~chain.is_call])
+    np.add.at(net_by_strike, strike_idx, gex)
+
+    # Sequential (cumsum) totals, in the same order as a contract-by-contract loop.
+    call_gex_total = float(np.cumsum(call_contrib)[-1]) if len(gex) else 0.0
+    put_gex_total = float(np.cumsum(put_contrib)[-1]) if len(gex) else 0.0
+
+    # Find the first strike where net GEX changes sign (approximate zero gamma level).
     zero_gamma_strike = None
-    
-    # Find the strike where GEX crosses zero (approximate zero gamma level)
-    for i in range(len(sorted_strikes) - 1):
-        current_strike, current_data = sorted_strikes[i]
-        next_strike, next_data = sorted_strikes[i + 1]
-        
-        current_gex = current_data["net_gex"]
-        next_gex = next_data["net_gex"]
-        
-        # Check if GEX crosses zero between these strikes
-        if (current_gex >= 0 and next_gex < 0) or (current_gex < 0 and next_gex >= 0):
-            # Linear interpolation to find approximate zero level
-            if abs(next_gex - current_gex) > 1e-9:
-                weight = abs(current_gex) / abs(next_gex - current_gex)
-                zero_gamma_strike = current_strike + (next_strike - current_strike) * weight
-            else:
-                zero_gamma_strike = current_strike
-            break
-    
+    nonneg = net_by_strike >= 0
+    crossings = np.flatnonzero(nonneg[:-1] != nonneg[1:])
+    if len(crossings):
+        i = int(crossings[0])
+        current_strike, next_strike = float(strikes[i]), float(strikes[i + 1])
+        current_gex, next_gex = float(net_by_strike[i]), float(net_by_strike[i + 1])
+        # Linear interpolation to find approximate zero level
+        if abs(next_gex - current_gex) > 1e-9:
+            weight = abs(current_gex) / abs(next_gex - current_gex)
+            zero_gamma_strike = current_strike + (next_strike - current_strike) * weight
+        else:
+            zero_gamma_strike = current_strike
+
     total_gex = call_gex_total + put_gex_total
-    
+
     return {
         "underlying": underlying,
         "underlying_price": underlying_price,
@@ -336,15 +374,17 @@ def calculate_total_gex(
         "call_gex": call_gex_total,
         "put_gex": put_gex_total,
         "zero_gamma_strike": zero_gamma_strike,
-        "num_strikes": len(strike_gex),
+        "num_strikes": len(strikes),
         "strikes": [
             {
                 "strike": strike,
-                "call_gex": data["call_gex"],
-                "put_gex": data["put_gex"],
-                "net_gex": data["net_gex"],
+                "call_gex": call_gex,
+                "put_gex": put_gex,
+                "net_gex": net_gex,
             }
-            for strike, data in sorted_strikes
+            for strike, call_gex, put_gex, net_gex in zip(
+                strikes.tolist(), call_by_strike.tolist(), put_by_strike.tolist(), net_by_strike.tolist()
+            )
         ],
     }
 
@@ -472,6 +512,11 @@ def calculate_and_update_gex(
     
     headers = _get_alpaca_headers()
     
+    # Fetch every chain up front: one pooled client, underlyings in parallel.
+    with SnapshotClient(headers, max_concurrency=max(1, len(symbols))) as client:
+        chains = client.fetch_chains(symbols)
+        logger.info(f"Option snapshot latency: {client.latency_histograms()}")
+    
     analyses = {}
     
     for symbol in symbols:
@@ -482,8 +527,7 @@ def calculate_and_update_gex(
             underlying_price = fetch_underlying_price(symbol, headers)
             logger.info(f"{symbol} price: ${underlying_price:.2f}")
             
-            # Fetch option snapshots
-            snapshots = fetch_option_snapshots(symbol, headers)
+            snapshots = chains.get(symbol.strip().upper()) or {}
             
             if not snapshots:
                 logger.warning(f"No option snapshots found for {symbol}")
@@ -14,19 +14,47 @@ can survive extreme market conditions.
 
 from __future__ import annotations
 
+import copy
 import logging
 import math
 import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing import shared_memory
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from enum import Enum
 
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Sector-specific volatility scaling (energy more volatile, utilities less, cash is stable).
+_SECTOR_VOL_MULTIPLIER: Dict[str, float] = {"XLE": 1.3, "XLU": 0.7, "SHV": 0.05}
+# Sector-specific Black Swan crash scaling (financials crash hardest, cash doesn't crash).
+_SECTOR_CRASH_MULTIPLIER: Dict[str, float] = {"XLF": 1.3, "XLU": 0.7, "SHV": 0.0}
+
+# Days per correlation segment (correlation is held constant within a segment).
+_CORRELATION_SEGMENT_DAYS = 10
+
+# Compact trade records returned by process-pool workers.
+_TRADE_SIGNALS = ("BUY", "SELL", "CLOSE")
+_TRADE_DTYPE = np.dtype(
+    [
+        ("path", np.int64),
+        ("day", np.int32),
+        ("symbol", np.int32),
+        ("signal", np.int8),
+        ("shares", np.float64),
+        ("price", np.float64),
+        ("value", np.float64),
+        ("cost", np.float64),
+    ]
+)
+# Shards per worker, so uneven path costs still balance across the pool.
+_SHARDS_PER_WORKER = 4
+
 
 class MarketRegime(Enum):
     """Market regime classification."""
@@ -44,6 +72,7 @@ class SimulationParameters:
     num_simulations: int = 1000
     num_days: int = 252  # Trading days in a year
     initial_capital: float = 100000.0
+    num_workers: int = 1  # >1: run strategy execution across a process pool
     
     # Market parameters (annualized)
     base_drift: float = 0.10  # 10% expected annual return
@@ -113,6 +142,21 @@ class SimulationPath:
     total_costs: float = 0.0
 
 
+@dataclass
+class PriceTensor:
+    """A batch of simulated paths for all sectors."""
+
+    prices: np.ndarray  # (paths, assets, num_days + 1), day 0 = initial price
+    sectors: List[str]
+    is_black_swan: np.ndarray  # (paths,) bool
+    crash_day: np.ndarray  # (paths,) int, -1 when no crash
+    crash_magnitude: np.ndarray  # (paths,) float, NaN when no crash
+
+    def path_prices(self, i: int) -> Dict[str, np.ndarray]:
+        """Symbol -> price array view for path `i` (the per-path generator's shape)."""
+        return {sector: self.prices[i, a] for a, sector in enumerate(self.sectors)}
+
+
 @dataclass
 class RiskMetrics:
     """Comprehensive risk metrics from Monte Carlo simulation."""
@@ -161,15 +205,22 @@ class MonteCarloSimulator:
     - Dynamic strategy execution
     """
     
-    def __init__(self, params: Optional[SimulationParameters] = None):
+    def __init__(
+        self,
+        params: Optional[SimulationParameters] = None,
+        rng: Optional[np.random.Generator] = None,
+        seed: Optional[int] = None,
+    ):
         """
         Initialize the Monte Carlo simulator.
         
         Args:
             params: Simulation parameters (uses defaults if None)
+            rng: Random generator to draw from (for reproducible runs)
+            seed: Seed for a new generator when `rng` is not given (None = random)
         """
         self.params = params or SimulationParameters()
-        self.rng = np.random.default_rng(seed=None)  # Use random seed for production
+        self.rng = rng if rng is not None else np.random.default_rng(seed=seed)
         
     def _generate_gbm_path(
         self,
@@ -313,10 +364,10 @@ class MonteCarloSimulator:
                 self.params.crash_day_min,
                 self.params.crash_day_max
             )
-            crash_magnitude = self.rng.uniform(
-                self.params.crash_magnitude_min,
-                self.params.crash_magnitude_max
-            )
+            # low + (high - low) * U: the configured min/max are signed (min > max) by default.
+            crash_magnitude = self.params.crash_magnitude_min + (
+                self.params.crash_magnitude_max - self.params.crash_magnitude_min
+            ) * self.rng.random()
         
         # Generate correlation structure that transitions during crisis
         correlation_schedule = np.full(num_days, self.params.normal_correlation)
@@ -341,7 +392,7 @@ class MonteCarloSimulator:
         prices = {}
         
         # Use segment-wise generation with dynamic correlation
-        segment_size = 10  # Generate in 10-day segments for dynamic correlation
+        segment_size = _CORRELATION_SEGMENT_DAYS  # Generate in segments for dynamic correlation
         num_segments = math.ceil(num_days / segment_size)
         
         # Initial prices (normalized to 100)
@@ -361,14 +412,7 @@ class MonteCarloSimulator:
             # Generate prices for each sector
             for i, sector in enumerate(sectors):
                 # Sector-specific parameters (some sectors are more volatile)
-                sector_vol_multiplier = 1.0
-                if sector == "XLE":  # Energy more volatile
-                    sector_vol_multiplier = 1.3
-                elif sector == "XLU":  # Utilities less volatile
-                    sector_vol_multiplier = 0.7
-                elif sector == "SHV":  # Cash is stable
-                    sector_vol_multiplier = 0.05
-                
+                sector_vol_multiplier = _SECTOR_VOL_MULTIPLIER.get(sector, 1.0)
                 volatility = self.params.base_volatility * sector_vol_multiplier
                 
                 # Calculate returns
@@ -395,12 +439,7 @@ class MonteCarloSimulator:
             for sector in sectors:
                 if sector != "SHV":  # Cash doesn't crash
                     # Different sectors crash by different amounts
-                    sector_crash_mult = 1.0
-                    if sector == "XLF":  # Financials crash hardest
-                        sector_crash_mult = 1.3
-                    elif sector == "XLU":  # Utilities crash less
-                        sector_crash_mult = 0.7
-                    
+                    sector_crash_mult = _SECTOR_CRASH_MULTIPLIER.get(sector, 1.0)
                     adjusted_crash = crash_magnitude * sector_crash_mult
                     prices[sector] = self._inject_black_swan(
                         prices[sector],
@@ -411,6 +450,163 @@ class MonteCarloSimulator:
         
         return prices, crash_day, crash_magnitude
     
+    def _correlation_schedule_batch(self, crash_day: np.ndarray) -> np.ndarray:
+        """
+        Per-path daily correlation schedule, shape (paths, num_days).
+
+        Vectorized form of the sigmoid transition used by `_generate_multi_asset_paths`;
+        paths without a crash (crash_day < 0) stay at the normal correlation.
+        """
+        p = self.params
+        num_days = p.num_days
+        schedule = np.full((len(crash_day), num_days), p.normal_correlation, dtype=np.float64)
+
+        days = np.arange(num_days)[None, :]
+        cd = crash_day[:, None]
+        in_transition = (
+            (cd >= 0)
+            & (days >= np.maximum(0, cd - p.correlation_transition_days))
+            & (days < np.minimum(num_days, cd + p.correlation_transition_days * 2))
+        )
+        t = (days - cd) / p.correlation_transition_days
+        sigmoid = 1 / (1 + np.exp(-t))
+        blended = p.normal_correlation * (1 - sigmoid) + p.crisis_correlation * sigmoid
+        return np.where(in_transition, blended, schedule)
+
+    def generate_price_tensor(
+        self,
+        num_paths: int,
+        black_swan: Optional[np.ndarray] = None,
+    ) -> PriceTensor:
+        """
+        Generate `num_paths` multi-asset price paths in one pass.
+
+        Same model as `_generate_multi_asset_paths` (GBM per sector, correlation averaged
+        over 10-day segments, Black Swan crash + recovery), computed for every path at once:
+        - one draw of standard normals, shape (paths, assets + 1, days)
+        - correlated shocks from the equicorrelation factor form
+          z_i = sqrt(rho) * common + sqrt(1 - rho) * e_i (the closed-form square root of the
+          constant-correlation matrix, so per-path/per-segment rho needs no re-factorization)
+        - log-returns cumulated along the time axis
+        - crashes and recoveries applied with (path, asset, day) masks
+
+        Args:
+            num_paths: Number of paths to generate
+            black_swan: Optional bool mask (num_paths,) selecting Black Swan paths;
+                drawn with `black_swan_probability` when None
+
+        Returns:
+            PriceTensor with prices of shape (num_paths, assets, num_days + 1)
+        """
+        p = self.params
+        sectors = list(p.sectors)
+        num_assets = len(sectors)
+        num_days = p.num_days
+        dt = 1 / 252
+
+        if black_swan is None:
+            black_swan = np.zeros(num_paths, dtype=bool)
+            n_swans = int(num_paths * p.black_swan_probability)
+            black_swan[self.rng.choice(num_paths, n_swans, replace=False)] = True
+        black_swan = np.asarray(black_swan, dtype=bool)
+        if black_swan.shape != (num_paths,):
+            raise ValueError("black_swan mask must have shape (num_paths,)")
+
+        n_swans = int(black_swan.sum())
+        crash_day = np.full(num_paths, -1, dtype=np.int64)
+        crash_magnitude = np.full(num_paths, np.nan)
+        crash_day[black_swan] = self.rng.integers(p.crash_day_min, p.crash_day_max, size=n_swans)
+        # low + (high - low) * U: the configured min/max are signed (min > max) by default.
+        crash_magnitude[black_swan] = p.crash_magnitude_min + (
+            p.crash_magnitude_max - p.crash_magnitude_min
+        ) * self.rng.random(n_swans)
+
+        # Correlation held constant within each segment (mean of the daily schedule).
+        schedule = self._correlation_schedule_batch(crash_day)
+        seg_starts = np.arange(0, num_days, _CORRELATION_SEGMENT_DAYS)
+        seg_len = np.diff(np.r_[seg_starts, num_days])
+        seg_corr = np.add.reduceat(schedule, seg_starts, axis=1) / seg_len
+        if (seg_corr < 0).any():
+            logger.warning("Negative correlation is not supported by the batched generator, clipping to 0")
+            seg_corr = np.clip(seg_corr, 0.0, 1.0)
+        rho = np.repeat(seg_corr, seg_len, axis=1)[:, None, :]  # (paths, 1, days)
+
+        draws = self.rng.standard_normal((num_paths, num_assets + 1, num_days))
+        shocks = np.sqrt(rho) * draws[:, -1:, :] + np.sqrt(1.0 - rho) * draws[:, :-1, :]
+        del draws
+
+        vol = p.base_volatility * np.array([_SECTOR_VOL_MULTIPLIER.get(s, 1.0) for s in sectors])[None, :, None]
+        log_returns = (p.base_drift - 0.5 * vol**2) * dt + vol * np.sqrt(dt) * shocks
+        del shocks
+
+        prices = np.empty((num_paths, num_assets, num_days + 1))
+        prices[:, :, 0] = 0.0
+        np.cumsum(log_returns, axis=2, out=prices[:, :, 1:])
+        np.exp(prices, out=prices)
+        prices *= 100.0  # Initial prices normalized to 100
+
+        if n_swans:
+            self._inject_black_swans_batch(prices, sectors, crash_day, crash_magnitude)
+
+        return PriceTensor(
+            prices=prices,
+            sectors=sectors,
+            is_black_swan=black_swan,
+            crash_day=crash_day,
+            crash_magnitude=crash_magnitude,
+        )
+
+    def _inject_black_swans_batch(
+        self,
+        prices: np.ndarray,
+        sectors: List[str],
+        crash_day: np.ndarray,
+        crash_magnitude: np.ndarray,
+    ) -> None:
+        """In-place, masked equivalent of `_inject_black_swan` for every crashed (path, sector)."""
+        swan_idx = np.flatnonzero(crash_day >= 0)
+        length = prices.shape[2]
+        days = np.arange(length)[None, None, :]
+
+        crash_mult = np.array([_SECTOR_CRASH_MULTIPLIER.get(s, 1.0) for s in sectors])
+        adj = crash_magnitude[swan_idx][:, None] * crash_mult[None, :]  # (swans, assets)
+        cd = crash_day[swan_idx][:, None, None]
+
+        # Recovery length as in `_inject_black_swan`: int(|crash| * 200), capped by the path end.
+        rec_days = np.minimum((np.abs(adj) * 200).astype(np.int64), length - cd[:, :, 0] - 1)[:, :, None]
+        step = np.log(1.15) / np.maximum(rec_days - 1, 1)
+
+        factor = np.where(days >= cd, 1.0 + adj[:, :, None], 1.0)
+        in_recovery = (days >= cd) & (days < cd + rec_days)
+        factor *= np.where(in_recovery, np.exp((days - cd) * step), 1.0)
+        prices[swan_idx] *= factor
+
+    def iter_price_tensors(
+        self,
+        num_paths: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+    ) -> Iterator[PriceTensor]:
+        """
+        Yield `PriceTensor` chunks covering `num_paths` paths (default: num_simulations).
+
+        Black Swan paths are chosen over the whole run, so exactly
+        int(num_paths * black_swan_probability) paths crash regardless of chunking.
+        `chunk_size` caps the number of paths held in memory at once.
+        """
+        p = self.params
+        num_paths = p.num_simulations if num_paths is None else int(num_paths)
+        chunk_size = num_paths if not chunk_size else int(chunk_size)
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+
+        black_swan = np.zeros(num_paths, dtype=bool)
+        n_swans = int(num_paths * p.black_swan_probability)
+        black_swan[self.rng.choice(num_paths, n_swans, replace=False)] = True
+
+        for lo in range(0, num_paths, chunk_size):
+            hi = min(lo + chunk_size, num_paths)
+            yield self.generate_price_tensor(hi - lo, black_swan=black_swan[lo:hi])
+
     def _calculate_transaction_cost(
         self,
         trade_value: float,
@@ -437,7 +633,9 @@ class MonteCarloSimulator:
         self,
         strategy_evaluate_fn: Any,
         strategy_config: Optional[Dict[str, Any]] = None,
-        save_all_paths: bool = False
+        save_all_paths: bool = False,
+        chunk_size: Optional[int] = None,
+        num_workers: Optional[int] = None,
     ) -> Tuple[List[SimulationPath], RiskMetrics]:
         """
         Run Monte Carlo simulation with a trading strategy.
@@ -447,65 +645,149 @@ class MonteCarloSimulator:
                 (market_data, account_snapshot, regime) and returns TradingSignal
             strategy_config: Configuration for the strategy
             save_all_paths: Whether to save detailed data for all paths (memory intensive)
+            chunk_size: Paths generated per batch (None = all at once); caps price memory
+            num_workers: Worker processes for strategy execution (default: params.num_workers).
+                With >1, `strategy_evaluate_fn` must be picklable. Prices are generated in this
+                process and every path starts from a fresh copy of `strategy_evaluate_fn` (see
+                `_PathStrategies`), so results for a given seed do not depend on the worker count.
             
         Returns:
             Tuple of (simulation_paths, risk_metrics)
         """
         logger.info(f"Starting Monte Carlo simulation with {self.params.num_simulations} paths...")
         
+        num_workers = self.params.num_workers if num_workers is None else num_workers
+        config = strategy_config or {}
         paths: List[SimulationPath] = []
+        equity_curves: List[np.ndarray] = []
         
-        # Determine which paths will be Black Swans
-        num_black_swans = int(self.params.num_simulations * self.params.black_swan_probability)
-        black_swan_indices = set(
-            self.rng.choice(self.params.num_simulations, num_black_swans, replace=False)
-        )
-        
-        for sim_idx in range(self.params.num_simulations):
-            is_black_swan = sim_idx in black_swan_indices
-            path_id = f"sim_{uuid.uuid4().hex[:12]}"
-            
-            # Generate price paths for all assets
-            prices, crash_day, crash_magnitude = self._generate_multi_asset_paths(
-                path_id=path_id,
-                is_black_swan=is_black_swan
-            )
-            
-            # Simulate strategy execution
-            equity_curve, trades = self._simulate_strategy_execution(
-                prices=prices,
-                strategy_evaluate_fn=strategy_evaluate_fn,
-                strategy_config=strategy_config or {}
-            )
-            
-            # Calculate path metrics
-            path = SimulationPath(
-                path_id=path_id,
-                prices=prices if save_all_paths else {},  # Save memory
-                equity_curve=equity_curve,
-                trades=trades if save_all_paths else [],  # Save memory
-                is_black_swan=is_black_swan,
-                crash_day=crash_day,
-                crash_magnitude=crash_magnitude,
-            )
-            
-            # Calculate performance metrics for this path
-            self._calculate_path_metrics(path)
-            
-            paths.append(path)
-            
-            # Log progress
-            if (sim_idx + 1) % 100 == 0:
-                logger.info(f"Completed {sim_idx + 1}/{self.params.num_simulations} simulations")
-        
-        # Calculate aggregate risk metrics
-        risk_metrics = self._calculate_risk_metrics(paths)
+        executor = ProcessPoolExecutor(max_workers=num_workers) if num_workers > 1 else None
+        strategies = _PathStrategies(strategy_evaluate_fn) if executor is None else None
+        try:
+            sim_idx = 0
+            for batch in self.iter_price_tensors(chunk_size=chunk_size):
+                if executor is not None:
+                    results = self._execute_batch_parallel(
+                        batch, strategy_evaluate_fn, config, executor, num_workers
+                    )
+                else:
+                    assert strategies is not None
+                    results = (
+                        self._simulate_strategy_execution(
+                            prices=batch.path_prices(i),
+                            strategy_evaluate_fn=strategies.for_path(),
+                            strategy_config=config,
+                        )
+                        for i in range(batch.prices.shape[0])
+                    )
+                
+                for i, (equity_curve, trades) in enumerate(results):
+                    if isinstance(trades, np.ndarray):
+                        num_trades = len(trades)
+                        total_costs = sum(trades["cost"].tolist())
+                        trades = _trades_from_array(trades, batch.sectors) if save_all_paths else []
+                    else:
+                        num_trades = len(trades)
+                        total_costs = sum(trade.get("cost", 0) for trade in trades)
+                    
+                    is_black_swan = bool(batch.is_black_swan[i])
+                    paths.append(
+                        SimulationPath(
+                            path_id=f"sim_{uuid.uuid4().hex[:12]}",
+                            # Copy so a saved path does not pin the whole batch tensor.
+                            prices={k: v.copy() for k, v in batch.path_prices(i).items()} if save_all_paths else {},
+                            equity_curve=equity_curve,
+                            trades=trades if save_all_paths else [],  # Save memory
+                            is_black_swan=is_black_swan,
+                            crash_day=int(batch.crash_day[i]) if is_black_swan else None,
+                            crash_magnitude=float(batch.crash_magnitude[i]) if is_black_swan else None,
+                            num_trades=num_trades,
+                            total_costs=total_costs,
+                        )
+                    )
+                    equity_curves.append(equity_curve)
+                    
+                    sim_idx += 1
+                    # Log progress
+                    if sim_idx % 100 == 0:
+                        logger.info(f"Completed {sim_idx}/{self.params.num_simulations} simulations")
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        
+        # Path and aggregate metrics, vectorized over the equity matrix.
+        metrics = self.compute_path_metrics(np.vstack(equity_curves))
+        for i, path in enumerate(paths):
+            path.final_equity = float(metrics["final_equity"][i])
+            path.total_return = float(metrics["total_return"][i])
+            path.max_drawdown = float(metrics["max_drawdown"][i])
+            path.sharpe_ratio = float(metrics["sharpe_ratio"][i])
+            rd = metrics["recovery_days"][i]
+            path.recovery_days = None if rd < 0 else int(rd)
+        risk_metrics = self._risk_metrics_from_arrays(metrics)
         
         logger.info(f"Monte Carlo simulation complete. VaR(95%)={risk_metrics.var_95:.2%}, "
                    f"Sharpe={risk_metrics.mean_sharpe:.2f}, Pass={risk_metrics.passes_stress_test}")
         
         return paths, risk_metrics
     
+    def _execute_batch_parallel(
+        self,
+        batch: PriceTensor,
+        strategy_evaluate_fn: Any,
+        strategy_config: Dict[str, Any],
+        executor: Executor,
+        num_workers: int,
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Run strategy execution for every path of `batch` across `executor`.
+
+        The price tensor is placed in a shared memory block once; workers attach to it by
+        name and map their shard of paths, so no price arrays are pickled. Each shard
+        returns an equity matrix and a compact `_TRADE_DTYPE` array.
+
+        Returns:
+            [(equity_curve, trades_array)] in path order
+        """
+        prices = batch.prices
+        num_paths = prices.shape[0]
+        shm = shared_memory.SharedMemory(create=True, size=max(prices.nbytes, 1))
+        try:
+            shared = np.ndarray(prices.shape, dtype=np.float64, buffer=shm.buf)
+            shared[...] = prices
+            del shared
+
+            num_shards = min(num_paths, num_workers * _SHARDS_PER_WORKER)
+            bounds = np.linspace(0, num_paths, num_shards + 1).astype(int).tolist()
+            futures = [
+                executor.submit(
+                    _simulate_shard,
+                    shm.name,
+                    prices.shape,
+                    batch.sectors,
+                    lo,
+                    hi,
+                    self.params,
+                    strategy_evaluate_fn,
+                    strategy_config,
+                )
+                for lo, hi in zip(bounds[:-1], bounds[1:])
+                if hi > lo
+            ]
+
+            results: List[Tuple[np.ndarray, np.ndarray]] = []
+            for fut in futures:
+                lo, equity, trades = fut.result()
+                # Trade rows are emitted in path order, so each path's trades are contiguous.
+                ends = np.searchsorted(trades["path"], np.arange(lo, lo + len(equity)), side="right")
+                starts = np.r_[0, ends[:-1]]
+                for j in range(len(equity)):
+                    results.append((equity[j], trades[starts[j] : ends[j]]))
+            return results
+        finally:
+            shm.close()
+            shm.unlink()
+    
     def _simulate_strategy_execution(
         self,
         prices: Dict[str, np.ndarray],
@@ -714,6 +996,65 @@ class MonteCarloSimulator:
         path.num_trades = len(path.trades)
         path.total_costs = sum(trade.get("cost", 0) for trade in path.trades)
     
+    def compute_path_metrics(self, equity: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Per-path metrics for an equity matrix of shape (paths, num_days + 1).
+
+        Vectorized equivalent of `_calculate_path_metrics`. `recovery_days` is -1 where the
+        path has no recovery.
+
+        Returns:
+            Dict of arrays: final_equity, total_return, max_drawdown, sharpe_ratio, recovery_days
+        """
+        equity = np.asarray(equity, dtype=np.float64)
+        if equity.ndim != 2 or equity.shape[1] < 1:
+            raise ValueError("equity must have shape (paths, days)")
+        n, length = equity.shape
+        initial_equity = self.params.initial_capital
+
+        final_equity = equity[:, -1]
+        total_return = (final_equity - initial_equity) / initial_equity
+
+        # Drawdown against the running peak.
+        peak = np.maximum.accumulate(equity, axis=1)
+        drawdown = (peak - equity) / peak
+        max_drawdown = np.maximum(drawdown.max(axis=1), 0.0)
+        has_dd = max_drawdown > 0
+        drawdown_start = np.argmax(drawdown, axis=1)
+
+        # Recovery: first new high after the path first goes into drawdown.
+        first_dd = np.where(has_dd, np.argmax(drawdown > 0, axis=1), length)
+        new_high = np.zeros_like(equity, dtype=bool)
+        new_high[:, 1:] = equity[:, 1:] > peak[:, :-1]
+        after_dd = np.arange(length)[None, :] > first_dd[:, None]
+        recovering = new_high & after_dd
+        has_recovery = recovering.any(axis=1)
+        recovery_day = np.argmax(recovering, axis=1)
+        recovery_days = np.where(has_dd & has_recovery, recovery_day - drawdown_start, -1)
+
+        # Annualized Sharpe of daily returns.
+        sharpe = np.zeros(n)
+        if length > 1:
+            returns = np.diff(equity, axis=1) / equity[:, :-1]
+            mean_return = returns.mean(axis=1)
+            std_return = returns.std(axis=1)
+            ok = std_return > 0
+            sharpe[ok] = (mean_return[ok] * 252 - self.params.risk_free_rate) / (std_return[ok] * np.sqrt(252))
+
+        return {
+            "final_equity": final_equity,
+            "total_return": total_return,
+            "max_drawdown": max_drawdown,
+            "sharpe_ratio": sharpe,
+            "recovery_days": recovery_days,
+        }
+
+    def calculate_risk_metrics_from_equity(self, equity: np.ndarray) -> RiskMetrics:
+        """
+        Aggregate risk metrics straight from an equity matrix of shape (paths, num_days + 1).
+        """
+        return self._risk_metrics_from_arrays(self.compute_path_metrics(equity))
+
     def _calculate_risk_metrics(self, paths: List[SimulationPath]) -> RiskMetrics:
         """
         Calculate aggregate risk metrics from all simulation paths.
@@ -724,27 +1065,44 @@ class MonteCarloSimulator:
         Returns:
             Comprehensive risk metrics
         """
-        # Extract metrics
-        returns = np.array([p.total_return for p in paths])
-        max_drawdowns = np.array([p.max_drawdown for p in paths])
-        sharpe_ratios = np.array([p.sharpe_ratio for p in paths])
-        final_equities = np.array([p.final_equity for p in paths])
-        
-        recovery_days = [p.recovery_days for p in paths if p.recovery_days is not None]
+        return self._risk_metrics_from_arrays(
+            {
+                "total_return": np.array([p.total_return for p in paths]),
+                "max_drawdown": np.array([p.max_drawdown for p in paths]),
+                "sharpe_ratio": np.array([p.sharpe_ratio for p in paths]),
+                "final_equity": np.array([p.final_equity for p in paths]),
+                "recovery_days": np.array(
+                    [-1 if p.recovery_days is None else p.recovery_days for p in paths], dtype=np.int64
+                ),
+            }
+        )
+
+    def _risk_metrics_from_arrays(self, metrics: Dict[str, np.ndarray]) -> RiskMetrics:
+        """
+        Aggregate risk metrics from per-path metric arrays (see `compute_path_metrics`).
+        """
+        returns = np.asarray(metrics["total_return"], dtype=np.float64)
+        max_drawdowns = np.asarray(metrics["max_drawdown"], dtype=np.float64)
+        sharpe_ratios = np.asarray(metrics["sharpe_ratio"], dtype=np.float64)
+        final_equities = np.asarray(metrics["final_equity"], dtype=np.float64)
+        recovery_all = np.asarray(metrics["recovery_days"])
+        recovery_days = recovery_all[recovery_all >= 0]
+        num_paths = len(returns)
         
         # Value at Risk (VaR)
-        var_95 = -np.percentile(returns, 5)  # Worst 5%
-        var_99 = -np.percentile(returns, 1)  # Worst 1%
+        q1, q5 = np.percentile(returns, [1, 5])
+        var_95 = float(-q5)  # Worst 5%
+        var_99 = float(-q1)  # Worst 1%
         
         # Conditional VaR (CVaR / Expected Shortfall)
-        worst_5_pct = returns[returns <= np.percentile(returns, 5)]
-        worst_1_pct = returns[returns <= np.percentile(returns, 1)]
+        worst_5_pct = returns[returns <= q5]
+        worst_1_pct = returns[returns <= q1]
         
         cvar_95 = -np.mean(worst_5_pct) if len(worst_5_pct) > 0 else 0.0
         cvar_99 = -np.mean(worst_1_pct) if len(worst_1_pct) > 0 else 0.0
         
         # Survival rate (paths that don't go to zero)
-        survival_rate = np.sum(final_equities > 0) / len(paths)
+        survival_rate = np.sum(final_equities > 0) / num_paths
         
         # Return statistics
         mean_return = float(np.mean(returns))
@@ -760,19 +1118,14 @@ class MonteCarloSimulator:
         worst_drawdown = float(np.max(max_drawdowns))
         
         # Recovery statistics
-        mean_recovery = float(np.mean(recovery_days)) if recovery_days else None
-        median_recovery = float(np.median(recovery_days)) if recovery_days else None
-        paths_without_recovery = len([p for p in paths if p.recovery_days is None])
+        mean_recovery = float(np.mean(recovery_days)) if len(recovery_days) else None
+        median_recovery = float(np.median(recovery_days)) if len(recovery_days) else None
+        paths_without_recovery = int(num_paths - len(recovery_days))
         
         # Distribution percentiles
+        pcts = (1, 5, 25, 50, 75, 95, 99)
         final_equity_distribution = {
-            "p1": float(np.percentile(final_equities, 1)),
-            "p5": float(np.percentile(final_equities, 5)),
-            "p25": float(np.percentile(final_equities, 25)),
-            "p50": float(np.percentile(final_equities, 50)),
-            "p75": float(np.percentile(final_equities, 75)),
-            "p95": float(np.percentile(final_equities, 95)),
-            "p99": float(np.percentile(final_equities, 99)),
+            f"p{q}": float(v) for q, v in zip(pcts, np.percentile(final_equities, pcts))
         }
         
         # Pass/Fail assessment
@@ -867,3 +1220,117 @@ class MonteCarloSimulator:
                 for p in paths
             ],
         }
+
+
+class _PathStrategies:
+    """
+    Per-path copies of `strategy_evaluate_fn` for one serial run or one worker shard.
+
+    Strategies keep state between calls (price history, last rebalance, holdings). Each
+    path is an independent scenario, so no path may see state left by another:
+    - if the callable's owner (the instance of a bound method, or the callable object
+      itself) defines `reset()`, it is deep-copied once and reset before every path;
+    - otherwise every path gets a deep copy of the caller's pristine callable;
+    - a callable that cannot be deep-copied is used as-is for every path (with a warning),
+      so it must be stateless or define `reset()`.
+    The caller's callable is only ever mutated in that last case.
+    """
+
+    def __init__(self, strategy_evaluate_fn: Any) -> None:
+        self._fn = strategy_evaluate_fn
+        self._copyable = True
+        self._shared: Any = None
+        if callable(getattr(getattr(strategy_evaluate_fn, "__self__", strategy_evaluate_fn), "reset", None)):
+            self._shared = self._copy() or strategy_evaluate_fn
+
+    def _copy(self) -> Any:
+        try:
+            return copy.deepcopy(self._fn)
+        except Exception as e:
+            self._copyable = False
+            logger.warning(
+                "strategy_evaluate_fn cannot be deep-copied (%s: %s); reusing it for every path",
+                type(e).__name__,
+                e,
+            )
+            return None
+
+    def for_path(self) -> Any:
+        """The strategy callable for the next path, in its initial state."""
+        if self._shared is not None:
+            getattr(self._shared, "__self__", self._shared).reset()
+            return self._shared
+        if self._copyable:
+            fn = self._copy()
+            if fn is not None:
+                return fn
+        return self._fn
+
+
+def _simulate_shard(
+    shm_name: str,
+    shape: Tuple[int, ...],
+    sectors: List[str],
+    lo: int,
+    hi: int,
+    params: SimulationParameters,
+    strategy_evaluate_fn: Any,
+    strategy_config: Dict[str, Any],
+) -> Tuple[int, np.ndarray, np.ndarray]:
+    """
+    Process-pool worker: run strategy execution for paths [lo, hi) of a shared price tensor.
+
+    Returns:
+        (lo, equity matrix of shape (hi - lo, num_days + 1), `_TRADE_DTYPE` trade array)
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        prices = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        simulator = MonteCarloSimulator(params)
+        symbol_index = {sector: a for a, sector in enumerate(sectors)}
+        signal_index = {signal: k for k, signal in enumerate(_TRADE_SIGNALS)}
+        strategies = _PathStrategies(strategy_evaluate_fn)
+
+        equity = np.empty((hi - lo, params.num_days + 1))
+        rows: List[Tuple[Any, ...]] = []
+        for j, i in enumerate(range(lo, hi)):
+            curve, trades = simulator._simulate_strategy_execution(
+                prices={sector: prices[i, a] for a, sector in enumerate(sectors)},
+                strategy_evaluate_fn=strategies.for_path(),
+                strategy_config=strategy_config,
+            )
+            equity[j] = curve
+            rows.extend(
+                (
+                    i,
+                    t["day"],
+                    symbol_index[t["symbol"]],
+                    signal_index[t["signal_type"]],
+                    t["shares"],
+                    t["price"],
+                    t["value"],
+                    t["cost"],
+                )
+                for t in trades
+            )
+        # Drop views into the shared buffer before closing it.
+        del prices
+        return lo, equity, np.array(rows, dtype=_TRADE_DTYPE)
+    finally:
+        shm.close()
+
+
+def _trades_from_array(trades: np.ndarray, sectors: List[str]) -> List[Dict[str, Any]]:
+    """Expand a `_TRADE_DTYPE` array into the trade dicts `_simulate_strategy_execution` returns."""
+    return [
+        {
+            "day": int(t["day"]),
+            "symbol": sectors[int(t["symbol"])],
+            "shares": float(t["shares"]),
+            "price": float(t["price"]),
+            "value": float(t["value"]),
+            "cost": float(t["cost"]),
+            "signal_type": _TRADE_SIGNALS[int(t["signal"])],
+        }
+        for t in trades
+    ]
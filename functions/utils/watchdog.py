@@ -17,15 +17,21 @@ Architecture:
 - Writes alerts to users/{userId}/alerts/{alertId}
 - Updates users/{userId}/status/trading when kill-switch is triggered
 - Logs explainability to users/{userId}/watchdog_events/{eventId}
+- Concurrent sweep mode (monitor_all_users_concurrent): cursor-paged users, bounded
+  fan-out on the async Firestore client, checkpointed at ops/watchdog_sweep_checkpoint
 """
 
+import asyncio
 import logging
+import os
+import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 from google.cloud import firestore
+from google.cloud.firestore_v1.field_path import FieldPath
 import vertexai
 from vertexai.generative_models import GenerativeModel
 
@@ -37,6 +43,14 @@ LOSING_STREAK_TIME_WINDOW_MINUTES = 10  # Time window to check for losing streak
 MIN_LOSS_PERCENT = Decimal("0.5")  # Minimum loss % to count as "losing trade" (0.5% = 50 bps)
 RAPID_DRAWDOWN_THRESHOLD = Decimal("5.0")  # Drawdown % in time window to trigger alert
 
+# Concurrent sweep defaults (overridable via WATCHDOG_SWEEP_* env vars)
+SWEEP_PAGE_SIZE = 300  # Users fetched per cursor page
+SWEEP_CONCURRENCY = 25  # Users monitored in parallel
+SWEEP_DEADLINE_SECONDS = 50.0  # Stop and checkpoint before the next scheduler tick
+
+# Sentinel: market regime not passed in, read it from Firestore
+_REGIME_NOT_LOADED: Any = object()
+
 
 @dataclass
 class AnomalyDetectionResult:
@@ -118,6 +132,74 @@ def _get_recent_trades(
         return []
 
 
+async def _get_recent_trades_async(
+    db: firestore.AsyncClient,
+    user_id: str,
+    time_window_minutes: int = 10
+) -> List[Dict[str, Any]]:
+    """
+    Async variant of _get_recent_trades for the concurrent sweep.
+    
+    Args:
+        db: Async Firestore client
+        user_id: User ID to query
+        time_window_minutes: Time window in minutes (default: 10)
+    
+    Returns:
+        List of trade dictionaries sorted by created_at (newest first)
+    """
+    try:
+        cutoff_time = datetime.utcnow() - timedelta(minutes=time_window_minutes)
+        
+        trades_ref = (
+            db.collection("users")
+            .document(user_id)
+            .collection("shadowTradeHistory")
+            .where("created_at", ">=", cutoff_time)
+            .order_by("created_at", direction=firestore.Query.DESCENDING)
+            .limit(100)  # Safety limit
+        )
+        
+        trades = []
+        async for doc in trades_ref.stream():
+            trade_data = doc.to_dict()
+            trade_data["id"] = doc.id
+            trades.append(trade_data)
+        
+        return trades
+    
+    except Exception as e:
+        logger.error(f"Error fetching recent trades for user {user_id}: {e}")
+        return []
+
+
+def _read_market_regime(db: firestore.Client) -> Optional[Dict[str, Any]]:
+    """
+    Read systemStatus/market_regime once.
+    
+    Returns:
+        Regime dictionary, or None if missing or unreadable
+    """
+    try:
+        regime_doc = db.collection("systemStatus").document("market_regime").get()
+        if regime_doc.exists:
+            return regime_doc.to_dict() or {}
+    except Exception as e:
+        logger.warning(f"Failed to fetch market regime: {e}")
+    return None
+
+
+async def _read_market_regime_async(db: firestore.AsyncClient) -> Optional[Dict[str, Any]]:
+    """Async variant of _read_market_regime (one read per sweep)."""
+    try:
+        regime_doc = await db.collection("systemStatus").document("market_regime").get()
+        if regime_doc.exists:
+            return regime_doc.to_dict() or {}
+    except Exception as e:
+        logger.warning(f"Failed to fetch market regime: {e}")
+    return None
+
+
 def _detect_losing_streak(
     trades: List[Dict[str, Any]],
     streak_threshold: int = LOSING_STREAK_THRESHOLD,
@@ -259,7 +341,8 @@ def _detect_rapid_drawdown(
 
 def _detect_market_condition_mismatch(
     trades: List[Dict[str, Any]],
-    db: firestore.Client
+    db: Optional[firestore.Client],
+    market_regime: Optional[Dict[str, Any]] = _REGIME_NOT_LOADED
 ) -> AnomalyDetectionResult:
     """
     Detect if strategy is trading against market conditions.
@@ -269,6 +352,8 @@ def _detect_market_condition_mismatch(
     Args:
         trades: List of trade dictionaries
         db: Firestore client to fetch market regime
+        market_regime: Regime already read for this sweep (None = not found);
+            when omitted, it is read from db
     
     Returns:
         AnomalyDetectionResult
@@ -278,13 +363,15 @@ def _detect_market_condition_mismatch(
     
     try:
         # Get current market regime
-        regime_doc = db.collection("systemStatus").document("market_regime").get()
+        if market_regime is _REGIME_NOT_LOADED:
+            regime_doc = db.collection("systemStatus").document("market_regime").get()
+            market_regime = (regime_doc.to_dict() or {}) if regime_doc.exists else None
         
-        if not regime_doc.exists:
+        if market_regime is None:
             logger.warning("Market regime not found, skipping condition mismatch check")
             return AnomalyDetectionResult(anomaly_detected=False)
         
-        regime_data = regime_doc.to_dict() or {}
+        regime_data = market_regime
         spy_gex = _as_decimal(regime_data.get("spy", {}).get("net_gex", "0"))
         market_bias = regime_data.get("market_volatility_bias", "Unknown")
         
@@ -365,7 +452,8 @@ async def _generate_explainability_with_gemini(
         
         # Call Gemini
         model = GenerativeModel("gemini-2.0-flash-exp")
-        response = model.generate_content(prompt)
+        # Run the blocking SDK call off the event loop so concurrent sweeps keep going
+        response = await asyncio.to_thread(model.generate_content, prompt)
         
         explanation = response.text.strip()
         
@@ -622,9 +710,179 @@ def _log_watchdog_event(
         return ""
 
 
+async def _run_write(offload: bool, fn: Any, **kwargs: Any) -> Any:
+    """Call a sync Firestore write helper, in a worker thread when offload is set."""
+    if offload:
+        return await asyncio.to_thread(fn, **kwargs)
+    return fn(**kwargs)
+
+
+async def _respond_to_trades(
+    db: firestore.Client,
+    user_id: str,
+    trades: List[Dict[str, Any]],
+    market_regime: Optional[Dict[str, Any]],
+    offload_writes: bool = False
+) -> Dict[str, Any]:
+    """
+    Run anomaly detection on a user's recent trades and act on the findings.
+    
+    Args:
+        db: Firestore client used for kill-switch / alert / event writes
+        user_id: User ID being monitored
+        trades: Recent trades (newest first, non-empty)
+        market_regime: Market regime shared by the sweep (None = not found)
+        offload_writes: Run the sync writes in a worker thread (concurrent sweep)
+    
+    Returns:
+        Dictionary with monitoring results
+    """
+    logger.info(f"User {user_id}: Analyzing {len(trades)} recent trades...")
+    
+    # Run anomaly detection checks
+    losing_streak = _detect_losing_streak(trades)
+    rapid_drawdown = _detect_rapid_drawdown(trades)
+    condition_mismatch = _detect_market_condition_mismatch(trades, db, market_regime=market_regime)
+    
+    # Determine if any critical anomaly was detected
+    anomalies = [
+        losing_streak,
+        rapid_drawdown,
+        condition_mismatch,
+    ]
+    
+    critical_anomaly = None
+    for anomaly in anomalies:
+        if anomaly.anomaly_detected and anomaly.should_halt_trading:
+            critical_anomaly = anomaly
+            break
+    
+    # If critical anomaly detected, activate kill-switch
+    if critical_anomaly:
+        logger.warning(
+            f"User {user_id}: CRITICAL ANOMALY DETECTED - {critical_anomaly.anomaly_type}"
+        )
+        
+        # Generate explainability with Gemini
+        explanation = await _generate_explainability_with_gemini(
+            anomaly=critical_anomaly,
+            trades=trades,
+            user_id=user_id,
+            market_data=market_regime
+        )
+        
+        # Activate kill-switch
+        kill_switch_result = await _run_write(
+            offload_writes,
+            _activate_kill_switch,
+            db=db,
+            user_id=user_id,
+            anomaly=critical_anomaly,
+            explanation=explanation
+        )
+        
+        # Send high-priority alert
+        alert_id = await _run_write(
+            offload_writes,
+            _send_high_priority_alert,
+            db=db,
+            user_id=user_id,
+            anomaly=critical_anomaly,
+            explanation=explanation
+        )
+        
+        # Log event for audit trail
+        event_id = await _run_write(
+            offload_writes,
+            _log_watchdog_event,
+            db=db,
+            user_id=user_id,
+            anomaly=critical_anomaly,
+            explanation=explanation,
+            kill_switch_activated=True
+        )
+        
+        return {
+            "user_id": user_id,
+            "status": "KILL_SWITCH_ACTIVATED",
+            "anomaly_type": critical_anomaly.anomaly_type,
+            "severity": critical_anomaly.severity,
+            "description": critical_anomaly.description,
+            "explanation": explanation,
+            "alert_id": alert_id,
+            "event_id": event_id,
+            "kill_switch_result": kill_switch_result,
+        }
+    
+    # Log non-critical anomalies (warnings only)
+    warnings = [a for a in anomalies if a.anomaly_detected and not a.should_halt_trading]
+    if warnings:
+        for warning in warnings:
+            logger.info(
+                f"User {user_id}: Warning - {warning.anomaly_type}: {warning.description}"
+            )
+            
+            # Log warning event (but don't halt trading)
+            await _run_write(
+                offload_writes,
+                _log_watchdog_event,
+                db=db,
+                user_id=user_id,
+                anomaly=warning,
+                explanation=warning.description,
+                kill_switch_activated=False
+            )
+        
+        return {
+            "user_id": user_id,
+            "status": "WARNINGS_DETECTED",
+            "warnings": [
+                {
+                    "type": w.anomaly_type,
+                    "severity": w.severity,
+                    "description": w.description,
+                }
+                for w in warnings
+            ],
+        }
+    
+    # All clear
+    logger.debug(f"User {user_id}: No anomalies detected")
+    return {
+        "user_id": user_id,
+        "status": "ALL_CLEAR",
+        "message": "No anomalies detected",
+        "trades_analyzed": len(trades),
+    }
+
+
+def _already_disabled(user_id: str, status_doc: Any) -> Optional[Dict[str, Any]]:
+    """Return the ALREADY_DISABLED result if the user's trading status is off."""
+    if status_doc.exists:
+        status_data = status_doc.to_dict() or {}
+        if not status_data.get("enabled", True):
+            logger.info(f"User {user_id}: Trading already disabled, skipping monitoring")
+            return {
+                "user_id": user_id,
+                "status": "ALREADY_DISABLED",
+                "message": "Trading already disabled for this user",
+            }
+    return None
+
+
+def _no_trades(user_id: str) -> Dict[str, Any]:
+    logger.debug(f"User {user_id}: No recent trades to monitor")
+    return {
+        "user_id": user_id,
+        "status": "NO_TRADES",
+        "message": "No recent trades found",
+    }
+
+
 async def monitor_user_trades(
     db: firestore.Client,
-    user_id: str
+    user_id: str,
+    market_regime: Optional[Dict[str, Any]] = _REGIME_NOT_LOADED
 ) -> Dict[str, Any]:
     """
     Monitor shadow trades for a single user and detect anomalies.
@@ -634,6 +892,8 @@ async def monitor_user_trades(
     Args:
         db: Firestore client
         user_id: User ID to monitor
+        market_regime: Market regime read once per sweep (None = not found);
+            when omitted, it is read from db
     
     Returns:
         Dictionary with monitoring results
@@ -648,17 +908,9 @@ async def monitor_user_trades(
             .collection("status")
             .document("trading")
         )
-        status_doc = status_ref.get()
-        
-        if status_doc.exists:
-            status_data = status_doc.to_dict() or {}
-            if not status_data.get("enabled", True):
-                logger.info(f"User {user_id}: Trading already disabled, skipping monitoring")
-                return {
-                    "user_id": user_id,
-                    "status": "ALREADY_DISABLED",
-                    "message": "Trading already disabled for this user",
-                }
+        disabled = _already_disabled(user_id, status_ref.get())
+        if disabled:
+            return disabled
         
         # Get recent trades
         trades = _get_recent_trades(
@@ -668,131 +920,85 @@ async def monitor_user_trades(
         )
         
         if not trades:
-            logger.debug(f"User {user_id}: No recent trades to monitor")
-            return {
-                "user_id": user_id,
-                "status": "NO_TRADES",
-                "message": "No recent trades found",
-            }
-        
-        logger.info(f"User {user_id}: Analyzing {len(trades)} recent trades...")
-        
-        # Run anomaly detection checks
-        losing_streak = _detect_losing_streak(trades)
-        rapid_drawdown = _detect_rapid_drawdown(trades)
-        condition_mismatch = _detect_market_condition_mismatch(trades, db)
+            return _no_trades(user_id)
         
-        # Determine if any critical anomaly was detected
-        anomalies = [
-            losing_streak,
-            rapid_drawdown,
-            condition_mismatch,
-        ]
+        if market_regime is _REGIME_NOT_LOADED:
+            market_regime = _read_market_regime(db)
         
-        critical_anomaly = None
-        for anomaly in anomalies:
-            if anomaly.anomaly_detected and anomaly.should_halt_trading:
-                critical_anomaly = anomaly
-                break
-        
-        # If critical anomaly detected, activate kill-switch
-        if critical_anomaly:
-            logger.warning(
-                f"User {user_id}: CRITICAL ANOMALY DETECTED - {critical_anomaly.anomaly_type}"
-            )
-            
-            # Get market data for context
-            market_data = None
-            try:
-                regime_doc = db.collection("systemStatus").document("market_regime").get()
-                if regime_doc.exists:
-                    market_data = regime_doc.to_dict()
-            except Exception as e:
-                logger.warning(f"Failed to fetch market data: {e}")
-            
-            # Generate explainability with Gemini
-            explanation = await _generate_explainability_with_gemini(
-                anomaly=critical_anomaly,
-                trades=trades,
-                user_id=user_id,
-                market_data=market_data
-            )
-            
-            # Activate kill-switch
-            kill_switch_result = _activate_kill_switch(
-                db=db,
-                user_id=user_id,
-                anomaly=critical_anomaly,
-                explanation=explanation
-            )
-            
-            # Send high-priority alert
-            alert_id = _send_high_priority_alert(
-                db=db,
-                user_id=user_id,
-                anomaly=critical_anomaly,
-                explanation=explanation
-            )
-            
-            # Log event for audit trail
-            event_id = _log_watchdog_event(
-                db=db,
-                user_id=user_id,
-                anomaly=critical_anomaly,
-                explanation=explanation,
-                kill_switch_activated=True
-            )
-            
-            return {
-                "user_id": user_id,
-                "status": "KILL_SWITCH_ACTIVATED",
-                "anomaly_type": critical_anomaly.anomaly_type,
-                "severity": critical_anomaly.severity,
-                "description": critical_anomaly.description,
-                "explanation": explanation,
-                "alert_id": alert_id,
-                "event_id": event_id,
-                "kill_switch_result": kill_switch_result,
-            }
-        
-        # Log non-critical anomalies (warnings only)
-        warnings = [a for a in anomalies if a.anomaly_detected and not a.should_halt_trading]
-        if warnings:
-            for warning in warnings:
-                logger.info(
-                    f"User {user_id}: Warning - {warning.anomaly_type}: {warning.description}"
-                )
-                
-                # Log warning event (but don't halt trading)
-                _log_watchdog_event(
-                    db=db,
-                    user_id=user_id,
-                    anomaly=warning,
-                    explanation=warning.description,
-                    kill_switch_activated=False
-                )
-            
-            return {
-                "user_id": user_id,
-                "status": "WARNINGS_DETECTED",
-                "warnings": [
-                    {
-                        "type": w.anomaly_type,
-                        "severity": w.severity,
-                        "description": w.description,
-                    }
-                    for w in warnings
-                ],
-            }
-        
-        # All clear
-        logger.debug(f"User {user_id}: No anomalies detected")
+        return await _respond_to_trades(db, user_id, trades, market_regime)
+    
+    except Exception as e:
+        logger.exception(f"Error monitoring user {user_id}: {e}")
         return {
             "user_id": user_id,
-            "status": "ALL_CLEAR",
-            "message": "No anomalies detected",
-            "trades_analyzed": len(trades),
+            "status": "ERROR",
+            "error": str(e),
         }
+
+
+async def monitor_user_trades_async(
+    async_db: firestore.AsyncClient,
+    db: firestore.Client,
+    user_id: str,
+    market_regime: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Concurrent-sweep variant of monitor_user_trades.
+    
+    The per-user reads (trading status, recent trades) go through the async client so
+    many users can be in flight at once. Kill-switch, alert and event writes only
+    happen for anomalous users and reuse the sync helpers in a worker thread.
+    
+    Args:
+        async_db: Async Firestore client for reads
+        db: Sync Firestore client for writes
+        user_id: User ID to monitor
+        market_regime: Market regime read once for the sweep (None = not found)
+    
+    Returns:
+        Dictionary with monitoring results (same shape as monitor_user_trades)
+    """
+    return await _monitor_user_async(async_db, db, user_id, market_regime)
+
+
+async def _monitor_user_async(
+    async_db: firestore.AsyncClient,
+    db: firestore.Client,
+    user_id: str,
+    market_regime: Optional[Dict[str, Any]],
+    acting: Optional[Set[str]] = None
+) -> Dict[str, Any]:
+    """
+    Body of monitor_user_trades_async.
+    
+    user_id is added to `acting` once the reads are done and the user moves on to
+    detection and writes. Until then the task has no side effects and the sweep may
+    cancel it at the deadline; after that the sweep lets it finish.
+    """
+    try:
+        status_doc = await (
+            async_db.collection("users")
+            .document(user_id)
+            .collection("status")
+            .document("trading")
+            .get()
+        )
+        disabled = _already_disabled(user_id, status_doc)
+        if disabled:
+            return disabled
+        
+        trades = await _get_recent_trades_async(
+            db=async_db,
+            user_id=user_id,
+            time_window_minutes=LOSING_STREAK_TIME_WINDOW_MINUTES
+        )
+        
+        if not trades:
+            return _no_trades(user_id)
+        
+        if acting is not None:
+            acting.add(user_id)
+        return await _respond_to_trades(db, user_id, trades, market_regime, offload_writes=True)
     
     except Exception as e:
         logger.exception(f"Error monitoring user {user_id}: {e}")
@@ -803,7 +1009,39 @@ async def monitor_user_trades(
         }
 
 
-async def monitor_all_users(db: firestore.Client) -> Dict[str, Any]:
+_SWEEP_COUNTERS = ("users_monitored", "kill_switches_activated", "warnings_detected", "errors")
+
+
+def _tally(stats: Dict[str, int], result: Dict[str, Any]) -> None:
+    """Add one per-user result to the sweep statistics."""
+    stats["users_monitored"] += 1
+    if result["status"] == "KILL_SWITCH_ACTIVATED":
+        stats["kill_switches_activated"] += 1
+    elif result["status"] == "WARNINGS_DETECTED":
+        stats["warnings_detected"] += 1
+    elif result["status"] == "ERROR":
+        stats["errors"] += 1
+
+
+def _env_number(name: str, default: float) -> float:
+    raw = os.environ.get(name)
+    if raw is None or raw.strip() == "":
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        logger.warning(f"Invalid {name}={raw!r}, using default {default}")
+        return default
+
+
+def _concurrent_sweep_enabled() -> bool:
+    return os.environ.get("WATCHDOG_SWEEP_CONCURRENT", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+async def monitor_all_users(
+    db: firestore.Client,
+    concurrent: Optional[bool] = None
+) -> Dict[str, Any]:
     """
     Monitor all active users for anomalous trading behavior.
     
@@ -811,10 +1049,16 @@ async def monitor_all_users(db: firestore.Client) -> Dict[str, Any]:
     
     Args:
         db: Firestore client
+        concurrent: Use monitor_all_users_concurrent (default: WATCHDOG_SWEEP_CONCURRENT env)
     
     Returns:
         Dictionary with aggregated monitoring results
     """
+    if concurrent is None:
+        concurrent = _concurrent_sweep_enabled()
+    if concurrent:
+        return await monitor_all_users_concurrent(db)
+    
     logger.info("🔍 Operational Watchdog: Starting monitoring sweep...")
     
     try:
@@ -822,41 +1066,35 @@ async def monitor_all_users(db: firestore.Client) -> Dict[str, Any]:
         users_ref = db.collection("users")
         users = users_ref.stream()
         
+        # One market regime read per sweep, shared by every user
+        market_regime = _read_market_regime(db)
+        
         results = []
-        kill_switches_activated = 0
-        warnings_detected = 0
-        errors = 0
+        stats = {k: 0 for k in _SWEEP_COUNTERS}
         
         for user_doc in users:
             user_id = user_doc.id
             
             try:
                 # Monitor this user
-                result = await monitor_user_trades(db=db, user_id=user_id)
-                results.append(result)
-                
-                # Track statistics
-                if result["status"] == "KILL_SWITCH_ACTIVATED":
-                    kill_switches_activated += 1
-                elif result["status"] == "WARNINGS_DETECTED":
-                    warnings_detected += 1
-                elif result["status"] == "ERROR":
-                    errors += 1
+                result = await monitor_user_trades(db=db, user_id=user_id, market_regime=market_regime)
             
             except Exception as e:
                 logger.error(f"Error monitoring user {user_id}: {e}")
-                errors += 1
-                results.append({
+                result = {
                     "user_id": user_id,
                     "status": "ERROR",
                     "error": str(e),
-                })
+                }
+            
+            results.append(result)
+            _tally(stats, result)
         
         # Log summary
         logger.info(
-            f"Watchdog sweep complete: {len(results)} users monitored, "
-            f"{kill_switches_activated} kill-switches activated, "
-            f"{warnings_detected} warnings, {errors} errors"
+            f"Watchdog sweep complete: {stats['users_monitored']} users monitored, "
+            f"{stats['kill_switches_activated']} kill-switches activated, "
+            f"{stats['warnings_detected']} warnings, {stats['errors']} errors"
         )
         
         # Store global watchdog status
@@ -864,20 +1102,14 @@ async def monitor_all_users(db: firestore.Client) -> Dict[str, Any]:
             watchdog_status_ref = db.collection("ops").document("watchdog_status")
             watchdog_status_ref.set({
                 "last_sweep_at": firestore.SERVER_TIMESTAMP,
-                "users_monitored": len(results),
-                "kill_switches_activated": kill_switches_activated,
-                "warnings_detected": warnings_detected,
-                "errors": errors,
+                **stats,
             }, merge=True)
         except Exception as e:
             logger.error(f"Failed to store watchdog status: {e}")
         
         return {
             "success": True,
-            "users_monitored": len(results),
-            "kill_switches_activated": kill_switches_activated,
-            "warnings_detected": warnings_detected,
-            "errors": errors,
+            **stats,
             "results": results,
         }
     
@@ -887,3 +1119,184 @@ async def monitor_all_users(db: firestore.Client) -> Dict[str, Any]:
             "success": False,
             "error": str(e),
         }
+
+
+async def monitor_all_users_concurrent(
+    db: firestore.Client,
+    async_db: Optional[firestore.AsyncClient] = None,
+    concurrency: Optional[int] = None,
+    page_size: Optional[int] = None,
+    deadline_seconds: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Monitor all users with bounded concurrency, resuming from the last checkpoint.
+    
+    Users are paged by document ID (cursor-based, `page_size` per page) and each page
+    is fanned out under a semaphore of `concurrency` on the async Firestore client.
+    The market regime is read once per invocation and shared by every user.
+    
+    After each page the cursor (last user ID finished with no gaps before it), the IDs
+    finished past the cursor, and the running totals are written to
+    ops/watchdog_sweep_checkpoint. At the deadline, users still in their read phase
+    are cancelled (no side effects yet, so they are simply redone next run); users
+    already detecting/writing are allowed to finish and are tallied. The next
+    invocation resumes after the cursor and skips the recorded IDs, so every user is
+    counted exactly once per sweep.
+    
+    Args:
+        db: Sync Firestore client (anomaly writes, status)
+        async_db: Async Firestore client (default: AsyncClient for db's project)
+        concurrency: Users monitored in parallel (default: WATCHDOG_SWEEP_CONCURRENCY or 25)
+        page_size: Users per cursor page (default: WATCHDOG_SWEEP_PAGE_SIZE or 300)
+        deadline_seconds: Time budget for this invocation
+            (default: WATCHDOG_SWEEP_DEADLINE_SECONDS or 50)
+    
+    Returns:
+        Dictionary with aggregated monitoring results; `completed` is False when the
+        sweep stopped at the deadline and will resume on the next run
+    """
+    concurrency = max(1, int(concurrency or _env_number("WATCHDOG_SWEEP_CONCURRENCY", SWEEP_CONCURRENCY)))
+    page_size = max(1, int(page_size or _env_number("WATCHDOG_SWEEP_PAGE_SIZE", SWEEP_PAGE_SIZE)))
+    if deadline_seconds is None:
+        deadline_seconds = _env_number("WATCHDOG_SWEEP_DEADLINE_SECONDS", SWEEP_DEADLINE_SECONDS)
+    deadline = time.monotonic() + deadline_seconds
+    
+    try:
+        if async_db is None:
+            async_db = firestore.AsyncClient(project=db.project)
+        
+        checkpoint_ref = async_db.collection("ops").document("watchdog_sweep_checkpoint")
+        checkpoint_doc = await checkpoint_ref.get()
+        checkpoint = (checkpoint_doc.to_dict() or {}) if checkpoint_doc.exists else {}
+        if checkpoint.get("completed", True):
+            checkpoint = {}
+        
+        cursor = checkpoint.get("cursor")
+        resumed = cursor is not None
+        stats = {k: int(checkpoint.get(k, 0)) for k in _SWEEP_COUNTERS}
+        
+        logger.info(
+            f"🔍 Operational Watchdog: Starting concurrent sweep "
+            f"(concurrency={concurrency}, page_size={page_size}, "
+            f"{'resuming after ' + cursor if resumed else 'from start'})..."
+        )
+        
+        # One market regime read per sweep, shared by every user
+        market_regime = await _read_market_regime_async(async_db)
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        acting: Set[str] = set()
+        
+        async def _monitor(user_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await _monitor_user_async(async_db, db, user_id, market_regime, acting)
+        
+        # Users finished past the cursor by the previous invocation (already tallied)
+        skip = set(checkpoint.get("done_after_cursor") or [])
+        
+        results = []
+        completed = False
+        users_ref = async_db.collection("users").order_by(FieldPath.document_id())
+        
+        while time.monotonic() < deadline:
+            page = users_ref.limit(page_size)
+            if cursor is not None:
+                page = page.start_after({FieldPath.document_id(): cursor})
+            user_ids = [doc.id async for doc in page.stream()]
+            
+            if not user_ids:
+                completed = True
+                break
+            
+            tasks = {
+                user_id: asyncio.create_task(_monitor(user_id))
+                for user_id in user_ids
+                if user_id not in skip
+            }
+            pending = set()
+            if tasks:
+                _, pending = await asyncio.wait(
+                    tasks.values(), timeout=max(0.0, deadline - time.monotonic())
+                )
+            if pending:
+                # Cancel users still reading; let users already acting finish their writes
+                for user_id, task in tasks.items():
+                    if task in pending and user_id not in acting:
+                        task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+            
+            cancelled = 0
+            done_after_cursor = []
+            for user_id in user_ids:
+                task = tasks.get(user_id)
+                if task is not None and task.cancelled():
+                    cancelled += 1
+                    continue
+                if task is not None:
+                    result = task.result()
+                    results.append(result)
+                    _tally(stats, result)
+                # Advance the cursor over the gap-free prefix of finished users only
+                if cancelled:
+                    done_after_cursor.append(user_id)
+                else:
+                    cursor = user_id
+            skip = set(done_after_cursor)
+            
+            if not cancelled and len(user_ids) < page_size:
+                completed = True
+                break
+            
+            await checkpoint_ref.set({
+                "cursor": cursor,
+                "done_after_cursor": done_after_cursor,
+                "completed": False,
+                "updated_at": firestore.SERVER_TIMESTAMP,
+                **stats,
+            })
+            
+            if cancelled:
+                logger.warning(
+                    f"Watchdog sweep deadline reached after {len(results)} users; "
+                    f"{cancelled} in-flight users will be retried next run"
+                )
+                break
+        
+        if completed:
+            await checkpoint_ref.set({
+                "cursor": None,
+                "completed": True,
+                "updated_at": firestore.SERVER_TIMESTAMP,
+            })
+            
+            logger.info(
+                f"Watchdog sweep complete: {stats['users_monitored']} users monitored, "
+                f"{stats['kill_switches_activated']} kill-switches activated, "
+                f"{stats['warnings_detected']} warnings, {stats['errors']} errors"
+            )
+            
+            # Store global watchdog status
+            try:
+                await async_db.collection("ops").document("watchdog_status").set({
+                    "last_sweep_at": firestore.SERVER_TIMESTAMP,
+                    **stats,
+                }, merge=True)
+            except Exception as e:
+                logger.error(f"Failed to store watchdog status: {e}")
+        
+        return {
+            "success": True,
+            "completed": completed,
+            "resumed": resumed,
+            "cursor": None if completed else cursor,
+            "users_processed": len(results),
+            **stats,
+            "results": results,
+        }
+    
+    except Exception as e:
+        logger.exception("Critical error in concurrent watchdog monitoring sweep")
+        return {
+            "success": False,
+            "error": str(e),
+        }
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark functions/strategies/sweep.BacktestSweep: runs/sec for a parameter grid.
+
+Sweeps a seeded random-entry strategy over synthetic 1m bars (no Alpaca access; the
+Backtester constructor still expects alpaca-py to be installed), once with a single
+worker and once with `--workers` processes, and checks both tables are identical.
+
+Usage:
+    python scripts/bench_backtest_sweep.py
+    python scripts/bench_backtest_sweep.py --days 20 --grid 8 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "functions"))
+
+from strategies.backtester import BacktestConfig  # noqa: E402
+from strategies.base_strategy import BaseStrategy, SignalType, TradingSignal  # noqa: E402
+from strategies.sweep import BacktestSweep  # noqa: E402
+
+
+class _RandomEntry(BaseStrategy):
+    """Enters with probability p_buy, exits with p_sell; driven by the per-run seed."""
+
+    def evaluate(self, market_data, account_snapshot, regime=None):
+        roll = random.random()
+        if not account_snapshot["positions"] and roll < self.config["p_buy"]:
+            kind = SignalType.BUY
+        elif account_snapshot["positions"] and roll < self.config["p_sell"]:
+            kind = SignalType.SELL
+        else:
+            kind = SignalType.HOLD
+        return TradingSignal(signal_type=kind, symbol="SPY", confidence=0.5, reasoning="")
+
+
+def _bars(days: int, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    price = 450.0
+    out = []
+    for d in range(days):
+        t0 = datetime(2024, 1, 2, 14, 30, tzinfo=timezone.utc) + timedelta(days=d)
+        for m in range(390):
+            price = round(price * (1.0 + rng.gauss(0.0, 0.0007)), 2)
+            out.append({
+                "timestamp": t0 + timedelta(minutes=m),
+                "open": price,
+                "high": price + 0.03,
+                "low": price - 0.03,
+                "close": price,
+                "volume": 1000 + m,
+            })
+    return out
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark the backtest parameter sweep.")
+    p.add_argument("--days", type=int, default=5, help="Trading days of 1m bars (390 per day).")
+    p.add_argument("--grid", type=int, default=4, help="Values per parameter (grid is grid x grid).")
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    p.add_argument("--seed", type=int, default=7)
+    args = p.parse_args()
+
+    bars = _bars(args.days, args.seed)
+    grid = {
+        "p_buy": [0.005 * (i + 1) for i in range(args.grid)],
+        "p_sell": [0.02 * (i + 1) for i in range(args.grid)],
+    }
+    print(f"bars={len(bars)} runs={args.grid ** 2}")
+
+    tables = []
+    for workers in sorted({1, args.workers}):
+        sweep = BacktestSweep(_RandomEntry, BacktestConfig(symbol="SPY"), bars=bars,
+                              alpaca_api_key="bench", alpaca_secret_key="bench",
+                              max_workers=workers, seed=args.seed)
+        tables.append(sweep.run(sweep.grid_runs(grid)))
+        s = sweep.stats
+        print(f"workers={workers:<3} {s.runs_per_s:>8.2f} runs/sec  ({s.elapsed_s:.2f}s, {s.failed} failed)")
+
+    assert all(t == tables[0] for t in tables), "results differ between worker counts"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark functions/backtester.Backtester: default loop vs `run(fast=True)`.
+
+Replays one year of synthetic 1m bars (252 days * 390 minutes, seeded random walk)
+through both modes with a strategy that reads `market_data` / `account_snapshot`
+every bar and trades every few hundred bars. Reports bars/sec per mode and the
+largest relative metric difference (must stay within FAST_MODE_RTOL).
+
+No Alpaca access is needed: `fetch_data` is replaced with the synthetic bars
+(the constructor still expects alpaca-py to be installed).
+
+Usage:
+    python scripts/bench_backtester.py
+    python scripts/bench_backtester.py --days 504
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "functions"))
+
+from backtester import FAST_MODE_RTOL, Backtester  # noqa: E402
+from strategies.base_strategy import BaseStrategy, SignalType, TradingSignal  # noqa: E402
+
+
+class _MeanReversion(BaseStrategy):
+    """Buys 2% below a slow EMA of the price, exits at the EMA; touches the snapshot every bar."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.ema = None
+
+    def evaluate(self, market_data, account_snapshot, regime=None):
+        price = market_data["price"]
+        self.ema = price if self.ema is None else self.ema + (price - self.ema) / 500.0
+        holding = bool(account_snapshot["positions"])
+        if not holding and price < self.ema * 0.995:
+            return TradingSignal(signal_type=SignalType.BUY, symbol="SPY", confidence=0.5, reasoning="dip")
+        if holding and price >= self.ema:
+            return TradingSignal(signal_type=SignalType.SELL, symbol="SPY", confidence=1.0, reasoning="revert")
+        return TradingSignal(signal_type=SignalType.HOLD, symbol="SPY", confidence=0.0, reasoning="")
+
+
+def _bars(days: int, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    price = 450.0
+    out = []
+    for d in range(days):
+        t0 = datetime(2024, 1, 2, 14, 30, tzinfo=timezone.utc) + timedelta(days=d)
+        for m in range(390):
+            price = round(price * (1.0 + rng.gauss(0.0, 0.0007)), 2)
+            out.append({
+                "timestamp": t0 + timedelta(minutes=m),
+                "open": price,
+                "high": price + 0.03,
+                "low": price - 0.03,
+                "close": price,
+                "volume": 1000 + m,
+            })
+    return out
+
+
+def _run(bars: List[Dict[str, Any]], fast: bool) -> tuple[float, Dict[str, Any]]:
+    bt = Backtester(strategy=_MeanReversion(), symbol="SPY", initial_capital=100000.0,
+                    alpaca_api_key="bench", alpaca_secret_key="bench")
+    bt.fetch_data = lambda: bars  # type: ignore[method-assign]
+    t0 = time.perf_counter()
+    results = bt.run(fast=fast)
+    return time.perf_counter() - t0, results
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark the backtester default vs fast mode.")
+    p.add_argument("--days", type=int, default=252, help="Trading days of 1m bars (390 per day).")
+    p.add_argument("--seed", type=int, default=7)
+    args = p.parse_args()
+    logging.disable(logging.INFO)  # per-fill/progress logging is not what we measure
+
+    bars = _bars(args.days, args.seed)
+    print(f"bars={len(bars)} ({args.days} days of 1m)")
+    exact_s, exact = _run(bars, fast=False)
+    print(f"default: {len(bars) / exact_s:>10,.0f} bars/sec  ({exact_s:.2f}s, {len(exact['trades'])} fills)")
+    fast_s, fast = _run(bars, fast=True)
+    print(f"fast:    {len(bars) / fast_s:>10,.0f} bars/sec  ({fast_s:.2f}s, {len(fast['trades'])} fills)  {exact_s / fast_s:.1f}x")
+
+    assert fast["trades"] == exact["trades"], "fills diverged"
+    worst = 0.0
+    for key, value in exact["metrics"].items():
+        a, b = float(fast["metrics"][key]), float(value)
+        if a != b:
+            worst = max(worst, abs(a - b) / max(abs(b), 1e-12))
+    print(f"max relative metric difference: {worst:.2e} (tolerance {FAST_MODE_RTOL:.0e})")
+
+
+if __name__ == "__main__":
+    main()
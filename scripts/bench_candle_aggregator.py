@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark CandleAggregator tick ingest throughput.
+
+Replays synthetic ticks (round-robin across N symbols, monotonically increasing
+event time) through:
+  - the indexed aggregator (per-(symbol, timeframe) heaps ordered by end_ts)
+  - a baseline that reproduces the previous full scan over every open bar
+  - the columnar `ingest_ticks()` path in `--batch-size` chunks (requires numpy)
+
+The baseline is O(open bars) per tick, so it is run on a smaller prefix of the
+same tick stream by default (`--baseline-ticks`); ticks/sec is comparable.
+
+Usage:
+    python -m scripts.bench_candle_aggregator
+    python -m scripts.bench_candle_aggregator --ticks 200000 --symbols 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+
+from backend.marketdata.candles.aggregator import CandleAggregator
+from backend.marketdata.candles.models import Candle, Tick
+from backend.time.nyse_time import ensure_aware_utc
+
+
+class _ScanAggregator(CandleAggregator):
+    """Pre-index behaviour: scan every open bar on each finalize check."""
+
+    def _finalize_ready(self, tf_key: tuple[str, str], *, watermark: datetime) -> list[Candle]:
+        finalize_before = ensure_aware_utc(watermark) - self.lateness
+        symbol, tf_text = tf_key
+        finalized: list[Candle] = []
+        for (sym, tft, start), st in list(self._bars.items()):
+            if sym != symbol or tft != tf_text:
+                continue
+            if st.end_ts <= finalize_before:
+                self._bars.pop((sym, tft, start), None)
+                self._due[tf_key].remove((st.end_ts, st.start_ts))
+                finalized.append(st.to_candle(is_final=True))
+                self.candles_finalized += 1
+        if tf_key in self._due and not self._due[tf_key]:
+            del self._due[tf_key]
+        finalized.sort(key=lambda c: (c.symbol, c.timeframe, c.start_ts))
+        return finalized
+
+
+def _synthetic_ticks(n: int, n_symbols: int, *, seed: int) -> Iterator[Tick]:
+    rng = random.Random(seed)
+    symbols = [f"S{i:04d}" for i in range(n_symbols)]
+    prices = [100.0 + rng.random() * 50.0 for _ in symbols]
+    t0 = datetime(2025, 12, 22, 14, 30, tzinfo=timezone.utc)  # 09:30 NY
+    step = timedelta(milliseconds=5)
+    for i in range(n):
+        j = i % n_symbols
+        prices[j] = max(0.01, prices[j] + rng.gauss(0.0, 0.02))
+        yield Tick(ts=t0 + step * i, price=round(prices[j], 2), size=rng.randint(1, 500), symbol=symbols[j])
+
+
+def _run(agg: CandleAggregator, ticks: list[Tick]) -> tuple[float, int]:
+    emitted = 0
+    t_start = time.perf_counter()
+    for t in ticks:
+        emitted += len(agg.ingest_tick(t))
+    emitted += len(agg.flush(ticks[-1].ts + timedelta(days=2)))
+    return time.perf_counter() - t_start, emitted
+
+
+def _run_columnar(agg: CandleAggregator, ticks: list[Tick], batch_size: int) -> tuple[float, int]:
+    import numpy as np
+
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    symbols = np.array([t.symbol for t in ticks])
+    ts_ns = np.array([(t.ts - epoch) // timedelta(microseconds=1) * 1000 for t in ticks], dtype=np.int64)
+    prices = np.array([t.price for t in ticks], dtype=np.float64)
+    sizes = np.array([t.size for t in ticks], dtype=np.int64)
+
+    emitted = 0
+    t_start = time.perf_counter()
+    for lo in range(0, len(ticks), batch_size):
+        hi = lo + batch_size
+        emitted += len(agg.ingest_ticks(symbols[lo:hi], ts_ns[lo:hi], prices[lo:hi], sizes[lo:hi]))
+    emitted += len(agg.flush(ticks[-1].ts + timedelta(days=2)))
+    return time.perf_counter() - t_start, emitted
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark CandleAggregator ingest throughput.")
+    p.add_argument("--ticks", type=int, default=1_000_000)
+    p.add_argument("--symbols", type=int, default=500)
+    p.add_argument("--timeframes", default="1m,5m,15m,1h,1d")
+    p.add_argument("--baseline-ticks", type=int, default=50_000, help="Ticks replayed through the scan baseline (0=skip)")
+    p.add_argument("--batch-size", type=int, default=250_000, help="Rows per ingest_ticks() call (0=skip)")
+    p.add_argument("--lateness-seconds", type=int, default=2)
+    p.add_argument("--seed", type=int, default=7)
+    args = p.parse_args()
+
+    tfs = [s.strip() for s in args.timeframes.split(",") if s.strip()]
+    ticks = list(_synthetic_ticks(args.ticks, args.symbols, seed=args.seed))
+    print(f"ticks={len(ticks)} symbols={args.symbols} timeframes={','.join(tfs)}")
+
+    if args.baseline_ticks > 0:
+        prefix = ticks[: args.baseline_ticks]
+        elapsed, emitted = _run(_ScanAggregator(tfs, max_lateness_seconds=args.lateness_seconds), prefix)
+        print(f"before (scan):    {len(prefix) / elapsed:>12,.0f} ticks/sec  ({len(prefix)} ticks, {emitted} candles, {elapsed:.2f}s)")
+
+    elapsed, emitted = _run(CandleAggregator(tfs, max_lateness_seconds=args.lateness_seconds), ticks)
+    print(f"after (indexed):  {len(ticks) / elapsed:>12,.0f} ticks/sec  ({len(ticks)} ticks, {emitted} candles, {elapsed:.2f}s)")
+
+    if args.batch_size > 0:
+        agg = CandleAggregator(tfs, max_lateness_seconds=args.lateness_seconds)
+        elapsed, emitted = _run_columnar(agg, ticks, args.batch_size)
+        print(f"columnar (batch): {len(ticks) / elapsed:>12,.0f} ticks/sec  ({len(ticks)} ticks, {emitted} candles, {elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark contract validation: jsonschema per event vs the compiled, cached validator.
+
+Validates `--events` copies of a valid event (and `--invalid-every`th one made
+invalid) against `--schema` (default: the v2 order_intent contract) with:
+  - before: `Draft202012Validator.iter_errors` on every event (requires jsonschema)
+  - after:  `get_compiled_validator_for_path(...).errors`, i.e. the generated fast
+            path, falling back to jsonschema only to explain rejected events
+
+Both report validations/sec; the run also checks that both paths return the same
+error lists.
+
+Usage:
+    python -m scripts.bench_contract_validation
+    python -m scripts.bench_contract_validation --events 200000 --invalid-every 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+from backend.contracts.registry import get_compiled_validator_for_path
+
+_DEFAULT_SCHEMA = Path(__file__).resolve().parents[1] / "backend" / "contracts" / "schemas" / "v2" / "order_intent.v2.0.0.schema.json"
+
+
+def _valid_order_intent(i: int) -> dict[str, Any]:
+    return {
+        "schema": "agenttrader.v2.order_intent",
+        "schema_version": "2.0.0",
+        "tenant_id": "tenant-1",
+        "created_at": "2026-01-08T14:30:00+00:00",
+        "intent_id": f"6f1c2d3e-0000-4000-8000-{i:012d}",
+        "account_id": "acct-1",
+        "symbol": "SPY",
+        "asset_class": "equity",
+        "side": "buy",
+        "order_type": "limit",
+        "time_in_force": "day",
+        "quantity": "10",
+        "limit_price": "501.25",
+        "currency": "USD",
+        "constraints": {"max_slippage_bps": 25, "allow_partial_fills": True},
+        "meta": {"source": "bench"},
+    }
+
+
+def _events(n: int, invalid_every: int) -> list[dict[str, Any]]:
+    out = []
+    for i in range(n):
+        e = _valid_order_intent(i)
+        if invalid_every > 0 and i % invalid_every == 0:
+            e["side"] = "hold"
+            e["quantity"] = "ten"
+        out.append(e)
+    return out
+
+
+def _jsonschema_errors(validator: Any, event: dict[str, Any]) -> list[dict[str, Any]] | None:
+    errors = [
+        {"path": ".".join(str(p) for p in e.path), "message": str(e.message), "schema_path": "/".join(str(p) for p in e.schema_path)}
+        for e in sorted(validator.iter_errors(event), key=lambda x: (list(x.path), str(x.message)))
+    ][:50]
+    return errors or None
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark compiled vs jsonschema contract validation.")
+    p.add_argument("--schema", default=str(_DEFAULT_SCHEMA))
+    p.add_argument("--events", type=int, default=50_000)
+    p.add_argument("--invalid-every", type=int, default=1000, help="Make every Nth event invalid (0=all valid)")
+    args = p.parse_args()
+
+    events = _events(args.events, args.invalid_every)
+    schema = json.loads(Path(args.schema).read_text(encoding="utf-8"))
+    print(f"schema={Path(args.schema).name} events={len(events)} invalid_every={args.invalid_every}")
+
+    t0 = time.perf_counter()
+    compiled = get_compiled_validator_for_path(args.schema)
+    print(f"compile (once per process): {(time.perf_counter() - t0) * 1000:.1f} ms, fast path={'yes' if compiled.is_valid else 'no'}")
+
+    from jsonschema import Draft202012Validator  # type: ignore
+
+    reference = Draft202012Validator(schema)
+    t0 = time.perf_counter()
+    before = [_jsonschema_errors(reference, e) for e in events]
+    elapsed = time.perf_counter() - t0
+    print(f"before (jsonschema): {len(events) / elapsed:>12,.0f} validations/sec  ({elapsed:.2f}s)")
+
+    t0 = time.perf_counter()
+    after = [compiled.errors(e) for e in events]
+    elapsed = time.perf_counter() - t0
+    print(f"after (compiled):    {len(events) / elapsed:>12,.0f} validations/sec  ({elapsed:.2f}s)")
+
+    mismatches = sum(1 for a, b in zip(before, after) if a != b)
+    rejected = sum(1 for a in after if a)
+    print(f"rejected={rejected} error_list_mismatches={mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark FileProposalStore.query_proposals with and without the sidecar index.
+
+Writes a synthetic proposal history (spread over `--days` UTC days, `--symbols`
+symbols, a handful of strategies/statuses) into a temporary data root through the
+indexed write path, then times dashboard-style filtered queries over a multi-day
+window with:
+  - the full scan (every line decoded, `use_index=False`)
+  - the index (filters evaluated on the sidecar, only matching lines decoded)
+
+Usage:
+    python -m scripts.bench_proposal_index
+    python -m scripts.bench_proposal_index --proposals 200000 --days 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from backend.dataplane.file_store import FileProposalStore
+
+_STRATEGIES = ("gamma_scalper", "0dte_straddle", "momentum", "mean_reversion")
+_STATUSES = ("PROPOSED", "APPROVED", "REJECTED", "EXECUTED")
+
+
+def _write_history(store: FileProposalStore, n: int, n_days: int, n_symbols: int, *, seed: int, chunk: int) -> None:
+    rng = random.Random(seed)
+    symbols = [f"S{i:04d}" for i in range(n_symbols)]
+    t0 = datetime(2026, 1, 5, tzinfo=timezone.utc)
+    step = timedelta(days=n_days) / n
+    buf: list[dict] = []
+    for i in range(n):
+        buf.append(
+            {
+                "proposal_id": f"p{i}",
+                "created_at_utc": (t0 + step * i).isoformat(),
+                "symbol": rng.choice(symbols),
+                "strategy_name": rng.choice(_STRATEGIES),
+                "status": rng.choice(_STATUSES),
+                "side": "BUY",
+                "qty": rng.randint(1, 10),
+                "rationale": "synthetic benchmark proposal",
+            }
+        )
+        if len(buf) >= chunk:
+            store.write_proposals(buf)
+            buf = []
+    store.write_proposals(buf)
+
+
+def _time_query(store: FileProposalStore, repeats: int, **filters) -> tuple[float, int]:
+    n = 0
+    t_start = time.perf_counter()
+    for _ in range(repeats):
+        n = len(store.query_proposals(**filters))
+    return (time.perf_counter() - t_start) / repeats, n
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark the proposal store sidecar index.")
+    p.add_argument("--proposals", type=int, default=5_000_000)
+    p.add_argument("--days", type=int, default=20)
+    p.add_argument("--symbols", type=int, default=200)
+    p.add_argument("--window-days", type=int, default=3, help="Query window length")
+    p.add_argument("--repeats", type=int, default=3)
+    p.add_argument("--chunk", type=int, default=50_000, help="Proposals per write_proposals() call")
+    p.add_argument("--root", default=None, help="Reuse/keep data under this root instead of a temp dir")
+    p.add_argument("--seed", type=int, default=7)
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(args.root) if args.root else Path(tmp)
+        indexed = FileProposalStore(root, use_index=True)
+        scan = FileProposalStore(root, use_index=False)
+
+        if not any(root.glob("proposals/*/*/*/proposals.ndjson")):
+            t_start = time.perf_counter()
+            _write_history(indexed, args.proposals, args.days, args.symbols, seed=args.seed, chunk=args.chunk)
+            print(f"wrote {args.proposals} proposals over {args.days} days in {time.perf_counter() - t_start:.1f}s")
+
+        start = datetime(2026, 1, 5, tzinfo=timezone.utc) + timedelta(days=args.days // 2)
+        window = {"start_utc": start, "end_utc": start + timedelta(days=args.window_days) - timedelta(microseconds=1)}
+        queries = {
+            "symbol": {"symbol": "S0007"},
+            "symbol+status": {"symbol": "S0007", "status": "APPROVED"},
+            "strategy": {"strategy_name": "momentum"},
+            "window only": {},
+        }
+        for label, filters in queries.items():
+            before, n_before = _time_query(scan, args.repeats, **window, **filters)
+            after, n_after = _time_query(indexed, args.repeats, **window, **filters)
+            assert n_before == n_after, (label, n_before, n_after)
+            print(
+                f"{label:<14} rows={n_after:>9}  scan={before * 1000:>9.1f}ms  "
+                f"indexed={after * 1000:>9.1f}ms  speedup={before / after:>6.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark PubSubPublisher throughput: per-message vs batched publishing.
+
+Publishes `--messages` heartbeat envelopes through an InMemoryPublisherClient that
+simulates a `--rtt-ms` publish round trip, using:
+  - publish_envelope() in a loop (one round trip per message)
+  - publish_many() (batches of `--max-messages`, futures in flight together)
+  - publish_nowait() + flush() (background batcher, `--max-inflight` batches overlap)
+
+Reports messages/sec per mode and the `pubsub_publish_latency_seconds` histogram
+(cumulative bucket counts per mode). Publisher JSON logs are discarded.
+
+Usage:
+    python -m scripts.bench_pubsub_publisher
+    python -m scripts.bench_pubsub_publisher --messages 50000 --rtt-ms 5 --max-messages 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import threading
+import time
+
+from backend.common.ops_metrics import REGISTRY
+from backend.messaging.envelope import EventEnvelope
+from backend.messaging.local import InMemoryEventBus, InMemoryPublisherClient
+from backend.messaging.publisher import PublishBatchSettings, PubSubPublisher
+
+
+def _envelopes(n: int) -> list[EventEnvelope]:
+    return [
+        EventEnvelope.new(event_type="ops.heartbeat", agent_name="bench", payload={"seq": i, "status": "ok"}, git_sha="bench")
+        for i in range(n)
+    ]
+
+
+def _publisher(rtt_s: float, settings: PublishBatchSettings) -> PubSubPublisher:
+    return PubSubPublisher(
+        project_id="local",
+        topic_id="ops-heartbeats",
+        agent_name="bench",
+        publisher_client=InMemoryPublisherClient(InMemoryEventBus(), latency_s=rtt_s),
+        shutdown_event=threading.Event(),
+        batch_settings=settings,
+    )
+
+
+def _timed(label: str, n: int, fn) -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        t0 = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - t0
+    print(f"{label:<16} {n / elapsed:>12,.0f} msgs/sec  ({n} messages, {elapsed:.2f}s)")
+
+
+def _print_latency_histogram() -> None:
+    snap = REGISTRY.snapshot()
+    buckets = snap.get("pubsub_publish_latency_seconds_bucket", {})
+    counts = snap.get("pubsub_publish_latency_seconds_count", {})
+    for mode_key in sorted(counts):
+        mode = dict(mode_key)["mode"]
+        total = counts[mode_key]
+        rows = sorted(
+            ((dict(k)["le"], v) for k, v in buckets.items() if dict(k)["mode"] == mode),
+            key=lambda kv: float(kv[0].replace("+Inf", "inf")),
+        )
+        print(f"latency[{mode}] count={int(total)}")
+        for le, v in rows:
+            print(f"  le={le:<8} {int(v):>8} ({100.0 * v / total if total else 0.0:5.1f}%)")
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark PubSubPublisher per-message vs batched publish.")
+    p.add_argument("--messages", type=int, default=20_000)
+    p.add_argument("--sync-messages", type=int, default=500, help="Messages for the per-message baseline (0=skip)")
+    p.add_argument("--rtt-ms", type=float, default=2.0)
+    p.add_argument("--max-messages", type=int, default=100)
+    p.add_argument("--max-latency-ms", type=float, default=10.0)
+    p.add_argument("--max-inflight", type=int, default=4)
+    args = p.parse_args()
+
+    settings = PublishBatchSettings(
+        max_messages=args.max_messages,
+        max_latency_s=args.max_latency_ms / 1000.0,
+        max_inflight_batches=args.max_inflight,
+    )
+    rtt_s = args.rtt_ms / 1000.0
+    print(f"messages={args.messages} rtt_ms={args.rtt_ms} max_messages={args.max_messages} max_inflight={args.max_inflight}")
+
+    if args.sync_messages > 0:
+        pub = _publisher(rtt_s, settings)
+        envs = _envelopes(args.sync_messages)
+        _timed("publish_envelope", len(envs), lambda: [pub.publish_envelope(e) for e in envs])
+
+    pub = _publisher(rtt_s, settings)
+    envs = _envelopes(args.messages)
+    _timed("publish_many", len(envs), lambda: pub.publish_many(envs))
+
+    pub = _publisher(rtt_s, settings)
+    envs = _envelopes(args.messages)
+
+    def _nowait() -> None:
+        futures = [pub.publish_nowait(e) for e in envs]
+        pub.flush()
+        for f in futures:
+            f.result()
+
+    _timed("publish_nowait", len(envs), _nowait)
+    pub.close()
+    _print_latency_histogram()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark the strategy sandbox host<->guest wire encodings.
+
+Runs the real guest loop (`guest_runner.serve_connection`) in a thread behind a local
+socketpair standing in for vsock, boots it through `WarmVMPool` (so the encoding
+negotiation is the production code path) and drives it with `StrategySession`:
+  - throughput: one `send()` of `--events` market events (pipelined), events/sec
+  - latency: `--samples` single-event `send()` round trips, p50/p99
+
+Encodings: ndjson (no negotiation), json-frames, msgpack (if installed). The example
+hello_strategy emits an intent for every other event. Host and guest share one process
+(and the GIL) here, so absolute numbers understate a real microVM; compare ratios.
+
+Usage:
+    python -m scripts.bench_strategy_sandbox_protocol
+    python -m scripts.bench_strategy_sandbox_protocol --events 50000 --samples 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import os
+import shutil
+import socket
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+from backend.strategy_runner.guest import guest_runner
+from backend.strategy_runner.protocol import (
+    ENCODING_JSON_FRAMES,
+    ENCODING_MSGPACK,
+    ENCODING_NDJSON,
+    supported_encodings,
+)
+from backend.strategy_runner.runner import DriveImageCache, FirecrackerAssets, StrategySandboxRunner, WarmVMPool
+
+HELLO = Path(__file__).resolve().parents[1] / "backend" / "strategy_runner" / "examples" / "hello_strategy" / "strategy.py"
+
+
+class _SocketpairVM:
+    """FirecrackerMicroVM stand-in: the guest loop runs in a thread on one end of a socketpair."""
+
+    def __init__(self, cfg: Any) -> None:
+        self.cfg = cfg
+        self.host_sock: socket.socket
+        self._work_dir = Path(tempfile.mkdtemp(prefix="bench_guest_"))
+        self._thread: threading.Thread
+
+    def start(self) -> None:
+        manifest = guest_runner._safe_extract_tar(self.cfg.strategy_drive_image, self._work_dir)
+        handler = guest_runner._get_handler(guest_runner._import_user_module(self._work_dir, manifest["entrypoint"]))
+        self.host_sock, guest_sock = socket.socketpair()
+
+        def _serve() -> None:
+            with guest_sock:
+                guest_runner.serve_connection(guest_sock, handler, port=self.cfg.vsock_port)
+
+        self._thread = threading.Thread(target=_serve, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._thread.join(timeout=5.0)
+
+    def cleanup(self) -> None:
+        shutil.rmtree(self._work_dir, ignore_errors=True)
+
+
+def _copy_drive(*, bundle: Any, out_dir: Path) -> Path:
+    img = Path(out_dir) / "strategy.ext4"
+    shutil.copyfile(bundle.bundle_path, img)
+    return img
+
+
+def _events(n: int) -> List[Dict[str, Any]]:
+    ts = datetime.now(tz=timezone.utc).isoformat()
+    return [
+        {
+            "protocol": "v1",
+            "type": "market_event",
+            "event_id": f"evt_{i}",
+            "ts": ts,
+            "symbol": "SPY",
+            "source": "bench",
+            "payload": {"price": 99.5 if i % 2 else 100.5, "kind": "trade", "size": 100, "bid": 99.4, "ask": 100.6},
+        }
+        for i in range(n)
+    ]
+
+
+def _bench(encoding: str, *, n_events: int, n_samples: int, cache_dir: Path) -> Dict[str, float]:
+    assets = FirecrackerAssets(Path("firecracker"), Path("vmlinux"), Path("rootfs.ext4"))
+    pool = WarmVMPool(
+        assets,
+        min_idle=0,
+        drive_cache=DriveImageCache(cache_dir, build=_copy_drive),
+        vm_factory=_SocketpairVM,
+        connect=lambda vm, cid, port, timeout_s: vm.host_sock,
+        encodings=() if encoding == ENCODING_NDJSON else (encoding,),
+    )
+    runner = StrategySandboxRunner(assets=assets, pool=pool)
+    batch = _events(n_events)
+    singles = _events(n_samples)
+
+    # Intents emit replay events on stdout; keep them out of the report (their cost stays in).
+    with pool, open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        with runner.open_session(strategy_source=HELLO, timeout_s=60.0) as session:
+            assert session.encoding == encoding, (session.encoding, encoding)
+            t0 = time.perf_counter()
+            intents = session.send(batch)
+            elapsed = time.perf_counter() - t0
+
+            rtts = []
+            for ev in singles:
+                t1 = time.perf_counter()
+                session.send([ev])
+                rtts.append(time.perf_counter() - t1)
+
+    rtts.sort()
+    return {
+        "events_per_s": n_events / elapsed,
+        "intents": float(len(intents)),
+        "p50_us": statistics.median(rtts) * 1e6,
+        "p99_us": rtts[max(0, int(len(rtts) * 0.99) - 1)] * 1e6,
+    }
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark strategy sandbox wire encodings over a socketpair.")
+    p.add_argument("--events", type=int, default=20000, help="Events in the throughput batch.")
+    p.add_argument("--samples", type=int, default=1000, help="Single-event round trips for latency.")
+    args = p.parse_args()
+
+    encodings = [ENCODING_NDJSON, ENCODING_JSON_FRAMES]
+    if ENCODING_MSGPACK in supported_encodings():
+        encodings.append(ENCODING_MSGPACK)
+
+    print(f"events={args.events} samples={args.samples}")
+    with tempfile.TemporaryDirectory(prefix="bench_drives_") as cache_dir:
+        for enc in encodings:
+            r = _bench(enc, n_events=args.events, n_samples=args.samples, cache_dir=Path(cache_dir))
+            print(
+                f"{enc:<12} {r['events_per_s']:>10,.0f} events/sec  intents={r['intents']:.0f}  "
+                f"rtt p50={r['p50_us']:>6.0f}us p99={r['p99_us']:>6.0f}us"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark structured-logging throughput as seen by the calling thread.
+
+Emits `--records` log calls (with a few `extra` fields and a bound request id)
+through `init_structured_logging` in:
+  - sync mode (format + json.dumps + write on the caller)
+  - queued mode (caller snapshots context and enqueues; a listener formats/writes)
+
+stdout is replaced by a sink that optionally sleeps `--sink-delay-us` per write to
+mimic a slow log pipe. Queued mode reports caller-side calls/sec, the time to drain
+the queue afterwards, and how many records were dropped because it was full.
+
+Usage:
+    python -m scripts.bench_structured_logging
+    python -m scripts.bench_structured_logging --records 200000 --sink-delay-us 20 --queue-size 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import logging
+import sys
+import time
+
+from backend.common import logging as structured_logging
+from backend.common.logging import bind_request_id, flush_structured_logging, init_structured_logging
+
+
+class _Sink(io.TextIOBase):
+    def __init__(self, delay_s: float) -> None:
+        self._delay_s = delay_s
+        self.lines = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        if self._delay_s > 0 and s.endswith("\n"):
+            time.sleep(self._delay_s)
+        self.lines += s.count("\n")
+        return len(s)
+
+
+def _emit(n: int) -> float:
+    lg = logging.getLogger("bench.structured_logging")
+    t0 = time.perf_counter()
+    with bind_request_id(request_id="bench-request"):
+        for i in range(n):
+            lg.info("order %s processed", i, extra={"event_type": "bench.log", "symbol": "SPY", "qty": 10})
+    return time.perf_counter() - t0
+
+
+def _run(n: int, *, queued: bool, queue_size: int, delay_s: float) -> None:
+    sink = _Sink(delay_s)
+    real_stdout = sys.stdout
+    sys.stdout = sink
+    try:
+        init_structured_logging(service="bench", env="bench", level="INFO", queued=queued, queue_size=queue_size)
+        handler = structured_logging._queue_handler
+        elapsed = _emit(n)
+        t_drain = time.perf_counter()
+        flush_structured_logging(timeout_s=600.0)
+        drain = time.perf_counter() - t_drain
+        dropped = handler.dropped if handler is not None else 0
+        init_structured_logging(service="bench", queued=False)
+    finally:
+        sys.stdout = real_stdout
+
+    label = "queued" if queued else "sync"
+    extra = f", drain {drain:.2f}s, dropped {dropped}" if queued else ""
+    print(f"{label:<7} {n / elapsed:>12,.0f} calls/sec on caller  ({n} calls, {elapsed:.2f}s, {sink.lines} lines written{extra})")
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark structured logging caller-side throughput.")
+    p.add_argument("--records", type=int, default=100_000)
+    p.add_argument("--queue-size", type=int, default=structured_logging.LOG_QUEUE_SIZE_DEFAULT)
+    p.add_argument("--sink-delay-us", type=float, default=0.0, help="Sleep per written line (simulates a slow stdout pipe)")
+    args = p.parse_args()
+
+    delay_s = args.sink_delay_us / 1e6
+    print(f"records={args.records} queue_size={args.queue_size} sink_delay_us={args.sink_delay_us}")
+    _run(args.records, queued=False, queue_size=args.queue_size, delay_s=delay_s)
+    _run(args.records, queued=True, queue_size=args.queue_size, delay_s=delay_s)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark the watchdog sweep against the Firestore emulator: sequential vs concurrent.
+
+Seeds `--users` synthetic users (every `--anomalous-every`th with a 5-trade losing
+streak) into a fresh emulator project per mode, then times:
+  - sequential: monitor_all_users(db, concurrent=False), one user at a time
+  - concurrent: monitor_all_users_concurrent(...), cursor pages of `--page-size`
+                fanned out under a semaphore of `--concurrency` (AsyncClient reads)
+
+Reports users/sec per mode and the kill-switch counts (which must match). Requires
+FIRESTORE_EMULATOR_HOST; Vertex AI is disabled so explanations use the local fallback.
+
+Usage:
+    FIRESTORE_EMULATOR_HOST=localhost:8080 python -m scripts.bench_watchdog_sweep
+    FIRESTORE_EMULATOR_HOST=localhost:8080 python -m scripts.bench_watchdog_sweep --users 5000 --concurrency 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+import uuid
+from datetime import datetime
+
+from google.cloud import firestore
+
+from functions.utils.watchdog import monitor_all_users, monitor_all_users_concurrent
+
+
+def _seed(project: str, n_users: int, anomalous_every: int) -> firestore.Client:
+    client = firestore.Client(project=project)
+    batch, pending, now = client.batch(), 0, datetime.utcnow()
+    for i in range(n_users):
+        user_ref = client.collection("users").document(f"user-{i:06d}")
+        batch.set(user_ref, {"display_name": user_ref.id})
+        pending += 1
+        if anomalous_every > 0 and i % anomalous_every == 0:
+            for t in range(5):
+                batch.set(
+                    user_ref.collection("shadowTradeHistory").document(f"t{t}"),
+                    {"created_at": now, "symbol": "SPY", "pnl_percent": "-1.5", "current_pnl": "-15.00"},
+                )
+                pending += 1
+        if pending >= 400:
+            batch.commit()
+            batch, pending = client.batch(), 0
+    if pending:
+        batch.commit()
+    return client
+
+
+def _report(label: str, n_users: int, elapsed: float, result: dict) -> None:
+    print(
+        f"{label:<11} {n_users / elapsed:>10,.0f} users/sec  ({elapsed:.2f}s, "
+        f"monitored={result.get('users_monitored')}, kill_switches={result.get('kill_switches_activated')}, "
+        f"errors={result.get('errors')})"
+    )
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark sequential vs concurrent watchdog sweeps on the Firestore emulator.")
+    p.add_argument("--users", type=int, default=5000)
+    p.add_argument("--anomalous-every", type=int, default=250)
+    p.add_argument("--concurrency", type=int, default=25)
+    p.add_argument("--page-size", type=int, default=300)
+    p.add_argument("--skip-sequential", action="store_true")
+    args = p.parse_args()
+
+    if not os.getenv("FIRESTORE_EMULATOR_HOST"):
+        raise SystemExit("FIRESTORE_EMULATOR_HOST is not set; start the Firestore emulator first")
+    for var in ("GOOGLE_CLOUD_PROJECT", "GCP_PROJECT"):
+        os.environ.pop(var, None)
+    logging.disable(logging.WARNING)
+
+    print(f"users={args.users} anomalous_every={args.anomalous_every} concurrency={args.concurrency} page_size={args.page_size}")
+
+    if not args.skip_sequential:
+        db = _seed(f"demo-watchdog-bench-{uuid.uuid4().hex[:8]}", args.users, args.anomalous_every)
+        t0 = time.perf_counter()
+        result = asyncio.run(monitor_all_users(db, concurrent=False))
+        _report("sequential", args.users, time.perf_counter() - t0, result)
+
+    project = f"demo-watchdog-bench-{uuid.uuid4().hex[:8]}"
+    db = _seed(project, args.users, args.anomalous_every)
+    t0 = time.perf_counter()
+    result = asyncio.run(
+        monitor_all_users_concurrent(
+            db,
+            async_db=firestore.AsyncClient(project=project),
+            concurrency=args.concurrency,
+            page_size=args.page_size,
+            deadline_seconds=3600.0,
+        )
+    )
+    _report("concurrent", args.users, time.perf_counter() - t0, result)
+
+
+if __name__ == "__main__":
+    main()
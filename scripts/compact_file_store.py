@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Compact closed days of the file data plane from NDJSON into columnar segments.
+
+Converts every tick/candle partition under DATA_PLANE_ROOT (default: data/) for UTC
+days strictly before `--before` (default: today UTC) into a sibling `.seg` file. The
+job is idempotent: partitions with a fresh segment are skipped.
+
+Usage:
+    python -m scripts.compact_file_store
+    python -m scripts.compact_file_store --before 2026-01-08 --remove-ndjson
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+from backend.dataplane.file_store import default_data_root
+from backend.dataplane.segments import compact_closed_days
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Compact closed NDJSON data-plane days into columnar segments.")
+    p.add_argument("--root", default=None, help="Data plane root (default: DATA_PLANE_ROOT or data/)")
+    p.add_argument("--before", default=None, help="Compact UTC days strictly before this date (YYYY-MM-DD)")
+    p.add_argument(
+        "--remove-ndjson",
+        action="store_true",
+        help="Delete NDJSON sources after compaction (kept for days with non-columnar fields)",
+    )
+    args = p.parse_args()
+
+    root = Path(args.root) if args.root else default_data_root()
+    before = date.fromisoformat(args.before) if args.before else datetime.now(timezone.utc).date()
+    stats = compact_closed_days(root, before=before, remove_ndjson=bool(args.remove_ndjson))
+    print(
+        f"compacted={stats['compacted']} skipped={stats['skipped']} rows={stats['rows']} "
+        f"root={root} before={before.isoformat()}"
+    )
+
+
+if __name__ == "__main__":
+    main()
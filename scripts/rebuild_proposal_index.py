@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Build (or rebuild) the sidecar index for existing proposal day files.
+
+Walks every `proposals/YYYY/MM/DD/proposals.ndjson` under DATA_PLANE_ROOT (default: data/),
+optionally restricted to `--start`/`--end` UTC dates (inclusive), and rewrites its
+`.idx`/`.keys` siblings from the NDJSON contents.
+
+Usage:
+    python -m scripts.rebuild_proposal_index
+    python -m scripts.rebuild_proposal_index --start 2026-01-01 --end 2026-01-31
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import date
+from pathlib import Path
+
+from backend.dataplane.file_store import default_data_root
+from backend.dataplane.proposal_index import rebuild_index
+
+
+def _day_of(path: Path) -> date | None:
+    try:
+        return date(int(path.parent.parent.parent.name), int(path.parent.parent.name), int(path.parent.name))
+    except ValueError:
+        return None
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Rebuild the proposal store sidecar index.")
+    p.add_argument("--root", default=None, help="Data plane root (default: DATA_PLANE_ROOT or data/)")
+    p.add_argument("--start", default=None, help="First UTC day to rebuild (YYYY-MM-DD)")
+    p.add_argument("--end", default=None, help="Last UTC day to rebuild (YYYY-MM-DD)")
+    args = p.parse_args()
+
+    root = Path(args.root) if args.root else default_data_root()
+    start = date.fromisoformat(args.start) if args.start else None
+    end = date.fromisoformat(args.end) if args.end else None
+
+    files = records = 0
+    for path in sorted(root.glob("proposals/*/*/*/proposals.ndjson")):
+        d = _day_of(path)
+        if d is None or (start is not None and d < start) or (end is not None and d > end):
+            continue
+        records += rebuild_index(path)
+        files += 1
+    print(f"rebuilt={files} records={records} root={root}")
+
+
+if __name__ == "__main__":
+    main()
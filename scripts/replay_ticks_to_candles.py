@@ -46,8 +46,7 @@ def main() -> None:
 
     agg = CandleAggregator(
         timeframes=tfs,
-        lateness_seconds=int(args.lateness_seconds),
-        emit_updates=False,  # deterministic backfill: finals-only
+        max_lateness_seconds=int(args.lateness_seconds),
     )
 
     batch: dict[tuple[str, str], list[Any]] = defaultdict(list)
@@ -60,8 +59,8 @@ def main() -> None:
             batch[(sym, tf)].clear()
 
     for sym in symbols:
-        ticks = tick_store.query_ticks(sym, start_utc, end_utc)
-        for t in ticks:
+        # Stream the window day by day instead of materializing every tick.
+        for t in tick_store.iter_ticks(sym, start_utc, end_utc):
             event = {
                 "symbol": sym,
                 "timestamp": t.get("timestamp", t.get("ts")),
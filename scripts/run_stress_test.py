@@ -58,6 +58,7 @@ def main():
         "black_swan_probability": 0.10,  # 10% of simulations have crashes
         "crash_magnitude_min": -0.10,
         "crash_magnitude_max": -0.20,
+        "num_workers": os.cpu_count() or 1,  # Shard strategy execution across processes
     }
     
     logger.info("\nSimulation Configuration:")
@@ -0,0 +1,172 @@
+"""
+Tests for the strategies backtester parameter sweep / walk-forward runner.
+"""
+
+import csv
+import os
+import random
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+try:  # pragma: no cover
+    import alpaca  # noqa: F401
+except Exception as e:  # pragma: no cover
+    pytestmark = pytest.mark.xfail(
+        reason=f"Backtester requires optional alpaca-py dependency for historical data client: {type(e).__name__}: {e}",
+        strict=False,
+    )
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../functions"))
+
+from strategies.backtester import Backtester, BacktestConfig
+from strategies.base_strategy import BaseStrategy, SignalType, TradingSignal
+from strategies.metrics_calculator import MetricsCalculator
+from strategies.sweep import (
+    BacktestSweep,
+    SharedBars,
+    parameter_grid,
+    select_walk_forward,
+    walk_forward_windows,
+    write_results,
+)
+
+
+class RandomEntryStrategy(BaseStrategy):
+    """Buys with probability `p_buy` and sells with `p_sell`; relies on the per-run seed."""
+
+    def __init__(self, config=None):
+        super().__init__(config)
+        if not 0.0 <= self.config["p_buy"] <= 1.0:
+            raise ValueError(f"p_buy out of range: {self.config['p_buy']}")
+
+    def evaluate(self, market_data, account_snapshot, regime=None):
+        roll = random.random()
+        if not account_snapshot["positions"] and roll < self.config["p_buy"]:
+            signal_type = SignalType.BUY
+        elif account_snapshot["positions"] and roll < self.config["p_sell"]:
+            signal_type = SignalType.SELL
+        else:
+            signal_type = SignalType.HOLD
+        return TradingSignal(signal_type=signal_type, symbol="SPY", confidence=0.5, reasoning="roll")
+
+
+def _bars(n=600, seed=3):
+    rng = random.Random(seed)
+    t0 = datetime(2025, 3, 3, 14, 30, tzinfo=timezone.utc)
+    price = 500.0
+    bars = []
+    for i in range(n):
+        price = round(price * (1.0 + rng.gauss(0.0, 0.001)), 2)
+        bars.append({
+            "timestamp": t0 + timedelta(minutes=i),
+            "open": price,
+            "high": price + 0.05,
+            "low": price - 0.05,
+            "close": price,
+            "volume": 1000 + i,
+        })
+    return bars
+
+
+GRID = {"p_buy": [0.02, 0.1], "p_sell": [0.05, 0.2]}
+
+
+def _sweep(bars, **kw):
+    kw.setdefault("max_workers", 2)
+    return BacktestSweep(
+        RandomEntryStrategy,
+        BacktestConfig(symbol="SPY"),
+        bars=bars,
+        alpaca_api_key="test",
+        alpaca_secret_key="test",
+        seed=11,
+        **kw,
+    )
+
+
+class TestPlans:
+    def test_grid_and_windows_are_stable(self):
+        assert parameter_grid({"b": [1, 2], "a": ["x"]}) == [{"a": "x", "b": 1}, {"a": "x", "b": 2}]
+        assert walk_forward_windows(10, train_bars=4, test_bars=2) == [
+            ((0, 4), (4, 6)),
+            ((2, 6), (6, 8)),
+            ((4, 8), (8, 10)),
+        ]
+        with pytest.raises(ValueError):
+            walk_forward_windows(10, train_bars=0, test_bars=2)
+
+    def test_shared_bars_round_trip(self):
+        bars = _bars(20)
+        shared = SharedBars.create(bars)
+        try:
+            attached = SharedBars.attach(shared.name, shared.n_bars)
+            assert attached.slice(5, 8) == bars[5:8]
+            attached.close()
+        finally:
+            shared.close()
+
+
+class TestSweep:
+    def test_grid_sweep_is_reproducible_and_matches_a_single_run(self):
+        bars = _bars()
+        sweep = _sweep(bars)
+        runs = sweep.grid_runs(GRID)
+        streamed = list(sweep.iter_results(runs))
+
+        assert len(streamed) == 4 and sweep.stats.completed == 4 and sweep.stats.failed == 0
+        assert [r["run_id"] for r in sweep.results] == ["p0000", "p0001", "p0002", "p0003"]
+        assert all(r["status"] == "ok" and r["bars"] == len(bars) for r in sweep.results)
+        assert sweep.stats.runs_per_s > 0
+        assert any(r["total_trades"] > 0 for r in sweep.results)
+
+        again = _sweep(bars, max_workers=1).run(runs)
+        assert again == sweep.results
+
+        # Same seed, same params, in-process: same metrics as the worker produced.
+        run = runs[3]
+        random.seed(run.seed)
+        bt = Backtester(RandomEntryStrategy(dict(run.params)), BacktestConfig(symbol="SPY"), "test", "test")
+        results = bt.run(bars=bars)
+        metrics = MetricsCalculator().calculate_all_metrics(bt.equity_curve, results["trades"], Decimal("100000.00"))
+        assert {k: sweep.results[3][k] for k in metrics} == metrics
+
+    def test_walk_forward_selects_train_winner_out_of_sample(self):
+        sweep = _sweep(_bars())
+        runs = sweep.walk_forward_runs(GRID, train_bars=200, test_bars=100)
+        rows = sweep.run(runs)
+        assert len(rows) == 4 * 2 * 4  # windows * segments * grid points
+
+        picked = select_walk_forward(rows, objective="total_return_pct")
+        assert [r["window_id"] for r in picked] == [0, 1, 2, 3]
+        for r in picked:
+            train = [x for x in rows if x["window_id"] == r["window_id"] and x["segment"] == "train"]
+            assert r["segment"] == "test"
+            assert r["train_total_return_pct"] == max(x["total_return_pct"] for x in train)
+
+    def test_cancel_stops_remaining_runs(self):
+        sweep = _sweep(_bars(), max_workers=1, max_in_flight=1)
+        runs = sweep.grid_runs({"p_buy": [0.05], "p_sell": [0.1 * i for i in range(1, 9)]})
+        seen = []
+        for row in sweep.iter_results(runs):
+            seen.append(row)
+            threading.Thread(target=sweep.cancel).start()
+        assert sweep.cancelled
+        assert 1 <= len(seen) < len(runs)
+        assert sweep.stats.completed + sweep.stats.failed + sweep.stats.cancelled == len(runs)
+
+    def test_failed_runs_are_reported_not_raised(self, tmp_path):
+        sweep = _sweep(_bars(50), max_workers=1)
+        rows = sweep.run(sweep.grid_runs({"p_buy": [2.0, 0.1], "p_sell": [0.1]}))
+        assert [r["status"] for r in rows] == ["error", "ok"]
+        assert rows[0]["error"] == "ValueError: p_buy out of range: 2.0"
+        assert sweep.stats.failed == 1 and sweep.stats.completed == 1
+
+        path = write_results(_sweep(_bars(50), max_workers=1).run(sweep.grid_runs(GRID)), tmp_path / "sweep.csv")
+        with path.open(newline="") as f:
+            table = list(csv.DictReader(f))
+        assert [r["run_id"] for r in table] == ["p0000", "p0001", "p0002", "p0003"]
+        assert {"param_p_buy", "param_p_sell", "sharpe_ratio", "max_drawdown_pct"} <= set(table[0])
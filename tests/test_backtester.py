@@ -4,7 +4,7 @@ Tests for the Backtesting Engine.
 
 import os
 import pytest
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from unittest.mock import Mock, patch, MagicMock
 
@@ -20,6 +20,7 @@ import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../functions"))
 
 from backtester import (
+    FAST_MODE_RTOL,
     Backtester,
     BacktestAccount,
     BacktestPosition,
@@ -426,6 +427,72 @@ class TestBacktester:
             )
 
 
+class CycleStrategy(BaseStrategy):
+    """Deterministic trader: buys when flat and sells after `hold_bars`, reading both snapshots."""
+
+    def __init__(self, hold_bars=7):
+        super().__init__()
+        self.hold_bars = hold_bars
+        self.entry_ts = None
+
+    def evaluate(self, market_data, account_snapshot, regime=None):
+        price = market_data["price"]
+        assert price == market_data.get("close") and float(account_snapshot["cash"]) > 0
+        if not account_snapshot["positions"]:
+            if int(price * 100) % 3 == 0:
+                self.entry_ts = market_data["timestamp"]
+                return TradingSignal(signal_type=SignalType.BUY, symbol="SPY", confidence=0.6, reasoning="flat")
+        elif market_data["timestamp"] >= self.exit_after():
+            return TradingSignal(signal_type=SignalType.SELL, symbol="SPY", confidence=1.0, reasoning="timeout")
+        return TradingSignal(signal_type=SignalType.HOLD, symbol="SPY", confidence=0.0, reasoning="hold")
+
+    def exit_after(self):
+        entry = datetime.fromisoformat(self.entry_ts)
+        return (entry + timedelta(minutes=self.hold_bars)).isoformat()
+
+
+class TestFastMode:
+    """The NumPy fast path must reproduce the default loop."""
+
+    @staticmethod
+    def _bars(n=3000):
+        import random
+
+        rng = random.Random(11)
+        price, bars = 450.0, []
+        t0 = datetime(2024, 1, 2, 14, 30, tzinfo=timezone.utc)
+        for i in range(n):
+            price = round(price * (1 + rng.gauss(0, 0.0008)), 2)
+            bars.append({
+                "timestamp": t0 + timedelta(minutes=i),
+                "open": price, "high": price + 0.05, "low": price - 0.05, "close": price, "volume": 1000 + i,
+            })
+        return bars
+
+    def _run(self, fast):
+        bars = self._bars()
+        with patch.dict(os.environ, {"APCA_API_KEY_ID": "test_key", "APCA_API_SECRET_KEY": "test_secret"}):
+            backtester = Backtester(strategy=CycleStrategy(), symbol="SPY", initial_capital=100000.0)
+        with patch.object(backtester, "fetch_data", return_value=bars):
+            return backtester.run(fast=fast)
+
+    def test_fast_mode_matches_default_mode(self):
+        exact, fast = self._run(False), self._run(True)
+
+        assert fast["trades"] == exact["trades"] and len(exact["trades"]) > 50
+        assert fast["closed_positions"] == exact["closed_positions"]
+        for key, value in exact["metrics"].items():
+            assert fast["metrics"][key] == pytest.approx(value, rel=FAST_MODE_RTOL, abs=1e-12), key
+        for curve in ("equity_curve", "benchmark_curve"):
+            assert len(fast[curve]) == len(exact[curve])
+            for a, b in zip(fast[curve], exact[curve]):
+                assert a.keys() == b.keys()
+                assert a["timestamp"] == b["timestamp"]
+                assert a["equity"] == pytest.approx(b["equity"], rel=FAST_MODE_RTOL)
+        assert [p["num_positions"] for p in fast["equity_curve"]] == [p["num_positions"] for p in exact["equity_curve"]]
+        assert fast["curve_arrays"]["equity"].dtype.name == "float64"
+
+
 def test_integration_with_gamma_scalper():
     """Integration test with GammaScalper strategy."""
     # This is a smoke test - just ensure imports work
@@ -76,3 +76,64 @@ def test_lateness_update_within_window_and_drop_beyond_window():
     assert out5 == []
     assert agg.late_drops >= 1
 
+
+
+def test_finalization_is_scoped_per_symbol_and_flush_drains_all_due_bars():
+    agg = CandleAggregator(timeframes=["1m", "5m"], max_lateness_seconds=0)
+
+    assert agg.ingest_tick(Tick(ts=_ny_to_utc(2025, 12, 22, 9, 30, 1), price=10.0, size=1, symbol="QQQ")) == []
+    assert agg.ingest_tick(Tick(ts=_ny_to_utc(2025, 12, 22, 9, 30, 2), price=20.0, size=1, symbol="SPY")) == []
+
+    # SPY's watermark moving past 09:31 must not finalize QQQ's open bar.
+    out = agg.ingest_tick(Tick(ts=_ny_to_utc(2025, 12, 22, 9, 31, 0), price=21.0, size=1, symbol="SPY"))
+    assert [(c.symbol, c.timeframe) for c in out] == [("SPY", "1m")]
+    assert agg.ops_snapshot()["open_bar_states"] == 4  # QQQ 1m/5m, SPY 1m(09:31)/5m
+
+    flushed = agg.flush(_ny_to_utc(2025, 12, 22, 9, 35, 0))
+    assert [(c.symbol, c.timeframe, c.start_ts) for c in flushed] == [
+        ("QQQ", "1m", _ny_to_utc(2025, 12, 22, 9, 30, 0)),
+        ("QQQ", "5m", _ny_to_utc(2025, 12, 22, 9, 30, 0)),
+        ("SPY", "1m", _ny_to_utc(2025, 12, 22, 9, 31, 0)),
+        ("SPY", "5m", _ny_to_utc(2025, 12, 22, 9, 30, 0)),
+    ]
+    assert agg.ops_snapshot()["open_bar_states"] == 0
+    assert agg.flush(_ny_to_utc(2025, 12, 22, 9, 40, 0)) == []
+
+
+def test_ingest_ticks_columnar_matches_per_tick_path():
+    np = pytest.importorskip("numpy")
+    import random
+
+    rng = random.Random(11)
+    t0_us = int(_utc(2025, 11, 2, 4, 0, 0).timestamp() * 1_000_000)  # spans the DST fall-back
+    rows = []
+    cur = 0
+    for _ in range(4000):
+        cur += rng.randint(0, 4_000_000)
+        late = rng.randint(0, 5_000_000) if rng.random() < 0.25 else 0
+        ts_ns = (t0_us + cur - late) * 1000 + rng.randint(0, 999)
+        rows.append((rng.choice(["spy", "QQQ", " iwm "]), ts_ns, round(100 + rng.gauss(0, 1), 2), rng.randint(0, 300)))
+
+    tfs = ["1s", "1m", "2m", "1h", "4h", "1d"]
+    per_tick = CandleAggregator(timeframes=tfs, max_lateness_seconds=2)
+    batched = CandleAggregator(timeframes=tfs, max_lateness_seconds=2)
+
+    epoch = dt.datetime(1970, 1, 1, tzinfo=dt.timezone.utc)
+    expected = []
+    for sym, ts_ns, price, size in rows:
+        ts = epoch + dt.timedelta(microseconds=ts_ns // 1000)
+        expected.extend(per_tick.ingest_tick(Tick(ts=ts, price=price, size=size, symbol=sym)))
+
+    got = []
+    for chunk in (rows[:1500], rows[1500:1501], rows[1501:]):
+        syms, ts_ns, prices, sizes = zip(*chunk)
+        got.extend(batched.ingest_ticks(np.array(syms), np.array(ts_ns), np.array(prices), np.array(sizes)))
+
+    assert got == expected
+    assert [c.vwap for c in got] == [c.vwap for c in expected]
+    assert batched.late_drops == per_tick.late_drops > 0
+    assert batched.candles_finalized == per_tick.candles_finalized
+    assert batched.get_open_bars() == per_tick.get_open_bars()
+
+    end = _utc(2025, 11, 4, 0, 0, 0)
+    assert batched.flush(end) == per_tick.flush(end)
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import copy
+import json
+from pathlib import Path
+
+import pytest
+
+from backend.contracts.compiled import UnsupportedSchema, compile_schema
+
+_V2_DIR = Path(__file__).resolve().parents[1] / "backend" / "contracts" / "schemas" / "v2"
+_ORDER_INTENT = _V2_DIR / "order_intent.v2.0.0.schema.json"
+
+
+def _order_intent() -> dict:
+    return {
+        "schema": "agenttrader.v2.order_intent",
+        "schema_version": "2.0.0",
+        "tenant_id": "t1",
+        "created_at": "2026-01-08T14:30:00+00:00",
+        "intent_id": "6f1c2d3e-0000-4000-8000-000000000001",
+        "account_id": "acct-1",
+        "symbol": "SPY",
+        "asset_class": "equity",
+        "side": "buy",
+        "order_type": "limit",
+        "time_in_force": "day",
+        "quantity": "10",
+        "limit_price": "501.25",
+        "currency": "USD",
+        "constraints": {"max_slippage_bps": 25, "allow_partial_fills": True},
+    }
+
+
+def _invalid_variants() -> list[dict]:
+    out = []
+    for mutate in (
+        lambda d: d.pop("symbol"),
+        lambda d: d.update(side="hold"),
+        lambda d: d.update(schema_version="1.0.0"),
+        lambda d: d.update(quantity="ten"),
+        lambda d: d.update(currency="usd"),
+        lambda d: d.update(symbol=""),
+        lambda d: d.update(constraints={"max_slippage_bps": 20000}),
+        lambda d: d.update(constraints={"max_slippage_bps": True}),
+        lambda d: d.update(constraints={"max_slippage_bps": 2.5}),
+        lambda d: d.update(meta=[1]),
+    ):
+        d = _order_intent()
+        mutate(d)
+        out.append(d)
+    return out
+
+
+@pytest.fixture(scope="module")
+def order_intent_schema() -> dict:
+    return json.loads(_ORDER_INTENT.read_text(encoding="utf-8"))
+
+
+def test_compiled_order_intent_accepts_valid_and_rejects_invalid(order_intent_schema: dict) -> None:
+    is_valid = compile_schema(order_intent_schema)
+    assert is_valid(_order_intent())
+    assert is_valid({**_order_intent(), "extra_field": {"anything": 1}})  # additionalProperties: true
+    for bad in _invalid_variants():
+        assert not is_valid(bad), bad
+
+
+def test_all_v2_contract_schemas_compile() -> None:
+    paths = sorted(_V2_DIR.glob("*.schema.json"))
+    assert paths
+    for p in paths:
+        compile_schema(json.loads(p.read_text(encoding="utf-8")))
+
+
+def test_keyword_semantics() -> None:
+    is_valid = compile_schema(
+        {
+            "type": "object",
+            "properties": {"n": {"type": "integer", "exclusiveMinimum": 0}, "tags": {"type": "array", "items": {"type": "string"}, "maxItems": 2}},
+            "additionalProperties": False,
+            "oneOf": [{"required": ["n"]}, {"required": ["tags"]}],
+        }
+    )
+    assert is_valid({"n": 1})
+    assert is_valid({"n": 2.0})  # integral floats are integers
+    assert not is_valid({"n": True})  # booleans are not numbers
+    assert not is_valid({"n": 0})
+    assert not is_valid({"n": 1, "tags": []})  # oneOf: both branches match
+    assert not is_valid({"tags": ["a", "b", "c"]})
+    assert not is_valid({"n": 1, "x": 1})
+    assert compile_schema({"const": 1})(1.0)
+    assert not compile_schema({"enum": [1, 2]})(True)
+
+
+def test_unsupported_keywords_are_reported() -> None:
+    with pytest.raises(UnsupportedSchema):
+        compile_schema({"type": "object", "unevaluatedProperties": False})
+    with pytest.raises(UnsupportedSchema):
+        compile_schema({"$ref": "https://example.com/other.json"})
+
+
+def test_registry_cache_matches_jsonschema_errors(order_intent_schema: dict) -> None:
+    jsonschema = pytest.importorskip("jsonschema")
+    from backend.contracts.registry import get_compiled_validator_for_path
+
+    compiled = get_compiled_validator_for_path(str(_ORDER_INTENT))
+    assert compiled is get_compiled_validator_for_path(str(_ORDER_INTENT))
+    assert compiled.is_valid is not None
+
+    reference = jsonschema.Draft202012Validator(order_intent_schema)
+    for event in [_order_intent(), *_invalid_variants()]:
+        expected = [
+            {"path": ".".join(str(p) for p in e.path), "message": str(e.message), "schema_path": "/".join(str(p) for p in e.schema_path)}
+            for e in sorted(reference.iter_errors(copy.deepcopy(event)), key=lambda x: (list(x.path), str(x.message)))
+        ]
+        assert compiled.errors(event) == (expected or None)
@@ -119,3 +119,214 @@ def test_proposal_store_partition_path(data_root: Path) -> None:
     assert len(lines) == 1
     assert json.loads(lines[0])["proposal_id"] == "p1"
 
+
+
+def test_compacted_segments_serve_same_ticks_and_candles(data_root: Path) -> None:
+    np = pytest.importorskip("numpy")
+    from backend.dataplane.segments import compact_closed_days, read_segment
+
+    ticks = FileTickStore()
+    ticks.write_ticks(
+        "SPY",
+        [
+            {"timestamp": "2026-01-07T14:30:02Z", "price": 101.0, "size": 2},
+            {"timestamp": "2026-01-07T14:30:01.5Z", "price": 100.5, "size": 5},
+            {"timestamp": "2026-01-07T14:30:03Z", "price": 102.0, "size": 1},
+        ],
+    )
+    candles = FileCandleStore()
+    candles.write_candles(
+        "SPY",
+        "1m",
+        [
+            {
+                "ts_start_utc": "2026-01-07T14:30:00Z",
+                "ts_end_utc": "2026-01-07T14:31:00Z",
+                "open": 100.5,
+                "high": 102.0,
+                "low": 100.5,
+                "close": 102.0,
+                "volume": 8,
+                "vwap": 100.9375,
+                "trade_count": 3,
+                "is_final": True,
+            }
+        ],
+    )
+
+    window = (_utc(2026, 1, 7, 14, 30, 2), _utc(2026, 1, 7, 23, 59, 59))
+    before_ticks = [(r["timestamp"], r["price"], r["size"]) for r in ticks.query_ticks("SPY", *window)]
+    before_candles = candles.query_candles("SPY", "1m", _utc(2026, 1, 7, 0, 0, 0), window[1])
+
+    stats = compact_closed_days(data_root, before=datetime(2026, 1, 8).date())
+    assert stats == {"compacted": 2, "skipped": 0, "rows": 4}
+    assert compact_closed_days(data_root, before=datetime(2026, 1, 8).date())["skipped"] == 2
+
+    seg_path = data_root / "ticks" / "2026" / "01" / "07" / "SPY.seg"
+    seg = read_segment(seg_path)
+    assert seg.rows == 3
+    assert seg.min_ts_ns < seg.max_ts_ns
+    assert isinstance(seg.columns["ts_ns"], np.memmap)
+
+    assert [(r["timestamp"], r["price"], r["size"]) for r in ticks.query_ticks("SPY", *window)] == before_ticks
+    got_candles = candles.query_candles("SPY", "1m", _utc(2026, 1, 7, 0, 0, 0), window[1])
+    assert [(c["ts_start_utc"], c["close"], c["volume"], c["vwap"]) for c in got_candles] == [
+        (c["ts_start_utc"].replace("Z", "+00:00"), c["close"], c["volume"], c["vwap"]) for c in before_candles
+    ]
+
+    arrays = ticks.query_tick_arrays("SPY", *window)
+    assert arrays["price"].tolist() == [101.0, 102.0]
+    assert arrays["size"].dtype == np.int64
+
+    # Late append to a compacted day: the segment is stale, NDJSON is authoritative again.
+    ticks.write_ticks("SPY", [{"timestamp": "2026-01-07T14:30:04Z", "price": 103.0, "size": 1}])
+    assert [r["price"] for r in ticks.query_ticks("SPY", *window)] == [101.0, 102.0, 103.0]
+
+
+def test_compaction_can_remove_ndjson_sources(data_root: Path) -> None:
+    pytest.importorskip("numpy")
+    from backend.dataplane.segments import compact_closed_days
+
+    store = FileTickStore()
+    store.write_ticks("QQQ", [{"timestamp": "2026-01-07T15:00:00Z", "price": 400.0, "size": 3}])
+    compact_closed_days(data_root, before=datetime(2026, 1, 8).date(), remove_ndjson=True)
+
+    day = data_root / "ticks" / "2026" / "01" / "07"
+    assert not (day / "QQQ.ndjson").exists()
+    assert (day / "QQQ.seg").exists()
+
+    store.write_ticks("QQQ", [{"timestamp": "2026-01-07T15:00:01Z", "price": 401.0, "size": 1}])
+    out = store.query_ticks("QQQ", _utc(2026, 1, 7, 0, 0, 0), _utc(2026, 1, 7, 23, 59, 59))
+    assert [(r["price"], r["size"]) for r in out] == [(400.0, 3), (401.0, 1)]
+
+
+def test_compaction_keeps_extra_tick_fields_in_row_queries(data_root: Path) -> None:
+    np = pytest.importorskip("numpy")
+    from backend.dataplane.segments import compact_closed_days, read_segment
+
+    store = FileTickStore()
+    store.write_ticks(
+        "IWM",
+        [
+            {"timestamp": "2026-01-07T15:00:00Z", "price": 200.0, "size": 3, "exchange": "V", "conditions": ["@"], "id": 42},
+            {"timestamp": "2026-01-07T15:00:01Z", "price": 200.5, "size": 1},
+        ],
+    )
+    window = (_utc(2026, 1, 7, 0, 0, 0), _utc(2026, 1, 7, 23, 59, 59))
+    before = store.query_ticks("IWM", *window)
+
+    compact_closed_days(data_root, before=datetime(2026, 1, 8).date(), remove_ndjson=True)
+
+    day = data_root / "ticks" / "2026" / "01" / "07"
+    assert read_segment(day / "IWM.seg").exact_rows is False
+    assert (day / "IWM.ndjson").exists()  # the only copy of exchange/conditions/id
+    assert store.query_ticks("IWM", *window) == before
+    assert before[0]["exchange"] == "V" and before[0]["conditions"] == ["@"] and before[0]["id"] == 42
+
+    arrays = store.query_tick_arrays("IWM", *window)
+    assert isinstance(arrays["price"], np.memmap)
+    assert arrays["price"].tolist() == [200.0, 200.5]
+
+
+def test_iter_ticks_streams_days_in_time_order_and_batches(data_root: Path) -> None:
+    store = FileTickStore()
+    store.write_ticks(
+        "SPY",
+        [
+            {"timestamp": "2026-01-08T10:00:00Z", "price": 3.0, "size": 1},
+            {"timestamp": "2026-01-07T10:00:02Z", "price": 2.0, "size": 1},
+            {"timestamp": "2026-01-07T10:00:01Z", "price": 1.0, "size": 1},
+        ],
+    )
+    window = (_utc(2026, 1, 7, 0, 0, 0), _utc(2026, 1, 9, 23, 59, 59))
+
+    it = store.iter_ticks("SPY", *window)
+    assert next(it)["price"] == 1.0
+    # Later days are only opened once the iterator reaches them.
+    store.write_ticks("SPY", [{"timestamp": "2026-01-09T10:00:00Z", "price": 4.0, "size": 1}])
+    assert [r["price"] for r in it] == [2.0, 3.0, 4.0]
+
+    batches = list(store.iter_ticks("SPY", *window, batch_size=3))
+    assert [[r["price"] for r in b] for b in batches] == [[1.0, 2.0, 3.0], [4.0]]
+    assert store.query_ticks("SPY", *window) == [r for b in batches for r in b]
+
+    with pytest.raises(ValueError):
+        store.iter_ticks("SPY", *window, batch_size=0)
+
+
+def test_iter_candles_and_proposals_match_list_apis(data_root: Path) -> None:
+    candles = FileCandleStore()
+    candles.write_candles(
+        "SPY",
+        "1m",
+        [
+            {"ts_start_utc": f"2026-01-0{d}T12:0{m}:00Z", "ts_end_utc": f"2026-01-0{d}T12:0{m + 1}:00Z", "close": float(m)}
+            for d in (8, 7)
+            for m in (2, 1)
+        ],
+    )
+    window = (_utc(2026, 1, 7, 0, 0, 0), _utc(2026, 1, 8, 23, 59, 59))
+    rows = list(candles.iter_candles("SPY", "1m", *window))
+    assert [r["ts_start_utc"][:16] for r in rows] == [
+        "2026-01-07T12:01",
+        "2026-01-07T12:02",
+        "2026-01-08T12:01",
+        "2026-01-08T12:02",
+    ]
+    assert rows == candles.query_candles("SPY", "1m", *window)
+
+    proposals = FileProposalStore()
+    proposals.write_proposals(
+        [
+            {"proposal_id": "p2", "created_at_utc": "2026-01-07T00:00:02Z", "symbol": "SPY", "status": "PROPOSED"},
+            {"proposal_id": "p1", "created_at_utc": "2026-01-07T00:00:01Z", "symbol": "SPY", "status": "PROPOSED"},
+            {"proposal_id": "p3", "created_at_utc": "2026-01-08T00:00:00Z", "symbol": "QQQ", "status": "PROPOSED"},
+        ]
+    )
+    batches = list(proposals.iter_proposals(start_utc=window[0], end_utc=window[1], symbol="spy", batch_size=1))
+    assert [[r["proposal_id"] for r in b] for b in batches] == [["p1"], ["p2"]]
+    assert [r["proposal_id"] for r in proposals.query_proposals(start_utc=window[0], end_utc=window[1])] == [
+        "p1",
+        "p2",
+        "p3",
+    ]
+
+
+def test_proposal_index_matches_full_scan_and_recovers_unindexed_tail(data_root: Path) -> None:
+    pytest.importorskip("numpy")
+    from backend.dataplane.proposal_index import index_path_for, rebuild_index
+
+    indexed = FileProposalStore()
+    scan = FileProposalStore(use_index=False)
+    recs = [
+        {
+            "proposal_id": f"p{i}",
+            "created_at_utc": f"2026-01-07T00:00:{59 - i:02d}Z",
+            "symbol": [" spy", "QQQ", "SPY "][i % 3],
+            "strategy_name": ["alpha", " beta"][i % 2],
+            "status": ["proposed", "APPROVED"][i % 2],
+        }
+        for i in range(12)
+    ]
+    indexed.write_proposals(recs[:8])
+    indexed.write_proposals(recs[8:10])
+    # An older writer appends without touching the index.
+    scan.write_proposals(recs[10:])
+
+    day = data_root / "proposals" / "2026" / "01" / "07" / "proposals.ndjson"
+    assert index_path_for(day).exists()
+    window = {"start_utc": _utc(2026, 1, 7, 0, 0, 5), "end_utc": _utc(2026, 1, 7, 0, 0, 55)}
+    cases = [{}, {"symbol": "spy"}, {"strategy_name": "beta"}, {"status": "Proposed", "symbol": "SPY"}, {"symbol": "IWM"}]
+
+    def ids(store: FileProposalStore, **filters: object) -> list[str]:
+        return [r["proposal_id"] for r in store.query_proposals(**window, **filters)]
+
+    for f in cases:
+        assert ids(indexed, **f) == ids(scan, **f)
+    assert ids(indexed, symbol="spy", status="proposed") == ["p8", "p6"]
+
+    # Rebuild covers the tail; further indexed writes keep results identical.
+    assert rebuild_index(day) == 12
+    indexed.write_proposals([{**recs[0], "proposal_id": "p12", "created_at_utc": "2026-01-07T00:00:30Z"}])
+    for f in cases:
+        assert ids(indexed, **f) == ids(scan, **f)
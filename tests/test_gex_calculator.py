@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("firebase_admin")
+pytest.importorskip("numpy")
+
+from functions.utils.gex_calculator import (
+    calculate_strike_gex,
+    calculate_total_gex,
+    option_chain_arrays,
+    parse_option_symbol,
+)
+
+
+def test_parse_option_symbol_handles_roots_containing_c_or_p() -> None:
+    assert parse_option_symbol("SPY241231C00550000") == {
+        "underlying": "SPY",
+        "date": "241231",
+        "type": "call",
+        "strike": 550.0,
+    }
+    assert parse_option_symbol("QQQ250117P00512500")["strike"] == 512.5
+    assert parse_option_symbol("SPY") is None
+    assert parse_option_symbol("SPY241231X00550000") is None
+
+    # Cached parses hand out independent dicts.
+    parse_option_symbol("SPY241231C00550000")["strike"] = 0.0
+    assert parse_option_symbol("SPY241231C00550000")["strike"] == 550.0
+
+
+def test_calculate_total_gex_matches_per_contract_sums_and_zero_gamma() -> None:
+    price = 500.0
+    snapshots = {
+        "SPY250117C00490000": {"greeks": {"gamma": 0.01}, "open_interest": 1000},
+        "SPY250117P00490000": {"greeks": {"gamma": 0.02}, "open_interest": 100},
+        "SPY250221C00500000": {"greeks": {"gamma": 0.03}, "openInterest": 500},
+        "SPY250117P00510000": {"greeks": {"gamma": 0.04}, "open_interest": 2000},
+        "SPY250117C00510000": {"greeks": {}, "open_interest": 2000},
+        "SPY250117C00520000": {"greeks": {"gamma": 0.05}},
+        "not-an-option": {"greeks": {"gamma": 1.0}, "open_interest": 1},
+    }
+
+    out = calculate_total_gex("SPY", snapshots, price)
+
+    per_contract = {
+        sym: calculate_strike_gex(snap, price, parse_option_symbol(sym)["type"])
+        for sym, snap in snapshots.items()
+        if parse_option_symbol(sym)
+    }
+    assert out["call_gex"] == pytest.approx(sum(v for s, v in per_contract.items() if "C0" in s))
+    assert out["put_gex"] == pytest.approx(sum(v for s, v in per_contract.items() if "P0" in s))
+    assert out["total_gex"] == pytest.approx(out["call_gex"] + out["put_gex"])
+    assert [s["strike"] for s in out["strikes"]] == [490.0, 500.0, 510.0, 520.0]
+    assert out["num_strikes"] == 4
+
+    # net: 490 -> +400k, 500 -> +750k, 510 -> -4M; crossing between 500 and 510.
+    net = [s["net_gex"] for s in out["strikes"]]
+    assert net[:3] == pytest.approx([400_000.0, 750_000.0, -4_000_000.0])
+    assert out["zero_gamma_strike"] == pytest.approx(500.0 + 10.0 * 750_000.0 / 4_750_000.0)
+
+    chain = option_chain_arrays(snapshots)
+    assert len(chain) == 6
+    assert str(chain.expiry[2]) == "2025-02-21"
+
+
+def test_option_chain_arrays_keeps_contracts_with_invalid_expiry_as_nat() -> None:
+    snapshots = {
+        "SPY250117C00490000": {"greeks": {"gamma": 0.01}, "open_interest": 1000},
+        "SPY241399C00500000": {"greeks": {"gamma": 0.02}, "open_interest": 100},  # month 13
+        "SPY250230P00500000": {"greeks": {"gamma": 0.03}, "open_interest": 100},  # Feb 30
+        "SPY250221P00510000": {"greeks": {"gamma": 0.04}, "open_interest": 200},
+    }
+
+    chain = option_chain_arrays(snapshots)
+
+    assert len(chain) == 4
+    assert chain.strike.tolist() == [490.0, 500.0, 500.0, 510.0]
+    assert [str(d) for d in chain.expiry] == ["2025-01-17", "NaT", "NaT", "2025-02-21"]
+    result = calculate_total_gex("SPY", snapshots, 500.0)
+    assert result["num_strikes"] == 3
+    expected = sum(
+        calculate_strike_gex(snapshot, 500.0, parse_option_symbol(symbol)["type"])
+        for symbol, snapshot in snapshots.items()
+    )
+    assert result["total_gex"] == pytest.approx(expected)
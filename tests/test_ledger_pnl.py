@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import pytest
+
 from backend.ledger.pnl import compute_pnl_fifo
 from backend.ledger.sample_dataset import EXPECTED_TOTALS, SAMPLE_LEDGER_TRADES
 
@@ -28,3 +30,135 @@ def test_compute_pnl_fifo_sample_dataset_per_trade_sanity() -> None:
     assert round(by_id["t5_buy_5_80"].realized_pnl_gross, 10) == 50.0
     assert round(by_id["t5_buy_5_80"].realized_pnl_net, 10) == 48.5
 
+
+
+def _sample_ledger_trades() -> list:
+    from backend.ledger.models import LedgerTrade
+
+    fields = ("tenant_id", "uid", "strategy_id", "run_id", "symbol", "side", "qty", "price", "ts", "fees")
+    return [
+        LedgerTrade(**{k: t[k] for k in fields}, broker_fill_id=t["trade_id"]) for t in SAMPLE_LEDGER_TRADES
+    ]
+
+
+def _reference_fifo_pnl(trades: list, marks: dict) -> list:
+    """Frozen copy of the original list-based FIFO loop of `compute_fifo_pnl`."""
+    groups: dict = {}
+    for t in sorted(trades, key=lambda t: (t.ts, str(t.broker_fill_id or ""), str(t.order_id or ""))):
+        g = groups.setdefault((t.tenant_id, t.uid, t.strategy_id, t.symbol), {"buy": [], "sell": [], "realized": 0.0})
+        cost = (float(t.fees or 0.0) + float(t.slippage or 0.0)) / float(t.qty)
+        px = float(t.price) + cost if t.side == "buy" else float(t.price) - cost
+        opposite = g["sell"] if t.side == "buy" else g["buy"]
+        qty = float(t.qty)
+        while qty > 0 and opposite:
+            lot = opposite[0]
+            n = min(qty, lot[0])
+            g["realized"] += ((lot[1] - px) if t.side == "buy" else (px - lot[1])) * n
+            lot[0] -= n
+            qty -= n
+            if lot[0] <= 0:
+                opposite.pop(0)
+        if qty > 0:
+            g[t.side].append([qty, px])
+
+    out = []
+    for key in sorted(groups):
+        g = groups[key]
+        m = marks.get(key[3])
+        unreal = 0.0
+        if m is not None:
+            unreal = sum((m - p) * q for q, p in g["buy"]) + sum((p - m) * q for q, p in g["sell"])
+        position = sum(q for q, _ in g["buy"]) - sum(q for q, _ in g["sell"])
+        out.append((*key, position, g["realized"], unreal))
+    return out
+
+
+def _rows(res: list) -> list:
+    return [
+        (r.tenant_id, r.uid, r.strategy_id, r.symbol, r.position_qty, r.realized_pnl, r.unrealized_pnl) for r in res
+    ]
+
+
+def test_compute_fifo_pnl_hand_computed_round_trip() -> None:
+    from datetime import datetime, timezone
+
+    from backend.ledger.models import LedgerTrade
+    from backend.ledger.pnl import FifoLedgerState, compute_fifo_pnl
+
+    t0 = datetime(2026, 1, 5, 15, 0, tzinfo=timezone.utc)
+
+    def fill(i: int, side: str, qty: float, price: float, fees: float = 0.0) -> LedgerTrade:
+        return LedgerTrade(
+            tenant_id="t", uid="u", strategy_id="s", run_id="r", symbol="SPY",
+            side=side, qty=qty, price=price, ts=t0.replace(minute=i), broker_fill_id=f"f{i}", fees=fees,
+        )
+
+    trades = [
+        fill(1, "buy", 10, 100.0, fees=1.0),  # long 10 @ 100.1
+        fill(2, "buy", 10, 110.0),  # long 10 @ 110
+        fill(3, "sell", 15, 120.0, fees=1.5),  # sells @ 119.9: +198 on lot 1, +49.5 on 5 of lot 2
+        fill(4, "sell", 10, 90.0),  # -100 on the last 5 of lot 2, then short 5 @ 90
+    ]
+    [row] = compute_fifo_pnl(trades=trades, mark_prices={"SPY": 80.0})
+    assert row.position_qty == -5.0
+    assert row.realized_pnl == pytest.approx(198.0 + 49.5 - 100.0)
+    assert row.unrealized_pnl == pytest.approx(50.0)
+
+    state = FifoLedgerState()
+    state.apply_many(trades)
+    assert state.snapshot({"SPY": 80.0}) == [row]
+
+
+def test_fifo_ledger_state_matches_reference_fifo_incrementally_and_from_checkpoint() -> None:
+    import json
+    import random
+    from datetime import timedelta
+
+    from backend.ledger.models import LedgerTrade
+    from backend.ledger.pnl import FifoLedgerState, compute_fifo_pnl
+
+    trades = _sample_ledger_trades()
+    rng = random.Random(3)
+    t0 = trades[-1].ts
+    for i in range(400):
+        trades.append(
+            LedgerTrade(
+                tenant_id="t_demo",
+                uid="uid_demo",
+                strategy_id=rng.choice(["strat_demo", "strat_b"]),
+                run_id="r",
+                symbol=rng.choice(["SPY", "QQQ"]),
+                side=rng.choice(["buy", "sell"]),
+                qty=float(rng.randint(1, 30)),
+                price=round(rng.uniform(90, 110), 2),
+                ts=t0 + timedelta(seconds=i // 3),
+                broker_fill_id=f"f{i}",
+                fees=round(rng.uniform(0, 1), 2),
+                slippage=round(rng.uniform(0, 0.2), 2),
+            )
+        )
+    marks = {"SPY": 101.5, "QQQ": 99.25}
+    expected = _reference_fifo_pnl(trades, marks)
+    assert _rows(compute_fifo_pnl(trades=trades, mark_prices=marks)) == expected
+
+    state = FifoLedgerState()
+    state.apply_many(trades[:200])
+    resumed = FifoLedgerState.from_checkpoint(json.loads(json.dumps(state.to_checkpoint(), default=str)))
+    for t in trades[200:]:
+        resumed.apply(t)
+    assert _rows(resumed.snapshot(marks)) == expected
+    assert resumed.trade_count == len(trades)
+
+    with pytest.raises(ValueError):
+        resumed.apply(trades[0])
+
+
+def test_fifo_ledger_state_sample_dataset_fee_totals() -> None:
+    from backend.ledger.pnl import FifoLedgerState
+
+    state = FifoLedgerState()
+    state.apply_many(_sample_ledger_trades())
+    totals = state.realized_totals()[("t_demo", "uid_demo", "strat_demo")]
+    assert round(totals["realized_pnl_gross"], 10) == EXPECTED_TOTALS["realized_pnl_gross"]
+    assert round(totals["realized_fees"], 10) == EXPECTED_TOTALS["realized_fees"]
+    assert round(totals["realized_pnl_net"], 10) == EXPECTED_TOTALS["realized_pnl_net"]
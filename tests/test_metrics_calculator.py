@@ -0,0 +1,87 @@
+"""
+Tests for the strategies MetricsCalculator: list, array and streaming paths.
+"""
+
+import os
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../functions"))
+
+from strategies.metrics_calculator import MetricsCalculator, StreamingMetrics
+
+START = Decimal("100000.00")
+T0 = datetime(2025, 3, 3, 14, 30, tzinfo=timezone.utc)
+
+
+def _curve(n=2000, seed=5):
+    rng = random.Random(seed)
+    equity = START
+    curve = []
+    for i in range(n):
+        equity = (equity * Decimal(str(round(1 + rng.gauss(0, 0.002), 6)))).quantize(Decimal("0.01"))
+        curve.append((T0 + timedelta(minutes=i), equity))
+    return curve
+
+
+def _trades(n=30, seed=5):
+    rng = random.Random(seed)
+    trades = []
+    for i in range(n):
+        action = "BUY" if i % 2 == 0 else "SELL"
+        cost = round(rng.uniform(9000, 11000), 2)
+        trades.append({"symbol": "SPY", "action": action, "total_cost": cost if action == "BUY" else -cost})
+    return trades
+
+
+def test_drawdown_and_trade_metrics_on_known_curve():
+    values = ["100", "120", "90", "130", "117"]
+    curve = [(T0 + timedelta(days=i), Decimal(v)) for i, v in enumerate(values)]
+    trades = [
+        {"symbol": "SPY", "action": "BUY", "total_cost": 100.0},
+        {"symbol": "SPY", "action": "SELL", "total_cost": -130.0},
+        {"symbol": "SPY", "action": "BUY", "total_cost": 120.0},
+        {"symbol": "SPY", "action": "SELL", "total_cost": -110.0},
+    ]
+    m = MetricsCalculator().calculate_all_metrics(curve, trades, Decimal("100"))
+    assert (m["max_drawdown_dollars"], m["max_drawdown_pct"]) == (30.0, 25.0)
+    assert (m["total_trades"], m["winning_trades"], m["losing_trades"]) == (2, 1, 1)
+    assert (m["largest_win"], m["largest_loss"], m["profit_factor"]) == (30.0, -10.0, 3.0)
+    assert m["trading_days"] == 5 and m["start_date"] == T0.isoformat()
+
+
+def test_array_path_matches_list_path():
+    np = pytest.importorskip("numpy")
+    curve, trades = _curve(), _trades()
+    calc = MetricsCalculator()
+    expected = calc.calculate_all_metrics(curve, trades, START)
+
+    equity = np.array([float(e) for _, e in curve])
+    assert calc.calculate_all_metrics_arrays([t for t, _ in curve], equity, trades, START) == expected
+
+    stamps = np.array([t.replace(tzinfo=None) for t, _ in curve], dtype="datetime64[us]")
+    got = calc.calculate_all_metrics_arrays(stamps, equity, trades, START)
+    assert got == expected and list(got) == list(expected)
+
+    assert calc.calculate_all_metrics_arrays(stamps[:1], equity[:1], trades, START) == calc._empty_metrics()
+
+
+def test_streaming_matches_batch_at_every_checkpoint():
+    curve, trades = _curve(), _trades()
+    calc = MetricsCalculator()
+    live = StreamingMetrics(START)
+    assert live.metrics() == calc._empty_metrics()
+
+    fills = iter(trades)
+    for i, (ts, equity) in enumerate(curve, start=1):
+        live.update(ts, equity)
+        if i % 100 == 0:
+            live.add_trade(next(fills))
+        if i in (2, 50, 1000, len(curve)):
+            seen = trades[: i // 100]
+            assert live.metrics() == calc.calculate_all_metrics(curve[:i], seen, START)
+    assert live.points == len(curve)
@@ -0,0 +1,181 @@
+"""
+Tests for the batched Monte Carlo path generator and vectorized risk metrics.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from functions.utils.monte_carlo import MonteCarloSimulator, SimulationParameters, SimulationPath
+
+
+def _params(**overrides) -> SimulationParameters:
+    base = dict(num_simulations=40, num_days=60, crash_day_min=10, crash_day_max=40)
+    base.update(overrides)
+    return SimulationParameters(**base)
+
+
+def test_price_tensor_is_seeded_and_chunking_keeps_black_swan_count() -> None:
+    params = _params(black_swan_probability=0.25)
+    a = MonteCarloSimulator(params, seed=11).generate_price_tensor(40)
+    b = MonteCarloSimulator(params, rng=np.random.default_rng(11)).generate_price_tensor(40)
+    assert a.prices.shape == (40, len(params.sectors), params.num_days + 1)
+    np.testing.assert_array_equal(a.prices, b.prices)
+    assert np.all(a.prices[:, :, 0] == 100.0)
+
+    chunks = list(MonteCarloSimulator(params, seed=5).iter_price_tensors(chunk_size=16))
+    assert [c.prices.shape[0] for c in chunks] == [16, 16, 8]
+    assert sum(int(c.is_black_swan.sum()) for c in chunks) == 10
+
+
+def test_black_swan_injection_matches_per_path_injection() -> None:
+    params = _params(base_volatility=0.0, base_drift=0.0, black_swan_probability=1.0)
+    sim = MonteCarloSimulator(params, seed=3)
+    batch = sim.generate_price_tensor(6)
+    xlf = batch.sectors.index("XLF")
+    shv = batch.sectors.index("SHV")
+    for i in range(6):
+        expected = sim._inject_black_swan(
+            np.full(params.num_days + 1, 100.0), int(batch.crash_day[i]), float(batch.crash_magnitude[i]) * 1.3
+        )
+        np.testing.assert_allclose(batch.prices[i, xlf], expected)
+        np.testing.assert_allclose(batch.prices[i, shv], 100.0)
+
+
+def test_vectorized_path_metrics_match_per_path_metrics() -> None:
+    sim = MonteCarloSimulator(_params(), seed=0)
+    rng = np.random.default_rng(2)
+    equity = 1e5 * np.exp(np.cumsum(rng.normal(0.0, 0.01, (50, 61)), axis=1))
+    equity[:, 0] = 1e5
+
+    metrics = sim.compute_path_metrics(equity)
+    paths = []
+    for i in range(len(equity)):
+        path = SimulationPath(path_id=str(i), prices={}, equity_curve=equity[i], trades=[])
+        sim._calculate_path_metrics(path)
+        paths.append(path)
+        assert metrics["max_drawdown"][i] == pytest.approx(path.max_drawdown)
+        assert metrics["sharpe_ratio"][i] == pytest.approx(path.sharpe_ratio)
+        assert metrics["recovery_days"][i] == (-1 if path.recovery_days is None else path.recovery_days)
+
+    vectorized = sim.calculate_risk_metrics_from_equity(equity)
+    legacy = sim._calculate_risk_metrics(paths)
+    assert vectorized.var_95 == pytest.approx(legacy.var_95)
+    assert vectorized.cvar_99 == pytest.approx(legacy.cvar_99)
+    assert vectorized.worst_drawdown == pytest.approx(legacy.worst_drawdown)
+    assert vectorized.paths_without_recovery == legacy.paths_without_recovery
+
+
+def test_simulate_strategy_runs_in_chunks() -> None:
+    sim = MonteCarloSimulator(_params(num_simulations=12), seed=1)
+    paths, metrics = sim.simulate_strategy(lambda **_: None, chunk_size=5)
+    assert len(paths) == 12
+    assert sum(p.is_black_swan for p in paths) == 1
+    assert all(p.final_equity == pytest.approx(sim.params.initial_capital) for p in paths)
+    assert metrics.survival_rate == 1.0
+
+
+class _Signal:
+    def __init__(self, signal_type: str, metadata: dict) -> None:
+        self.signal_type = signal_type
+        self.metadata = metadata
+
+
+def _rotate_into_leader(market_data, account_snapshot, regime):
+    # Deterministic toy strategy: hold the best daily performer, flatten under stress.
+    if regime != "NORMAL":
+        return _Signal("CLOSE_ALL", {})
+    best = max(market_data.values(), key=lambda d: d["price"] / d["previous_price"])
+    return _Signal("BUY", {"symbol": best["symbol"], "allocation": 0.5})
+
+
+class _WarmupTrader:
+    """Stateful toy strategy: rotates into the leader on its first 3 calls only."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def evaluate(self, market_data, account_snapshot, regime):
+        self.calls += 1
+        if self.calls > 3:
+            return _Signal("HOLD", {})
+        return _rotate_into_leader(market_data, account_snapshot, regime)
+
+
+def test_stateful_strategy_results_do_not_depend_on_worker_count() -> None:
+    params = _params(num_simulations=9, black_swan_probability=0.0)
+    strategy = _WarmupTrader()
+
+    def run(workers: int):
+        sim = MonteCarloSimulator(params, seed=5)
+        return sim.simulate_strategy(strategy.evaluate, chunk_size=9, num_workers=workers)
+
+    runs = {workers: run(workers) for workers in (1, 2, 3)}
+    assert strategy.calls == 0  # every path gets its own copy; the caller's instance is untouched
+    serial_paths, serial_metrics = runs[1]
+    assert all(p.num_trades > 0 for p in serial_paths)  # each path starts from a fresh state
+    for workers in (2, 3):
+        paths, metrics = runs[workers]
+        for a, b in zip(serial_paths, paths):
+            np.testing.assert_array_equal(a.equity_curve, b.equity_curve)
+            assert a.num_trades == b.num_trades
+        assert metrics == serial_metrics
+
+
+class _ResettableTrader(_WarmupTrader):
+    copies = 0
+
+    def __deepcopy__(self, memo):
+        type(self).copies += 1
+        return type(self)()
+
+    def reset(self) -> None:
+        self.calls = 0
+
+
+def test_resettable_strategy_is_copied_once_and_reset_per_path() -> None:
+    params = _params(num_simulations=6, black_swan_probability=0.0)
+    strategy = _ResettableTrader()
+    expected, _ = MonteCarloSimulator(params, seed=5).simulate_strategy(_WarmupTrader().evaluate, num_workers=1)
+
+    paths, _ = MonteCarloSimulator(params, seed=5).simulate_strategy(strategy.evaluate, num_workers=1)
+
+    assert _ResettableTrader.copies == 1
+    assert strategy.calls == 0
+    assert [p.num_trades for p in paths] == [p.num_trades for p in expected]
+
+
+def test_uncopyable_strategy_is_reused_with_a_warning(caplog) -> None:
+    import threading
+
+    class _Holder:
+        def __init__(self) -> None:
+            self.lock = threading.Lock()  # cannot be deep-copied
+
+        def __call__(self, market_data, account_snapshot, regime):
+            return _rotate_into_leader(market_data, account_snapshot, regime)
+
+    with caplog.at_level("WARNING", logger="functions.utils.monte_carlo"):
+        paths, _ = MonteCarloSimulator(_params(num_simulations=4), seed=3).simulate_strategy(_Holder(), num_workers=1)
+
+    assert len(paths) == 4 and all(p.num_trades > 0 for p in paths)
+    assert sum("cannot be deep-copied" in r.getMessage() for r in caplog.records) == 1
+
+
+def test_parallel_strategy_execution_is_deterministic_across_worker_counts() -> None:
+    params = _params(num_simulations=10, black_swan_probability=0.2)
+
+    def run(workers: int):
+        sim = MonteCarloSimulator(params, seed=21)
+        return sim.simulate_strategy(_rotate_into_leader, save_all_paths=True, chunk_size=6, num_workers=workers)
+
+    serial_paths, serial_metrics = run(1)
+    parallel_paths, parallel_metrics = run(3)
+    assert serial_paths[0].num_trades > 0
+    for a, b in zip(serial_paths, parallel_paths):
+        np.testing.assert_array_equal(a.equity_curve, b.equity_curve)
+        assert a.trades == b.trades
+        assert (a.num_trades, a.total_costs, a.crash_day) == (b.num_trades, b.total_costs, b.crash_day)
+    assert serial_metrics == parallel_metrics
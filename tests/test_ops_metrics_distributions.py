@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from backend.common.ops_metrics import MetricRegistry, timed
+
+
+def _series(reg: MetricRegistry, name: str) -> dict:
+    return reg.snapshot().get(name, {})
+
+
+def test_histogram_buckets_are_cumulative_and_rendered() -> None:
+    reg = MetricRegistry()
+    h = reg.histogram("op_seconds", help="op latency", buckets=(0.1, 1.0))
+    for v in (0.05, 0.5, 0.5, 3.0):
+        h.observe(v)
+
+    buckets = _series(reg, "op_seconds_bucket")
+    assert buckets[(("le", "0.1"),)] == 1.0
+    assert buckets[(("le", "1.0"),)] == 3.0
+    assert buckets[(("le", "+Inf"),)] == 4.0
+    assert _series(reg, "op_seconds_count")[()] == 4.0
+    assert _series(reg, "op_seconds_sum")[()] == pytest.approx(4.05)
+
+    text = reg.render_prometheus_text()
+    assert "# TYPE op_seconds histogram" in text
+    assert 'op_seconds_bucket{le="+Inf"} 4.0' in text
+
+
+def test_unlabeled_histogram_exports_zero_series_before_first_observation() -> None:
+    reg = MetricRegistry()
+    reg.histogram("idle_seconds", buckets=(1.0,))
+    assert 'idle_seconds_bucket{le="+Inf"} 0.0' in reg.render_prometheus_text()
+
+
+def test_histogram_merges_shards_across_threads_including_exited_ones() -> None:
+    reg = MetricRegistry()
+    h = reg.histogram("work_seconds", label_names=("op",), buckets=(1.0,))
+
+    def _work() -> None:
+        for _ in range(1000):
+            h.observe(0.5, labels={"op": "a"})
+
+    threads = [threading.Thread(target=_work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert _series(reg, "work_seconds_count")[(("op", "a"),)] == 8000.0
+    # Retired shards are folded, not lost, on subsequent scrapes.
+    assert _series(reg, "work_seconds_count")[(("op", "a"),)] == 8000.0
+
+
+def test_bound_labels_match_keyword_labels() -> None:
+    reg = MetricRegistry()
+    h = reg.histogram("bound_seconds", label_names=("op",), buckets=(1.0,))
+    h.labels(op="x").observe(0.1)
+    h.observe(0.2, labels={"op": "x"})
+    assert _series(reg, "bound_seconds_count")[(("op", "x"),)] == 2.0
+    with pytest.raises(ValueError):
+        h.observe(0.1, labels={"other": "x"})
+
+
+def test_labels_returns_one_child_per_label_set() -> None:
+    reg = MetricRegistry()
+    h = reg.histogram("rebound_seconds", label_names=("op",), buckets=(1.0,))
+    s = reg.summary("rebound_rtt_seconds", label_names=("op",))
+    assert h.labels(op="x") is h.labels(op="x")
+    assert h.labels(op="x") is not h.labels(op="y")
+    assert s.labels(op="x") is s.labels(op="x")
+
+    for _ in range(100):
+        h.labels(op="x").observe(0.1)
+    assert _series(reg, "rebound_seconds_count")[(("op", "x"),)] == 100.0
+    # One shard per (thread, label set), however often the child is rebound.
+    assert len(h._data._live) == 1
+
+
+def test_summary_quantiles_over_window() -> None:
+    reg = MetricRegistry()
+    s = reg.summary("rtt_seconds", quantiles=(0.5, 0.99))
+    for v in range(1, 101):
+        s.observe(float(v))
+
+    q = _series(reg, "rtt_seconds")
+    assert q[(("quantile", "0.5"),)] == 50.0
+    assert q[(("quantile", "0.99"),)] == 99.0
+    assert _series(reg, "rtt_seconds_count")[()] == 100.0
+    assert "# TYPE rtt_seconds summary" in reg.render_prometheus_text()
+
+
+def test_timed_context_manager_and_decorators_record_on_error() -> None:
+    reg = MetricRegistry()
+    h = reg.histogram("timed_seconds", label_names=("fn",))
+
+    with timed(h, labels={"fn": "block"}):
+        pass
+
+    @timed(h, labels={"fn": "sync"})
+    def _boom() -> None:
+        raise RuntimeError("x")
+
+    @timed(h, labels={"fn": "async"})
+    async def _coro() -> int:
+        return 1
+
+    with pytest.raises(RuntimeError):
+        _boom()
+    assert asyncio.run(_coro()) == 1
+
+    counts = _series(reg, "timed_seconds_count")
+    assert counts[(("fn", "block"),)] == 1.0
+    assert counts[(("fn", "sync"),)] == 1.0
+    assert counts[(("fn", "async"),)] == 1.0
+
+
+def test_metric_type_conflict_is_rejected() -> None:
+    reg = MetricRegistry()
+    reg.counter("dup_total")
+    with pytest.raises(ValueError):
+        reg.histogram("dup_total")
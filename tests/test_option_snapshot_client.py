@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from backend.ingestion.rate_limit import TokenBucket
+from backend.marketdata.options.snapshot_client import LatencyHistogram, SnapshotClient
+
+
+class _FakeAlpaca(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    pages = 3
+    delay_s = 0.05
+
+    def log_message(self, *args) -> None:  # keep pytest output quiet
+        pass
+
+    def do_GET(self) -> None:
+        srv = self.server
+        url = urlparse(self.path)
+        qs = parse_qs(url.query)
+        with srv.lock:
+            srv.peers.add(self.client_address)
+            srv.in_flight += 1
+            srv.max_in_flight = max(srv.max_in_flight, srv.in_flight)
+            srv.headers_seen.add(self.headers.get("APCA-API-KEY-ID"))
+        time.sleep(self.delay_s)
+
+        if url.path == "/v1beta1/options/snapshots":
+            symbols = qs["symbols"][0].split(",")
+            if "BAD" in symbols:
+                body, status = {"message": "boom"}, 500
+            else:
+                body, status = {"snapshots": {s: {"sym": s} for s in symbols}}, 200
+        else:
+            underlying = url.path.rsplit("/", 1)[-1]
+            page = int(qs.get("page_token", ["0"])[0])
+            body = {"snapshots": {f"{underlying}-{page}": {"page": page}}}
+            if page + 1 < self.pages:
+                body["next_page_token"] = str(page + 1)
+            status = 200
+
+        data = json.dumps(body).encode()
+        with srv.lock:
+            srv.in_flight -= 1
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture()
+def fake_server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _FakeAlpaca)
+    srv.daemon_threads = True
+    srv.lock = threading.Lock()
+    srv.peers = set()
+    srv.in_flight = 0
+    srv.max_in_flight = 0
+    srv.headers_seen = set()
+    t = threading.Thread(target=srv.serve_forever, daemon=True)
+    t.start()
+    try:
+        yield srv
+    finally:
+        srv.shutdown()
+        srv.server_close()
+
+
+def _client(srv, **kw) -> SnapshotClient:
+    host, port = srv.server_address
+    return SnapshotClient({"APCA-API-KEY-ID": "k"}, data_host=f"http://{host}:{port}", **kw)
+
+
+def test_fetch_chains_paginates_concurrently_over_pooled_connections(fake_server) -> None:
+    with _client(fake_server, max_concurrency=2, rate_per_sec=1000) as client:
+        chains = client.fetch_chains(["spy", "QQQ", "SPY"], max_pages=5)
+        hist = client.latency_histograms()
+
+    assert sorted(chains) == ["QQQ", "SPY"]
+    assert sorted(chains["SPY"]) == ["SPY-0", "SPY-1", "SPY-2"]
+    assert sorted(chains["QQQ"]) == ["QQQ-0", "QQQ-1", "QQQ-2"]
+    assert fake_server.headers_seen == {"k"}
+    # Both chains were in flight together, on at most two reused connections.
+    assert fake_server.max_in_flight == 2
+    assert len(fake_server.peers) <= 2
+    assert hist["chain"]["count"] == 6
+    assert sum(hist["chain"]["buckets"].values()) == 6
+
+
+def test_fetch_chain_respects_max_pages(fake_server) -> None:
+    with _client(fake_server, max_concurrency=1, rate_per_sec=1000) as client:
+        assert sorted(client.fetch_chain("SPY", max_pages=2)) == ["SPY-0", "SPY-1"]
+
+
+def test_fetch_symbols_batches_under_concurrency_limit_and_skips_failures(fake_server) -> None:
+    symbols = [f"SPY2501{i:05d}" for i in range(25)] + ["BAD"]
+    with _client(fake_server, max_concurrency=3, rate_per_sec=1000) as client:
+        out = client.fetch_symbols(symbols, chunk_size=5)
+        hist = client.latency_histograms()
+
+    # Sorted batches of 5: the batch holding "BAD" (the first one) fails and is skipped.
+    assert len(out) == 21
+    assert "BAD" not in out
+    assert fake_server.max_in_flight <= 3
+    assert hist["symbols"]["count"] == 6
+
+
+def test_token_bucket_limits_request_rate(fake_server) -> None:
+    bucket = TokenBucket(rate_per_sec=20.0, capacity=1.0)
+    t0 = time.monotonic()
+    with _client(fake_server, max_concurrency=4, rate_limit=bucket) as client:
+        client.fetch_symbols([f"S{i}" for i in range(6)], chunk_size=1)
+    # One burst token, then 5 more at 20/s.
+    assert time.monotonic() - t0 >= 0.2
+
+
+def test_token_bucket_acquire_timeout() -> None:
+    bucket = TokenBucket(rate_per_sec=1.0, capacity=1.0)
+    assert bucket.acquire()
+    assert bucket.acquire(timeout=0.01) is False
+    with pytest.raises(ValueError):
+        bucket.acquire(2.0)
+
+
+def test_latency_histogram_quantiles() -> None:
+    h = LatencyHistogram(bounds_ms=(10, 100))
+    for ms in (1, 2, 3, 50, 500):
+        h.observe(ms)
+    d = h.to_dict()
+    assert d["buckets"] == {"le_10": 3, "le_100": 1, "le_inf": 1}
+    assert d["p50_ms"] == 10.0
+    assert d["p99_ms"] == 500
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from backend.messaging import publisher as publisher_mod
+from backend.messaging.envelope import EventEnvelope
+from backend.messaging.local import InMemoryEventBus, InMemoryPublisherClient
+from backend.messaging.publisher import PublishBatchSettings, PubSubPublisher
+
+
+class _Unavailable(Exception):
+    code = "UNAVAILABLE"
+
+
+def _publisher(bus: InMemoryEventBus, **kwargs) -> PubSubPublisher:
+    settings = kwargs.pop("batch_settings", PublishBatchSettings(max_messages=10, max_latency_s=0.005))
+    return PubSubPublisher(
+        project_id="local",
+        topic_id="ops-heartbeats",
+        agent_name="test-agent",
+        publisher_client=InMemoryPublisherClient(bus, **kwargs),
+        shutdown_event=threading.Event(),
+        batch_settings=settings,
+    )
+
+
+def _env(i: int) -> EventEnvelope:
+    return EventEnvelope.new(event_type="ops.heartbeat", agent_name="test-agent", payload={"i": i}, git_sha="abc")
+
+
+@pytest.fixture(autouse=True)
+def _fast_retries(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("PUBSUB_PUBLISH_INITIAL_BACKOFF_S", "0")
+    monkeypatch.setenv("PUBSUB_PUBLISH_MAX_BACKOFF_S", "0")
+
+
+def test_publish_many_batches_and_preserves_order() -> None:
+    bus = InMemoryEventBus()
+    pub = _publisher(bus)
+
+    ids = pub.publish_many([_env(i) for i in range(25)])
+
+    assert len(ids) == 25 and len(set(ids)) == 25
+    assert [e.payload["i"] for e in bus.drain(topic="ops-heartbeats")] == list(range(25))
+
+
+def test_publish_many_sends_every_batch_before_waiting() -> None:
+    from backend.common.ops_metrics import REGISTRY
+
+    def _count(name: str, key: tuple) -> float:
+        return REGISTRY.snapshot().get(name, {}).get(key, 0.0)
+
+    many = (("mode", "many"),)
+    latency_before = _count("pubsub_publish_latency_seconds_count", many)
+    batches_before = _count("pubsub_publish_batch_messages_count", ())
+    bus = InMemoryEventBus()
+    pub = _publisher(bus, latency_s=0.1)
+
+    t0 = time.monotonic()
+    ids = pub.publish_many([_env(i) for i in range(25)])
+
+    assert len(ids) == 25
+    assert time.monotonic() - t0 < 0.25  # three batches share one simulated round trip
+    assert _count("pubsub_publish_batch_messages_count", ()) - batches_before == 3
+    assert _count("pubsub_publish_latency_seconds_count", many) - latency_before == 1
+
+
+def test_publish_nowait_resolves_futures_after_flush() -> None:
+    bus = InMemoryEventBus()
+    pub = _publisher(bus, latency_s=0.01)
+
+    futures = [pub.publish_nowait(_env(i)) for i in range(35)]
+    assert pub.flush(timeout_s=5.0)
+
+    assert all(f.done() for f in futures)
+    assert len({f.result() for f in futures}) == 35
+    assert sorted(e.payload["i"] for e in bus.drain(topic="ops-heartbeats")) == list(range(35))
+    pub.close()
+
+
+def test_publish_nowait_retries_transient_failures() -> None:
+    bus = InMemoryEventBus()
+    failed_once: set[int] = set()
+
+    def _fail(envelope: EventEnvelope):
+        i = envelope.payload["i"]
+        if i % 3 == 0 and i not in failed_once:
+            failed_once.add(i)
+            return _Unavailable("try again")
+        return None
+
+    pub = _publisher(bus, fail=_fail)
+    futures = [pub.publish_nowait(_env(i)) for i in range(12)]
+    assert all(f.result(timeout=5.0) for f in futures)
+    assert len(bus.drain(topic="ops-heartbeats")) == 12
+    pub.close()
+
+
+def test_flow_control_blocks_producer_until_bytes_drain() -> None:
+    bus = InMemoryEventBus()
+    size = len(_env(0).to_bytes())
+    pub = _publisher(
+        bus,
+        latency_s=0.05,
+        batch_settings=PublishBatchSettings(max_messages=1, max_latency_s=0.0, max_outstanding_bytes=size + 1),
+    )
+
+    t0 = time.monotonic()
+    first = pub.publish_nowait(_env(0))
+    second = pub.publish_nowait(_env(1))  # must wait for the first ack
+    assert first.done()
+    assert time.monotonic() - t0 >= 0.04
+    assert second.result(timeout=5.0)
+    pub.close()
+
+
+def test_contract_violations_are_rejected_per_batch(monkeypatch: pytest.MonkeyPatch) -> None:
+    class _Validator:
+        def errors(self, event):
+            return [{"path": "payload", "message": "bad"}] if event["payload"]["i"] == 1 else None
+
+    monkeypatch.setattr(publisher_mod, "get_compiled_validator", lambda topic: _Validator())
+    monkeypatch.setattr(publisher_mod, "try_write_contract_violation_alert", lambda **kwargs: None)
+    bus = InMemoryEventBus()
+    pub = _publisher(bus)
+
+    with pytest.raises(ValueError, match="contract_validation_failed"):
+        pub.publish_many([_env(0), _env(1), _env(2)])
+    assert bus.drain(topic="ops-heartbeats") == []
+
+    futures = [pub.publish_nowait(_env(i)) for i in range(3)]
+    pub.flush(timeout_s=5.0)
+    with pytest.raises(ValueError, match="contract_validation_failed"):
+        futures[1].result()
+    assert futures[0].result() and futures[2].result()
+    assert [e.payload["i"] for e in bus.drain(topic="ops-heartbeats")] == [0, 2]
+    pub.close()
+
+
+def test_sync_and_batched_publish_send_the_same_attributes() -> None:
+    calls: list[dict[str, str]] = []
+
+    class _RecordingClient(InMemoryPublisherClient):
+        def publish(self, topic, data, **attrs):
+            calls.append(attrs)
+            return super().publish(topic, data, **attrs)
+
+    pub = PubSubPublisher(
+        project_id="local",
+        topic_id="ops-heartbeats",
+        agent_name="test-agent",
+        publisher_client=_RecordingClient(InMemoryEventBus()),
+        shutdown_event=threading.Event(),
+    )
+    env = _env(1)
+    pub.publish_envelope(env)
+    pub.publish_many([env])
+
+    assert len(calls) == 2 and calls[0] == calls[1]
+    assert calls[0]["event_type"] == "ops.heartbeat" and calls[0]["trace_id"] == env.trace_id
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import signal
+import threading
+import time
+
+from backend.common import shutdown
+
+
+def test_signal_handler_never_takes_the_hook_lock_or_runs_hooks_inline() -> None:
+    calls: list[str] = []
+
+    def slow_hook() -> None:
+        time.sleep(0.5)
+        calls.append(threading.current_thread().name)
+
+    shutdown.register_shutdown_hook(slow_hook)
+    handler = shutdown._wrap_handler(signal.SIG_IGN)
+    try:
+        # The interrupted code may hold the (non-reentrant) hook lock.
+        with shutdown._HOOKS_LOCK:
+            t0 = time.perf_counter()
+            handler(signal.SIGTERM, None)
+            assert time.perf_counter() - t0 < 0.1
+            assert shutdown.SHUTDOWN_EVENT.is_set()
+            assert calls == []
+
+            runner = threading.Thread(target=shutdown._run_hooks_when_shutdown_requested, name="shutdown-hooks")
+            runner.start()
+            runner.join(timeout=5.0)
+        assert calls == ["shutdown-hooks"]
+    finally:
+        shutdown.unregister_shutdown_hook(slow_hook)
+        shutdown.SHUTDOWN_EVENT.clear()
+    assert slow_hook not in shutdown._HOOKS
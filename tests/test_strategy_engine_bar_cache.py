@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("asyncpg")
+
+from backend.strategy_engine.bar_cache import BarWindowCache
+from backend.strategy_engine.models import Bar
+
+T0 = datetime(2026, 1, 5, 15, 0, tzinfo=timezone.utc)
+
+
+def _bar(minute: int, close: float = 1.0) -> Bar:
+    return Bar(ts=T0 + timedelta(minutes=minute), open=close, high=close, low=close, close=close, volume=1)
+
+
+class _Table:
+    """In-memory public.market_data_1m honoring the cache's (since, lookback) bounds."""
+
+    def __init__(self) -> None:
+        self.rows: dict[str, dict[datetime, Bar]] = {}
+        self.now = T0
+        self.calls: list[dict] = []
+
+    def put(self, symbol: str, bar: Bar) -> None:
+        self.rows.setdefault(symbol, {})[bar.ts] = bar
+
+    async def fetch_many(self, since_by_symbol, lookback_minutes):
+        self.calls.append(dict(since_by_symbol))
+        return self._read(since_by_symbol, lookback_minutes)
+
+    def _read(self, since_by_symbol, lookback_minutes):
+        cutoff = self.now - timedelta(minutes=lookback_minutes)
+        out = {}
+        for s, since in since_by_symbol.items():
+            bars = [b for ts, b in self.rows.get(s, {}).items() if ts >= cutoff and (since is None or ts >= since)]
+            out[s] = sorted(bars, key=lambda b: b.ts, reverse=True)
+        return out
+
+    def expected(self, symbol: str, lookback_minutes: int) -> list[Bar]:
+        return self._read({symbol: None}, lookback_minutes)[symbol]
+
+
+def _refresh(cache: BarWindowCache, table: _Table, symbols, lookback: int = 30):
+    return asyncio.run(cache.refresh(symbols, lookback, now=table.now))
+
+
+def test_incremental_reads_match_full_window_reads() -> None:
+    table = _Table()
+    for m in range(-40, 1):
+        table.put("SPY", _bar(m, 100 + m))
+    cache = BarWindowCache(fetch_many=table.fetch_many)
+
+    assert _refresh(cache, table, ["SPY"])["SPY"] == table.expected("SPY", 30)
+    assert cache.stats()["misses"] == 1
+
+    for step in range(1, 6):
+        table.now = T0 + timedelta(minutes=step)
+        table.put("SPY", _bar(step - 1, 999.0))  # the forming bar is rewritten
+        table.put("SPY", _bar(step, 100 + step))
+        assert _refresh(cache, table, ["SPY"])["SPY"] == table.expected("SPY", 30)
+
+    stats = cache.stats()
+    assert stats["hits"] == 5 and stats["misses"] == 1 and stats["invalidations"] == 0
+    # Each incremental read re-reads the last seen bar and picks up the new one.
+    assert stats["rows_fetched"] == 31 + 5 * 2
+    assert table.calls[-1] == {"SPY": T0 + timedelta(minutes=4)}
+
+
+def test_gap_and_future_skew_force_a_reload_on_the_next_read() -> None:
+    table = _Table()
+    for m in range(-5, 1):
+        table.put("SPY", _bar(m))
+    cache = BarWindowCache(fetch_many=table.fetch_many, max_gap=timedelta(minutes=3))
+    _refresh(cache, table, ["SPY"])
+
+    table.now = T0 + timedelta(minutes=10)
+    table.put("SPY", _bar(10))
+    assert _refresh(cache, table, ["SPY"])["SPY"] == table.expected("SPY", 30)
+
+    # A late backfill inside the gap is only visible because the gap expired the window.
+    table.put("SPY", _bar(5, 55.0))
+    assert _refresh(cache, table, ["SPY"])["SPY"] == table.expected("SPY", 30)
+    assert table.calls[-1] == {"SPY": None}
+    assert cache.stats()["invalidations"] == 1
+
+    table.put("SPY", _bar(30))  # 20 minutes ahead of "now"
+    _refresh(cache, table, ["SPY"])
+    _refresh(cache, table, ["SPY"])
+    assert table.calls[-1] == {"SPY": None}
+
+
+def test_vanished_last_bar_and_lookback_change_reload_immediately() -> None:
+    table = _Table()
+    for m in range(-5, 1):
+        table.put("SPY", _bar(m))
+        table.put("QQQ", _bar(m))
+    cache = BarWindowCache(fetch_many=table.fetch_many)
+    _refresh(cache, table, ["SPY", "QQQ"])
+
+    del table.rows["SPY"][T0]
+    out = _refresh(cache, table, ["SPY", "QQQ"])
+    assert out["SPY"] == table.expected("SPY", 30)
+    assert table.calls[-1] == {"SPY": None}
+
+    _refresh(cache, table, ["SPY"], lookback=3)
+    assert table.calls[-1] == {"SPY": None}
+    assert _refresh(cache, table, ["SPY"], lookback=3)["SPY"] == table.expected("SPY", 3)
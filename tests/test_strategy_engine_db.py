@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+pytest.importorskip("asyncpg")
+
+from backend.common.ops_metrics import REGISTRY
+from backend.strategy_engine import db, models, risk
+
+
+class _FakeConn:
+    def __init__(self) -> None:
+        self.queries: list[str] = []
+
+    async def fetch(self, query, *args):
+        self.queries.append(query)
+        if "market_data_1m" in query:
+            return [
+                {"symbol": "QQQ", "ts": 2, "open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0, "volume": 5},
+                {"symbol": "SPY", "ts": 3, "open": 2.0, "high": 2.0, "low": 2.0, "close": 2.0, "volume": 6},
+                {"symbol": "SPY", "ts": 1, "open": 3.0, "high": 3.0, "low": 3.0, "close": 3.0, "volume": 7},
+            ]
+        if "options_flow" in query:
+            return [{"symbol": "SPY", "ts": 4, "total_value": 10.0}, {"symbol": "SPY", "ts": 2, "total_value": None}]
+        return [{"symbol": "SPY", "qty": 3.0}]
+
+    async def execute(self, query, *args):
+        self.queries.append(query)
+
+
+class _FakePool:
+    def __init__(self) -> None:
+        self.conn = _FakeConn()
+        self.acquired = 0
+        self.in_use = 0
+
+    @asynccontextmanager
+    async def acquire(self):
+        self.acquired += 1
+        self.in_use += 1
+        try:
+            yield self.conn
+        finally:
+            self.in_use -= 1
+
+    def get_size(self) -> int:
+        return 4
+
+    def get_idle_size(self) -> int:
+        return 4 - self.in_use
+
+
+def _metric(name: str) -> float:
+    return REGISTRY.snapshot()[name][()]
+
+
+def test_queries_share_the_process_pool_and_report_metrics(monkeypatch) -> None:
+    pool = _FakePool()
+    monkeypatch.setattr(db, "_pool", pool)
+    before = _metric("strategy_db_pool_acquires_total")
+
+    async def _run():
+        positions = await models.fetch_positions()
+        await risk.log_decision("sid", "SPY", "HOLD", "r", {}, False)
+        return positions
+
+    positions = asyncio.run(_run())
+
+    assert positions == [models.Position(symbol="SPY", qty=3.0)]
+    assert pool.acquired == 2
+    assert len(pool.conn.queries) == 2
+    assert _metric("strategy_db_pool_acquires_total") - before == 2
+    assert _metric("strategy_db_pool_size") == 4
+    assert _metric("strategy_db_pool_in_use") == 0
+    assert "strategy_db_pool_acquire_wait_seconds_total" in REGISTRY.render_prometheus_text()
+
+
+@pytest.mark.parametrize(
+    "mode,expected",
+    [("transaction", 0), ("statement", 0), ("SESSION", 100), ("none", 100)],
+)
+def test_prepared_statements_follow_pgbouncer_mode(monkeypatch, mode: str, expected: int) -> None:
+    monkeypatch.setattr(db.config, "STRATEGY_DB_PGBOUNCER_MODE", mode)
+    assert db.statement_cache_size() == expected
+
+
+def test_batch_market_inputs_use_one_connection_for_the_watchlist(monkeypatch) -> None:
+    pool = _FakePool()
+    monkeypatch.setattr(db, "_pool", pool)
+
+    bars, flow = asyncio.run(models.fetch_recent_market_inputs(["SPY", "QQQ", "IWM", "SPY"], 30, 5))
+
+    assert pool.acquired == 1
+    assert all("$1::text[]" in q for q in pool.conn.queries)
+    assert list(bars) == ["SPY", "QQQ", "IWM"]
+    assert [b.ts for b in bars["SPY"]] == [3, 1]
+    assert bars["QQQ"][0].volume == 5
+    assert bars["IWM"] == []
+    assert flow == {"SPY": [models.FlowEvent(ts=4, total_value=10.0)], "QQQ": [], "IWM": []}
+
+
+def test_failed_pool_init_is_retried_lazily_with_backoff(monkeypatch) -> None:
+    pool = _FakePool()
+    pool.close = lambda: asyncio.sleep(0)
+    attempts: list[int] = []
+    one_off: list[_FakeConn] = []
+    now = [1000.0]
+
+    async def create_pool(*args, **kwargs):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OSError("connection refused")
+        return pool
+
+    async def connect(*args, **kwargs):
+        conn = _FakeConn()
+        conn.close = lambda: asyncio.sleep(0)
+        one_off.append(conn)
+        return conn
+
+    monkeypatch.setattr(db.asyncpg, "create_pool", create_pool)
+    monkeypatch.setattr(db.asyncpg, "connect", connect)
+    monkeypatch.setattr(db.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(db, "_pool", None)
+    monkeypatch.setattr(db, "_pool_wanted", False)
+    monkeypatch.setattr(db, "_pool_failures", 0)
+    monkeypatch.setattr(db, "_pool_retry_at", 0.0)
+
+    async def _run():
+        with pytest.raises(OSError):
+            await db.init_pool(timeout_s=1.0)
+        await models.fetch_positions()  # within the backoff: one-off connection, no retry
+        now[0] += db._POOL_RETRY_INITIAL_S
+        await models.fetch_positions()  # backoff elapsed: the pool comes up
+        await db.close_pool()
+
+    asyncio.run(_run())
+
+    assert len(attempts) == 2
+    assert len(one_off) == 1
+    assert pool.acquired == 1
+    assert db.get_pool() is None
+
+
+def test_no_pool_without_init(monkeypatch) -> None:
+    async def create_pool(*args, **kwargs):
+        raise AssertionError("pool created without init_pool()")
+
+    async def connect(*args, **kwargs):
+        conn = _FakeConn()
+        conn.close = lambda: asyncio.sleep(0)
+        return conn
+
+    monkeypatch.setattr(db.asyncpg, "create_pool", create_pool)
+    monkeypatch.setattr(db.asyncpg, "connect", connect)
+    monkeypatch.setattr(db, "_pool", None)
+    monkeypatch.setattr(db, "_pool_wanted", False)
+
+    assert asyncio.run(models.fetch_positions()) == [models.Position(symbol="SPY", qty=3.0)]
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("asyncpg")
+pytest.importorskip("pydantic")
+
+from backend.strategy_engine import driver
+from backend.strategy_engine.daily_target_halt import DailyTargetHaltLatch
+from backend.strategy_engine.models import Bar
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.intents: list[str] = []
+        self.decisions: list[tuple[str, str]] = []
+        self.logs: list[dict] = []
+
+
+class _Allocator:
+    """Yields between `emit_agent_intent` and `log_decision`; raises for symbol "BAD"."""
+
+    async def allocate_for_strategy_limits(self, *, intent, **_):
+        if intent.symbol == "BAD":
+            await asyncio.sleep(0)
+            raise RuntimeError("allocator exploded")
+        await asyncio.sleep(0.05)
+        return SimpleNamespace(allowed=True)
+
+
+@pytest.fixture
+def rec(monkeypatch: pytest.MonkeyPatch) -> _Recorder:
+    r = _Recorder()
+    now = datetime.now(timezone.utc)
+
+    async def strategy_definition(name):
+        return "strategy-1"
+
+    async def log_decision(strategy_id, symbol, action, reason, payload, executed):
+        r.decisions.append((symbol, action))
+
+    async def prefetch(symbols):
+        bars = {s: [Bar(ts=now, open=1.0, high=1.0, low=1.0, close=1.0, volume=1)] for s in symbols}
+        return bars, {s: [] for s in symbols}
+
+    monkeypatch.setattr(driver, "get_or_create_strategy_definition", strategy_definition)
+    monkeypatch.setattr(driver, "log_decision", log_decision)
+    monkeypatch.setattr(driver, "_prefetch_market_inputs", prefetch)
+    monkeypatch.setattr(driver, "make_decision", lambda bars, flow: {"action": "buy", "reason": "test", "signal_payload": {}})
+    monkeypatch.setattr(driver, "emit_agent_intent", lambda intent: r.intents.append(intent.symbol))
+    monkeypatch.setattr(driver, "RiskAllocator", _Allocator)
+    monkeypatch.setattr(driver, "log_json", lambda **fields: r.logs.append(fields))
+    monkeypatch.setattr(driver, "read_daily_return_pct", lambda: None)
+    monkeypatch.setattr(driver, "_daily_target_latch", DailyTargetHaltLatch())
+    monkeypatch.setattr(driver.config, "STRATEGY_BATCH_PREFETCH", True)
+    monkeypatch.setattr(driver.config, "STRATEGY_SYMBOL_CONCURRENCY", 4)
+    return r
+
+
+def test_failing_symbol_does_not_cancel_the_others(rec: _Recorder, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(driver.config, "STRATEGY_SYMBOLS", ["SPY", "BAD", "QQQ", "IWM"])
+
+    with pytest.raises(RuntimeError, match="allocator exploded"):
+        asyncio.run(driver.run_strategy(False))
+
+    # Every intent emitted by a healthy symbol has its decision record.
+    assert sorted(rec.intents) == ["BAD", "IWM", "QQQ", "SPY"]
+    assert sorted(rec.decisions) == [("IWM", "buy"), ("QQQ", "buy"), ("SPY", "buy")]
+    failed = [f for f in rec.logs if f.get("intent_type") == "strategy_symbol_failed"]
+    assert [f["symbol"] for f in failed] == ["BAD"]
+
+
+def test_daily_target_halt_stops_symbols_not_yet_started(rec: _Recorder, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(driver.config, "STRATEGY_SYMBOLS", ["A", "B", "C", "D"])
+    monkeypatch.setattr(driver.config, "STRATEGY_SYMBOL_CONCURRENCY", 2)
+    monkeypatch.setattr(driver, "read_daily_return_pct", lambda: 0.05)
+
+    asyncio.run(driver.run_strategy(False))
+
+    assert rec.intents == []
+    assert rec.decisions == [("A", "flat")]
+    started = [f["symbol"] for f in rec.logs if f.get("intent_type") == "strategy_symbol_start"]
+    assert started == ["A"]
+
+
+def test_prefetch_error_skips_every_symbol_as_internal_error(rec: _Recorder, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(driver.config, "STRATEGY_SYMBOLS", ["SPY", "QQQ", "IWM"])
+
+    async def prefetch(symbols):
+        raise ConnectionError("db down")
+
+    monkeypatch.setattr(driver, "_prefetch_market_inputs", prefetch)
+
+    asyncio.run(driver.run_strategy(False))
+
+    skipped = [f for f in rec.logs if f.get("intent_type") == "strategy_cycle_skipped"]
+    assert sorted(f["symbol"] for f in skipped) == ["IWM", "QQQ", "SPY"]
+    assert {f["error_type"] for f in skipped} == {"ConnectionError"}
+    assert rec.intents == [] and rec.decisions == []
@@ -146,3 +146,92 @@ def test_compute_strategy_pnl_for_period_includes_realized_fees_and_gross_pnl()
     # Net realized P&L: 10 - 3 => 7
     assert out[k].realized_pnl == 7.0
 
+
+
+def test_compute_strategy_pnl_for_period_resumes_from_checkpoint() -> None:
+    from backend.ledger.pnl import FifoLedgerState
+
+    def trade(side: str, qty: float, price: float, ts: datetime, fill: str) -> LedgerTrade:
+        return LedgerTrade(
+            tenant_id="t1",
+            uid="u1",
+            strategy_id="s1",
+            run_id="r1",
+            symbol="AAPL",
+            side=side,
+            qty=qty,
+            price=price,
+            ts=ts,
+            broker_fill_id=fill,
+            fees=0.5,
+        )
+
+    history = [
+        trade("buy", 10, 100.0, _dt(2025, 10, 3), "f1"),
+        trade("sell", 4, 105.0, _dt(2025, 10, 20), "f2"),
+        trade("buy", 2, 98.0, _dt(2025, 11, 5), "f3"),
+        trade("sell", 6, 110.0, _dt(2025, 12, 2), "f4"),
+        trade("buy", 3, 107.0, _dt(2025, 12, 20), "f5"),
+    ]
+    period_start, period_end = month_period_utc(year=2025, month=12)
+    marks = {"AAPL": 112.0}
+    full = compute_strategy_pnl_for_period(history, period_start=period_start, period_end=period_end, mark_prices=marks)
+
+    state = FifoLedgerState()
+    state.apply_many(t for t in history if t.ts < _dt(2025, 11, 1))
+    resumed = compute_strategy_pnl_for_period(
+        history[2:],
+        period_start=period_start,
+        period_end=period_end,
+        mark_prices=marks,
+        checkpoint=state.to_checkpoint(),
+    )
+    k = ("t1", "u1", "s1")
+    assert resumed[k].realized_pnl == full[k].realized_pnl
+    assert resumed[k].unrealized_pnl == full[k].unrealized_pnl
+    assert resumed[k].realized_pnl_gross == full[k].realized_pnl_gross
+    assert resumed[k].realized_fees == full[k].realized_fees
+
+
+def test_checkpoint_matches_replay_with_multiple_symbols() -> None:
+    from backend.ledger.pnl import FifoLedgerState
+
+    def trade(symbol: str, side: str, qty: float, price: float, ts: datetime, fill: str) -> LedgerTrade:
+        return LedgerTrade(
+            tenant_id="t1",
+            uid="u1",
+            strategy_id="s1",
+            run_id="r1",
+            symbol=symbol,
+            side=side,
+            qty=qty,
+            price=price,
+            ts=ts,
+            broker_fill_id=fill,
+            fees=0.75,
+        )
+
+    history = [
+        trade("SPY", "buy", 5, 500.0, _dt(2025, 12, 2), "f1"),
+        trade("QQQ", "buy", 4, 400.0, _dt(2025, 12, 6), "f2"),
+        trade("QQQ", "sell", 4, 411.0, _dt(2025, 12, 8), "f3"),
+    ]
+    period_start, period_end = _dt(2025, 12, 5), _dt(2025, 12, 31)
+    marks = {"SPY": 502.0, "QQQ": 411.0}
+    full = compute_strategy_pnl_for_period(history, period_start=period_start, period_end=period_end, mark_prices=marks)
+
+    state = FifoLedgerState()
+    state.apply(history[0])
+    resumed = compute_strategy_pnl_for_period(
+        history[1:],
+        period_start=period_start,
+        period_end=period_end,
+        mark_prices=marks,
+        checkpoint=state.to_checkpoint(),
+    )
+    k = ("t1", "u1", "s1")
+    # Lots are matched per symbol: the QQQ round trip realizes 4 * 11 = 44 gross, 1.5 fees.
+    assert full[k].realized_pnl_gross == 44.0
+    assert full[k].realized_fees == 1.5
+    assert full[k].realized_pnl == 42.5
+    assert resumed[k] == full[k]
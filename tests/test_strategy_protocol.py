@@ -1,6 +1,20 @@
+import io
+import struct
+
 import pytest
 
-from backend.strategy_runner.protocol import PROTOCOL_VERSION, ProtocolError, parse_order_intent
+from backend.strategy_runner.protocol import (
+    ENCODING_JSON_FRAMES,
+    ENCODING_MSGPACK,
+    ENCODING_NDJSON,
+    PROTOCOL_VERSION,
+    ProtocolError,
+    choose_encoding,
+    encode_messages,
+    parse_order_intent,
+    read_message,
+    supported_encodings,
+)
 
 
 def test_parse_order_intent_valid():
@@ -65,3 +79,27 @@ def test_parse_order_intent_invalid(bad):
     with pytest.raises(ProtocolError):
         parse_order_intent(bad)
 
+
+
+@pytest.mark.parametrize("encoding", supported_encodings())
+def test_wire_encodings_round_trip(encoding):
+    msgs = [
+        {"protocol": PROTOCOL_VERSION, "type": "sync", "seq": 1},
+        {"protocol": PROTOCOL_VERSION, "type": "log", "message": "multi\nline \u00e9"},
+    ]
+    f = io.BytesIO(encode_messages(msgs, encoding))
+    assert [read_message(f, encoding), read_message(f, encoding)] == msgs
+    assert read_message(f, encoding) is None
+
+
+def test_framed_reader_rejects_truncated_and_oversized_frames():
+    blob = encode_messages([{"type": "sync", "seq": 1}], ENCODING_JSON_FRAMES)
+    with pytest.raises(ProtocolError):
+        read_message(io.BytesIO(blob[:-1]), ENCODING_JSON_FRAMES)
+    with pytest.raises(ProtocolError):
+        read_message(io.BytesIO(struct.pack(">I", 1 << 30)), ENCODING_JSON_FRAMES)
+
+
+def test_choose_encoding_follows_peer_preference():
+    assert choose_encoding([ENCODING_JSON_FRAMES, ENCODING_MSGPACK]) == ENCODING_JSON_FRAMES
+    assert choose_encoding(["protobuf"]) == ENCODING_NDJSON
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import shutil
+import socket
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from backend.strategy_runner.bundle import create_strategy_bundle
+from backend.strategy_runner.guest import guest_runner
+from backend.strategy_runner.protocol import ENCODING_NDJSON, supported_encodings
+from backend.strategy_runner.runner import (
+    DriveImageCache,
+    FirecrackerAssets,
+    StrategyRunnerError,
+    StrategySandboxRunner,
+    WarmVMPool,
+)
+
+HELLO = Path(__file__).resolve().parents[1] / "backend" / "strategy_runner" / "examples" / "hello_strategy"
+BOOT_S = 0.05
+
+
+def _fake_drive(*, bundle, out_dir):
+    # The fake guest reads the bundle straight from the "drive"; no mke2fs needed.
+    img = Path(out_dir) / "strategy.ext4"
+    shutil.copyfile(bundle.bundle_path, img)
+    return img
+
+
+class _FakeVM:
+    """Stands in for FirecrackerMicroVM: runs the real guest loop in a thread over a socketpair."""
+
+    def __init__(self, cfg):
+        self.cfg = cfg
+        self.host_sock = None
+        self._thread = None
+        self._work_dir = None
+
+    def start(self):
+        time.sleep(BOOT_S)  # kernel boot + guest runner import
+        self._work_dir = Path(tempfile.mkdtemp(prefix="fake_guest_"))
+        manifest = guest_runner._safe_extract_tar(self.cfg.strategy_drive_image, self._work_dir)
+        handler = guest_runner._get_handler(guest_runner._import_user_module(self._work_dir, manifest["entrypoint"]))
+        self.host_sock, guest_sock = socket.socketpair()
+
+        def _serve():
+            with guest_sock:
+                guest_runner.serve_connection(guest_sock, handler, port=self.cfg.vsock_port)
+
+        self._thread = threading.Thread(target=_serve, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+    def cleanup(self):
+        if self._work_dir is not None:
+            shutil.rmtree(self._work_dir, ignore_errors=True)
+
+
+def _connect(vm, guest_cid, port, timeout_s):
+    return vm.host_sock
+
+
+def _pool(tmp_path: Path, **kw) -> WarmVMPool:
+    assets = FirecrackerAssets(Path("fc"), Path("vmlinux"), Path("rootfs.ext4"))
+    kw.setdefault("drive_cache", DriveImageCache(tmp_path / "drives", build=_fake_drive))
+    return WarmVMPool(assets, vm_factory=_FakeVM, connect=_connect, **kw)
+
+
+def _event(i: int, price: float) -> dict:
+    ts = datetime.now(tz=timezone.utc).isoformat()
+    return {
+        "protocol": "v1",
+        "type": "market_event",
+        "event_id": f"evt_{i}",
+        "ts": ts,
+        "symbol": "SPY",
+        "source": "sim",
+        "payload": {"price": price, "kind": "trade"},
+    }
+
+
+def test_bundles_are_content_addressed(tmp_path: Path):
+    a = create_strategy_bundle(strategy_source=HELLO, entrypoint="strategy.py", out_dir=tmp_path / "a")
+    time.sleep(1.1)  # a different mtime must not change the hash
+    b = create_strategy_bundle(strategy_source=HELLO, entrypoint="strategy.py", out_dir=tmp_path / "b")
+    assert a.sha256 == b.sha256
+
+    built = []
+    cache = DriveImageCache(tmp_path / "drives", build=lambda **kw: built.append(1) or _fake_drive(**kw))
+    assert cache.get(a) == cache.get(b) == tmp_path / "drives" / f"{a.sha256}.ext4"
+    assert len(built) == 1 and cache.stats() == {"hits": 1, "misses": 1}
+
+
+def test_drive_cache_dir_must_be_private(tmp_path: Path):
+    bundle = create_strategy_bundle(strategy_source=HELLO, entrypoint="strategy.py", out_dir=tmp_path / "b")
+
+    cache = DriveImageCache(tmp_path / "drives", build=_fake_drive)
+    cache.get(bundle)
+    assert (tmp_path / "drives").stat().st_mode & 0o777 == 0o700
+
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)
+    planted = shared / f"{bundle.sha256}.ext4"
+    planted.write_bytes(b"not the strategy")
+    with pytest.raises(StrategyRunnerError, match="0700"):
+        DriveImageCache(shared, build=_fake_drive).get(bundle)
+
+
+def test_pool_hands_out_prebooted_guests_per_bundle(tmp_path: Path):
+    hello = create_strategy_bundle(strategy_source=HELLO, entrypoint="strategy.py", out_dir=tmp_path / "hello")
+    other_src = tmp_path / "other.py"
+    other_src.write_text("def on_market_event(event):\n    return None\n", encoding="utf-8")
+    other = create_strategy_bundle(strategy_source=other_src, out_dir=tmp_path / "other")
+
+    with _pool(tmp_path, min_idle=1) as pool:
+        pool.prewarm(hello, count=2)
+        deadline = time.time() + 5.0
+        while pool.stats()["idle"] < 2 and time.time() < deadline:
+            time.sleep(0.01)
+
+        t0 = time.perf_counter()
+        g1 = pool.acquire(hello)
+        assert time.perf_counter() - t0 < BOOT_S
+        g2 = pool.acquire(other)  # nothing warm for this bundle yet
+        assert (g1.warm, g2.warm) == (True, False)
+        assert g1.guest_cid != g2.guest_cid
+        assert pool.stats()["warm_hits"] == 1 and pool.stats()["cold_boots"] == 1
+
+        pool.release(g1)
+        pool.release(g2)
+        deadline = time.time() + 5.0
+        while pool.stats()["booting"] and time.time() < deadline:
+            time.sleep(0.01)
+        assert pool.stats()["idle_by_bundle"] == {hello.sha256: 1, other.sha256: 1}
+    assert pool.stats()["idle"] == 0
+
+
+def test_session_keeps_one_connection_and_matches_run(tmp_path: Path):
+    with _pool(tmp_path, min_idle=1) as pool:
+        runner = StrategySandboxRunner(assets=pool.assets, pool=pool)
+        events = [_event(i, 99.0 + i) for i in range(6)]  # evt_1..evt_5 are >= 100
+
+        with runner.open_session(strategy_source=HELLO / "strategy.py") as session:
+            first = session.send(events[:3])
+            assert session.send([]) == []
+            rest = session.send(events[3:])
+        assert [m["event_id"] for m in first] == ["evt_1", "evt_2"]
+        assert [m["event_id"] for m in rest] == ["evt_3", "evt_4", "evt_5"]
+        assert session.intents == first + rest and session.events_sent == 6
+
+        one_shot = runner.run(strategy_source=HELLO / "strategy.py", events=events)
+        assert [m["event_id"] for m in one_shot] == [m["event_id"] for m in session.intents]
+
+
+@pytest.mark.parametrize("encoding", supported_encodings())
+def test_encodings_negotiate_and_pipeline_large_batches(tmp_path: Path, encoding: str):
+    n = 3000  # far more than fits in the socket buffers if written before reading
+    framed = () if encoding == ENCODING_NDJSON else (encoding,)
+    with _pool(tmp_path, min_idle=0, encodings=framed) as pool:
+        runner = StrategySandboxRunner(assets=pool.assets, pool=pool)
+        events = [_event(i, 100.0 if i % 3 == 0 else 50.0) for i in range(n)]
+        with runner.open_session(strategy_source=HELLO / "strategy.py", timeout_s=10.0) as session:
+            assert session.encoding == encoding
+            intents = session.send(events)
+            assert [m["event_id"] for m in session.send(events[:1])] == ["evt_0"]
+        assert [m["event_id"] for m in intents] == [f"evt_{i}" for i in range(0, n, 3)]
+
+        # The one-shot path pipelines too.
+        assert len(runner.run(strategy_source=HELLO / "strategy.py", events=events)) == len(intents)
+
+
+def test_per_event_round_trip_latency(tmp_path: Path):
+    n = 200
+    with _pool(tmp_path, min_idle=0) as pool:
+        runner = StrategySandboxRunner(assets=pool.assets, pool=pool)
+        with runner.open_session(strategy_source=HELLO / "strategy.py", timeout_s=5.0) as session:
+            rtts = []
+            for i in range(n):
+                t0 = time.perf_counter()
+                session.send([_event(i, 100.0 + (i % 2))])
+                rtts.append(time.perf_counter() - t0)
+        assert len(session.intents) == n
+
+    rtts.sort()
+    p50 = statistics.median(rtts)
+    p99 = rtts[int(n * 0.99) - 1]
+    print(f"session per-event round trip: p50={p50 * 1e6:.0f}us p99={p99 * 1e6:.0f}us (n={n})")
+    # One open connection: a round trip costs far less than a boot.
+    assert p50 < BOOT_S
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import json
+import logging
+import queue
+
+import pytest
+
+from backend.common import logging as structured_logging
+from backend.common.logging import bind_request_id, flush_structured_logging, init_structured_logging
+from backend.common.ops_metrics import REGISTRY
+
+
+@pytest.fixture(autouse=True)
+def _restore_root_logging():
+    root = logging.getLogger()
+    prev_handlers, prev_level = list(root.handlers), root.level
+    yield
+    structured_logging._stop_queued_logging()
+    root.handlers = prev_handlers
+    root.setLevel(prev_level)
+
+
+def _lines(capsys: pytest.CaptureFixture[str]) -> list[dict]:
+    out = capsys.readouterr().out
+    return [json.loads(line) for line in out.splitlines() if line.startswith("{")]
+
+
+def test_queued_mode_formats_on_listener_with_caller_context(capsys: pytest.CaptureFixture[str]) -> None:
+    init_structured_logging(service="svc", env="test", queued=True, queue_size=100)
+    lg = logging.getLogger("queued.test")
+    args = {"n": 1}
+
+    with bind_request_id(request_id="req-123"):
+        lg.info("hello %s", args, extra={"event_type": "unit.test", "symbol": "SPY"})
+    args["n"] = 2  # mutation after the call must not leak into the line
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        lg.exception("failed")
+
+    assert flush_structured_logging(timeout_s=5.0)
+    first, second = _lines(capsys)
+    assert first["message"] == "hello {'n': 1}"
+    assert first["request_id"] == "req-123"
+    assert first["correlation_id"] == "req-123"
+    assert first["event_type"] == "unit.test"
+    assert first["symbol"] == "SPY"
+    assert first["service"] == "svc"
+    assert second["severity"] == "ERROR"
+    assert "ValueError: boom" in second["exception"]
+
+
+def test_queued_mode_drops_and_counts_when_full(capsys: pytest.CaptureFixture[str]) -> None:
+    init_structured_logging(service="svc", queued=True, queue_size=1)
+    handler = structured_logging._queue_handler
+    assert handler is not None
+    # Stop the consumer so the queue stays full.
+    structured_logging._queue_listener.stop()
+    before = REGISTRY.snapshot()["log_records_dropped_total"][()]
+
+    lg = logging.getLogger("queued.full")
+    for _ in range(5):
+        lg.warning("x")
+
+    assert isinstance(handler.queue, queue.Queue)
+    assert handler.dropped >= 4
+    after = REGISTRY.snapshot()["log_records_dropped_total"][()]
+    assert after - before == handler.dropped
+    structured_logging._queue_listener = None
+
+
+def test_reinit_to_sync_mode_drains_queue(capsys: pytest.CaptureFixture[str]) -> None:
+    init_structured_logging(service="svc", queued=True)
+    logging.getLogger("queued.reinit").info("queued line")
+    init_structured_logging(service="svc", queued=False)
+    logging.getLogger("queued.reinit").info("sync line")
+
+    messages = [line["message"] for line in _lines(capsys)]
+    assert messages == ["queued line", "sync line"]
+    assert structured_logging._queue_handler is None
+
+
+def test_queued_mode_leaves_the_callers_record_untouched(capsys: pytest.CaptureFixture[str]) -> None:
+    init_structured_logging(service="svc", queued=True)
+    seen: list[logging.LogRecord] = []
+
+    class _Capture(logging.Handler):
+        def emit(self, record: logging.LogRecord) -> None:
+            seen.append(record)
+
+    logging.getLogger().addHandler(_Capture())  # runs after the queue handler
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logging.getLogger("queued.shared").exception("failed %s", "once")
+
+    assert flush_structured_logging(timeout_s=5.0)
+    [record] = seen
+    assert (record.msg, record.args) == ("failed %s", ("once",))
+    assert record.exc_info is not None and record.exc_info[0] is ValueError
+    assert "request_id" not in record.__dict__
+    [line] = _lines(capsys)
+    assert line["message"] == "failed once"
+    assert "ValueError: boom" in line["exception"]
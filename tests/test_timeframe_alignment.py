@@ -59,3 +59,16 @@ def test_1d_alignment_ny_midnight_boundary_dst_aware():
     assert e_before == ny_midnight_utc
     assert s_before == (ny_midnight - dt.timedelta(days=1)).astimezone(dt.timezone.utc)
 
+
+
+def test_intraday_bar_end_follows_next_boundary_across_dst_fall_back():
+    # 2025-11-02 01:00-02:00 NY occurs twice (EDT then EST).
+    tf_1m = parse_timeframe("1m")
+    s, e = bar_range_utc(_utc(2025, 11, 2, 6, 0, 30), tf_1m, tz="America/New_York")  # 01:00:30 EST
+    assert (s, e) == (_utc(2025, 11, 2, 6, 0), _utc(2025, 11, 2, 6, 1))
+    s, e = bar_range_utc(_utc(2025, 11, 2, 5, 59, 30), tf_1m, tz="America/New_York")  # 01:59:30 EDT
+    assert (s, e) == (_utc(2025, 11, 2, 5, 59), _utc(2025, 11, 2, 6, 0))
+
+    # 4h bars stay wall-clock aligned: 00:00-04:00 NY spans 5 elapsed hours on this day.
+    s, e = bar_range_utc(_utc(2025, 11, 2, 8, 30), parse_timeframe("4h"), tz="America/New_York")
+    assert (s, e) == (_utc(2025, 11, 2, 4, 0), _utc(2025, 11, 2, 9, 0))
@@ -0,0 +1,256 @@
+"""
+Unit tests for the concurrent watchdog sweep (no emulator).
+
+An in-memory fake stands in for the sync and async Firestore clients so paging,
+deadline cancellation, checkpoint resume and exactly-once counting are exercised
+deterministically.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import pytest
+
+try:
+    from functions.utils.watchdog import monitor_all_users_concurrent
+except Exception as e:  # pragma: no cover
+    pytestmark = pytest.mark.xfail(
+        reason=f"Watchdog depends on optional cloud deps (e.g. Firestore / Vertex AI): {type(e).__name__}: {e}",
+        strict=False,
+    )
+
+Path = Tuple[str, ...]
+
+
+class _Snapshot:
+    def __init__(self, doc_id: str, data: Optional[Dict[str, Any]]) -> None:
+        self.id = doc_id
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        return dict(self._data) if self._data is not None else None
+
+
+class _FakeStore:
+    def __init__(self) -> None:
+        self.docs: Dict[Path, Dict[str, Any]] = {}
+        self.hang_reads_for: set[str] = set()
+        self.slow_writes_for: Dict[str, float] = {}
+        self.page_cursors: list[Optional[str]] = []
+        self.kill_switch_writes: list[str] = []
+        self._auto_id = 0
+
+    def children(self, path: Path) -> list[str]:
+        n = len(path)
+        return sorted({k[n] for k in list(self.docs) if k[:n] == path and len(k) > n})
+
+
+class _DocRef:
+    def __init__(self, store: _FakeStore, path: Path, is_async: bool) -> None:
+        self._store, self._path, self._async = store, path, is_async
+        self.id = path[-1]
+
+    def collection(self, name: str) -> "_Query":
+        return _Query(self._store, self._path + (name,), self._async)
+
+    def _get(self) -> _Snapshot:
+        return _Snapshot(self.id, self._store.docs.get(self._path))
+
+    def _set(self, data: Dict[str, Any], merge: bool = False) -> None:
+        if self._path[0] == "users" and self._path[-2:] == ("status", "trading"):
+            self._store.kill_switch_writes.append(self._path[1])
+            time.sleep(self._store.slow_writes_for.get(self._path[1], 0.0))
+        if merge:
+            self._store.docs.setdefault(self._path, {}).update(data)
+        else:
+            self._store.docs[self._path] = dict(data)
+
+    def get(self):
+        if not self._async:
+            return self._get()
+
+        async def _aget() -> _Snapshot:
+            if self._path[0] == "users" and self._path[1] in self._store.hang_reads_for:
+                await asyncio.Event().wait()
+            await asyncio.sleep(0)
+            return self._get()
+
+        return _aget()
+
+    def set(self, data: Dict[str, Any], merge: bool = False):
+        if not self._async:
+            return self._set(data, merge)
+
+        async def _aset() -> None:
+            self._set(data, merge)
+
+        return _aset()
+
+
+class _Query:
+    def __init__(self, store: _FakeStore, path: Path, is_async: bool, **opts: Any) -> None:
+        self._store, self._path, self._async = store, path, is_async
+        self._opts = {"filters": (), "order": None, "limit": None, "after": None, **opts}
+
+    def _with(self, **opts: Any) -> "_Query":
+        return _Query(self._store, self._path, self._async, **{**self._opts, **opts})
+
+    def document(self, doc_id: str) -> _DocRef:
+        return _DocRef(self._store, self._path + (doc_id,), self._async)
+
+    def where(self, field: str, op: str, value: Any) -> "_Query":
+        assert op == ">="
+        return self._with(filters=self._opts["filters"] + ((field, value),))
+
+    def order_by(self, field: str, direction: Any = None) -> "_Query":
+        return self._with(order=(str(field), direction))
+
+    def limit(self, n: int) -> "_Query":
+        return self._with(limit=n)
+
+    def start_after(self, values: Dict[str, Any]) -> "_Query":
+        return self._with(after=values["__name__"])
+
+    def add(self, data: Dict[str, Any]):
+        self._store._auto_id += 1
+        ref = self.document(f"auto-{self._store._auto_id}")
+        ref._set(data)
+        return (None, ref)
+
+    def _snapshots(self) -> list[_Snapshot]:
+        out = []
+        for doc_id in self._store.children(self._path):
+            if self._opts["after"] is not None and doc_id <= self._opts["after"]:
+                continue
+            data = self._store.docs.get(self._path + (doc_id,), {})
+            if all(f in data and data[f] >= v for f, v in self._opts["filters"]):
+                out.append(_Snapshot(doc_id, data))
+        order = self._opts["order"]
+        if order and order[0] != "__name__":
+            out.sort(key=lambda s: s._data[order[0]], reverse=True)
+        return out[: self._opts["limit"]] if self._opts["limit"] else out
+
+    def stream(self):
+        if self._path == ("users",):
+            self._store.page_cursors.append(self._opts["after"])
+        if not self._async:
+            return iter(self._snapshots())
+
+        async def _astream():
+            await asyncio.sleep(0)
+            for snap in self._snapshots():
+                yield snap
+
+        return _astream()
+
+
+class _FakeClient:
+    project = "demo-watchdog-unit"
+
+    def __init__(self, store: _FakeStore, is_async: bool) -> None:
+        self._store, self._async = store, is_async
+
+    def collection(self, name: str) -> _Query:
+        return _Query(self._store, (name,), self._async)
+
+
+ANOMALOUS = {"u006", "u013"}
+N_USERS = 20
+
+
+@pytest.fixture
+def store(monkeypatch: pytest.MonkeyPatch) -> _FakeStore:
+    # Keep explanations on the local fallback path (no Vertex AI calls).
+    for var in ("GOOGLE_CLOUD_PROJECT", "GCP_PROJECT"):
+        monkeypatch.delenv(var, raising=False)
+    s = _FakeStore()
+    now = datetime.utcnow()
+    for i in range(N_USERS):
+        user_id = f"u{i:03d}"
+        s.docs[("users", user_id)] = {"n": i}
+        if user_id in ANOMALOUS:
+            for t in range(5):
+                s.docs[("users", user_id, "shadowTradeHistory", f"t{t}")] = {
+                    "created_at": now, "symbol": "SPY", "pnl_percent": "-1.5", "current_pnl": "-15.00",
+                }
+    s.docs[("systemStatus", "market_regime")] = {"spy": {"net_gex": "1000"}, "market_volatility_bias": "Bullish"}
+    return s
+
+
+def _sweep(store: _FakeStore, deadline_seconds: float) -> Dict[str, Any]:
+    return asyncio.run(
+        monitor_all_users_concurrent(
+            _FakeClient(store, is_async=False),
+            async_db=_FakeClient(store, is_async=True),
+            concurrency=4,
+            page_size=8,
+            deadline_seconds=deadline_seconds,
+        )
+    )
+
+
+def test_sweep_pages_by_cursor_and_writes_status(store: _FakeStore) -> None:
+    result = _sweep(store, deadline_seconds=30.0)
+
+    assert result["success"] is True and result["completed"] is True and result["resumed"] is False
+    assert store.page_cursors == [None, "u007", "u015"]
+    assert result["users_monitored"] == N_USERS
+    assert result["kill_switches_activated"] == len(ANOMALOUS)
+    assert sorted(store.kill_switch_writes) == sorted(ANOMALOUS)
+
+    status = store.docs[("ops", "watchdog_status")]
+    assert status["users_monitored"] == N_USERS
+    assert status["kill_switches_activated"] == len(ANOMALOUS)
+    assert store.docs[("ops", "watchdog_sweep_checkpoint")]["completed"] is True
+
+
+def test_deadline_cancels_reads_finishes_writes_and_resumes_exactly_once(store: _FakeStore) -> None:
+    # u005 never finishes its reads; u006 is still writing its kill-switch at the deadline.
+    store.hang_reads_for.add("u005")
+    store.slow_writes_for["u006"] = 0.4
+
+    first = _sweep(store, deadline_seconds=0.2)
+
+    assert first["success"] is True and first["completed"] is False
+    assert first["cursor"] == "u004"
+    first_ids = [r["user_id"] for r in first["results"]]
+    assert "u005" not in first_ids and {"u006", "u007"} <= set(first_ids)
+    assert first["kill_switches_activated"] == 1  # u006's write finished and was tallied
+    checkpoint = store.docs[("ops", "watchdog_sweep_checkpoint")]
+    assert checkpoint["completed"] is False
+    assert checkpoint["cursor"] == "u004"
+    assert checkpoint["done_after_cursor"] == ["u006", "u007"]
+    assert checkpoint["users_monitored"] == 7
+    assert ("ops", "watchdog_status") not in store.docs
+
+    store.hang_reads_for.clear()
+    second = _sweep(store, deadline_seconds=30.0)
+
+    assert second["completed"] is True and second["resumed"] is True
+    second_ids = [r["user_id"] for r in second["results"]]
+    assert "u006" not in second_ids and "u007" not in second_ids
+    all_ids = first_ids + second_ids
+    assert sorted(all_ids) == [f"u{i:03d}" for i in range(N_USERS)]  # each user exactly once
+    assert second["users_monitored"] == N_USERS
+    assert second["kill_switches_activated"] == len(ANOMALOUS)
+    assert sorted(store.kill_switch_writes) == sorted(ANOMALOUS)
+    assert store.docs[("ops", "watchdog_status")]["users_monitored"] == N_USERS
+    assert store.docs[("ops", "watchdog_sweep_checkpoint")] == {
+        "cursor": None, "completed": True, "updated_at": store.docs[("ops", "watchdog_sweep_checkpoint")]["updated_at"],
+    }
+
+
+def test_completed_checkpoint_starts_a_fresh_sweep(store: _FakeStore) -> None:
+    _sweep(store, deadline_seconds=30.0)
+    again = _sweep(store, deadline_seconds=30.0)
+
+    assert again["completed"] is True and again["resumed"] is False
+    assert store.page_cursors[-3:] == [None, "u007", "u015"]
+    assert again["users_monitored"] == N_USERS  # totals reset, not carried over
+    assert again["kill_switches_activated"] == 0  # already disabled by the first sweep
+    assert {r["status"] for r in again["results"] if r["user_id"] in ANOMALOUS} == {"ALREADY_DISABLED"}
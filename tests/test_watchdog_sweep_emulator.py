@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import uuid
+from datetime import datetime
+
+import pytest
+try:
+    from google.cloud import firestore
+
+    from functions.utils.watchdog import monitor_all_users_concurrent
+except Exception as e:  # pragma: no cover
+    pytestmark = pytest.mark.xfail(
+        reason=f"Optional dependency for Firestore emulator tests missing: {type(e).__name__}: {e}",
+        strict=False,
+    )
+
+ANOMALOUS_EVERY = 250
+
+
+def _seed_users(client: "firestore.Client", n_users: int) -> list[str]:
+    """Create n_users users; every ANOMALOUS_EVERY-th one gets a 5-trade losing streak."""
+    anomalous = []
+    batch = client.batch()
+    pending = 0
+    now = datetime.utcnow()
+    for i in range(n_users):
+        user_id = f"user-{i:06d}"
+        user_ref = client.collection("users").document(user_id)
+        batch.set(user_ref, {"display_name": user_id})
+        pending += 1
+        if i % ANOMALOUS_EVERY == 0:
+            anomalous.append(user_id)
+            for t in range(5):
+                batch.set(
+                    user_ref.collection("shadowTradeHistory").document(f"t{t}"),
+                    {"created_at": now, "symbol": "SPY", "pnl_percent": "-1.5", "current_pnl": "-15.00"},
+                )
+                pending += 1
+        if pending >= 400:
+            batch.commit()
+            batch = client.batch()
+            pending = 0
+    if pending:
+        batch.commit()
+    return anomalous
+
+
+def test_concurrent_sweep_resumes_from_checkpoint_on_emulator(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Integration gate: the concurrent watchdog sweep covers 5k users exactly once across
+    a deadline-interrupted run and its resumed run.
+
+    This test is intended to run under:
+      firebase-tools emulators:exec --only firestore ...
+    """
+
+    if not os.getenv("FIRESTORE_EMULATOR_HOST"):
+        pytest.skip("FIRESTORE_EMULATOR_HOST is not set; run under Firestore emulator")
+
+    # Fresh project id: the emulator keeps data per project, so each run starts empty.
+    project = f"demo-watchdog-{uuid.uuid4().hex[:8]}"
+    n_users = int(os.getenv("WATCHDOG_EMULATOR_USERS", "5000"))
+    # Keep explanations on the local fallback path (no Vertex AI calls).
+    for var in ("GOOGLE_CLOUD_PROJECT", "GCP_PROJECT"):
+        monkeypatch.delenv(var, raising=False)
+
+    db = firestore.Client(project=project)
+    anomalous = _seed_users(db, n_users)
+
+    async def _sweep(deadline_seconds: float) -> dict:
+        return await monitor_all_users_concurrent(
+            db,
+            async_db=firestore.AsyncClient(project=project),
+            concurrency=50,
+            page_size=500,
+            deadline_seconds=deadline_seconds,
+        )
+
+    first = asyncio.run(_sweep(deadline_seconds=1.0))
+    assert first["success"] is True
+    if not first["completed"]:
+        checkpoint = db.collection("ops").document("watchdog_sweep_checkpoint").get().to_dict() or {}
+        assert checkpoint["completed"] is False
+        assert checkpoint["cursor"] == first["cursor"]
+        assert checkpoint["users_monitored"] == first["users_processed"]
+
+        resumed = asyncio.run(_sweep(deadline_seconds=600.0))
+        assert resumed["success"] is True and resumed["completed"] is True
+        assert resumed["resumed"] is (first["cursor"] is not None)
+        final = resumed
+        results = first["results"] + resumed["results"]
+    else:
+        final = first
+        results = first["results"]
+
+    assert final["users_monitored"] == n_users
+    assert final["errors"] == 0
+    # Every user is counted exactly once across both runs: users finished past the
+    # cursor in the first run are recorded in the checkpoint and skipped on resume.
+    statuses = {r["user_id"]: r["status"] for r in results}
+    assert len(results) == len(statuses) == n_users
+    halted = {u for u, s in statuses.items() if s in ("KILL_SWITCH_ACTIVATED", "ALREADY_DISABLED")}
+    assert halted == set(anomalous)
+
+    status = db.collection("ops").document("watchdog_status").get().to_dict() or {}
+    assert status["users_monitored"] == n_users
+    assert (db.collection("ops").document("watchdog_sweep_checkpoint").get().to_dict() or {})["completed"] is True
+    for user_id in anomalous:
+        trading = db.collection("users").document(user_id).collection("status").document("trading").get()
+        assert (trading.to_dict() or {}).get("enabled") is False